@@ -6,3 +6,23 @@ class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
     verbose_name = _('Учетные записи')
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save, \
+            pre_delete
+
+        from accounts.models import User, Employee
+        from accounts import fragment_cache
+        from accounts.org_graph import employee_deleted, employee_saved
+        from talentum import invalidation
+
+        post_save.connect(employee_saved, sender=Employee)
+        post_delete.connect(employee_deleted, sender=Employee)
+
+        post_save.connect(fragment_cache.employee_saved, sender=Employee)
+        pre_delete.connect(fragment_cache.employee_deleting, sender=Employee)
+        post_save.connect(fragment_cache.user_changed, sender=User)
+        pre_delete.connect(fragment_cache.user_changed, sender=User)
+
+        invalidation.track(User)
+        invalidation.track(Employee, 'user')
@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, identify_hasher, \
+    make_password
+from django.db.models import Exists, OuterRef
+
+from accounts.login_executor import get_login_executor
+from accounts.models import Employee
+
+UserModel = get_user_model()
+
+
+def login_queryset():
+    """
+    Пользователь вместе с профилем сотрудника и признаком наличия
+    подчиненных (has_subordinates) - все, что нужно для ответа
+    на вход, одним запросом.
+    """
+    return UserModel._default_manager.select_related(
+        'employee_profile'
+    ).annotate(
+        has_subordinates=Exists(Employee.objects.filter(
+            manager_id=OuterRef('employee_profile__id')
+        ))
+    )
+
+
+def _needs_rehash(encoded):
+    try:
+        return identify_hasher(encoded).must_update(encoded)
+    except ValueError:
+        return False
+
+
+class OffloadedPasswordBackend(ModelBackend):
+    """
+    ModelBackend, который выполняет хеширование паролей в пуле
+    get_login_executor(). Запросы к базе остаются в вызывающем потоке,
+    в пул передаются только чистые функции check_password/make_password.
+    Для несуществующего пользователя пароль тоже хешируется, чтобы время
+    ответа не выдавало наличие учетной записи.
+    """
+
+    def _credentials(self, username, kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        return username
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        username = self._credentials(username, kwargs)
+        if username is None or password is None:
+            return None
+
+        executor = get_login_executor()
+        try:
+            user = login_queryset().get(
+                **{UserModel.USERNAME_FIELD: username}
+            )
+        except UserModel.DoesNotExist:
+            executor.run(make_password, password)
+            return None
+
+        if not executor.run(check_password, password, user.password):
+            return None
+        if _needs_rehash(user.password):
+            user.password = executor.run(make_password, password)
+            user.save(update_fields=['password'])
+        if self.user_can_authenticate(user):
+            return user
+        return None
+
+    async def aauthenticate(self, request, username=None, password=None,
+                            **kwargs):
+        username = self._credentials(username, kwargs)
+        if username is None or password is None:
+            return None
+
+        executor = get_login_executor()
+        try:
+            user = await login_queryset().aget(
+                **{UserModel.USERNAME_FIELD: username}
+            )
+        except UserModel.DoesNotExist:
+            await executor.arun(make_password, password)
+            return None
+
+        if not await executor.arun(check_password, password, user.password):
+            return None
+        if _needs_rehash(user.password):
+            user.password = await executor.arun(make_password, password)
+            await user.asave(update_fields=['password'])
+        if self.user_can_authenticate(user):
+            return user
+        return None
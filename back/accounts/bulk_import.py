@@ -0,0 +1,529 @@
+import csv
+import io
+import json
+import os
+
+from django.db import connection, transaction
+
+from accounts.models import User
+from accounts.org_graph import schedule_rebuild
+from talentum import invalidation
+from goals.models import Goal
+
+FORMAT_CSV = 'csv'
+FORMAT_JSONL = 'jsonl'
+FORMATS = (FORMAT_CSV, FORMAT_JSONL)
+FORMAT_EXTENSIONS = {
+    '.csv': FORMAT_CSV,
+    '.jsonl': FORMAT_JSONL,
+    '.ndjson': FORMAT_JSONL,
+}
+
+MAX_ERRORS = 100
+
+EMPLOYEE_COLUMNS = (
+    'username',
+    'email',
+    'first_name',
+    'last_name',
+    'role',
+    'position',
+    'hire_dt',
+    'manager',
+)
+EMPLOYEE_REQUIRED_COLUMNS = ('username', 'email', 'position', 'hire_dt')
+
+GOAL_COLUMNS = (
+    'employee',
+    'title',
+    'description',
+    'expected_results',
+    'start_period',
+    'end_period',
+    'status',
+)
+GOAL_REQUIRED_COLUMNS = ('employee', 'title', 'start_period', 'end_period')
+
+IS_DATE_SQL = """
+CREATE OR REPLACE FUNCTION pg_temp.import_is_date(value text)
+RETURNS boolean LANGUAGE plpgsql STABLE AS $$
+BEGIN
+    PERFORM value::date;
+    RETURN true;
+EXCEPTION WHEN others THEN
+    RETURN false;
+END
+$$
+"""
+
+EMPLOYEE_ERRORS_SQL = """
+SELECT line, message FROM (
+    SELECT line, 'username: обязательное поле' AS message
+    FROM import_employees WHERE username IS NULL
+    UNION ALL
+    SELECT line, 'email: обязательное поле'
+    FROM import_employees WHERE email IS NULL
+    UNION ALL
+    SELECT line, 'position: обязательное поле'
+    FROM import_employees WHERE position IS NULL
+    UNION ALL
+    SELECT line, 'hire_dt: обязательное поле'
+    FROM import_employees WHERE hire_dt IS NULL
+    UNION ALL
+    SELECT line, 'username: не более 150 символов'
+    FROM import_employees WHERE length(username) > 150
+    UNION ALL
+    SELECT line, 'position: не более 100 символов'
+    FROM import_employees WHERE length(position) > 100
+    UNION ALL
+    SELECT line, 'email: некорректный адрес'
+    FROM import_employees
+    WHERE email !~ '^[^@\\s]+@[^@\\s]+$' OR length(email) > 254
+    UNION ALL
+    SELECT line, 'role: недопустимое значение ' || role
+    FROM import_employees WHERE role <> ALL(%(roles)s)
+    UNION ALL
+    SELECT line, 'hire_dt: некорректная дата ' || hire_dt
+    FROM import_employees WHERE NOT pg_temp.import_is_date(hire_dt)
+    UNION ALL
+    SELECT line, 'username: повторяется в файле'
+    FROM (
+        SELECT line, count(*) OVER (PARTITION BY username) AS n
+        FROM import_employees WHERE username IS NOT NULL
+    ) duplicates WHERE n > 1
+    UNION ALL
+    SELECT line, 'email: повторяется в файле'
+    FROM (
+        SELECT line, count(*) OVER (PARTITION BY email) AS n
+        FROM import_employees WHERE email IS NOT NULL
+    ) duplicates WHERE n > 1
+    UNION ALL
+    SELECT s.line, 'email: уже используется пользователем ' || u.username
+    FROM import_employees s
+    JOIN users u ON u.email = s.email AND u.username <> s.username
+    UNION ALL
+    SELECT line, 'manager: сотрудник не может быть своим руководителем'
+    FROM import_employees WHERE manager = username
+    UNION ALL
+    SELECT s.line, 'manager: неизвестный сотрудник ' || s.manager
+    FROM import_employees s
+    WHERE s.manager IS NOT NULL
+      AND NOT EXISTS (
+          SELECT 1 FROM import_employees m WHERE m.username = s.manager
+      )
+      AND NOT EXISTS (
+          SELECT 1 FROM users u JOIN employees e ON e.user_id = u.id
+          WHERE u.username = s.manager
+      )
+) errors
+ORDER BY line, message
+"""
+
+# Иерархия после загрузки: руководители из файла заменяют текущих,
+# остальные сотрудники сохраняют своих. Обход вверх от каждой строки
+# останавливается на повторно встреченном сотруднике; строка входит
+# в цикл, если обход вернулся к ней самой.
+EMPLOYEE_CYCLES_SQL = """
+WITH RECURSIVE edges(username, manager) AS (
+    SELECT username, manager FROM import_employees
+    UNION ALL
+    SELECT u.username, mu.username
+    FROM employees e
+    JOIN users u ON u.id = e.user_id
+    LEFT JOIN employees m ON m.id = e.manager_id
+    LEFT JOIN users mu ON mu.id = m.user_id
+    WHERE NOT EXISTS (
+        SELECT 1 FROM import_employees s WHERE s.username = u.username
+    )
+),
+walk(line, start, current, path) AS (
+    SELECT line, username, manager, ARRAY[username]
+    FROM import_employees WHERE manager IS NOT NULL
+    UNION ALL
+    SELECT w.line, w.start, e.manager, w.path || w.current
+    FROM walk w
+    JOIN edges e ON e.username = w.current
+    WHERE e.manager IS NOT NULL AND w.current <> ALL(w.path)
+)
+SELECT DISTINCT line, 'manager: циклическая ссылка в иерархии'
+FROM walk WHERE current = start
+ORDER BY line
+"""
+
+# Пустые имя, фамилия и роль не затирают текущие значения
+# существующих пользователей.
+UPDATE_USERS_SQL = """
+UPDATE users u SET
+    email = s.email,
+    first_name = coalesce(s.first_name, u.first_name),
+    last_name = coalesce(s.last_name, u.last_name),
+    role = coalesce(s.role, u.role)
+FROM import_employees s
+WHERE u.username = s.username
+"""
+
+INSERT_USERS_SQL = """
+INSERT INTO users (
+    username, email, first_name, last_name, role, password,
+    is_superuser, is_staff, is_active, date_joined, registration_dttm
+)
+SELECT
+    s.username, s.email, coalesce(s.first_name, ''),
+    coalesce(s.last_name, ''), coalesce(s.role, %(default_role)s),
+    '!' || md5(random()::text || clock_timestamp()::text),
+    false, false, true, now(), now()
+FROM import_employees s
+WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.username = s.username)
+"""
+
+UPSERT_EMPLOYEES_SQL = """
+WITH upserted AS (
+    INSERT INTO employees (user_id, hire_dt, position)
+    SELECT u.id, s.hire_dt::date, s.position
+    FROM import_employees s
+    JOIN users u ON u.username = s.username
+    ON CONFLICT (user_id) DO UPDATE SET
+        hire_dt = EXCLUDED.hire_dt,
+        position = EXCLUDED.position
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+FROM upserted
+"""
+
+# Руководители назначаются одним UPDATE после загрузки всех строк,
+# поэтому порядок строк в файле значения не имеет.
+UPDATE_MANAGERS_SQL = """
+UPDATE employees e
+SET manager_id = m.id
+FROM import_employees s
+JOIN users u ON u.username = s.username
+LEFT JOIN users mu ON mu.username = s.manager
+LEFT JOIN employees m ON m.user_id = mu.id
+WHERE e.user_id = u.id AND e.manager_id IS DISTINCT FROM m.id
+"""
+
+GOAL_ERRORS_SQL = """
+SELECT line, message FROM (
+    SELECT line, 'employee: обязательное поле' AS message
+    FROM import_goals WHERE employee IS NULL
+    UNION ALL
+    SELECT line, 'title: обязательное поле'
+    FROM import_goals WHERE title IS NULL
+    UNION ALL
+    SELECT line, 'start_period: обязательное поле'
+    FROM import_goals WHERE start_period IS NULL
+    UNION ALL
+    SELECT line, 'end_period: обязательное поле'
+    FROM import_goals WHERE end_period IS NULL
+    UNION ALL
+    SELECT line, 'title: не более 255 символов'
+    FROM import_goals WHERE length(title) > 255
+    UNION ALL
+    SELECT line, 'status: недопустимое значение ' || status
+    FROM import_goals WHERE status <> ALL(%(statuses)s)
+    UNION ALL
+    SELECT line, 'start_period: некорректная дата ' || start_period
+    FROM import_goals WHERE NOT pg_temp.import_is_date(start_period)
+    UNION ALL
+    SELECT line, 'end_period: некорректная дата ' || end_period
+    FROM import_goals WHERE NOT pg_temp.import_is_date(end_period)
+    UNION ALL
+    SELECT line, 'end_period: раньше начала периода'
+    FROM import_goals
+    WHERE CASE
+        WHEN pg_temp.import_is_date(start_period)
+             AND pg_temp.import_is_date(end_period)
+        THEN end_period::date < start_period::date
+    END
+    UNION ALL
+    SELECT line, 'title: цель с таким началом периода повторяется в файле'
+    FROM (
+        SELECT line, count(*) OVER (
+            PARTITION BY employee, title, start_period
+        ) AS n
+        FROM import_goals
+        WHERE employee IS NOT NULL AND title IS NOT NULL
+          AND start_period IS NOT NULL
+    ) duplicates WHERE n > 1
+    UNION ALL
+    SELECT s.line, 'employee: неизвестный сотрудник ' || s.employee
+    FROM import_goals s
+    WHERE s.employee IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM users u JOIN employees e ON e.user_id = u.id
+        WHERE u.username = s.employee
+    )
+) errors
+ORDER BY line, message
+"""
+
+# Цель определяется сотрудником, названием и началом периода.
+UPDATE_GOALS_SQL = """
+UPDATE goals g SET
+    description = coalesce(s.description, g.description),
+    expected_results = coalesce(s.expected_results, g.expected_results),
+    end_period = s.end_period::date,
+    status = coalesce(s.status, g.status),
+    updated_dttm = now()
+FROM import_goals s
+JOIN users u ON u.username = s.employee
+JOIN employees e ON e.user_id = u.id
+WHERE g.employee_id = e.id
+  AND g.title = s.title
+  AND g.start_period = s.start_period::date
+"""
+
+INSERT_GOALS_SQL = """
+INSERT INTO goals (
+    employee_id, title, description, expected_results,
+    start_period, end_period, status, created_dttm, updated_dttm
+)
+SELECT
+    e.id, s.title, coalesce(s.description, ''),
+    coalesce(s.expected_results, ''), s.start_period::date,
+    s.end_period::date, coalesce(s.status, %(default_status)s), now(), now()
+FROM import_goals s
+JOIN users u ON u.username = s.employee
+JOIN employees e ON e.user_id = u.id
+WHERE NOT EXISTS (
+    SELECT 1 FROM goals g
+    WHERE g.employee_id = e.id
+      AND g.title = s.title
+      AND g.start_period = s.start_period::date
+)
+"""
+
+
+class BulkImportError(Exception):
+    """Ошибки проверки загружаемых данных; ничего не записано."""
+
+    def __init__(self, errors, total=None):
+        self.errors = errors
+        self.total = total if total is not None else len(errors)
+        super().__init__(f'{self.total} ошибок в загружаемых данных')
+
+
+def detect_format(filename, default=None):
+    extension = os.path.splitext(filename or '')[1].lower()
+    file_format = FORMAT_EXTENSIONS.get(extension, default)
+    if file_format is None:
+        raise BulkImportError([{
+            'file': filename,
+            'line': None,
+            'message': 'Неизвестный формат файла, ожидается CSV или JSONL',
+        }])
+    return file_format
+
+
+def _text_stream(stream):
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def read_records(stream, file_format, columns, required_columns, name):
+    """
+    Строки файла в виде кортежей (номер строки, значения columns...).
+    Пустые значения приводятся к None. Номер строки - номер записи
+    в файле, начиная с 1 (без заголовка CSV).
+    """
+    stream = _text_stream(stream)
+
+    if file_format == FORMAT_CSV:
+        reader = csv.DictReader(stream)
+        missing = set(required_columns) - set(reader.fieldnames or [])
+        if missing:
+            raise BulkImportError([{
+                'file': name,
+                'line': None,
+                'message': 'Нет обязательных колонок: '
+                           + ', '.join(sorted(missing)),
+            }])
+        for line, record in enumerate(reader, start=1):
+            yield (line, *(_clean(record.get(column)) for column in columns))
+        return
+
+    line = 0
+    for raw_line in stream:
+        if not raw_line.strip():
+            continue
+        line += 1
+        try:
+            record = json.loads(raw_line)
+        except ValueError:
+            record = None
+        if not isinstance(record, dict):
+            raise BulkImportError([{
+                'file': name,
+                'line': line,
+                'message': 'Строка не является JSON-объектом',
+            }])
+        yield (line, *(_clean(record.get(column)) for column in columns))
+
+
+class CopyStream:
+    """
+    Файлоподобный объект для COPY FROM STDIN: строки записей
+    сериализуются в CSV по мере чтения, без промежуточного файла.
+    Ошибка чтения файла завершает поток и сохраняется в error.
+    """
+
+    def __init__(self, records):
+        self.records = iter(records)
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.pending = ''
+        self.error = None
+
+    def read(self, size=-1):
+        while size < 0 or len(self.pending) < size:
+            try:
+                record = next(self.records)
+            except StopIteration:
+                break
+            except BulkImportError as error:
+                self.error = error
+                self.pending = ''
+                break
+            self.writer.writerow(record)
+            self.pending += self.buffer.getvalue()
+            self.buffer.seek(0)
+            self.buffer.truncate()
+
+        if size < 0:
+            size = len(self.pending)
+        chunk, self.pending = self.pending[:size], self.pending[size:]
+        return chunk
+
+
+def _create_staging_table(cursor, table, columns):
+    definitions = ', '.join(f'{column} text' for column in columns)
+    cursor.execute(f'DROP TABLE IF EXISTS {table}')
+    cursor.execute(
+        f'CREATE TEMPORARY TABLE {table} (line integer, {definitions}) '
+        f'ON COMMIT DROP'
+    )
+
+
+def copy_records(cursor, table, columns, records):
+    """Загружает записи в таблицу через COPY; возвращает число строк."""
+    stream = CopyStream(records)
+    cursor.copy_expert(
+        f'COPY {table} (line, {", ".join(columns)}) '
+        f'FROM STDIN WITH (FORMAT csv)',
+        stream
+    )
+    if stream.error:
+        raise stream.error
+    cursor.execute(f'ANALYZE {table}')
+    cursor.execute(f'SELECT count(*) FROM {table}')
+    return cursor.fetchone()[0]
+
+
+def _check(cursor, sql, params, name):
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
+    if rows:
+        raise BulkImportError(
+            [
+                {'file': name, 'line': line, 'message': message}
+                for line, message in rows[:MAX_ERRORS]
+            ],
+            total=len(rows)
+        )
+
+
+def _import_employees(cursor, records):
+    _create_staging_table(cursor, 'import_employees', EMPLOYEE_COLUMNS)
+    rows = copy_records(
+        cursor, 'import_employees', EMPLOYEE_COLUMNS, records
+    )
+
+    _check(cursor, EMPLOYEE_ERRORS_SQL, {
+        'roles': [role for role, _ in User.ROLE_CHOICES],
+    }, 'employees')
+    _check(cursor, EMPLOYEE_CYCLES_SQL, None, 'employees')
+
+    cursor.execute(UPDATE_USERS_SQL)
+    users_updated = cursor.rowcount
+    cursor.execute(INSERT_USERS_SQL, {'default_role': User.ROLE_EMPLOYEE})
+    users_created = cursor.rowcount
+    cursor.execute(UPSERT_EMPLOYEES_SQL)
+    employees_created, employees_updated = cursor.fetchone()
+    cursor.execute(UPDATE_MANAGERS_SQL)
+    managers_changed = cursor.rowcount
+
+    return {
+        'rows': rows,
+        'users_created': users_created,
+        'users_updated': users_updated,
+        'employees_created': employees_created,
+        'employees_updated': employees_updated,
+        'managers_changed': managers_changed,
+    }
+
+
+def _import_goals(cursor, records):
+    _create_staging_table(cursor, 'import_goals', GOAL_COLUMNS)
+    rows = copy_records(cursor, 'import_goals', GOAL_COLUMNS, records)
+
+    _check(cursor, GOAL_ERRORS_SQL, {
+        'statuses': [status for status, _ in Goal.STATUS_CHOICES],
+    }, 'goals')
+
+    params = {'default_status': Goal.STATUS_DRAFT}
+    cursor.execute(UPDATE_GOALS_SQL, params)
+    goals_updated = cursor.rowcount
+    cursor.execute(INSERT_GOALS_SQL, params)
+    goals_created = cursor.rowcount
+
+    return {
+        'rows': rows,
+        'goals_created': goals_created,
+        'goals_updated': goals_updated,
+    }
+
+
+def import_org(employees=None, goals=None,
+               employees_format=FORMAT_CSV, goals_format=FORMAT_CSV):
+    """
+    Загружает пользователей с профилями сотрудников и/или цели из CSV или
+    JSONL одной транзакцией: COPY во временные таблицы, проверка всех
+    строк SQL-запросами и upsert в основные таблицы.
+
+    Сотрудники и руководители (колонка manager) задаются username;
+    новым пользователям назначается неиспользуемый пароль. Цель
+    определяется сотрудником, названием и началом периода. При ошибках
+    проверки выбрасывается BulkImportError и ничего не сохраняется.
+    """
+    result = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(IS_DATE_SQL)
+        if employees is not None:
+            result['employees'] = _import_employees(
+                cursor,
+                read_records(
+                    employees, employees_format, EMPLOYEE_COLUMNS,
+                    EMPLOYEE_REQUIRED_COLUMNS, 'employees'
+                )
+            )
+            # Руководители меняются SQL-запросами в обход сигналов
+            schedule_rebuild()
+        if goals is not None:
+            result['goals'] = _import_goals(
+                cursor,
+                read_records(
+                    goals, goals_format, GOAL_COLUMNS,
+                    GOAL_REQUIRED_COLUMNS, 'goals'
+                )
+            )
+        # Кеши процессов сбрасываются целиком после фиксации
+        invalidation.publish_all()
+    return result
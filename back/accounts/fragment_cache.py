@@ -0,0 +1,318 @@
+import threading
+import time
+import random
+from collections import Counter, OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from talentum import invalidation
+
+DEFAULT_LOCAL_SIZE = 10000
+DEFAULT_LOCAL_TTL = 60
+DEFAULT_SHARED_TTL = 60 * 60
+
+EMPLOYEE_PREFIX = 'accounts.employee:'
+USER_PREFIX = 'accounts.user:'
+# Поколение всех фрагментов: увеличивается при сбросе всех кешей
+GENERATION_KEY = 'employee-fragment-generation'
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Словарь с ограничением размера (вытесняются давно не читавшиеся
+    записи) и временем жизни записей. on_evict(key, value) вызывается
+    для каждой удаленной записи.
+    """
+
+    def __init__(self, maxsize, ttl, on_evict=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            expires, value = item
+            if expires < time.monotonic():
+                self._remove(key)
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            while len(self._data) > self.maxsize:
+                self._remove(next(iter(self._data)))
+
+    def pop(self, key):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._data):
+                self._remove(key)
+
+    def _remove(self, key):
+        _, value = self._data.pop(key)
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+
+def _copy(value):
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+class EmployeeFragmentCache:
+    """
+    Двухуровневый кеш сериализованных сотрудников (EmployeeSerializer).
+
+    Первый уровень - LRU в памяти процесса, второй - общий кеш Django
+    с ключом по поколению, ID сотрудника и его версии. После фиксации
+    изменений сотрудника, его пользователя или пользователя его
+    руководителя (manager_name) по шине инвалидации (talentum.invalidation)
+    рассылается ключ сотрудника; каждый процесс удаляет зависимые записи
+    первого уровня и увеличивает версию сотрудника во втором. Сброс всех
+    кешей (массовая загрузка, переподключение слушателя) увеличивает
+    поколение. Записи старых версий больше не читаются и истекают
+    по времени. Версии увеличиваются в каждом процессе, поэтому второй
+    уровень не устаревает и без общего бэкенда CACHES (LocMemCache
+    у каждого процесса свой).
+    """
+
+    def __init__(self, local_size, local_ttl, shared_ttl):
+        self.shared_ttl = shared_ttl
+        self.local = LRUCache(local_size, local_ttl, on_evict=self._evicted)
+        self.stats = Counter()
+        # Ключ шины -> ключи первого уровня, которые от него зависят
+        self._dependents = defaultdict(set)
+        self._lock = threading.RLock()
+
+    def _evicted(self, local_key, entry):
+        for dependency in entry[1]:
+            dependents = self._dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(local_key)
+                if not dependents:
+                    del self._dependents[dependency]
+
+    @staticmethod
+    def version_key(employee_id):
+        return f'employee-fragment-version:{employee_id}'
+
+    @staticmethod
+    def fragment_key(employee_id, generation, version):
+        return f'employee-fragment:{generation}:{employee_id}:{version}'
+
+    @staticmethod
+    def dependencies(employee):
+        keys = {
+            f'{EMPLOYEE_PREFIX}{employee.pk}',
+            f'{USER_PREFIX}{employee.user_id}',
+        }
+        if employee.manager_id is not None:
+            keys.add(f'{EMPLOYEE_PREFIX}{employee.manager_id}')
+            keys.add(f'{USER_PREFIX}{employee.manager.user_id}')
+        return keys
+
+    def _store_local(self, local_key, data, dependencies):
+        with self._lock:
+            self.local.set(local_key, (data, dependencies))
+            for dependency in dependencies:
+                self._dependents[dependency].add(local_key)
+
+    def invalidate(self, keys):
+        """Обработчик шины инвалидации: keys=None сбрасывает все."""
+        if keys is None:
+            self.bump_generation()
+        else:
+            self.bump_versions([
+                int(key[len(EMPLOYEE_PREFIX):]) for key in keys
+                if key.startswith(EMPLOYEE_PREFIX)
+            ])
+        self.invalidate_local(keys)
+
+    def invalidate_local(self, keys):
+        with self._lock:
+            if keys is None:
+                self.local.clear()
+                return
+            for key in keys:
+                for local_key in list(self._dependents.get(key, ())):
+                    self.local.pop(local_key)
+
+    def _bypass(self):
+        return any(
+            key == invalidation.ALL
+            or key.startswith(EMPLOYEE_PREFIX)
+            or key.startswith(USER_PREFIX)
+            for key in invalidation.pending_keys()
+        )
+
+    def _versions(self, employee_ids):
+        """Поколение и версии сотрудников {ID: версия}."""
+        keys = {self.version_key(pk): pk for pk in employee_ids}
+        keys[GENERATION_KEY] = None
+        found = cache.get_many(keys)
+        versions = {keys[key]: version for key, version in found.items()}
+        for key, pk in keys.items():
+            if pk not in versions:
+                # Случайная начальная версия: после вытеснения счетчика
+                # из общего кеша старые фрагменты не совпадут с новыми.
+                cache.add(key, random.getrandbits(48), None)
+                versions[pk] = cache.get(key)
+        return versions.pop(None), versions
+
+    def render_many(self, instances, render):
+        """
+        Представления сотрудников в исходном порядке; отсутствующие
+        в обоих уровнях получаются вызовом render(instance).
+        """
+        if self._bypass():
+            self.stats['bypassed'] += len(instances)
+            return [render(instance) for instance in instances]
+
+        results = [None] * len(instances)
+        missing = []
+        for index, instance in enumerate(instances):
+            entry = self.local.get(instance.pk)
+            if entry is None:
+                missing.append(index)
+            else:
+                results[index] = _copy(entry[0])
+        self.stats['local_hits'] += len(instances) - len(missing)
+        if not missing:
+            return results
+
+        generation, versions = self._versions(
+            {instances[i].pk for i in missing}
+        )
+        fragment_keys = {
+            i: self.fragment_key(instances[i].pk, generation,
+                                 versions[instances[i].pk])
+            for i in missing
+        }
+        found = cache.get_many(fragment_keys.values())
+        rendered = {}
+        for index in missing:
+            instance = instances[index]
+            entry = found.get(fragment_keys[index])
+            if entry is None:
+                data = render(instance)
+                entry = (data, self.dependencies(instance))
+                rendered[fragment_keys[index]] = entry
+                self.stats['misses'] += 1
+            else:
+                self.stats['shared_hits'] += 1
+            self._store_local(instance.pk, *entry)
+            results[index] = _copy(entry[0])
+        if rendered:
+            cache.set_many(rendered, self.shared_ttl)
+        return results
+
+    def bump_versions(self, employee_ids):
+        """Новые версии в общем кеше: прежние фрагменты больше не читаются."""
+        for pk in employee_ids:
+            try:
+                cache.incr(self.version_key(pk))
+            except ValueError:
+                pass
+
+    def bump_generation(self):
+        """Новое поколение: не читается ни один прежний фрагмент."""
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            pass
+
+    def hit_rates(self):
+        stats = dict(self.stats)
+        total = sum(
+            stats.get(name, 0)
+            for name in ('local_hits', 'shared_hits', 'misses')
+        )
+        for name in ('local_hits', 'shared_hits'):
+            stats[f'{name[:-5]}_hit_rate'] = (
+                stats.get(name, 0) / total if total else 0.0
+            )
+        stats['local_size'] = len(self.local)
+        return stats
+
+
+_fragments = None
+_fragments_lock = threading.Lock()
+
+
+def get_employee_fragments():
+    global _fragments
+
+    if _fragments is None:
+        with _fragments_lock:
+            if _fragments is None:
+                _fragments = EmployeeFragmentCache(
+                    getattr(settings, 'EMPLOYEE_FRAGMENT_LOCAL_SIZE',
+                            DEFAULT_LOCAL_SIZE),
+                    getattr(settings, 'EMPLOYEE_FRAGMENT_LOCAL_TTL',
+                            DEFAULT_LOCAL_TTL),
+                    getattr(settings, 'EMPLOYEE_FRAGMENT_SHARED_TTL',
+                            DEFAULT_SHARED_TTL),
+                )
+                invalidation.subscribe(_fragments.invalidate)
+    return _fragments
+
+
+def _publish(employee_ids, using):
+    """
+    Ключи сотрудников после фиксации транзакции. Кеш создается заранее,
+    чтобы обработчик текущего процесса был подписан на шину.
+    """
+    if employee_ids:
+        get_employee_fragments()
+        invalidation.publish(
+            *(f'{EMPLOYEE_PREFIX}{pk}' for pk in employee_ids), using=using
+        )
+
+
+def employee_saved(sender, instance, using=None, **kwargs):
+    _publish([instance.pk], using)
+
+
+def employee_deleting(sender, instance, using=None, **kwargs):
+    # Подчиненным manager обнуляется запросом UPDATE без сигналов
+    _publish(
+        [instance.pk, *instance.subordinates.values_list('id', flat=True)],
+        using
+    )
+
+
+def user_changed(sender, instance, using=None, **kwargs):
+    """Сотрудник пользователя и его подчиненные (manager_name)."""
+    from accounts.models import Employee
+
+    _publish(
+        list(Employee.objects.filter(
+            Q(user_id=instance.pk) | Q(manager__user_id=instance.pk)
+        ).values_list('id', flat=True)),
+        using
+    )
@@ -0,0 +1,30 @@
+from django.db.models.expressions import RawSQL
+
+SUBTREE_SQL = """
+WITH RECURSIVE subtree(id) AS (
+    SELECT id FROM employees WHERE id = %s
+    UNION
+    SELECT e.id FROM employees e JOIN subtree s ON e.manager_id = s.id
+)
+SELECT id FROM subtree
+"""
+
+IDS_SQL = 'SELECT unnest(%s::bigint[])'
+
+
+def subtree_ids_sql(root_id):
+    """
+    Подзапрос с ID сотрудника и всех его подчиненных на всех уровнях.
+    Используется как правая часть фильтра __in, чтобы отбор
+    по поддереву выполнялся в том же SQL-запросе.
+    """
+    return RawSQL(SUBTREE_SQL, [root_id])
+
+
+def ids_sql(ids):
+    """
+    Подзапрос со списком ID, переданным одним параметром-массивом:
+    для больших поддеревьев (снимок accounts.org_graph) фильтр __in
+    не разворачивается в десятки тысяч параметров запроса.
+    """
+    return RawSQL(IDS_SQL, [list(ids)])
@@ -0,0 +1,33 @@
+from collections import defaultdict
+
+from accounts.models import Employee
+from talentum.dataloader import Loader
+
+
+class ManagerNameLoader(Loader):
+    """Полное имя руководителя по manager_id сотрудника."""
+
+    def key(self, employee):
+        return employee.manager_id
+
+    def batch(self, keys):
+        managers = Employee.objects.filter(id__in=keys).select_related('user')
+        return {
+            manager.id: manager.user.get_full_name() for manager in managers
+        }
+
+
+class SubordinatesLoader(Loader):
+    """Прямые подчиненные сотрудника с пользователями и руководителем."""
+    default = ()
+
+    def key(self, employee):
+        return employee.pk
+
+    def batch(self, keys):
+        subordinates = defaultdict(list)
+        for employee in Employee.objects.filter(
+            manager_id__in=keys
+        ).select_related('user', 'manager__user').order_by('id'):
+            subordinates[employee.manager_id].append(employee)
+        return subordinates
@@ -0,0 +1,100 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+
+DEFAULT_WORKERS = 4
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_TIMEOUT = 10
+
+
+class LoginExecutorSaturated(Exception):
+    """Все слоты проверки паролей заняты, запрос нужно отклонить."""
+
+
+class LoginExecutor:
+    """
+    Ограниченный пул потоков для проверки паролей.
+
+    hashlib.pbkdf2_hmac отпускает GIL, поэтому хеширование в потоках
+    идет параллельно с обработкой остальных запросов. Одновременно
+    выполняется не больше workers проверок и ждут не больше queue_size;
+    сверх этого run сразу выбрасывает LoginExecutorSaturated.
+    При workers=0 функция выполняется в вызывающем потоке.
+    """
+
+    def __init__(self, workers, queue_size, timeout):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor = None
+        if workers > 0:
+            self._executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix='login'
+            )
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise LoginExecutorSaturated()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn, *args):
+        if self._executor is None:
+            return fn(*args)
+        future = self._submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise LoginExecutorSaturated()
+
+    async def arun(self, fn, *args):
+        if self._executor is None:
+            return fn(*args)
+        future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            raise LoginExecutorSaturated()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_executor = None
+_executor_key = None
+_executor_lock = threading.Lock()
+
+
+def get_login_executor():
+    """
+    Пул текущего процесса. Создается при первом обращении и заново
+    после fork (воркеры gunicorn) или изменения настроек.
+    """
+    global _executor, _executor_key
+
+    key = (
+        os.getpid(),
+        getattr(settings, 'LOGIN_EXECUTOR_WORKERS', DEFAULT_WORKERS),
+        getattr(settings, 'LOGIN_EXECUTOR_QUEUE_SIZE', DEFAULT_QUEUE_SIZE),
+        getattr(settings, 'LOGIN_EXECUTOR_TIMEOUT', DEFAULT_TIMEOUT),
+    )
+    if _executor_key != key:
+        with _executor_lock:
+            if _executor_key != key:
+                if _executor is not None and _executor_key[0] == key[0]:
+                    _executor.shutdown()
+                _executor = LoginExecutor(*key[1:])
+                _executor_key = key
+    return _executor
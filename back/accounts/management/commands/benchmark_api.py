@@ -0,0 +1,275 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, F, Q
+from django.test import override_settings
+from django.urls import reverse
+
+from accounts.models import Employee, User
+from accounts.synthetic_org import SyntheticOrg
+from feedback.models import FeedbackRequest
+from goals.models import Goal
+from talentum.benchmark import Scenario, compare, measure, report
+
+
+def _size(value):
+    for unit in ('B', 'KiB', 'MiB'):
+        if value < 1024:
+            return f'{value:.0f} {unit}'
+        value /= 1024
+    return f'{value:.1f} GiB'
+
+
+def build_scenarios(prefix):
+    """
+    Сценарии основных эндпоинтов на данных организации prefix. Для
+    каждого выбирается самый нагруженный подходящий пользователь или
+    объект (большая команда, много целей и запросов отзывов); сценарий
+    пропускается, если подходящих данных нет.
+    """
+    employees = Employee.objects.filter(
+        user__username__startswith=f'{prefix}-'
+    ).select_related('user', 'manager__user')
+    goals = Goal.objects.filter(
+        employee__user__username__startswith=f'{prefix}-'
+    ).select_related('employee__user', 'employee__manager__user')
+    scenarios = []
+
+    def add(name, user, method, path, data=None):
+        scenarios.append(Scenario(name, user, method, path, data))
+
+    # Руководитель команды без вложенных команд: свои цели и цели команды
+    lead = employees.annotate(team=Count('subordinates')).filter(
+        team__gt=0
+    ).exclude(
+        subordinates__subordinates__isnull=False
+    ).order_by('-team', 'pk').first()
+    if lead:
+        add('goals.list', lead.user, 'GET', reverse('goal-list'))
+
+    owner = employees.filter(manager__isnull=False).annotate(
+        goal_count=Count('goals')
+    ).order_by('-goal_count', 'pk').first()
+    if owner:
+        add('goals.my_goals', owner.user, 'GET', reverse('goal-my-goals'))
+        goal = goals.filter(employee=owner).annotate(
+            progress_count=Count('progress_entries')
+        ).order_by('-progress_count', 'pk').first()
+        if goal:
+            add('goals.retrieve', owner.user, 'GET',
+                reverse('goal-detail', args=[goal.pk]))
+
+    with_manager = goals.filter(employee__manager__isnull=False)
+    goal = with_manager.filter(status=Goal.STATUS_DRAFT).order_by('pk').first()
+    if goal:
+        add('goals.submit', goal.employee.user, 'POST',
+            reverse('goal-submit', args=[goal.pk]))
+    goal = with_manager.filter(
+        status=Goal.STATUS_PENDING_APPROVAL
+    ).order_by('pk').first()
+    if goal:
+        add('goals.approve', goal.employee.manager.user, 'POST',
+            reverse('goal-approve', args=[goal.pk]))
+    goal = goals.filter(status=Goal.STATUS_IN_PROGRESS).order_by('pk').first()
+    if goal:
+        add('goals.complete', goal.employee.user, 'POST',
+            reverse('goal-complete', args=[goal.pk]))
+
+    manager = employees.annotate(team=Count('subordinates')).order_by(
+        '-team', 'pk'
+    ).first()
+    if manager:
+        add('employees.my_team', manager.user, 'GET',
+            reverse('employee-my-team'))
+
+    goal = goals.filter(feedback_stats__requests_count__gt=0).order_by(
+        '-feedback_stats__requests_count', 'pk'
+    ).first()
+    if goal:
+        add('feedback_requests.list', goal.employee.user, 'GET',
+            reverse('goal-feedback-request-list', args=[goal.pk]))
+
+    # Руководитель не входит в число рецензентов сгенерированных целей
+    goal = with_manager.filter(
+        status=Goal.STATUS_PENDING_ASSESSMENT
+    ).exclude(
+        feedback_requests__reviewer=F('employee__manager')
+    ).order_by('pk').first()
+    if goal:
+        add('feedback_requests.create', goal.employee.user, 'POST',
+            reverse('goal-feedback-request-list', args=[goal.pk]), {
+                'reviewer': goal.employee.manager_id,
+                'message': 'Поделись, пожалуйста, впечатлениями о цели.',
+            })
+
+    reviewer = employees.annotate(pending=Count(
+        'feedback_requests_to_review',
+        filter=Q(feedback_requests_to_review__status=(
+            FeedbackRequest.STATUS_PENDING
+        ))
+    )).order_by('-pending', 'pk').first()
+    if reviewer:
+        add('feedback_inbox.list', reviewer.user, 'GET',
+            reverse('feedback-inbox-list'))
+
+    goal = goals.filter(
+        status=Goal.STATUS_PENDING_ASSESSMENT,
+        self_assessment__isnull=False,
+        expert_evaluation__isnull=True,
+        feedback_stats__peer_feedback_count__gt=0,
+    ).order_by('pk').first()
+    expert = goal and employees.filter(
+        user__role=User.ROLE_EXPERTISE_LEADER
+    ).exclude(pk=goal.employee_id).order_by('pk').first()
+    if expert:
+        add('expert_evaluation.create', expert.user, 'POST',
+            reverse('goal-expert-evaluation-list', args=[goal.pk]), {
+                'final_rating': 8,
+                'comments': 'Цель достигнута.',
+                'areas_to_improve': 'Планирование сроков.',
+            })
+    return scenarios
+
+
+class Command(BaseCommand):
+    help = ('End-to-end API benchmark: seeds a synthetic organization of the '
+            'given size (once; it is reused by later runs), runs every major '
+            'endpoint as a realistic user and records latency percentiles, '
+            'SQL query counts and peak allocations. Changes made by requests '
+            'are rolled back. Results are written as JSON and compared with '
+            'a baseline; regressions fail the command.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=10000)
+        parser.add_argument(
+            '--goals',
+            type=int,
+            help='Total goals (defaults to 10 per employee)'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            help='Run only scenarios whose name starts with this value '
+                 '(repeatable)'
+        )
+        parser.add_argument('--output', help='Write results to this JSON file')
+        parser.add_argument(
+            '--baseline',
+            help='Compare with results from this JSON file'
+        )
+        parser.add_argument(
+            '--latency-tolerance',
+            type=float,
+            default=0.2,
+            help='Allowed relative growth of p50/p95 latency'
+        )
+        parser.add_argument(
+            '--memory-tolerance',
+            type=float,
+            default=0.2,
+            help='Allowed relative growth of peak allocations'
+        )
+        parser.add_argument(
+            '--min-latency-ms',
+            type=float,
+            default=1.0,
+            help='Latency growth below this is treated as noise'
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as file:
+                    baseline = json.load(file)
+            except (OSError, ValueError) as error:
+                raise CommandError(f'Cannot read baseline: {error}')
+
+        parameters = {
+            'employees': options['employees'],
+            'goals': options['goals'] or options['employees'] * 10,
+            'seed': options['seed'],
+            'iterations': options['iterations'],
+            'warmup': options['warmup'],
+        }
+        prefix = (f'bench-e{parameters["employees"]}-g{parameters["goals"]}'
+                  f'-s{parameters["seed"]}')
+        if not User.objects.filter(username__startswith=f'{prefix}-') \
+                .exists():
+            started = time.perf_counter()
+            SyntheticOrg(
+                employees=parameters['employees'],
+                goals=parameters['goals'],
+                seed=parameters['seed'],
+                prefix=prefix,
+            ).create()
+            self.stdout.write(
+                f'Seeded {prefix} in {time.perf_counter() - started:.1f}s'
+            )
+
+        scenarios = build_scenarios(prefix)
+        if options['scenario']:
+            scenarios = [
+                scenario for scenario in scenarios
+                if scenario.name.startswith(tuple(options['scenario']))
+            ]
+        if not scenarios:
+            raise CommandError('No scenarios to run')
+
+        results = {}
+        # Трассировка памяти бенчмарка несовместима с профилированием памяти
+        with override_settings(MEMORY_PROFILING_VIEWS=[]):
+            for scenario in scenarios:
+                results[scenario.name] = measure(
+                    scenario, options['iterations'], options['warmup']
+                )
+                self.print_result(scenario.name, results[scenario.name])
+        current = report(results, parameters)
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(current, file, ensure_ascii=False, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+
+        if baseline is not None:
+            self.check_baseline(current, baseline, options)
+
+    def print_result(self, name, result):
+        latency = result['latency_ms']
+        line = (
+            f'{name:26} {",".join(map(str, result["status"])):>7} '
+            f'p50 {latency["p50"]:8.2f} ms  p95 {latency["p95"]:8.2f} ms  '
+            f'p99 {latency["p99"]:8.2f} ms  '
+            f'{result["queries"]:3} queries  '
+            f'peak {_size(result["peak_bytes"]):>10}'
+        )
+        if any(status >= 400 for status in result['status']):
+            self.stdout.write(self.style.WARNING(line))
+        else:
+            self.stdout.write(line)
+
+    def check_baseline(self, current, baseline, options):
+        if baseline.get('parameters') != current['parameters']:
+            self.stdout.write(self.style.WARNING(
+                f'Baseline parameters differ: {baseline.get("parameters")}'
+            ))
+        regressions = compare(
+            current, baseline,
+            latency_tolerance=options['latency_tolerance'],
+            memory_tolerance=options['memory_tolerance'],
+            min_latency_ms=options['min_latency_ms'],
+        )
+        for item in regressions:
+            self.stdout.write(self.style.ERROR(
+                f'{item["scenario"]}: {item["metric"]} '
+                f'{item["baseline"]} -> {item["current"]}'
+            ))
+        if regressions:
+            raise CommandError(f'{len(regressions)} regression(s)')
+        self.stdout.write(self.style.SUCCESS('No regressions'))
@@ -0,0 +1,143 @@
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from talentum.benchmark import PERCENTILES, percentile
+
+
+class Command(BaseCommand):
+    help = ('Measures API latency percentiles while other threads hammer the '
+            'token endpoint, with password checks inline and in the bounded '
+            'login executor. Creates and removes a temporary user.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=10.0)
+        parser.add_argument('--login-threads', type=int, default=16)
+        parser.add_argument('--api-threads', type=int, default=4)
+        parser.add_argument(
+            '--retry-delay',
+            type=float,
+            default=0.1,
+            help='Pause of a login thread after a 503 response'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=getattr(settings, 'LOGIN_EXECUTOR_WORKERS', 4),
+            help='Login executor workers for the executor run'
+        )
+        parser.add_argument(
+            '--queue-size',
+            type=int,
+            default=getattr(settings, 'LOGIN_EXECUTOR_QUEUE_SIZE', 16),
+            help='Login executor queue size for the executor run'
+        )
+
+    def handle(self, *args, **options):
+        password = uuid.uuid4().hex
+        user = User.objects.create_user(
+            username=f'login-storm-{uuid.uuid4().hex[:8]}',
+            email=f'{uuid.uuid4().hex}@example.com',
+            password=password
+        )
+        access = str(RefreshToken.for_user(user).access_token)
+        credentials = {'username': user.username, 'password': password}
+
+        runs = [
+            ('baseline', 0, None),
+            ('inline', options['login_threads'], {
+                'LOGIN_EXECUTOR_WORKERS': 0,
+            }),
+            ('executor', options['login_threads'], {
+                'LOGIN_EXECUTOR_WORKERS': options['workers'],
+                'LOGIN_EXECUTOR_QUEUE_SIZE': options['queue_size'],
+            }),
+        ]
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        try:
+            for name, login_threads, overrides in runs:
+                with override_settings(**(overrides or {})):
+                    api_latencies, logins = self.run_storm(
+                        options['duration'], login_threads,
+                        options['api_threads'], options['retry_delay'],
+                        credentials, access
+                    )
+                self.report(name, api_latencies, logins, options['duration'])
+        finally:
+            request_logger.setLevel(level)
+            user.delete()
+
+    def run_storm(self, duration, login_threads, api_threads, retry_delay,
+                  credentials, access):
+        deadline = time.perf_counter() + duration
+        api_latencies = []
+        logins = Counter()
+        lock = threading.Lock()
+
+        def login_loop():
+            client = Client(SERVER_NAME='localhost')
+            try:
+                while time.perf_counter() < deadline:
+                    response = client.post(
+                        reverse('token_obtain_pair'), credentials
+                    )
+                    with lock:
+                        logins[response.status_code] += 1
+                    if response.status_code == 503:
+                        time.sleep(retry_delay)
+            finally:
+                connection.close()
+
+        def api_loop():
+            client = Client(
+                SERVER_NAME='localhost',
+                HTTP_AUTHORIZATION=f'Bearer {access}'
+            )
+            latencies = []
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    client.get(reverse('user-me'))
+                    latencies.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+            with lock:
+                api_latencies.extend(latencies)
+
+        threads = [
+            threading.Thread(target=login_loop) for _ in range(login_threads)
+        ] + [
+            threading.Thread(target=api_loop) for _ in range(api_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return api_latencies, logins
+
+    def report(self, name, api_latencies, logins, duration):
+        latency = ', '.join(
+            f'p{q}={percentile(api_latencies, q) * 1000:.1f}ms'
+            for q in PERCENTILES
+        )
+        self.stdout.write(
+            f'{name}: API {len(api_latencies) / duration:.1f} req/s, '
+            f'{latency}'
+        )
+        if logins:
+            outcomes = ', '.join(
+                f'{code}: {count}' for code, count in sorted(logins.items())
+            )
+            self.stdout.write(f'  logins: {outcomes}')
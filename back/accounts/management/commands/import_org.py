@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.bulk_import import FORMATS, BulkImportError, detect_format, \
+    import_org
+
+
+class Command(BaseCommand):
+    help = ('Bulk loads users, employees and goals from CSV or JSONL files '
+            'through PostgreSQL COPY. Managers and goal owners are referenced '
+            'by username. Nothing is saved if any row is invalid.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', help='Employees file')
+        parser.add_argument('--goals', help='Goals file')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='File format (detected from the extension by default)'
+        )
+
+    def handle(self, *args, **options):
+        if not options['employees'] and not options['goals']:
+            raise CommandError('Pass --employees and/or --goals')
+
+        files = []
+        kwargs = {}
+        try:
+            for name in ['employees', 'goals']:
+                path = options[name]
+                if not path:
+                    continue
+                kwargs[f'{name}_format'] = detect_format(
+                    path, options['format']
+                )
+                kwargs[name] = open(path, 'rb')
+                files.append(kwargs[name])
+
+            started = time.perf_counter()
+            result = import_org(**kwargs)
+            elapsed = time.perf_counter() - started
+        except BulkImportError as error:
+            for item in error.errors:
+                self.stderr.write(
+                    f'{item["file"]}:{item["line"] or "-"}: {item["message"]}'
+                )
+            raise CommandError(f'Import failed: {error.total} error(s)')
+        finally:
+            for file in files:
+                file.close()
+
+        for name, counts in result.items():
+            details = ', '.join(
+                f'{key}={value}' for key, value in counts.items()
+            )
+            self.stdout.write(f'{name}: {details}')
+        self.stdout.write(self.style.SUCCESS(f'Imported in {elapsed:.2f}s'))
@@ -0,0 +1,67 @@
+import glob
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from talentum.sampling import flamegraph_svg, format_collapsed, merge_collapsed
+
+
+class Command(BaseCommand):
+    help = ('Merges the collapsed stacks written by the continuous sampling '
+            'profiler of every worker into one flame graph. Writes SVG when '
+            'the output ends with .svg, collapsed stacks (for flamegraph.pl '
+            'or speedscope) otherwise.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output',
+            help='Output file (.svg for a flame graph, '
+                 '"-" for collapsed stacks on stdout)'
+        )
+        parser.add_argument(
+            '--directory',
+            help='Directory with collapsed files '
+                 '(defaults to SAMPLING_PROFILER_DIR)'
+        )
+        parser.add_argument(
+            '--since',
+            type=float,
+            help='Only files written in the last N minutes'
+        )
+        parser.add_argument(
+            '--match',
+            help='Only stacks containing this text (e.g. "goals/views.py")'
+        )
+        parser.add_argument('--title', default='Talentum CPU')
+
+    def handle(self, *args, **options):
+        directory = options['directory'] or settings.SAMPLING_PROFILER_DIR
+        paths = sorted(glob.glob(os.path.join(directory, '*.collapsed')))
+        if options['since'] is not None:
+            threshold = time.time() - options['since'] * 60
+            paths = [path for path in paths
+                     if os.path.getmtime(path) >= threshold]
+        if not paths:
+            raise CommandError(f'No collapsed stack files in {directory}')
+
+        counts = merge_collapsed(paths, match=options['match'])
+        samples = sum(counts.values())
+        output = options['output']
+        if output == '-':
+            self.stdout.write(format_collapsed(counts), ending='')
+            return
+
+        if output.endswith('.svg'):
+            content = flamegraph_svg(
+                counts, title=f'{options["title"]} ({samples} samples)'
+            )
+        else:
+            content = format_collapsed(counts)
+        with open(output, 'w') as file:
+            file.write(content)
+        self.stdout.write(self.style.SUCCESS(
+            f'Merged {len(paths)} file(s), {samples} sample(s), '
+            f'{len(counts)} unique stack(s) -> {output}'
+        ))
@@ -0,0 +1,115 @@
+import csv
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.bulk_import import FORMATS, BulkImportError, detect_format, \
+    read_records
+from accounts.provisioning import default_workers, hash_passwords, \
+    provision_users
+
+COLUMNS = ('username', 'email', 'first_name', 'last_name', 'role',
+           'password')
+REQUIRED_COLUMNS = ('username', 'email')
+
+
+class Command(BaseCommand):
+    help = ('Creates users in bulk from a CSV or JSONL file. Passwords are '
+            'hashed in a process pool; users without a password (or all '
+            'users with --invite) get an unusable password and an invite '
+            'token.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', nargs='?', help='Users file')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='File format (detected from the extension by default)'
+        )
+        parser.add_argument(
+            '--invite',
+            action='store_true',
+            help='Ignore passwords and issue invite tokens to everyone'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Hashing processes (defaults to the number of CPUs)'
+        )
+        parser.add_argument(
+            '--invites-output',
+            help='CSV file for username, uid and invite token'
+        )
+        parser.add_argument(
+            '--benchmark',
+            type=int,
+            metavar='PASSWORDS',
+            help='Compare serial and parallel hashing of PASSWORDS '
+                 'passwords without touching the database'
+        )
+
+    def handle(self, *args, **options):
+        if options['benchmark']:
+            self.benchmark(options['benchmark'], options['workers'])
+            return
+        if not options['file']:
+            raise CommandError('Pass a users file or --benchmark')
+
+        try:
+            file_format = detect_format(options['file'], options['format'])
+            with open(options['file'], 'rb') as file:
+                rows = [
+                    dict(zip(COLUMNS, record[1:]))
+                    for record in read_records(
+                        file, file_format, COLUMNS, REQUIRED_COLUMNS, 'users'
+                    )
+                ]
+        except BulkImportError as error:
+            raise CommandError(error.errors[0]['message'])
+
+        started = time.perf_counter()
+        provisioned = provision_users(
+            rows, invite=options['invite'], workers=options['workers']
+        )
+        elapsed = time.perf_counter() - started
+
+        invites = [
+            (user.username, *invite)
+            for user, invite in provisioned if invite
+        ]
+        if options['invites_output'] and invites:
+            with open(options['invites_output'], 'w', newline='',
+                      encoding='utf-8') as output:
+                writer = csv.writer(output)
+                writer.writerow(['username', 'uid', 'token'])
+                writer.writerows(invites)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(provisioned)} user(s), {len(invites)} invite(s) '
+            f'in {elapsed:.2f}s ({len(provisioned) / elapsed:.0f} users/s)')
+        )
+
+    def benchmark(self, count, workers):
+        workers = workers or default_workers()
+        passwords = [f'password-{i}' for i in range(count)]
+
+        started = time.perf_counter()
+        for password in passwords:
+            make_password(password)
+        serial = time.perf_counter() - started
+
+        started = time.perf_counter()
+        hash_passwords(passwords, workers=workers)
+        parallel = time.perf_counter() - started
+
+        self.stdout.write(
+            f'serial: {count / serial:.1f} hashes/s ({serial:.2f}s)'
+        )
+        self.stdout.write(
+            f'parallel ({workers} workers): {count / parallel:.1f} hashes/s '
+            f'({parallel:.2f}s)'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Speedup: {serial / parallel:.2f}x')
+        )
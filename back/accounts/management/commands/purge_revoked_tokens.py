@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from accounts.revocation import purge_expired
+
+
+class Command(BaseCommand):
+    help = ('Deletes revocation records for refresh tokens that have '
+            'already expired. Run periodically (e.g. daily from cron).')
+
+    def handle(self, *args, **options):
+        deleted = purge_expired()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} expired revocation records'
+        ))
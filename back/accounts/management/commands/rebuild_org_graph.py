@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.org_graph import get_org_graph_store
+
+
+class Command(BaseCommand):
+    help = ('Rebuilds the shared employee hierarchy snapshot. Needed only '
+            'after managers were changed outside the application (raw SQL, '
+            'restored dump); running workers pick up the new snapshot on '
+            'their next access.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        store = get_org_graph_store()
+        graph = store.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Snapshot v{graph.version}: {len(graph)} employees, '
+            f'{time.perf_counter() - started:.2f}s -> {store.path}'
+        ))
@@ -0,0 +1,139 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from talentum.memprofile import get_capture_store, traced
+
+
+def _size(value):
+    sign = '-' if value < 0 else ''
+    value = abs(value)
+    for unit in ('B', 'KiB', 'MiB'):
+        if value < 1024:
+            return f'{sign}{value:.0f} {unit}'
+        value /= 1024
+    return f'{sign}{value:.1f} GiB'
+
+
+class Command(BaseCommand):
+    help = ('Replays a request captured by the memory profiling middleware '
+            'under tracemalloc (inside a rolled back transaction) and prints '
+            'peak memory and allocation sites next to the captured ones.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'capture',
+            nargs='?',
+            help='Capture id (defaults to the latest capture)'
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List stored captures instead of replaying'
+        )
+        parser.add_argument(
+            '--user',
+            type=int,
+            help='Replay as this user id instead of the captured one'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=1,
+            help='Untraced runs before the traced one (fills caches)'
+        )
+        parser.add_argument('--top', type=int, default=15)
+
+    def handle(self, *args, **options):
+        store = get_capture_store()
+        ids = store.ids()
+        if options['list']:
+            for capture_id in ids:
+                capture = store.load(capture_id)
+                self.stdout.write(
+                    f'{capture_id}  {capture["view"]:40} '
+                    f'peak {_size(capture["peak"]):>10}  '
+                    f'{capture["request"]["method"]} '
+                    f'{capture["request"]["path"]}'
+                )
+            return
+
+        capture_id = options['capture'] or (ids[0] if ids else None)
+        if capture_id is None:
+            raise CommandError(
+                f'No captures in {settings.MEMORY_PROFILING_DIR}'
+            )
+        try:
+            capture = store.load(capture_id)
+        except (ValueError, FileNotFoundError):
+            raise CommandError(f'Capture {capture_id} not found')
+
+        # Повтор не должен сам сохранять снимки
+        with override_settings(MEMORY_PROFILING_VIEWS=[]):
+            response, trace = self.replay(capture, options)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{capture["view"]}: {capture["request"]["method"]} '
+            f'{capture["request"]["path"]} -> {response.status_code} '
+            f'(captured {capture["status"]})'
+        ))
+        for name in ('peak', 'retained'):
+            captured, replayed = capture[name], getattr(trace, name)
+            self.stdout.write(
+                f'{name:9} {_size(captured):>10} -> {_size(replayed):>10} '
+                f'({_size(replayed - captured)})'
+            )
+
+        captured_sites = {site['site']: site['size']
+                          for site in capture['sites']}
+        replayed_sites = {site['site']: site['size'] for site in trace.sites}
+        sites = sorted(
+            set(captured_sites) | set(replayed_sites),
+            key=lambda site: -abs(replayed_sites.get(site, 0)
+                                  - captured_sites.get(site, 0))
+        )
+        self.stdout.write(
+            f'\n{"captured":>10} {"replayed":>10} {"diff":>10}  site'
+        )
+        for site in sites[:options['top']]:
+            captured = captured_sites.get(site, 0)
+            replayed = replayed_sites.get(site, 0)
+            self.stdout.write(
+                f'{_size(captured):>10} {_size(replayed):>10} '
+                f'{_size(replayed - captured):>10}  {site}'
+            )
+
+    def replay(self, capture, options):
+        request = capture['request']
+        client = APIClient(HTTP_HOST=request['host'])
+        user_id = options['user'] or request.get('user_id')
+        if user_id is not None:
+            try:
+                client.force_authenticate(user=User.objects.get(pk=user_id))
+            except User.DoesNotExist:
+                raise CommandError(f'User {user_id} not found')
+
+        body = request.get('body')
+        data = json.dumps(body) if body is not None else ''
+
+        def run():
+            with transaction.atomic():
+                response = client.generic(
+                    request['method'], request['path'], data,
+                    content_type=request['content_type'] or None
+                )
+                transaction.set_rollback(True)
+            return response
+
+        for _ in range(options['warmup']):
+            run()
+        with traced(settings.MEMORY_PROFILING_FRAMES,
+                    max(options['top'], settings.MEMORY_PROFILING_TOP)) \
+                as trace:
+            response = run()
+        return response, trace
@@ -0,0 +1,82 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.synthetic_org import DEFAULT_UNTIL, SeedError, SyntheticOrg
+
+
+class Command(BaseCommand):
+    help = ('Generates a deterministic synthetic organization for scale '
+            'testing: a skewed employee hierarchy, goals in every status, '
+            'progress entries, self assessments, feedback requests with peer '
+            'feedback, expert evaluations and goal feedback stats. Rows are '
+            'loaded through PostgreSQL COPY in one transaction.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=100000)
+        parser.add_argument(
+            '--goals',
+            type=int,
+            help='Total goals (defaults to 10 per employee)'
+        )
+        parser.add_argument(
+            '--fan-out',
+            type=float,
+            default=6.0,
+            help='Average growth of each hierarchy level over the previous one'
+        )
+        parser.add_argument(
+            '--depth',
+            type=int,
+            default=10,
+            help='Maximum hierarchy depth; the deepest level takes everyone '
+                 'left over'
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.2,
+            help='Pareto shape of team sizes (smaller is more skewed)'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--prefix',
+            default='synthetic',
+            help='Username prefix: <prefix>-<n>, <prefix>-0 is the root'
+        )
+        parser.add_argument(
+            '--password',
+            help='Password of every generated user (unusable by default)'
+        )
+        parser.add_argument(
+            '--until',
+            type=date.fromisoformat,
+            default=DEFAULT_UNTIL,
+            help='Last day covered by goal periods and timestamps'
+        )
+
+    def handle(self, *args, **options):
+        goals = options['goals']
+        if goals is None:
+            goals = options['employees'] * 10
+        started = time.perf_counter()
+        try:
+            counts = SyntheticOrg(
+                employees=options['employees'],
+                goals=goals,
+                fan_out=options['fan_out'],
+                depth=options['depth'],
+                skew=options['skew'],
+                seed=options['seed'],
+                prefix=options['prefix'],
+                password=options['password'],
+                until=options['until'],
+            ).create()
+        except SeedError as error:
+            raise CommandError(str(error))
+        elapsed = time.perf_counter() - started
+
+        for name, count in counts.items():
+            self.stdout.write(f'{name}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Seeded in {elapsed:.2f}s'))
@@ -0,0 +1,108 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from talentum.slowlog import read_records
+
+ORDERINGS = {
+    'total': lambda group: group['total_ms'],
+    'max': lambda group: group['max_ms'],
+    'count': lambda group: group['count'],
+}
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+class Command(BaseCommand):
+    help = ('Ranks slow query shapes from the slow query log by total time '
+            '(or max duration, or count) and shows the views that issued '
+            'them with the slowest sample and its EXPLAIN plan.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log',
+            help='Slow query log (defaults to SLOW_QUERY_LOG)'
+        )
+        parser.add_argument(
+            '--since',
+            type=float,
+            help='Only queries logged in the last N hours'
+        )
+        parser.add_argument('--view', help='Only queries from this view')
+        parser.add_argument(
+            '--order', choices=list(ORDERINGS), default='total'
+        )
+        parser.add_argument('--limit', type=int, default=10)
+        parser.add_argument(
+            '--explain',
+            action='store_true',
+            help='Print the plan of the slowest sample that has one'
+        )
+
+    def handle(self, *args, **options):
+        path = options['log'] or settings.SLOW_QUERY_LOG
+        since = None
+        if options['since'] is not None:
+            since = timezone.now() - timedelta(hours=options['since'])
+
+        groups = defaultdict(lambda: {
+            'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'durations': [],
+            'views': defaultdict(int), 'params_counts': set(),
+            'slowest': None, 'plan': None,
+        })
+        for record in read_records(path):
+            if since is not None and parse_datetime(record['time']) < since:
+                continue
+            if options['view'] and record['view'] != options['view']:
+                continue
+            group = groups[record['shape']]
+            duration = record['duration_ms']
+            group['count'] += 1
+            group['total_ms'] += duration
+            group['durations'].append(duration)
+            group['views'][record['view']] += 1
+            group['params_counts'].add(record.get('params_count', 0))
+            if duration >= group['max_ms']:
+                group['max_ms'] = duration
+                group['slowest'] = record
+            if record.get('explain') and (
+                group['plan'] is None
+                or duration >= group['plan']['duration_ms']
+            ):
+                group['plan'] = record
+        if not groups:
+            raise CommandError(f'No slow queries in {path}')
+
+        ranked = sorted(groups.items(), key=lambda item: ORDERINGS[
+            options['order']](item[1]), reverse=True)
+        for position, (shape, group) in enumerate(
+                ranked[:options['limit']], start=1):
+            views = ', '.join(
+                f'{view} x{count}' for view, count in sorted(
+                    group['views'].items(), key=lambda item: -item[1])
+            )
+            params_counts = sorted(group['params_counts'])
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{position}. shape {shape}: {group["count"]} queries, '
+                f'total {group["total_ms"]:.0f} ms, '
+                f'p95 {_percentile(group["durations"], 95):.0f} ms, '
+                f'max {group["max_ms"]:.0f} ms'
+            ))
+            self.stdout.write(f'   views: {views}')
+            self.stdout.write(
+                f'   params: {params_counts[0]}..{params_counts[-1]}'
+            )
+            self.stdout.write(f'   sql: {group["slowest"]["sql"][:500]}')
+            if options['explain'] and group['plan'] is not None:
+                self.stdout.write(
+                    f'   plan ({group["plan"]["duration_ms"]:.0f} ms):'
+                )
+                for line in group['plan']['explain'].splitlines():
+                    self.stdout.write(f'     {line}')
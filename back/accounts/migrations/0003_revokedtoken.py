@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_employee_profile_photo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True, verbose_name='ключ')),
+                ('revoked_dttm', models.DateTimeField(default=django.utils.timezone.now, verbose_name='дата отзыва')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='срок действия')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='revoked_tokens', to=settings.AUTH_USER_MODEL, verbose_name='пользователь')),
+            ],
+            options={
+                'verbose_name': 'отозванный токен',
+                'verbose_name_plural': 'отозванные токены',
+                'db_table': 'revoked_tokens',
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='revokedtoken',
+            name='revoked_dttm',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='дата отзыва'),
+        ),
+    ]
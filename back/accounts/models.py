@@ -1,7 +1,10 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from django.utils.encoding import filepath_to_uri
 from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
 from urllib.parse import urljoin
 
 
@@ -23,6 +26,25 @@ class ProfilePhotoStorage(S3Boto3Storage):
             return url.replace('https://', 'http://', 1)
         return url
 
+    def public_url(self, name):
+        """
+        URL публичного файла, собранный из настроек без создания
+        клиента boto3 и подписи запроса. Если файлы не публичные
+        (включена подпись URL), используется url.
+        """
+        if self.querystring_auth:
+            return self.url(name)
+
+        key = filepath_to_uri(self._normalize_name(clean_name(name)))
+        if self.custom_domain:
+            return f'http://{self.custom_domain}/{key}'
+        if self.endpoint_url:
+            endpoint = self.endpoint_url.rstrip('/').replace(
+                'https://', 'http://', 1
+            )
+            return f'{endpoint}/{self.bucket_name}/{key}'
+        return self.url(name)
+
 
 class User(AbstractUser):
     ROLE_EMPLOYEE = 'employee'
@@ -109,6 +131,55 @@ class Employee(models.Model):
     def email(self):
         return self.user.email
 
+    @property
+    def profile_photo_url(self):
+        if not self.profile_photo:
+            return None
+        storage = self.profile_photo.storage
+        if hasattr(storage, 'public_url'):
+            return storage.public_url(self.profile_photo.name)
+        url = storage.url(self.profile_photo.name)
+        if url.startswith('https://'):
+            return url.replace('https://', 'http://', 1)
+        return url
+
     @property
     def role(self):
         return self.user.role
+
+
+class RevokedToken(models.Model):
+    """
+    Отозванный refresh-токен (key = jti) или все токены пользователя,
+    выпущенные до revoked_dttm (key = 'user:<id>').
+    """
+    key = models.CharField(
+        _('ключ'),
+        max_length=255,
+        unique=True
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='revoked_tokens',
+        verbose_name=_('пользователь')
+    )
+    revoked_dttm = models.DateTimeField(
+        _('дата отзыва'),
+        default=timezone.now,
+        db_index=True
+    )
+    expires_at = models.DateTimeField(
+        _('срок действия'),
+        db_index=True
+    )
+
+    class Meta:
+        verbose_name = _('отозванный токен')
+        verbose_name_plural = _('отозванные токены')
+        db_table = 'revoked_tokens'
+
+    def __str__(self):
+        return self.key
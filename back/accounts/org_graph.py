@@ -0,0 +1,383 @@
+import fcntl
+import itertools
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+
+from accounts.models import Employee
+from talentum import invalidation
+
+MAGIC = b'ORGG'
+FORMAT_VERSION = 1
+# magic, формат, версия снимка, число сотрудников, длина массива position
+HEADER = struct.Struct('<4sIqqq')
+COUNTER = struct.Struct('<q')
+# Ключ шины инвалидации: иерархия изменилась
+ORG_GRAPH_KEY = 'accounts.org_graph'
+
+
+def build_tree(ids, manager_ids):
+    """
+    Массивы дерева по отсортированным ID сотрудников и ID их руководителей
+    (-1 - нет руководителя). Индексы узлов - позиции в ids.
+
+    parent - индекс руководителя, depth - глубина от корня,
+    order - узлы в порядке обхода в глубину, tin/tout - границы поддерева
+    узла в order: поддерево i - order[tin[i]:tout[i]].
+    Узлы цикла руководителей (недостижимые из корней) обходятся
+    от первого встреченного, как отдельные деревья.
+    """
+    n = len(ids)
+    max_id = int(ids[-1]) if n else -1
+    position = np.full(max_id + 1, -1, dtype=np.int32)
+    position[ids] = np.arange(n, dtype=np.int32)
+    parent = np.where(
+        manager_ids >= 0, position[np.maximum(manager_ids, 0)], -1
+    ).astype(np.int32)
+
+    # Дети каждого узла подряд в by_parent[starts[i]:starts[i + 1]]
+    by_parent = np.argsort(parent, kind='stable')
+    n_roots = int(np.count_nonzero(parent < 0))
+    counts = np.bincount(parent[parent >= 0], minlength=n)
+    starts = np.concatenate(([n_roots], n_roots + np.cumsum(counts))).tolist()
+    by_parent = by_parent.tolist()
+    parents = parent.tolist()
+
+    tin = [-1] * n
+    depth = [0] * n
+    order = []
+    for start in itertools.chain(by_parent[:n_roots], range(n)):
+        if tin[start] >= 0:
+            continue
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            if tin[node] >= 0:
+                continue
+            tin[node] = len(order)
+            order.append(node)
+            children = by_parent[starts[node]:starts[node + 1]]
+            for child in children:
+                depth[child] = depth[node] + 1
+            stack.extend(reversed(children))
+
+    # Размер поддерева накапливается снизу вверх, в обратном порядке обхода
+    size = [1] * n
+    for node in reversed(order):
+        up = parents[node]
+        if up >= 0 and tin[up] < tin[node]:
+            size[up] += size[node]
+
+    tin = np.array(tin, dtype=np.int32)
+    return {
+        'ids': ids,
+        'parent': parent,
+        'depth': np.array(depth, dtype=np.int32),
+        'tin': tin,
+        'tout': tin + np.array(size, dtype=np.int32),
+        'order': np.array(order, dtype=np.int32),
+        'position': position,
+    }
+
+
+LAYOUT = (
+    ('ids', np.int64),
+    ('parent', np.int32),
+    ('depth', np.int32),
+    ('tin', np.int32),
+    ('tout', np.int32),
+    ('order', np.int32),
+)
+
+
+def serialize(version, arrays):
+    n = len(arrays['ids'])
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, version, n,
+                         len(arrays['position']))]
+    for name, dtype in LAYOUT:
+        parts.append(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+    parts.append(arrays['position'].astype(np.int32).tobytes())
+    return b''.join(parts)
+
+
+def load_tree(version):
+    """Сериализованный снимок иерархии из базы, одним запросом."""
+    rows = np.array(
+        Employee.objects.order_by('id').values_list(
+            'id', Coalesce(F('manager_id'), Value(-1))
+        ),
+        dtype=np.int64
+    ).reshape(-1, 2)
+    return serialize(version, build_tree(rows[:, 0], rows[:, 1]))
+
+
+class OrgGraph:
+    """
+    Неизменяемый снимок иерархии сотрудников поверх буфера
+    (bytes или mmap) без копирования массивов.
+    """
+
+    def __init__(self, buffer):
+        magic, fmt, self.version, n, positions = HEADER.unpack_from(buffer)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise ValueError('Неизвестный формат снимка иерархии')
+        offset = HEADER.size
+        for name, dtype in LAYOUT:
+            array = np.frombuffer(buffer, dtype=dtype, count=n, offset=offset)
+            setattr(self, name, array)
+            offset += array.nbytes
+        self.position = np.frombuffer(
+            buffer, dtype=np.int32, count=positions, offset=offset
+        )
+        self._size = n
+
+    def __len__(self):
+        return self._size
+
+    def index(self, employee_id):
+        if 0 <= employee_id < len(self.position):
+            index = int(self.position[employee_id])
+            if index >= 0:
+                return index
+        return None
+
+    def __contains__(self, employee_id):
+        return self.index(employee_id) is not None
+
+    def manager_id(self, employee_id):
+        index = self.index(employee_id)
+        if index is None or self.parent[index] < 0:
+            return None
+        return int(self.ids[self.parent[index]])
+
+    def is_ancestor(self, ancestor_id, employee_id):
+        """Является ли ancestor_id руководителем employee_id на любом уровне."""
+        ancestor, employee = self.index(ancestor_id), self.index(employee_id)
+        if ancestor is None or employee is None or ancestor == employee:
+            return False
+        return self.tin[ancestor] < self.tin[employee] < self.tout[ancestor]
+
+    def has_subordinates(self, employee_id):
+        index = self.index(employee_id)
+        return index is not None and self.tout[index] - self.tin[index] > 1
+
+    def subtree_ids(self, employee_id, include_root=True, levels=None):
+        """
+        ID сотрудника и всех его подчиненных в порядке обхода в глубину;
+        levels ограничивает глубину относительно сотрудника.
+        """
+        index = self.index(employee_id)
+        if index is None:
+            return np.empty(0, dtype=np.int64)
+        start = self.tin[index] + (0 if include_root else 1)
+        nodes = self.order[start:self.tout[index]]
+        if levels is not None:
+            nodes = nodes[self.depth[nodes] <= self.depth[index] + levels]
+        return self.ids[nodes]
+
+
+class OrgGraphStore:
+    """
+    Снимок иерархии в файле, общем для всех процессов на машине.
+
+    Каждый процесс отображает файл в память (mmap) и читает массивы
+    без копирования. Рядом лежит счетчик версий: изменение руководителей
+    увеличивает его, и при следующем обращении один из процессов
+    под файловой блокировкой строит снимок заново, остальные подхватывают
+    готовый файл.
+    """
+
+    def __init__(self, directory, name):
+        os.makedirs(directory, exist_ok=True)
+        self.directory, self.name = directory, name
+        base = os.path.join(directory, name)
+        self.path = base + '.bin'
+        self.lock_path = base + '.lock'
+        self.counter_path = base + '.version'
+        self._graph = None
+        self._counter = None
+
+    @contextmanager
+    def _locked(self):
+        # Файл блокировки открывается заново: flock на дескрипторе,
+        # унаследованном после fork, делится с родительским процессом.
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _counter_map(self):
+        if self._counter is None:
+            with self._locked():
+                fd = os.open(self.counter_path, os.O_RDWR | os.O_CREAT,
+                             0o600)
+                try:
+                    if os.fstat(fd).st_size < COUNTER.size:
+                        os.ftruncate(fd, COUNTER.size)
+                    self._counter = mmap.mmap(fd, COUNTER.size)
+                finally:
+                    os.close(fd)
+        return self._counter
+
+    def current_version(self):
+        return COUNTER.unpack_from(self._counter_map())[0]
+
+    def bump(self):
+        counter = self._counter_map()
+        with self._locked():
+            COUNTER.pack_into(counter, 0, COUNTER.unpack_from(counter)[0] + 1)
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        return OrgGraph(buffer)
+
+    def _publish(self, graph_bytes):
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(graph_bytes)
+        os.replace(tmp_path, self.path)
+
+    def rebuild(self):
+        """Новая версия и снимок, построенный сразу."""
+        self.bump()
+        return self.get()
+
+    def get(self):
+        version = self.current_version()
+        graph = self._graph
+        if graph is not None and graph.version == version:
+            return graph
+
+        graph = self._load()
+        if graph is None or graph.version != version:
+            with self._locked():
+                graph = self._load()
+                version = self.current_version()
+                if graph is None or graph.version != version:
+                    self._publish(load_tree(version))
+                    graph = self._load()
+        self._graph = graph
+        return graph
+
+    @property
+    def last_loaded(self):
+        return self._graph
+
+
+class _CommitBump:
+    """
+    Отложенное до фиксации транзакции увеличение версии снимка.
+    Пока такой обратный вызов стоит в connection.run_on_commit,
+    в транзакции есть незафиксированные изменения иерархии.
+
+    Счетчик версий лежит в файле на машине, поэтому изменение
+    рассылается через шину инвалидации: каждый процесс (в том числе
+    текущий) увеличивает версию в org_graph_changed. Несколько увеличений
+    на одной машине не приводят к лишним перестроениям: снимок строится
+    один раз для последней версии.
+    """
+    _sequence = itertools.count()
+
+    def __init__(self):
+        self.seq = next(self._sequence)
+
+    def __call__(self):
+        invalidation.notify([ORG_GRAPH_KEY])
+
+
+def _pending_changes(conn):
+    return tuple(
+        func.seq for _, func, _ in conn.run_on_commit
+        if isinstance(func, _CommitBump)
+    )
+
+
+def _effective_graph(conn):
+    pending = _pending_changes(conn)
+    if pending:
+        cached = getattr(conn, 'org_graph_private', None)
+        if cached is not None and cached[0] == pending:
+            return cached[1]
+        return None
+    return get_org_graph_store().last_loaded
+
+
+def get_org_graph():
+    """
+    Актуальный снимок иерархии. Если в текущей транзакции менялись
+    руководители, снимок строится в памяти процесса из ее данных
+    и не публикуется для других процессов.
+    """
+    conn = transaction.get_connection()
+    pending = _pending_changes(conn)
+    if not pending:
+        return get_org_graph_store().get()
+
+    cached = getattr(conn, 'org_graph_private', None)
+    if cached is None or cached[0] != pending:
+        cached = (pending, OrgGraph(load_tree(-1)))
+        conn.org_graph_private = cached
+    return cached[1]
+
+
+def schedule_rebuild():
+    """Помечает снимок устаревшим после фиксации текущей транзакции."""
+    get_org_graph_store()
+    transaction.on_commit(_CommitBump())
+
+
+def org_graph_changed(keys):
+    """Обработчик шины инвалидации: помечает снимок устаревшим."""
+    if keys is None or ORG_GRAPH_KEY in keys:
+        get_org_graph_store().bump()
+
+
+def employee_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and 'manager' not in update_fields:
+        return
+    if not created:
+        graph = _effective_graph(transaction.get_connection())
+        if (graph is not None and instance.pk in graph
+                and graph.manager_id(instance.pk) == instance.manager_id):
+            return
+    schedule_rebuild()
+
+
+def employee_deleted(sender, instance, **kwargs):
+    schedule_rebuild()
+
+
+_store = None
+_store_key = None
+_store_lock = threading.Lock()
+
+
+def get_org_graph_store():
+    global _store, _store_key
+
+    key = (
+        os.getpid(),
+        settings.ORG_GRAPH_DIR,
+        connection.settings_dict['NAME'],
+    )
+    if _store_key != key:
+        with _store_lock:
+            if _store_key != key:
+                _store = OrgGraphStore(key[1], f'org_graph-{key[2]}')
+                _store_key = key
+                invalidation.subscribe(org_graph_changed)
+    return _store
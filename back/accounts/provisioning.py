@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+BATCH_SIZE = 1000
+# Меньшие пакеты хешируются в текущем процессе: запуск пула
+# обходится дороже нескольких хешей.
+MIN_PARALLEL_PASSWORDS = 16
+
+
+def _init_worker(password_hashers):
+    # Процесс пула запускается через forkserver и импортирует этот модуль
+    # до настройки Django, поэтому модуль не обращается к моделям при
+    # импорте. Хеши считаются с алгоритмами родительского процесса.
+    django.setup()
+    settings.PASSWORD_HASHERS = password_hashers
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Хеши паролей в исходном порядке. PBKDF2 занимает процессор целиком,
+    поэтому хеширование распределяется по процессам, а не потокам.
+    Процессы запускаются через forkserver, а не fork: копия
+    многопоточного процесса может унаследовать захваченные блокировки
+    и открытые соединения с базой.
+    """
+    passwords = list(passwords)
+    workers = workers or default_workers()
+    if workers <= 1 or len(passwords) < MIN_PARALLEL_PASSWORDS:
+        return [make_password(password) for password in passwords]
+
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('forkserver'),
+        initializer=_init_worker,
+        initargs=(settings.PASSWORD_HASHERS,)
+    ) as executor:
+        return list(executor.map(make_password, passwords,
+                                 chunksize=chunksize))
+
+
+def invite_token(user):
+    """
+    Идентификатор и токен приглашения для установки пароля.
+    Токен перестает действовать после смены пароля или входа.
+    """
+    return (
+        urlsafe_base64_encode(force_bytes(user.pk)),
+        default_token_generator.make_token(user)
+    )
+
+
+def provision_users(rows, invite=False, workers=None):
+    """
+    Создает пользователей пакетами через bulk_create.
+
+    rows - словари с полями username, email, first_name, last_name, role
+    и password. Пароли хешируются в workers процессах (hash_passwords),
+    workers=1 - в текущем. Если пароль не задан или invite=True,
+    пользователю назначается неиспользуемый пароль и выдается токен
+    приглашения.
+    Возвращает список пар (пользователь, (uid, token) или None).
+    """
+    User = get_user_model()
+    rows = list(rows)
+    passwords = [
+        None if invite else row.get('password') or None for row in rows
+    ]
+    hashed = iter(hash_passwords(
+        [password for password in passwords if password], workers=workers
+    ))
+
+    users = []
+    for row, password in zip(rows, passwords):
+        user = User(
+            username=row['username'],
+            email=row['email'],
+            first_name=row.get('first_name') or '',
+            last_name=row.get('last_name') or '',
+            role=row.get('role') or User.ROLE_EMPLOYEE,
+        )
+        if password:
+            user.password = next(hashed)
+        else:
+            user.set_unusable_password()
+        users.append(user)
+
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+
+    return [
+        (user, None if user.has_usable_password() else invite_token(user))
+        for user in users
+    ]
@@ -0,0 +1,220 @@
+import hashlib
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from accounts.models import RevokedToken
+
+DEFAULT_CAPACITY = 100000
+DEFAULT_SYNC_INTERVAL = 30
+DEFAULT_REBUILD_INTERVAL = 60 * 60
+DEFAULT_SYNC_OVERLAP = 60
+ERROR_RATE = 0.01
+
+
+class BloomFilter:
+    """
+    Вероятностное множество строк: ложноотрицательных ответов нет,
+    доля ложноположительных около error_rate при capacity элементах.
+    """
+
+    def __init__(self, capacity, error_rate=ERROR_RATE):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        ))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+def user_key(user_id):
+    return f'user:{user_id}'
+
+
+class RevocationFilter:
+    """
+    Фильтр Блума отозванных токенов текущего процесса.
+
+    Раз в TOKEN_REVOCATION_SYNC_INTERVAL секунд догружает записи
+    RevokedToken, отозванные после предыдущей синхронизации, раз
+    в TOKEN_REVOCATION_REBUILD_INTERVAL строится заново без истекших.
+    Отзывы из этого процесса попадают в фильтр сразу, из других
+    процессов - при следующей синхронизации.
+
+    Синхронизация идет по revoked_dttm, а не по id: повторный отзыв
+    всех токенов пользователя обновляет существующую запись. Окно
+    TOKEN_REVOCATION_SYNC_OVERLAP секунд перекрывает записи,
+    зафиксированные позже своего revoked_dttm, и расхождение часов.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._synced_since = None
+        self._synced_at = 0.0
+        self._built_at = 0.0
+
+    def _setting(self, name, default):
+        return getattr(settings, name, default)
+
+    def _sync_from(self, started):
+        overlap = self._setting(
+            'TOKEN_REVOCATION_SYNC_OVERLAP', DEFAULT_SYNC_OVERLAP
+        )
+        return started - timedelta(seconds=overlap)
+
+    def rebuild(self):
+        started = timezone.now()
+        keys = list(RevokedToken.objects.filter(
+            expires_at__gt=started
+        ).values_list('key', flat=True))
+        capacity = max(
+            self._setting('TOKEN_REVOCATION_FILTER_CAPACITY',
+                          DEFAULT_CAPACITY),
+            2 * len(keys)
+        )
+        bloom = BloomFilter(capacity)
+        for key in keys:
+            bloom.add(key)
+
+        now = time.monotonic()
+        with self._lock:
+            self._bloom = bloom
+            self._synced_since = self._sync_from(started)
+            self._synced_at = self._built_at = now
+
+    def sync(self):
+        started = timezone.now()
+        keys = list(RevokedToken.objects.filter(
+            revoked_dttm__gte=self._synced_since
+        ).values_list('key', flat=True))
+        with self._lock:
+            for key in keys:
+                self._bloom.add(key)
+            self._synced_since = self._sync_from(started)
+            self._synced_at = time.monotonic()
+
+    def _refresh(self):
+        now = time.monotonic()
+        rebuild_interval = self._setting(
+            'TOKEN_REVOCATION_REBUILD_INTERVAL', DEFAULT_REBUILD_INTERVAL
+        )
+        sync_interval = self._setting(
+            'TOKEN_REVOCATION_SYNC_INTERVAL', DEFAULT_SYNC_INTERVAL
+        )
+        if self._bloom is None or now - self._built_at > rebuild_interval:
+            self.rebuild()
+        elif now - self._synced_at > sync_interval:
+            self.sync()
+
+    def add(self, key):
+        if self._bloom is None:
+            self.rebuild()
+        with self._lock:
+            self._bloom.add(key)
+
+    def might_contain(self, *keys):
+        self._refresh()
+        bloom = self._bloom
+        return any(key in bloom for key in keys)
+
+
+_filter = None
+_filter_pid = None
+_filter_lock = threading.Lock()
+
+
+def get_revocation_filter():
+    global _filter, _filter_pid
+
+    pid = os.getpid()
+    if _filter_pid != pid:
+        with _filter_lock:
+            if _filter_pid != pid:
+                _filter = RevocationFilter()
+                _filter_pid = pid
+    return _filter
+
+
+def _token_datetime(token, claim):
+    return datetime.fromtimestamp(token[claim], tz=dt_timezone.utc)
+
+
+def is_token_revoked(token):
+    """
+    Проверка refresh-токена: без обращения к базе, если фильтр Блума
+    не содержит ни jti, ни ключа пользователя; при попадании
+    отзыв подтверждается запросом к RevokedToken.
+    """
+    jti = token[jwt_settings.JTI_CLAIM]
+    user_id = token.get(jwt_settings.USER_ID_CLAIM)
+    keys = [jti] if user_id is None else [jti, user_key(user_id)]
+    if not get_revocation_filter().might_contain(*keys):
+        return False
+
+    condition = Q(key=jti)
+    if user_id is not None:
+        condition |= Q(
+            key=user_key(user_id),
+            revoked_dttm__gte=_token_datetime(token, 'iat')
+        )
+    return RevokedToken.objects.filter(condition).exists()
+
+
+def revoke_token(token):
+    """Отзыв одного refresh-токена по jti."""
+    jti = token[jwt_settings.JTI_CLAIM]
+    RevokedToken.objects.get_or_create(
+        key=jti,
+        defaults={
+            'user_id': token.get(jwt_settings.USER_ID_CLAIM),
+            'expires_at': _token_datetime(token, 'exp'),
+        }
+    )
+    get_revocation_filter().add(jti)
+
+
+def revoke_user_tokens(user):
+    """Отзыв всех refresh-токенов пользователя, выпущенных до этого момента."""
+    now = timezone.now()
+    key = user_key(user.pk)
+    RevokedToken.objects.update_or_create(
+        key=key,
+        defaults={
+            'user': user,
+            'revoked_dttm': now,
+            'expires_at': now + jwt_settings.REFRESH_TOKEN_LIFETIME,
+        }
+    )
+    get_revocation_filter().add(key)
+
+
+def purge_expired():
+    deleted, _ = RevokedToken.objects.filter(
+        expires_at__lte=timezone.now()
+    ).delete()
+    return deleted
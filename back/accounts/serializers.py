@@ -1,9 +1,23 @@
+from collections import Counter
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
 from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, \
+    TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from talentum.dataloader import BatchListSerializer, get_loader
+from .fragment_cache import get_employee_fragments
+from .loaders import ManagerNameLoader, SubordinatesLoader
 from .models import Employee
+from .revocation import is_token_revoked
 
 User = get_user_model()
 
@@ -72,13 +86,117 @@ class UserCreateSerializer(serializers.ModelSerializer):
         return user
 
 
+class UserProvisionSerializer(serializers.ModelSerializer):
+    password = serializers.CharField(
+        write_only=True,
+        required=False,
+        allow_blank=True,
+        validators=[validate_password]
+    )
+
+    class Meta:
+        model = User
+        fields = (
+            'username',
+            'email',
+            'first_name',
+            'last_name',
+            'role',
+            'password'
+        )
+        extra_kwargs = {
+            # Уникальность проверяется одним запросом для всего списка
+            'username': {'validators': []},
+            'email': {'validators': []},
+        }
+
+
+class UserBulkProvisionSerializer(serializers.Serializer):
+    users = UserProvisionSerializer(many=True, allow_empty=False)
+    invite = serializers.BooleanField(default=False)
+
+    def validate_users(self, value):
+        errors = []
+        for field in ['username', 'email']:
+            values = [row[field] for row in value]
+            duplicates = {
+                item for item, count in Counter(values).items() if count > 1
+            }
+            existing = set(User.objects.filter(
+                **{f'{field}__in': values}
+            ).values_list(field, flat=True))
+            for item in sorted(duplicates):
+                errors.append(f"{field} {item} повторяется в списке")
+            for item in sorted(existing):
+                errors.append(f"{field} {item} уже используется")
+        if errors:
+            raise serializers.ValidationError(errors)
+        return value
+
+
+class UserInviteAcceptSerializer(serializers.Serializer):
+    uid = serializers.CharField()
+    token = serializers.CharField()
+    password = serializers.CharField(write_only=True)
+    password2 = serializers.CharField(write_only=True)
+
+    def validate(self, attrs):
+        try:
+            user_id = force_str(urlsafe_base64_decode(attrs['uid']))
+            user = User.objects.get(pk=user_id)
+        except (ValueError, User.DoesNotExist):
+            user = None
+
+        if (user is None
+                or not default_token_generator.check_token(
+                    user, attrs['token'])):
+            raise serializers.ValidationError(
+                {"token": "Приглашение недействительно или устарело"}
+            )
+        if attrs['password'] != attrs['password2']:
+            raise serializers.ValidationError(
+                {"password": "Пароли не совпадают"}
+            )
+        validate_password(attrs['password'], user)
+
+        attrs['user'] = user
+        return attrs
+
+    def save(self):
+        user = self.validated_data['user']
+        user.set_password(self.validated_data['password'])
+        user.save(update_fields=['password'])
+        return user
+
+
+def manager_name(serializer, employee):
+    # Уже загруженный руководитель (select_related) не требует запроса
+    if Employee.manager.is_cached(employee):
+        manager = employee.manager
+        return manager.user.get_full_name() if manager else None
+    return get_loader(serializer, ManagerNameLoader).load(employee)
+
+
+class EmployeeListSerializer(BatchListSerializer):
+    """Список сотрудников с пакетным чтением кеша фрагментов."""
+
+    def render_items(self, items):
+        return self.child.to_representation_many(items)
+
+
 class EmployeeSerializer(serializers.ModelSerializer):
+    """
+    Представления сотрудников берутся из кеша фрагментов
+    (accounts.fragment_cache) и строятся заново только при промахе.
+    """
     user = UserSerializer(read_only=True)
     manager_name = serializers.SerializerMethodField()
     profile_photo_url = serializers.SerializerMethodField()
+    batch_loaders = (ManagerNameLoader,)
 
     class Meta:
         model = Employee
+        list_serializer_class = EmployeeListSerializer
         fields = (
             'id',
             'user',
@@ -92,17 +210,18 @@ class EmployeeSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'user', 'profile_photo_url')
 
     def get_manager_name(self, obj):
-        if obj.manager:
-            return obj.manager.user.get_full_name()
-        return None
+        return manager_name(self, obj)
         
     def get_profile_photo_url(self, obj):
-        if obj.profile_photo and hasattr(obj.profile_photo, 'url'):
-            url = obj.profile_photo.url
-            if url.startswith('https://'):
-                return url.replace('https://', 'http://', 1)
-            return url
-        return None
+        return obj.profile_photo_url
+
+    def to_representation_many(self, instances):
+        return get_employee_fragments().render_many(
+            instances, super().to_representation
+        )
+
+    def to_representation(self, instance):
+        return self.to_representation_many([instance])[0]
 
 
 class EmployeeDetailSerializer(serializers.ModelSerializer):
@@ -111,9 +230,11 @@ class EmployeeDetailSerializer(serializers.ModelSerializer):
     manager_name = serializers.SerializerMethodField()
     is_manager = serializers.SerializerMethodField()
     profile_photo_url = serializers.SerializerMethodField()
+    batch_loaders = (ManagerNameLoader, SubordinatesLoader)
 
     class Meta:
         model = Employee
+        list_serializer_class = BatchListSerializer
         fields = (
             'id',
             'user',
@@ -128,23 +249,18 @@ class EmployeeDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'user', 'is_manager', 'profile_photo_url')
 
     def get_subordinates(self, obj):
-        return EmployeeSerializer(obj.subordinates.all(), many=True).data
+        return EmployeeSerializer(
+            get_loader(self, SubordinatesLoader).load(obj), many=True
+        ).data
 
     def get_manager_name(self, obj):
-        if obj.manager:
-            return obj.manager.user.get_full_name()
-        return None
+        return manager_name(self, obj)
 
     def get_is_manager(self, obj):
-        return obj.subordinates.exists()
+        return bool(get_loader(self, SubordinatesLoader).load(obj))
         
     def get_profile_photo_url(self, obj):
-        if obj.profile_photo and hasattr(obj.profile_photo, 'url'):
-            url = obj.profile_photo.url
-            if url.startswith('https://'):
-                return url.replace('https://', 'http://', 1)
-            return url
-        return None
+        return obj.profile_photo_url
 
 
 class EmployeeCreateUpdateSerializer(serializers.ModelSerializer):
@@ -180,22 +296,58 @@ class EmployeePhotoUploadSerializer(serializers.ModelSerializer):
         fields = ('profile_photo',)
 
 
+class EmployeeImportSerializer(serializers.Serializer):
+    employees = serializers.FileField(required=False)
+    goals = serializers.FileField(required=False)
+
+    def validate(self, attrs):
+        if not attrs.get('employees') and not attrs.get('goals'):
+            raise serializers.ValidationError(
+                "Необходимо передать файл сотрудников или целей"
+            )
+        return attrs
+
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Данные пользователя собираются один раз (get_claims) и используются
+    и в токене, и в теле ответа. Пользователь с профилем сотрудника
+    и признаком руководителя загружается бэкендом аутентификации одним
+    запросом (accounts.backends.login_queryset).
+    """
+    token_claims = ('username', 'email', 'role', 'full_name')
+
     @classmethod
-    def get_token(cls, user):
+    def get_token(cls, user, claims=None):
         token = super().get_token(user)
 
-        token['username'] = user.username
-        token['email'] = user.email
-        token['role'] = user.role
-        token['full_name'] = user.get_full_name()
+        if claims is None:
+            claims = cls.get_claims(user)
+        for claim in cls.token_claims:
+            token[claim] = claims[claim]
 
         return token
 
     def validate(self, attrs):
-        data = super().validate(attrs)
+        # Аутентификация без выпуска токенов в TokenObtainPairSerializer
+        super(TokenObtainPairSerializer, self).validate(attrs)
+
+        claims = self.get_claims(self.user)
+        refresh = self.get_token(self.user, claims)
+        data = {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            **claims
+        }
+
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
 
-        user = self.user
+        return data
+
+    @classmethod
+    def get_claims(cls, user):
+        data = {}
         data['user_id'] = user.id
         data['username'] = user.username
         data['email'] = user.email
@@ -204,14 +356,45 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
         try:
             employee = user.employee_profile
-            data['employee_id'] = employee.id
-            data['position'] = employee.position
-            data['has_employee_profile'] = True
-            data['is_manager'] = employee.subordinates.exists()
-            if employee.profile_photo:
-                data['profile_photo_url'] = employee.profile_photo.url
         except Employee.DoesNotExist:
+            employee = None
+
+        if employee is None:
             data['has_employee_profile'] = False
             data['is_manager'] = False
+            return data
+
+        data['employee_id'] = employee.id
+        data['position'] = employee.position
+        data['has_employee_profile'] = True
+        is_manager = getattr(user, 'has_subordinates', None)
+        if is_manager is None:
+            is_manager = employee.subordinates.exists()
+        data['is_manager'] = is_manager
+        if employee.profile_photo:
+            data['profile_photo_url'] = employee.profile_photo_url
 
         return data
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Обновление токена с проверкой отзыва (accounts.revocation).
+    Для неотозванного токена проверка не обращается к базе.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if is_token_revoked(refresh):
+            raise TokenError('Токен отозван')
+        return super().validate(attrs)
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+
+    def validate_refresh(self, value):
+        try:
+            return RefreshToken(value)
+        except TokenError as e:
+            raise serializers.ValidationError(str(e))
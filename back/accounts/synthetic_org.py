@@ -0,0 +1,630 @@
+from datetime import date
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+
+from accounts.bulk_import import CopyStream
+from accounts.models import User
+from accounts.org_graph import schedule_rebuild
+from analytics.calibration import mark_reviewers
+from feedback.models import FeedbackRequest
+from goals.models import Goal
+from talentum import invalidation
+
+# Доли статусов целей; в сумме 1
+STATUS_SHARES = {
+    Goal.STATUS_DRAFT: 0.10,
+    Goal.STATUS_PENDING_APPROVAL: 0.08,
+    Goal.STATUS_APPROVED: 0.07,
+    Goal.STATUS_IN_PROGRESS: 0.30,
+    Goal.STATUS_PENDING_ASSESSMENT: 0.15,
+    Goal.STATUS_COMPLETED: 0.25,
+    Goal.STATUS_CANCELLED: 0.05,
+}
+# Цели этих статусов относятся к прошедшим кварталам
+PAST_STATUSES = (Goal.STATUS_COMPLETED, Goal.STATUS_CANCELLED)
+PROGRESS_STATUSES = (
+    Goal.STATUS_IN_PROGRESS,
+    Goal.STATUS_PENDING_ASSESSMENT,
+    Goal.STATUS_COMPLETED,
+)
+FEEDBACK_STATUSES = (
+    Goal.STATUS_PENDING_ASSESSMENT,
+    Goal.STATUS_COMPLETED,
+)
+# Вероятность самооценки по статусу цели
+SELF_ASSESSMENT_SHARES = {
+    Goal.STATUS_IN_PROGRESS: 0.2,
+    Goal.STATUS_PENDING_ASSESSMENT: 0.8,
+    Goal.STATUS_COMPLETED: 1.0,
+}
+# Вероятность ответа рецензента по статусу цели
+FEEDBACK_COMPLETION_SHARES = {
+    Goal.STATUS_PENDING_ASSESSMENT: 0.5,
+    Goal.STATUS_COMPLETED: 0.9,
+}
+EXPERT_EVALUATION_SHARE = 0.8
+EXPERTISE_LEADER_SHARE = 0.02
+MAX_REVIEWERS = 4
+MEAN_PROGRESS_ENTRIES = 2
+PAST_QUARTERS = 8
+
+DEFAULT_UNTIL = date(2025, 12, 31)
+# Пароль, с которым нельзя войти (как у User.set_unusable_password)
+UNUSABLE_PASSWORD = '!synthetic'
+
+FIRST_NAMES = (
+    'Александр', 'Мария', 'Дмитрий', 'Анна', 'Сергей', 'Елена', 'Андрей',
+    'Ольга', 'Алексей', 'Наталья', 'Иван', 'Татьяна', 'Михаил', 'Ирина',
+    'Никита', 'Екатерина',
+)
+LAST_NAMES = (
+    'Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Петров',
+    'Соколов', 'Михайлов', 'Новиков', 'Федоров', 'Морозов', 'Волков',
+    'Алексеев', 'Лебедев', 'Семенов', 'Егоров',
+)
+POSITIONS = (
+    'Разработчик', 'Аналитик', 'Тестировщик', 'Дизайнер',
+    'Менеджер проектов', 'DevOps-инженер', 'Технический писатель',
+)
+MANAGER_POSITIONS = (
+    'Генеральный директор', 'Директор направления', 'Руководитель отдела',
+)
+TEAM_LEAD_POSITION = 'Руководитель группы'
+GOAL_ACTIONS = (
+    'Сократить', 'Автоматизировать', 'Внедрить', 'Улучшить', 'Описать',
+    'Перевести', 'Ускорить', 'Покрыть тестами',
+)
+GOAL_SUBJECTS = (
+    'процесс релиза', 'отчетность команды', 'время ответа API',
+    'онбординг новых сотрудников', 'мониторинг сервисов',
+    'документацию по продукту', 'сборку проекта', 'работу с клиентами',
+)
+COMMENTS = (
+    'Хороший результат, цель достигнута в срок.',
+    'Есть заметный прогресс, но часть задач перенесена.',
+    'Отличная работа и помощь коллегам.',
+    'Результат ниже ожидаемого, нужно больше внимания к срокам.',
+)
+AREAS_TO_IMPROVE = (
+    'Планирование и оценка сроков.',
+    'Коммуникация с соседними командами.',
+    'Глубина технической экспертизы.',
+    'Делегирование задач.',
+)
+PROGRESS_NOTES = (
+    'Подготовлен план работ.',
+    'Выполнена первая часть задач.',
+    'Проведена встреча с заинтересованными сторонами.',
+    'Результаты промежуточной проверки согласованы.',
+)
+
+USER_COLUMNS = (
+    'id', 'password', 'is_superuser', 'username', 'first_name', 'last_name',
+    'email', 'is_staff', 'is_active', 'date_joined', 'role',
+    'registration_dttm',
+)
+EMPLOYEE_COLUMNS = ('id', 'user_id', 'hire_dt', 'position', 'manager_id')
+GOAL_COLUMNS = (
+    'id', 'employee_id', 'title', 'description', 'expected_results',
+    'start_period', 'end_period', 'status', 'created_dttm', 'updated_dttm',
+)
+PROGRESS_COLUMNS = ('id', 'goal_id', 'description', 'created_dttm')
+SELF_ASSESSMENT_COLUMNS = (
+    'id', 'goal_id', 'rating', 'comments', 'areas_to_improve', 'created_dttm',
+    'updated_dttm',
+)
+FEEDBACK_REQUEST_COLUMNS = (
+    'id', 'goal_id', 'reviewer_id', 'requested_by_id', 'message', 'status',
+    'created_dttm', 'updated_dttm',
+)
+PEER_FEEDBACK_COLUMNS = (
+    'id', 'feedback_request_id', 'rating', 'comments', 'areas_to_improve',
+    'created_dttm', 'updated_dttm',
+)
+EXPERT_EVALUATION_COLUMNS = (
+    'id', 'goal_id', 'expert_id', 'final_rating', 'comments',
+    'areas_to_improve', 'created_dttm', 'updated_dttm',
+)
+STATS_COLUMNS = (
+    'goal_id', 'requests_count', 'pending_requests_count',
+    'peer_feedback_count', 'peer_rating_sum', 'peer_rating_mean',
+    'self_rating', 'final_rating', 'updated_dttm',
+)
+# Таблицы в порядке загрузки
+TABLES = (
+    'users', 'employees', 'goals', 'goals_progresses',
+    'goals_self_assessments', 'feedback_requests', 'peer_feedback',
+    'expert_evaluations', 'goals_feedback_stats',
+)
+
+
+class SeedError(Exception):
+    pass
+
+
+def build_hierarchy(rng, count, fan_out, depth, skew):
+    """
+    Дерево из count сотрудников с одним корнем (индекс 0), уровень за
+    уровнем: уровень в среднем в fan_out раз больше предыдущего, пока
+    не закончатся сотрудники; последний допустимый уровень depth
+    получает всех оставшихся. Подчиненные распределяются между
+    сотрудниками уровня с весами Парето(skew): чем меньше skew, тем
+    неравномернее команды и больше сотрудников без подчиненных.
+
+    Возвращает parent (-1 у корня) и level. Подчиненные одного
+    руководителя получают соседние индексы.
+    """
+    parent = np.full(count, -1, dtype=np.int64)
+    level = np.zeros(count, dtype=np.int32)
+    current = np.zeros(1, dtype=np.int64)
+    placed = 1
+    current_level = 0
+    while placed < count:
+        current_level += 1
+        remaining = count - placed
+        if current_level >= depth:
+            size = remaining
+        else:
+            size = min(remaining, max(1, round(len(current) * fan_out)))
+        weights = rng.pareto(skew, len(current)) + 1e-9
+        children = rng.multinomial(size, weights / weights.sum())
+        parent[placed:placed + size] = np.repeat(current, children)
+        level[placed:placed + size] = current_level
+        current = np.arange(placed, placed + size, dtype=np.int64)
+        placed += size
+    return parent, level
+
+
+def _reserve_ids(cursor, table, count):
+    """
+    Первый ID непрерывного блока из count значений последовательности
+    таблицы. Таблица блокируется от вставок до конца транзакции.
+    """
+    cursor.execute(f'LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE')
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+    sequence, = cursor.fetchone()
+    cursor.execute('SELECT nextval(%s)', [sequence])
+    first, = cursor.fetchone()
+    if count > 1:
+        cursor.execute('SELECT setval(%s, %s)', [sequence, first + count - 1])
+    return first
+
+
+def _copy(cursor, table, columns, rows):
+    cursor.copy_expert(
+        f'COPY {table} ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)',
+        CopyStream(rows)
+    )
+
+
+def _timestamps(values):
+    return np.datetime_as_string(values, unit='s', timezone='UTC').tolist()
+
+
+def _pick(rng, choices, size):
+    return np.array(choices, dtype=object)[
+        rng.integers(0, len(choices), size)
+    ].tolist()
+
+
+def _quarter_start(until, back):
+    quarter = (until.year * 4 + (until.month - 1) // 3) - back
+    return np.datetime64(
+        f'{quarter // 4:04d}-{quarter % 4 * 3 + 1:02d}-01', 'D'
+    )
+
+
+class SyntheticOrg:
+    """
+    Детерминированная синтетическая организация: одинаковые параметры
+    и seed дают одинаковые данные (кроме значений ID, которые
+    выделяются из последовательностей таблиц).
+
+    Все строки создаются массивами numpy и загружаются через COPY
+    в обход save(), поэтому агрегаты GoalFeedbackStats вычисляются
+    здесь же по тем же данным.
+    """
+
+    def __init__(self, employees, goals, fan_out=6.0, depth=10, skew=1.2,
+                 seed=0, prefix='synthetic', password=None,
+                 until=DEFAULT_UNTIL):
+        if employees < 1:
+            raise SeedError('Нужен хотя бы один сотрудник')
+        if depth < 1 and employees > 1:
+            raise SeedError('Глубина иерархии должна быть не меньше 1')
+        if fan_out <= 0 or skew <= 0:
+            raise SeedError('fan_out и skew должны быть положительными')
+        self.employees = employees
+        self.goals = goals
+        self.fan_out = fan_out
+        self.depth = depth
+        self.skew = skew
+        self.seed = seed
+        self.prefix = prefix
+        self.password = password
+        self.until = until
+        self.now = np.datetime64(until, 's') + np.timedelta64(18, 'h')
+        self.counts = {}
+
+    def create(self):
+        """Создает организацию одной транзакцией; возвращает число строк."""
+        if User.objects.filter(username__startswith=f'{self.prefix}-') \
+                .exists():
+            raise SeedError(
+                f'Пользователи с префиксом {self.prefix} уже существуют'
+            )
+        rng = np.random.default_rng(self.seed)
+        with transaction.atomic(), connection.cursor() as cursor:
+            employee_ids = self._create_employees(cursor, rng)
+            goal_ids, owners, statuses, created = self._create_goals(
+                cursor, rng, employee_ids
+            )
+            self._create_progress(cursor, rng, goal_ids, statuses, created)
+            self_ratings = self._create_self_assessments(
+                cursor, rng, goal_ids, statuses, created
+            )
+            requests = self._create_feedback(
+                cursor, rng, goal_ids, owners, statuses, created,
+                employee_ids
+            )
+            final_ratings = self._create_expert_evaluations(
+                cursor, rng, goal_ids, owners, statuses, created,
+                employee_ids
+            )
+            self._create_stats(
+                cursor, goal_ids, self_ratings, requests, final_ratings
+            )
+            # Статистика планировщика для запросов сразу после загрузки
+            for table in TABLES:
+                cursor.execute(f'ANALYZE {table}')
+            # Руководители и цели загружены в обход сигналов
+            schedule_rebuild()
+            invalidation.publish_all()
+        return self.counts
+
+    def _create_employees(self, cursor, rng):
+        count = self.employees
+        parent, level = build_hierarchy(
+            rng, count, self.fan_out, self.depth, self.skew
+        )
+        has_reports = np.bincount(parent[parent >= 0], minlength=count) > 0
+
+        roles = np.where(
+            rng.random(count) < EXPERTISE_LEADER_SHARE,
+            User.ROLE_EXPERTISE_LEADER, User.ROLE_EMPLOYEE
+        ).astype(object)
+        roles[0] = User.ROLE_ADMIN
+        if count > 1 and not (roles == User.ROLE_EXPERTISE_LEADER).any():
+            roles[1] = User.ROLE_EXPERTISE_LEADER
+        self.roles = roles
+
+        positions = np.array(_pick(rng, POSITIONS, count), dtype=object)
+        positions[has_reports] = TEAM_LEAD_POSITION
+        for manager_level, position in enumerate(MANAGER_POSITIONS):
+            positions[has_reports & (level == manager_level)] = position
+
+        first_names = _pick(rng, FIRST_NAMES, count)
+        last_names = _pick(rng, LAST_NAMES, count)
+        # Стаж руководителей больше
+        tenure = rng.integers(30, 3650, count) + (
+            (self.depth - level) * 120 * has_reports
+        )
+        hire_dates = (np.datetime64(self.until, 'D') - tenure).astype(str)
+        joined = _timestamps(
+            np.datetime64(self.until, 's')
+            - tenure.astype('timedelta64[D]').astype('timedelta64[s]')
+        )
+        # Хеш вычисляется один раз: у всех пользователей общий пароль
+        password = (make_password(self.password) if self.password
+                    else UNUSABLE_PASSWORD)
+
+        first_user = _reserve_ids(cursor, 'users', count)
+        first_employee = _reserve_ids(cursor, 'employees', count)
+        user_ids = np.arange(first_user, first_user + count)
+        employee_ids = np.arange(first_employee, first_employee + count)
+
+        usernames = [f'{self.prefix}-{index}' for index in range(count)]
+        _copy(cursor, 'users', USER_COLUMNS, (
+            (user_ids[index], password, False, usernames[index],
+             first_names[index], last_names[index],
+             f'{usernames[index]}@example.com', False, True, joined[index],
+             roles[index], joined[index])
+            for index in range(count)
+        ))
+        manager_ids = np.where(parent >= 0, employee_ids[parent], -1).tolist()
+        _copy(cursor, 'employees', EMPLOYEE_COLUMNS, (
+            (employee_ids[index], user_ids[index], hire_dates[index],
+             positions[index],
+             manager_ids[index] if manager_ids[index] >= 0 else None)
+            for index in range(count)
+        ))
+
+        self.parent = parent
+        self.counts['users'] = count
+        self.counts['employees'] = count
+        return employee_ids
+
+    def _create_goals(self, cursor, rng, employee_ids):
+        count = self.goals
+        # Число целей на сотрудника неравномерно: веса из гамма-распределения
+        weights = rng.gamma(2.0, size=self.employees)
+        per_employee = rng.multinomial(count, weights / weights.sum())
+        owners = np.repeat(np.arange(self.employees), per_employee)
+
+        statuses = np.array(list(STATUS_SHARES), dtype=object)[rng.choice(
+            len(STATUS_SHARES), size=count, p=list(STATUS_SHARES.values())
+        )]
+        past = np.isin(statuses, PAST_STATUSES)
+        quarters_back = np.where(
+            past, rng.integers(1, PAST_QUARTERS + 1, count), 0
+        )
+        starts = np.array([
+            _quarter_start(self.until, back)
+            for back in range(PAST_QUARTERS + 1)
+        ])
+        ends = np.array([
+            _quarter_start(self.until, back - 1) - np.timedelta64(1, 'D')
+            for back in range(PAST_QUARTERS + 1)
+        ])
+        start_period = starts[quarters_back]
+        end_period = ends[quarters_back]
+        created = (
+            start_period.astype('datetime64[s]')
+            - rng.integers(0, 14 * 86400, count).astype('timedelta64[s]')
+        )
+        updated = np.minimum(
+            created + rng.integers(0, 60 * 86400, count)
+            .astype('timedelta64[s]'),
+            self.now
+        )
+
+        actions = _pick(rng, GOAL_ACTIONS, count)
+        subjects = _pick(rng, GOAL_SUBJECTS, count)
+        start_text = start_period.astype(str).tolist()
+        end_text = end_period.astype(str).tolist()
+        created_text = _timestamps(created)
+        updated_text = _timestamps(updated)
+        status_list = statuses.tolist()
+
+        first = _reserve_ids(cursor, 'goals', count)
+        goal_ids = np.arange(first, first + count)
+        owner_ids = employee_ids[owners].tolist()
+        _copy(cursor, 'goals', GOAL_COLUMNS, (
+            (first + index, owner_ids[index],
+             f'{actions[index]} {subjects[index]}',
+             f'Цель на период {start_text[index]} - {end_text[index]}: '
+             f'{actions[index].lower()} {subjects[index]}.',
+             'Измеримый результат согласован с руководителем.',
+             start_text[index], end_text[index], status_list[index],
+             created_text[index], updated_text[index])
+            for index in range(count)
+        ))
+        self.counts['goals'] = count
+        return goal_ids, owners, statuses, created
+
+    def _create_progress(self, cursor, rng, goal_ids, statuses, created):
+        eligible = np.flatnonzero(np.isin(statuses, PROGRESS_STATUSES))
+        per_goal = rng.poisson(MEAN_PROGRESS_ENTRIES, len(eligible))
+        goals = np.repeat(eligible, per_goal)
+        count = len(goals)
+        created_text = _timestamps(np.minimum(
+            created[goals]
+            + rng.integers(86400, 90 * 86400, count).astype('timedelta64[s]'),
+            self.now
+        ))
+        notes = _pick(rng, PROGRESS_NOTES, count)
+        goal_id_list = goal_ids[goals].tolist()
+
+        first = _reserve_ids(cursor, 'goals_progresses', count)
+        _copy(cursor, 'goals_progresses', PROGRESS_COLUMNS, (
+            (first + index, goal_id_list[index], notes[index],
+             created_text[index])
+            for index in range(count)
+        ))
+        self.counts['progress'] = count
+
+    def _create_self_assessments(self, cursor, rng, goal_ids, statuses,
+                                 created):
+        shares = np.array([
+            SELF_ASSESSMENT_SHARES.get(status, 0.0) for status in statuses
+        ])
+        goals = np.flatnonzero(rng.random(len(statuses)) < shares)
+        count = len(goals)
+        ratings = rng.integers(4, 11, count)
+        created_text = _timestamps(np.minimum(
+            created[goals] + np.timedelta64(80, 'D'), self.now
+        ))
+        comments = _pick(rng, COMMENTS, count)
+        areas = _pick(rng, AREAS_TO_IMPROVE, count)
+        goal_id_list = goal_ids[goals].tolist()
+        rating_list = ratings.tolist()
+
+        first = _reserve_ids(cursor, 'goals_self_assessments', count)
+        _copy(cursor, 'goals_self_assessments', SELF_ASSESSMENT_COLUMNS, (
+            (first + index, goal_id_list[index], rating_list[index],
+             comments[index], areas[index], created_text[index],
+             created_text[index])
+            for index in range(count)
+        ))
+        self.counts['self_assessments'] = count
+
+        self_ratings = np.zeros(len(statuses), dtype=np.int64)
+        self_ratings[goals] = ratings
+        return self_ratings
+
+    def _reviewers(self, rng, owners, per_goal):
+        """
+        Рецензенты целей - коллеги владельца по команде (подчиненные
+        того же руководителя), без повторов; не больше размера команды
+        без самого владельца.
+        """
+        parent = self.parent
+        team_size = np.bincount(parent[parent >= 0],
+                                minlength=self.employees)
+        # Подчиненные руководителя идут подряд, начиная с first_child
+        first_child = np.full(self.employees, -1, dtype=np.int64)
+        children = np.flatnonzero(parent >= 0)
+        managers, first = np.unique(parent[children], return_index=True)
+        first_child[managers] = children[first]
+
+        manager = parent[owners]
+        size = np.where(manager >= 0, team_size[np.maximum(manager, 0)], 1)
+        per_goal = np.minimum(per_goal, size - 1)
+        goals = np.repeat(np.arange(len(owners)), per_goal)
+        # Номер рецензента внутри цели: 0..per_goal-1
+        slot = np.arange(len(goals)) - np.repeat(
+            np.cumsum(per_goal) - per_goal, per_goal
+        )
+        start = first_child[np.maximum(manager[goals], 0)]
+        position = owners[goals] - start
+        shift = rng.integers(0, np.maximum(size - 1, 1))[goals]
+        reviewers = start + (
+            position + 1 + (shift + slot) % (size[goals] - 1)
+        ) % size[goals]
+        return goals, reviewers
+
+    def _create_feedback(self, cursor, rng, goal_ids, owners, statuses,
+                         created, employee_ids):
+        eligible = np.flatnonzero(np.isin(statuses, FEEDBACK_STATUSES))
+        wanted = rng.integers(1, MAX_REVIEWERS + 1, len(eligible))
+        goals, reviewers = self._reviewers(rng, owners[eligible], wanted)
+        goals = eligible[goals]
+        count = len(goals)
+
+        shares = np.array([
+            FEEDBACK_COMPLETION_SHARES[status] for status in statuses[goals]
+        ])
+        answered = rng.random(count) < shares
+        request_status = np.where(
+            answered, FeedbackRequest.STATUS_COMPLETED,
+            FeedbackRequest.STATUS_PENDING
+        ).tolist()
+        requested = np.minimum(
+            created[goals] + np.timedelta64(85, 'D'), self.now
+        )
+        requested_text = _timestamps(requested)
+        goal_id_list = goal_ids[goals].tolist()
+        reviewer_ids = employee_ids[reviewers].tolist()
+        owner_ids = employee_ids[owners[goals]].tolist()
+
+        first = _reserve_ids(cursor, 'feedback_requests', count)
+        _copy(cursor, 'feedback_requests', FEEDBACK_REQUEST_COLUMNS, (
+            (first + index, goal_id_list[index], reviewer_ids[index],
+             owner_ids[index], 'Поделись, пожалуйста, впечатлениями о цели.',
+             request_status[index], requested_text[index],
+             requested_text[index])
+            for index in range(count)
+        ))
+        self.counts['feedback_requests'] = count
+
+        answered_index = np.flatnonzero(answered)
+        ratings = rng.integers(3, 11, len(answered_index))
+        feedback_text = _timestamps(np.minimum(
+            requested[answered_index]
+            + rng.integers(3600, 14 * 86400, len(answered_index))
+            .astype('timedelta64[s]'),
+            self.now
+        ))
+        comments = _pick(rng, COMMENTS, len(answered_index))
+        areas = _pick(rng, AREAS_TO_IMPROVE, len(answered_index))
+        rating_list = ratings.tolist()
+        request_ids = (first + answered_index).tolist()
+
+        first = _reserve_ids(cursor, 'peer_feedback', len(answered_index))
+        _copy(cursor, 'peer_feedback', PEER_FEEDBACK_COLUMNS, (
+            (first + index, request_ids[index], rating_list[index],
+             comments[index], areas[index], feedback_text[index],
+             feedback_text[index])
+            for index in range(len(answered_index))
+        ))
+        self.counts['peer_feedback'] = len(answered_index)
+        # Отзывы загружены в обход сигналов калибровки рецензентов
+        mark_reviewers(np.unique(
+            employee_ids[reviewers[answered_index]]
+        ).tolist())
+
+        goal_count = len(statuses)
+        peer_ratings = np.zeros(count, dtype=np.int64)
+        peer_ratings[answered_index] = ratings
+        return {
+            'requests': np.bincount(goals, minlength=goal_count),
+            'pending': np.bincount(goals, weights=~answered,
+                                   minlength=goal_count).astype(np.int64),
+            'feedback': np.bincount(goals, weights=answered,
+                                    minlength=goal_count).astype(np.int64),
+            'rating_sum': np.bincount(goals, weights=peer_ratings,
+                                      minlength=goal_count).astype(np.int64),
+        }
+
+    def _create_expert_evaluations(self, cursor, rng, goal_ids, owners,
+                                   statuses, created, employee_ids):
+        completed = statuses == Goal.STATUS_COMPLETED
+        goals = np.flatnonzero(
+            completed & (rng.random(len(statuses)) < EXPERT_EVALUATION_SHARE)
+        )
+        leaders = np.flatnonzero(self.roles == User.ROLE_EXPERTISE_LEADER)
+        if not len(leaders):
+            goals = goals[:0]
+        choice = rng.integers(0, max(len(leaders), 1), len(goals))
+        experts = leaders[choice]
+        # Лидер не оценивает свою цель: берется следующий лидер,
+        # а если он единственный - цель остается без оценки
+        own = experts == owners[goals]
+        experts[own] = leaders[(choice[own] + 1) % len(leaders)]
+        keep = experts != owners[goals]
+        goals, experts = goals[keep], experts[keep]
+        count = len(goals)
+        ratings = rng.integers(3, 11, count)
+        created_text = _timestamps(np.minimum(
+            created[goals] + np.timedelta64(100, 'D'), self.now
+        ))
+        comments = _pick(rng, COMMENTS, count)
+        areas = _pick(rng, AREAS_TO_IMPROVE, count)
+        goal_id_list = goal_ids[goals].tolist()
+        expert_ids = employee_ids[experts].tolist()
+        rating_list = ratings.tolist()
+
+        first = _reserve_ids(cursor, 'expert_evaluations', count)
+        _copy(cursor, 'expert_evaluations', EXPERT_EVALUATION_COLUMNS, (
+            (first + index, goal_id_list[index], expert_ids[index],
+             rating_list[index], comments[index], areas[index],
+             created_text[index], created_text[index])
+            for index in range(count)
+        ))
+        self.counts['expert_evaluations'] = count
+
+        final_ratings = np.zeros(len(statuses), dtype=np.int64)
+        final_ratings[goals] = ratings
+        return final_ratings
+
+    def _create_stats(self, cursor, goal_ids, self_ratings, requests,
+                      final_ratings):
+        """
+        Строки GoalFeedbackStats для целей с самооценкой, запросами
+        отзывов или итоговой оценкой - те же значения, что дает
+        GoalFeedbackStatsManager.rebuild.
+        """
+        goals = np.flatnonzero(
+            (self_ratings > 0) | (requests['requests'] > 0)
+            | (final_ratings > 0)
+        )
+        now = _timestamps(np.array([self.now]))[0]
+        columns = [
+            goal_ids[goals].tolist(),
+            requests['requests'][goals].tolist(),
+            requests['pending'][goals].tolist(),
+            requests['feedback'][goals].tolist(),
+            requests['rating_sum'][goals].tolist(),
+            self_ratings[goals].tolist(),
+            final_ratings[goals].tolist(),
+        ]
+        _copy(cursor, 'goals_feedback_stats', STATS_COLUMNS, (
+            (goal_id, requests_count, pending, feedback, rating_sum,
+             rating_sum / feedback if feedback else None,
+             self_rating or None, final_rating or None, now)
+            for goal_id, requests_count, pending, feedback, rating_sum,
+            self_rating, final_rating in zip(*columns)
+        ))
+        self.counts['goal_feedback_stats'] = len(goals)
@@ -2,6 +2,7 @@ from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
 from accounts.models import User, Employee
 
@@ -135,3 +136,19 @@ class AuthenticationTests(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('access', response.data)
+
+    def test_user_login_single_query(self):
+        """Тест получения токена одним запросом с общими данными в ответе"""
+        url = reverse('token_obtain_pair')
+        data = {
+            'username': 'manager',
+            'password': 'password123'
+        }
+        with self.assertNumQueries(1):
+            response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_manager'])
+        access = AccessToken(response.data['access'])
+        for claim in ['username', 'email', 'role', 'full_name']:
+            self.assertEqual(access[claim], response.data[claim])
@@ -0,0 +1,280 @@
+import io
+import json
+import os
+import tempfile
+from datetime import date
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.bulk_import import BulkImportError, FORMAT_JSONL, import_org
+from accounts.models import User, Employee
+from goals.models import Goal
+
+EMPLOYEES_CSV = """username,email,first_name,last_name,role,position,hire_dt,manager
+dev,dev@example.com,Dev,User,,Developer,2024-02-01,lead
+lead,lead@example.com,Lead,User,,Team Lead,2023-01-01,head
+head,head@example.com,Head,User,expertise_leader,Head,2020-01-01,
+"""
+
+
+def csv_file(content):
+    return io.BytesIO(content.encode('utf-8'))
+
+
+def jsonl_file(records):
+    return io.BytesIO(
+        '\n'.join(json.dumps(record) for record in records).encode('utf-8')
+    )
+
+
+class BulkImportTestCase(APITestCase):
+    """Тесты массовой загрузки сотрудников и целей"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создание данных для всех тестов"""
+        cls.admin_user = User.objects.create_user(
+            username='admin',
+            password='password123',
+            email='admin@example.com',
+            role='admin'
+        )
+        cls.existing_user = User.objects.create_user(
+            username='existing',
+            password='password123',
+            email='existing@example.com',
+            role='employee'
+        )
+        cls.existing = Employee.objects.create(
+            user=cls.existing_user,
+            position='Analyst',
+            hire_dt=date(2022, 1, 1)
+        )
+
+    def _employee(self, username):
+        return Employee.objects.select_related('manager__user').get(
+            user__username=username
+        )
+
+    def test_import_employees_with_managers(self):
+        """Тест загрузки сотрудников с руководителями в любом порядке"""
+        result = import_org(employees=csv_file(EMPLOYEES_CSV))
+
+        self.assertEqual(result['employees']['users_created'], 3)
+        self.assertEqual(result['employees']['employees_created'], 3)
+        dev = self._employee('dev')
+        self.assertEqual(dev.manager.user.username, 'lead')
+        self.assertEqual(dev.hire_dt, date(2024, 2, 1))
+        self.assertEqual(dev.user.role, User.ROLE_EMPLOYEE)
+        self.assertFalse(dev.user.has_usable_password())
+        self.assertEqual(
+            self._employee('lead').manager.user.username, 'head'
+        )
+        self.assertIsNone(self._employee('head').manager)
+        self.assertEqual(
+            self._employee('head').user.role, User.ROLE_EXPERTISE_LEADER
+        )
+
+    def test_reimport_updates_existing_rows(self):
+        """Тест обновления существующих пользователей и сотрудников"""
+        import_org(employees=csv_file(EMPLOYEES_CSV))
+        result = import_org(employees=csv_file(
+            "username,email,position,hire_dt,manager\n"
+            "dev,dev@example.com,Senior Developer,2024-02-01,existing\n"
+            "existing,existing@example.com,Analyst,2022-01-01,\n"
+        ))
+
+        self.assertEqual(result['employees']['users_created'], 0)
+        self.assertEqual(result['employees']['users_updated'], 2)
+        self.assertEqual(result['employees']['employees_updated'], 2)
+        self.assertEqual(result['employees']['managers_changed'], 1)
+        dev = self._employee('dev')
+        self.assertEqual(dev.position, 'Senior Developer')
+        self.assertEqual(dev.manager, self.__class__.existing)
+        self.assertEqual(Employee.objects.count(), 4)
+
+    def test_reimport_keeps_unset_user_fields(self):
+        """Тест сохранения роли и имени, не заданных в файле"""
+        admin_user = self.__class__.admin_user
+        admin_user.first_name = 'Admin'
+        admin_user.last_name = 'User'
+        admin_user.save()
+
+        result = import_org(employees=csv_file(
+            "username,email,first_name,position,hire_dt\n"
+            "admin,admin@example.com,,Administrator,2021-01-01\n"
+        ))
+
+        self.assertEqual(result['employees']['users_updated'], 1)
+        self.assertEqual(result['employees']['employees_created'], 1)
+        admin_user.refresh_from_db()
+        self.assertEqual(admin_user.role, User.ROLE_ADMIN)
+        self.assertEqual(admin_user.first_name, 'Admin')
+        self.assertEqual(admin_user.last_name, 'User')
+
+    def test_validation_errors_abort_import(self):
+        """Тест отклонения загрузки с ошибками без сохранения строк"""
+        content = (
+            "username,email,position,hire_dt,manager\n"
+            "first,first@example.com,Developer,2024-02-30,\n"
+            "second,existing@example.com,Developer,2024-01-01,nobody\n"
+            "second,second@example.com,Developer,2024-01-01,\n"
+        )
+        with self.assertRaises(BulkImportError) as context:
+            import_org(employees=csv_file(content))
+
+        messages = {
+            (error['line'], error['message'].split(':')[0])
+            for error in context.exception.errors
+        }
+        self.assertIn((1, 'hire_dt'), messages)
+        self.assertIn((2, 'email'), messages)
+        self.assertIn((2, 'manager'), messages)
+        self.assertIn((3, 'username'), messages)
+        self.assertFalse(User.objects.filter(username='first').exists())
+
+    def test_manager_cycle_is_rejected(self):
+        """Тест обнаружения циклов в иерархии с учетом текущих данных"""
+        import_org(employees=csv_file(EMPLOYEES_CSV))
+        content = (
+            "username,email,position,hire_dt,manager\n"
+            "head,head@example.com,Head,2020-01-01,dev\n"
+        )
+        with self.assertRaises(BulkImportError) as context:
+            import_org(employees=csv_file(content))
+
+        self.assertEqual(context.exception.errors[0]['line'], 1)
+        self.assertIn('циклическая', context.exception.errors[0]['message'])
+        self.assertIsNone(self._employee('head').manager)
+
+    def test_import_goals_jsonl(self):
+        """Тест загрузки и обновления целей из JSONL"""
+        goal = {
+            'employee': 'existing',
+            'title': 'Goal',
+            'description': 'Description',
+            'start_period': '2025-01-01',
+            'end_period': '2025-03-31',
+            'status': Goal.STATUS_IN_PROGRESS,
+        }
+        result = import_org(
+            goals=jsonl_file([goal, {**goal, 'title': 'Other'}]),
+            goals_format=FORMAT_JSONL
+        )
+        self.assertEqual(result['goals']['goals_created'], 2)
+
+        result = import_org(
+            goals=jsonl_file([{**goal, 'status': Goal.STATUS_COMPLETED}]),
+            goals_format=FORMAT_JSONL
+        )
+        self.assertEqual(result['goals']['goals_created'], 0)
+        self.assertEqual(result['goals']['goals_updated'], 1)
+        self.assertEqual(
+            Goal.objects.get(title='Goal').status, Goal.STATUS_COMPLETED
+        )
+
+        with self.assertRaises(BulkImportError) as context:
+            import_org(
+                goals=jsonl_file([{
+                    **goal, 'employee': 'nobody', 'end_period': '2024-01-01'
+                }]),
+                goals_format=FORMAT_JSONL
+            )
+        fields = {
+            error['message'].split(':')[0]
+            for error in context.exception.errors
+        }
+        self.assertEqual(fields, {'employee', 'end_period'})
+
+    def test_reimport_keeps_unset_goal_fields(self):
+        """Тест сохранения статуса и текста цели, не заданных в файле"""
+        goal = {
+            'employee': 'existing',
+            'title': 'Goal',
+            'description': 'Description',
+            'expected_results': 'Results',
+            'start_period': '2025-01-01',
+            'end_period': '2025-03-31',
+            'status': Goal.STATUS_IN_PROGRESS,
+        }
+        import_org(goals=jsonl_file([goal]), goals_format=FORMAT_JSONL)
+
+        result = import_org(
+            goals=csv_file(
+                "employee,title,description,expected_results,start_period,"
+                "end_period,status\n"
+                "existing,Goal,,,2025-01-01,2025-06-30,\n"
+            )
+        )
+
+        self.assertEqual(result['goals']['goals_updated'], 1)
+        updated = Goal.objects.get(title='Goal')
+        self.assertEqual(updated.status, Goal.STATUS_IN_PROGRESS)
+        self.assertEqual(updated.description, 'Description')
+        self.assertEqual(updated.expected_results, 'Results')
+        self.assertEqual(updated.end_period, date(2025, 6, 30))
+
+    def test_import_api(self):
+        """Тест загрузки через API"""
+        url = reverse('employee-bulk-import')
+        data = {
+            'employees': SimpleUploadedFile(
+                'employees.csv', EMPLOYEES_CSV.encode('utf-8')
+            ),
+            'goals': SimpleUploadedFile(
+                'goals.jsonl',
+                json.dumps({
+                    'employee': 'dev',
+                    'title': 'Goal',
+                    'start_period': '2025-01-01',
+                    'end_period': '2025-03-31',
+                }).encode('utf-8')
+            ),
+        }
+
+        self.client.force_authenticate(user=self.__class__.existing_user)
+        response = self.client.post(url, data, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.__class__.admin_user)
+        for file in data.values():
+            file.seek(0)
+        response = self.client.post(url, data, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['employees']['users_created'], 3)
+        self.assertEqual(response.data['goals']['goals_created'], 1)
+        self.assertEqual(
+            Goal.objects.get(title='Goal').employee, self._employee('dev')
+        )
+
+        response = self.client.post(url, {
+            'employees': SimpleUploadedFile(
+                'employees.csv', b'username,email\nbad,bad\n'
+            )
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('position', response.data['errors'][0]['message'])
+
+    def test_import_command(self):
+        """Тест загрузки через management-команду"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'employees.csv')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(EMPLOYEES_CSV)
+
+            out = io.StringIO()
+            call_command('import_org', '--employees', path, stdout=out)
+            self.assertIn('users_created=3', out.getvalue())
+
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write('username,email,position,hire_dt\nx,x,,\n')
+            with self.assertRaises(CommandError):
+                call_command(
+                    'import_org', '--employees', path,
+                    stdout=io.StringIO(), stderr=io.StringIO()
+                )
@@ -0,0 +1,184 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts import fragment_cache
+from accounts.fragment_cache import EmployeeFragmentCache, LRUCache
+from accounts.models import User, Employee
+from accounts.serializers import EmployeeSerializer
+from talentum import invalidation
+
+
+class LRUCacheTests(SimpleTestCase):
+    """Тесты LRU-кеша процесса"""
+
+    def test_evicts_least_recently_used(self):
+        """Тест вытеснения давно не читавшихся записей"""
+        evicted = []
+        lru = LRUCache(2, ttl=60, on_evict=lambda key, _: evicted.append(key))
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+
+        self.assertEqual(evicted, ['b'])
+        self.assertEqual(lru.get('a'), 1)
+        self.assertIsNone(lru.get('b'))
+
+    def test_expires_entries(self):
+        """Тест истечения времени жизни записи"""
+        lru = LRUCache(2, ttl=0.01)
+        lru.set('a', 1)
+        time.sleep(0.02)
+        self.assertIsNone(lru.get('a'))
+        self.assertEqual(len(lru), 0)
+
+
+class EmployeeFragmentCacheTests(TransactionTestCase):
+    """Тесты кеша представлений сотрудников с зафиксированными данными"""
+
+    def setUp(self):
+        cache.clear()
+        self.fragments = EmployeeFragmentCache(100, 60, 60)
+        patcher = mock.patch.object(
+            fragment_cache, '_fragments', self.fragments
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        invalidation.subscribe(self.fragments.invalidate)
+        self.addCleanup(invalidation.unsubscribe, self.fragments.invalidate)
+
+        self.manager_user = User.objects.create_user(
+            username='manager', email='manager@example.com',
+            first_name='Manager', last_name='User'
+        )
+        self.manager = Employee.objects.create(
+            user=self.manager_user, hire_dt='2020-01-01', position='Lead'
+        )
+        self.employees = []
+        for i in range(3):
+            user = User.objects.create_user(
+                username=f'employee{i}', email=f'employee{i}@example.com'
+            )
+            self.employees.append(Employee.objects.create(
+                user=user, hire_dt='2021-01-01', position='Developer',
+                manager=self.manager
+            ))
+
+    def serialize(self):
+        return EmployeeSerializer(
+            Employee.objects.filter(manager=self.manager).order_by('id'),
+            many=True
+        ).data
+
+    def test_second_serialization_served_from_cache(self):
+        """Тест: повторная сериализация не обращается к связанным данным"""
+        first = self.serialize()
+
+        # Остается только запрос списка сотрудников
+        with self.assertNumQueries(1):
+            second = self.serialize()
+        self.assertEqual(second, first)
+        self.assertEqual(self.fragments.stats['misses'], 3)
+        self.assertEqual(self.fragments.stats['local_hits'], 3)
+
+    def test_shared_level_used_after_local_miss(self):
+        """Тест: после очистки памяти процесса данные берутся из общего кеша"""
+        first = self.serialize()
+        self.fragments.local.clear()
+
+        self.assertEqual(self.serialize(), first)
+        self.assertEqual(self.fragments.stats['shared_hits'], 3)
+
+    def test_request_host_shares_fragments(self):
+        """Тест: ссылки на фото абсолютные, представление не зависит от хоста"""
+        factory = APIRequestFactory()
+        for host in ('a.example.com', 'b.example.com'):
+            request = Request(factory.get('/', HTTP_HOST=host))
+            EmployeeSerializer(
+                Employee.objects.filter(manager=self.manager).order_by('id'),
+                many=True, context={'request': request}
+            ).data
+
+        self.assertEqual(self.fragments.stats['misses'], 3)
+        self.assertEqual(self.fragments.stats['local_hits'], 3)
+
+    def test_manager_rename_invalidates_subordinates(self):
+        """Тест: переименование руководителя обновляет manager_name"""
+        self.serialize()
+
+        self.manager_user.first_name = 'Renamed'
+        self.manager_user.save()
+
+        names = {item['manager_name'] for item in self.serialize()}
+        self.assertEqual(names, {'Renamed User'})
+
+        # Другой процесс: памяти процесса нет, общий кеш с новой версией
+        self.fragments.local.clear()
+        names = {item['manager_name'] for item in self.serialize()}
+        self.assertEqual(names, {'Renamed User'})
+
+    def test_employee_save_invalidates_fragment(self):
+        """Тест: сохранение сотрудника обновляет его представление"""
+        self.serialize()
+
+        employee = self.employees[0]
+        employee.position = 'Senior Developer'
+        employee.save()
+
+        positions = [item['position'] for item in self.serialize()]
+        self.assertEqual(positions[0], 'Senior Developer')
+
+    def test_other_process_notification_evicts_local_entry(self):
+        """Тест: ключ из шины удаляет зависимые записи памяти процесса"""
+        self.serialize()
+        invalidation.dispatch({f'accounts.user:{self.manager_user.id}'})
+        self.assertEqual(len(self.fragments.local), 0)
+
+    def test_other_process_change_bumps_shared_version(self):
+        """Тест: ключ из шины обновляет и второй уровень этого процесса"""
+        self.serialize()
+        employee = self.employees[0]
+        # Изменение, зафиксированное другим процессом
+        Employee.objects.filter(pk=employee.pk).update(position='Architect')
+
+        invalidation.dispatch({f'accounts.employee:{employee.pk}'})
+        self.fragments.local.clear()
+
+        positions = [item['position'] for item in self.serialize()]
+        self.assertEqual(positions, ['Architect', 'Developer', 'Developer'])
+
+    def test_flush_all_starts_new_generation(self):
+        """Тест: сброс всех кешей после массовой загрузки"""
+        self.serialize()
+        Employee.objects.filter(manager=self.manager).update(
+            position='Analyst'
+        )
+
+        invalidation.dispatch({invalidation.ALL})
+        self.assertEqual(len(self.fragments.local), 0)
+
+        positions = {item['position'] for item in self.serialize()}
+        self.assertEqual(positions, {'Analyst'})
+        self.assertEqual(self.fragments.stats['misses'], 6)
+
+    def test_cache_stats_endpoint(self):
+        """Тест статистики попаданий для администратора"""
+        self.serialize()
+        self.serialize()
+        admin = User.objects.create_user(
+            username='admin', email='admin@example.com', role='admin'
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        response = client.get(reverse('employee-cache-stats'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['local_hit_rate'], 0.5)
@@ -0,0 +1,128 @@
+import threading
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.login_executor import LoginExecutor, LoginExecutorSaturated, \
+    get_login_executor
+from accounts.models import User, Employee
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+class LoginExecutorTests(TestCase):
+    """Тесты ограниченного пула проверки паролей"""
+
+    def test_rejects_when_saturated(self):
+        """Тест немедленного отказа при занятых слотах"""
+        executor = LoginExecutor(workers=1, queue_size=0, timeout=5)
+        self.addCleanup(executor.shutdown)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+            return 'done'
+
+        thread = threading.Thread(target=executor.run, args=(blocking,))
+        thread.start()
+        started.wait(5)
+
+        with self.assertRaises(LoginExecutorSaturated):
+            executor.run(lambda: None)
+
+        release.set()
+        thread.join()
+        self.assertEqual(executor.run(lambda: 'free'), 'free')
+
+    def test_inline_without_workers(self):
+        """Тест выполнения в текущем потоке при workers=0"""
+        executor = LoginExecutor(workers=0, queue_size=0, timeout=5)
+        self.assertEqual(
+            executor.run(threading.get_ident), threading.get_ident()
+        )
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class OffloadedLoginTests(TestCase):
+    """Тесты входа с проверкой пароля в пуле"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создаем данные один раз для всех тестов в классе"""
+        cls.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            first_name='Test',
+            last_name='User',
+            role='employee'
+        )
+        cls.employee = Employee.objects.create(
+            user=cls.user,
+            hire_dt='2021-01-01',
+            position='Developer'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.credentials = {
+            'username': 'employee',
+            'password': 'password123'
+        }
+
+    @override_settings(LOGIN_EXECUTOR_WORKERS=1, LOGIN_EXECUTOR_QUEUE_SIZE=0)
+    def test_token_endpoint_returns_503_when_saturated(self):
+        """Тест ответа 503 при заполненном пуле"""
+        executor = get_login_executor()
+        started, release = threading.Event(), threading.Event()
+        thread = threading.Thread(
+            target=executor.run,
+            args=(lambda: started.set() or release.wait(5),)
+        )
+        thread.start()
+        started.wait(5)
+
+        try:
+            response = self.client.post(
+                reverse('token_obtain_pair'), self.credentials
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+            self.assertEqual(response['Retry-After'], '1')
+        finally:
+            release.set()
+            thread.join()
+
+        response = self.client.post(
+            reverse('token_obtain_pair'), self.credentials
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_async_token_endpoint(self):
+        """Тест асинхронного получения токена"""
+        url = reverse('token_obtain_pair_async')
+
+        response = self.client.post(url, self.credentials, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertIn('access', data)
+        self.assertIn('refresh', data)
+        self.assertEqual(data['user_id'], self.__class__.user.id)
+        self.assertEqual(data['employee_id'], self.__class__.employee.id)
+        self.assertFalse(data['is_manager'])
+
+        response = self.client.post(url, {
+            'username': 'employee',
+            'password': 'wrong'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(url, {
+            'username': 'employee'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', response.json())
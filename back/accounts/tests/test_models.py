@@ -1,7 +1,7 @@
 from django.test import SimpleTestCase, TestCase
 from django.core.files.uploadedfile import SimpleUploadedFile
 
-from accounts.models import User, Employee
+from accounts.models import User, Employee, ProfilePhotoStorage
 
 
 class UserModelSimpleTests(SimpleTestCase):
@@ -101,3 +101,29 @@ class EmployeeModelTests(TestCase):
         # Проверяем, что фото сохранилось
         self.assertTrue(employee.profile_photo)
         self.assertIn('test_image', employee.profile_photo.name)
+
+
+class ProfilePhotoStorageTests(SimpleTestCase):
+    """Тесты формирования URL фото без обращения к хранилищу"""
+
+    def test_public_url_with_custom_domain(self):
+        storage = ProfilePhotoStorage(
+            custom_domain='localhost:9000/talentum',
+            querystring_auth=False
+        )
+        self.assertEqual(
+            storage.public_url('photo 1.png'),
+            'http://localhost:9000/talentum/profile_photos/photo%201.png'
+        )
+
+    def test_public_url_with_endpoint(self):
+        storage = ProfilePhotoStorage(
+            custom_domain=None,
+            endpoint_url='https://s3:9000/',
+            bucket_name='talentum',
+            querystring_auth=False
+        )
+        self.assertEqual(
+            storage.public_url('photo.png'),
+            'http://s3:9000/talentum/profile_photos/photo.png'
+        )
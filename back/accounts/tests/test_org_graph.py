@@ -0,0 +1,170 @@
+import random
+import tempfile
+
+import numpy as np
+from django.test import TestCase, override_settings
+
+from accounts.models import User, Employee
+from accounts.org_graph import ORG_GRAPH_KEY, OrgGraph, OrgGraphStore, \
+    _CommitBump, build_tree, get_org_graph, get_org_graph_store, serialize
+from talentum import invalidation
+
+
+def make_graph(managers):
+    """Снимок по словарю {id: id руководителя или None}"""
+    ids = np.array(sorted(managers), dtype=np.int64)
+    manager_ids = np.array(
+        [-1 if managers[i] is None else managers[i] for i in ids.tolist()],
+        dtype=np.int64
+    )
+    return OrgGraph(serialize(1, build_tree(ids, manager_ids)))
+
+
+def brute_force_subtree(managers, root):
+    result = {root}
+    changed = True
+    while changed:
+        changed = False
+        for employee, manager in managers.items():
+            if manager in result and employee not in result:
+                result.add(employee)
+                changed = True
+    return result
+
+
+class OrgGraphTests(TestCase):
+    """Тесты снимка иерархии"""
+
+    def test_matches_brute_force(self):
+        """Тест поддеревьев и предков на случайном дереве"""
+        rng = random.Random(7)
+        ids = rng.sample(range(1, 500), 200)
+        managers = {ids[0]: None}
+        for i, employee in enumerate(ids[1:], start=1):
+            managers[employee] = (
+                None if rng.random() < 0.05 else rng.choice(ids[:i])
+            )
+        graph = make_graph(managers)
+
+        for root in ids:
+            expected = brute_force_subtree(managers, root)
+            self.assertEqual(set(graph.subtree_ids(root).tolist()), expected)
+            self.assertEqual(graph.has_subordinates(root), len(expected) > 1)
+            for other in rng.sample(ids, 10):
+                self.assertEqual(
+                    graph.is_ancestor(root, other),
+                    other in expected and other != root
+                )
+            self.assertEqual(graph.manager_id(root), managers[root])
+
+    def test_levels_and_unknown_ids(self):
+        """Тест ограничения глубины и неизвестных ID"""
+        graph = make_graph({1: None, 2: 1, 3: 2, 4: 3, 5: 1})
+
+        self.assertEqual(
+            sorted(graph.subtree_ids(1, include_root=False, levels=2)),
+            [2, 3, 5]
+        )
+        self.assertEqual(len(graph.subtree_ids(42)), 0)
+        self.assertFalse(graph.is_ancestor(1, 42))
+        self.assertNotIn(42, graph)
+
+    def test_manager_cycle(self):
+        """Тест: цикл руководителей не зацикливает построение"""
+        graph = make_graph({1: 2, 2: 1, 3: None})
+
+        self.assertEqual(len(graph), 3)
+        self.assertEqual(set(graph.subtree_ids(1).tolist()), {1, 2})
+
+
+class OrgGraphStoreTests(TestCase):
+    """Тесты общего снимка иерархии и его обновления"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создаем данные один раз для всех тестов в классе"""
+        cls.employees = []
+        for i in range(3):
+            user = User.objects.create_user(
+                username=f'user{i}',
+                email=f'user{i}@example.com',
+                password='password123'
+            )
+            cls.employees.append(Employee.objects.create(
+                user=user,
+                hire_dt='2021-01-01',
+                position='Developer',
+                manager=cls.employees[-1] if cls.employees else None
+            ))
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(ORG_GRAPH_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_uncommitted_changes_visible_in_transaction(self):
+        """Тест: изменения текущей транзакции видны без публикации снимка"""
+        top, middle, bottom = self.employees
+        self.assertTrue(get_org_graph().is_ancestor(top.id, bottom.id))
+
+        bottom.manager = None
+        bottom.save()
+
+        graph = get_org_graph()
+        self.assertFalse(graph.is_ancestor(top.id, bottom.id))
+        self.assertEqual(graph.version, -1)
+
+    def test_shared_snapshot_rebuilt_after_commit(self):
+        """Тест: снимок строится один раз и перестраивается после фиксации"""
+        top, middle, bottom = self.employees
+        store = get_org_graph_store()
+        graph = store.get()
+        self.assertTrue(graph.is_ancestor(top.id, bottom.id))
+
+        # Другой процесс находит готовый файл и не обращается к базе
+        other = OrgGraphStore(store.directory, store.name)
+        with self.assertNumQueries(0):
+            self.assertEqual(other.get().version, graph.version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            middle.manager = None
+            middle.save()
+
+        with self.assertNumQueries(1):
+            rebuilt = other.get()
+        self.assertEqual(rebuilt.version, graph.version + 1)
+        self.assertFalse(rebuilt.is_ancestor(top.id, bottom.id))
+        with self.assertNumQueries(0):
+            self.assertEqual(store.get().version, rebuilt.version)
+
+    def test_unchanged_manager_does_not_invalidate(self):
+        """Тест: сохранение без смены руководителя не меняет версию"""
+        store = get_org_graph_store()
+        version = store.get().version
+        get_org_graph()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.employees[1].position = 'Team Lead'
+            self.employees[1].save()
+
+        self.assertFalse(any(
+            isinstance(callback, _CommitBump) for callback in callbacks
+        ))
+        self.assertEqual(store.current_version(), version)
+
+    def test_bus_notification_invalidates_snapshot(self):
+        """Тест: изменение на другой машине приходит через шину инвалидации"""
+        store = get_org_graph_store()
+        version = store.get().version
+
+        invalidation.dispatch({ORG_GRAPH_KEY})
+        self.assertEqual(store.current_version(), version + 1)
+
+        invalidation.dispatch({'accounts.user:1'})
+        self.assertEqual(store.current_version(), version + 1)
+
+        # После переподключения слушателя снимок строится заново
+        invalidation.dispatch(None)
+        self.assertEqual(store.current_version(), version + 2)
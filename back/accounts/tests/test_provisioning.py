@@ -0,0 +1,179 @@
+import csv
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from accounts.provisioning import MIN_PARALLEL_PASSWORDS, hash_passwords
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class HashPasswordsTestCase(TestCase):
+    """Тесты параллельного хеширования паролей"""
+
+    def test_parallel_hashing_keeps_order(self):
+        """Тест сохранения порядка хешей при хешировании в пуле процессов"""
+        passwords = [
+            f'password-{i}' for i in range(MIN_PARALLEL_PASSWORDS * 2)
+        ]
+        hashed = hash_passwords(passwords, workers=2)
+
+        self.assertEqual(len(hashed), len(passwords))
+        for password, encoded in zip(passwords, hashed):
+            self.assertTrue(check_password(password, encoded))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class UserProvisioningAPITestCase(APITestCase):
+    """Тесты массового создания пользователей"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создание данных для всех тестов"""
+        cls.admin_user = User.objects.create_user(
+            username='admin',
+            password='password123',
+            email='admin@example.com',
+            role='admin'
+        )
+        cls.employee_user = User.objects.create_user(
+            username='employee',
+            password='password123',
+            email='employee@example.com',
+            role='employee'
+        )
+
+    def setUp(self):
+        self.url = reverse('user-bulk-provision')
+
+    def _users(self, count, **extra):
+        return [
+            {
+                'username': f'new{i}',
+                'email': f'new{i}@example.com',
+                'first_name': 'New',
+                'last_name': f'User{i}',
+                **extra
+            }
+            for i in range(count)
+        ]
+
+    def test_provision_with_passwords(self):
+        """Тест создания пользователей с паролями"""
+        self.client.force_authenticate(user=self.__class__.admin_user)
+
+        response = self.client.post(self.url, {
+            'users': self._users(3, password='Str0ng-Passw0rd')
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 3)
+        self.assertNotIn('invite_token', response.data['users'][0])
+
+        user = User.objects.get(username='new2')
+        self.assertEqual(user.role, User.ROLE_EMPLOYEE)
+        self.assertTrue(user.check_password('Str0ng-Passw0rd'))
+
+    def test_provision_hashes_in_request_process(self):
+        """Тест хеширования паролей API без пула процессов"""
+        self.client.force_authenticate(user=self.__class__.admin_user)
+
+        with mock.patch('accounts.provisioning.ProcessPoolExecutor') as pool:
+            response = self.client.post(self.url, {
+                'users': self._users(
+                    MIN_PARALLEL_PASSWORDS, password='Str0ng-Passw0rd'
+                )
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        pool.assert_not_called()
+        self.assertTrue(
+            User.objects.get(username='new0').check_password('Str0ng-Passw0rd')
+        )
+
+    def test_provision_with_invites(self):
+        """Тест выдачи приглашений и установки пароля по ним"""
+        self.client.force_authenticate(user=self.__class__.admin_user)
+
+        response = self.client.post(self.url, {
+            'users': self._users(2, password='Str0ng-Passw0rd'),
+            'invite': True
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(username='new0')
+        self.assertFalse(user.has_usable_password())
+
+        invite = response.data['users'][0]
+        self.client.force_authenticate(user=None)
+        accept_url = reverse('user-accept-invite')
+        data = {
+            'uid': invite['invite_uid'],
+            'token': invite['invite_token'],
+            'password': 'N3w-Passw0rd!',
+            'password2': 'N3w-Passw0rd!'
+        }
+        response = self.client.post(accept_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.check_password('N3w-Passw0rd!'))
+
+        response = self.client.post(accept_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_provision_rejects_duplicates(self):
+        """Тест отклонения повторяющихся и занятых username/email"""
+        self.client.force_authenticate(user=self.__class__.admin_user)
+        users = self._users(2)
+        users[1]['username'] = 'new0'
+        users.append({'username': 'other', 'email': 'employee@example.com'})
+
+        response = self.client.post(self.url, {'users': users}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data['users']), 2)
+        self.assertFalse(User.objects.filter(username='new0').exists())
+
+    def test_provision_forbidden_for_employee(self):
+        """Тест запрета массового создания для сотрудника"""
+        self.client.force_authenticate(user=self.__class__.employee_user)
+
+        response = self.client.post(self.url, {
+            'users': self._users(1)
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_provision_command(self):
+        """Тест массового создания через management-команду"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'users.csv')
+            invites_path = os.path.join(directory, 'invites.csv')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(
+                    'username,email,password\n'
+                    'first,first@example.com,Str0ng-Passw0rd\n'
+                    'second,second@example.com,\n'
+                )
+
+            out = io.StringIO()
+            call_command(
+                'provision_users', path,
+                '--invites-output', invites_path,
+                stdout=out
+            )
+            self.assertIn('Created 2 user(s), 1 invite(s)', out.getvalue())
+
+            with open(invites_path, encoding='utf-8') as file:
+                invites = list(csv.DictReader(file))
+        self.assertEqual([row['username'] for row in invites], ['second'])
+        self.assertTrue(
+            User.objects.get(username='first').check_password(
+                'Str0ng-Passw0rd'
+            )
+        )
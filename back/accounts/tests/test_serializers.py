@@ -65,3 +65,62 @@ class EmployeeSerializerTests(TestCase):
         # Проверяем наличие поля profile_photo_url
         self.assertIn('profile_photo_url', serializer.data)
         self.assertIsNotNone(serializer.data['profile_photo_url'])
+
+
+class EmployeeBatchLoadingTests(TestCase):
+    """Тесты пакетной загрузки связанных данных при сериализации списков"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создаем данные один раз для всех тестов в классе"""
+        cls.managers, cls.employees = [], []
+        for i in range(3):
+            manager_user = User.objects.create_user(
+                username=f'manager{i}',
+                email=f'manager{i}@example.com',
+                first_name='Manager',
+                last_name=str(i)
+            )
+            manager = Employee.objects.create(
+                user=manager_user, hire_dt='2020-01-01', position='Lead'
+            )
+            user = User.objects.create_user(
+                username=f'employee{i}', email=f'employee{i}@example.com'
+            )
+            cls.managers.append(manager)
+            cls.employees.append(Employee.objects.create(
+                user=user, hire_dt='2021-01-01', position='Developer',
+                manager=manager
+            ))
+
+    def test_manager_names_loaded_in_one_query(self):
+        """Тест: имена руководителей списка загружаются одним запросом"""
+        employees = Employee.objects.filter(
+            id__in=[employee.id for employee in self.employees]
+        ).select_related('user').order_by('id')
+
+        with self.assertNumQueries(2):
+            data = EmployeeSerializer(employees, many=True).data
+
+        self.assertEqual(
+            [item['manager_name'] for item in data],
+            ['Manager 0', 'Manager 1', 'Manager 2']
+        )
+
+    def test_subordinates_loaded_in_one_query(self):
+        """Тест: подчиненные и признак руководителя - один запрос на список"""
+        managers = Employee.objects.filter(
+            id__in=[manager.id for manager in self.managers]
+        ).select_related('user').order_by('id')
+
+        with self.assertNumQueries(2):
+            data = EmployeeDetailSerializer(managers, many=True).data
+
+        for i, (item, employee) in enumerate(zip(data, self.employees)):
+            self.assertTrue(item['is_manager'])
+            self.assertEqual(
+                [sub['id'] for sub in item['subordinates']], [employee.id]
+            )
+            self.assertEqual(
+                item['subordinates'][0]['manager_name'], f'Manager {i}'
+            )
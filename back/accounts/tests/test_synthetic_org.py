@@ -0,0 +1,129 @@
+import io
+
+import numpy as np
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import F
+from django.test import TestCase
+
+from accounts.models import Employee, User
+from accounts.synthetic_org import SyntheticOrg, build_hierarchy
+from feedback.models import (ExpertEvaluation, FeedbackRequest,
+                             GoalFeedbackStats, PeerFeedback)
+from goals.models import Goal
+
+
+def _snapshot(prefix):
+    """Данные организации без ID: по номеру сотрудника в username."""
+    def number(username):
+        return int(username.rsplit('-', 1)[1])
+
+    employees = sorted(
+        (number(username), manager and number(manager), position)
+        for username, manager, position in Employee.objects.filter(
+            user__username__startswith=f'{prefix}-'
+        ).values_list('user__username', 'manager__user__username',
+                      'position')
+    )
+    goals = sorted(
+        (number(username), title, status, str(start_period))
+        for username, title, status, start_period in Goal.objects.filter(
+            employee__user__username__startswith=f'{prefix}-'
+        ).values_list('employee__user__username', 'title', 'status',
+                      'start_period')
+    )
+    return employees, goals
+
+
+class SyntheticOrgTestCase(TestCase):
+    """Тесты генерации синтетической организации"""
+
+    def test_hierarchy_respects_depth(self):
+        parent, level = build_hierarchy(
+            np.random.default_rng(1), 5000, fan_out=4, depth=5, skew=1.2
+        )
+        self.assertEqual(parent[0], -1)
+        self.assertTrue((parent[1:] >= 0).all())
+        self.assertTrue((parent[1:] < np.arange(1, 5000)).all())
+        self.assertEqual(level.max(), 5)
+        self.assertTrue((level[1:] == level[parent[1:]] + 1).all())
+
+    def test_org_is_consistent(self):
+        counts = SyntheticOrg(
+            employees=300, goals=3000, depth=4, seed=7, prefix='org'
+        ).create()
+
+        self.assertEqual(
+            User.objects.filter(username__startswith='org-').count(), 300
+        )
+        self.assertEqual(Goal.objects.count(), 3000)
+        self.assertEqual(
+            set(Goal.objects.values_list('status', flat=True)),
+            {status for status, _ in Goal.STATUS_CHOICES}
+        )
+        self.assertEqual(PeerFeedback.objects.count(),
+                         counts['peer_feedback'])
+        self.assertEqual(User.objects.get(username='org-0').role,
+                         User.ROLE_ADMIN)
+
+        # Рецензент - коллега владельца цели по команде
+        self.assertFalse(FeedbackRequest.objects.filter(
+            reviewer=F('requested_by')
+        ).exists())
+        self.assertFalse(FeedbackRequest.objects.exclude(
+            reviewer__manager=F('requested_by__manager')
+        ).exists())
+        self.assertFalse(FeedbackRequest.objects.filter(
+            feedback__isnull=False, status=FeedbackRequest.STATUS_PENDING
+        ).exists())
+        self.assertFalse(ExpertEvaluation.objects.exclude(
+            expert__user__role=User.ROLE_EXPERTISE_LEADER
+        ).exists())
+        self.assertFalse(ExpertEvaluation.objects.exclude(
+            goal__status=Goal.STATUS_COMPLETED
+        ).exists())
+
+        # Агрегаты совпадают с полным пересчетом
+        fields = ['goal_id', 'requests_count', 'pending_requests_count',
+                  'peer_feedback_count', 'peer_rating_sum',
+                  'peer_rating_mean', 'self_rating', 'final_rating']
+        seeded = list(
+            GoalFeedbackStats.objects.order_by('goal_id').values(*fields)
+        )
+        self.assertEqual(len(seeded), counts['goal_feedback_stats'])
+        GoalFeedbackStats.objects.rebuild(
+            goal_ids=[row['goal_id'] for row in seeded]
+        )
+        self.assertEqual(
+            list(GoalFeedbackStats.objects.order_by('goal_id')
+                 .values(*fields)),
+            seeded
+        )
+
+        # Новые объекты получают ID после загруженных
+        user = User.objects.create_user(
+            username='after', email='after@example.com', password='x'
+        )
+        self.assertGreater(user.pk, User.objects.exclude(pk=user.pk)
+                           .order_by('-pk').values_list('pk', flat=True)[0])
+
+    def test_same_seed_gives_same_org(self):
+        options = {'employees': 200, 'goals': 1000, 'seed': 3}
+        SyntheticOrg(prefix='first', **options).create()
+        SyntheticOrg(prefix='second', **options).create()
+        SyntheticOrg(prefix='other', **{**options, 'seed': 4}).create()
+
+        self.assertEqual(_snapshot('first'), _snapshot('second'))
+        self.assertNotEqual(_snapshot('first'), _snapshot('other'))
+
+    def test_command(self):
+        output = io.StringIO()
+        call_command('seed_org', employees=50, depth=3, password='secret',
+                     stdout=output)
+        self.assertIn('goals: 500', output.getvalue())
+        self.assertTrue(
+            User.objects.get(username='synthetic-1').check_password('secret')
+        )
+
+        with self.assertRaises(CommandError):
+            call_command('seed_org', employees=50, stdout=io.StringIO())
@@ -0,0 +1,168 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User, RevokedToken
+from accounts.revocation import BloomFilter, get_revocation_filter, \
+    is_token_revoked, purge_expired, revoke_token, user_key
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+class BloomFilterTests(TestCase):
+    """Тесты фильтра Блума"""
+
+    def test_no_false_negatives(self):
+        """Тест отсутствия ложноотрицательных ответов"""
+        bloom = BloomFilter(1000)
+        keys = [f'jti-{i}' for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(
+            f'other-{i}' in bloom for i in range(10000)
+        )
+        self.assertLess(false_positives, 300)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class TokenRevocationTests(TestCase):
+    """Тесты отзыва refresh-токенов"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создаем данные один раз для всех тестов в классе"""
+        cls.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='password123',
+            role='admin'
+        )
+        cls.user = User.objects.create_user(
+            username='employee',
+            email='employee@example.com',
+            password='password123',
+            role='employee'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.refresh_url = reverse('token_refresh')
+        self.logout_url = reverse('token_revoke')
+        get_revocation_filter().rebuild()
+
+    def refresh(self, token):
+        return self.client.post(
+            self.refresh_url, {'refresh': str(token)}, format='json'
+        )
+
+    def test_logout_revokes_only_given_token(self):
+        """Тест выхода: отзывается только переданный токен"""
+        revoked = RefreshToken.for_user(self.user)
+        other = RefreshToken.for_user(self.user)
+
+        response = self.client.post(
+            self.logout_url, {'refresh': str(revoked)}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(
+            self.refresh(revoked).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        self.assertEqual(self.refresh(other).status_code, status.HTTP_200_OK)
+
+    def test_refresh_of_valid_token_skips_revocation_table(self):
+        """Тест: неотозванный токен проверяется без запроса к базе"""
+        token = RefreshToken.for_user(self.user)
+
+        # Единственный запрос - проверка активности пользователя
+        with self.assertNumQueries(1):
+            response = self.refresh(token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_logout_with_invalid_token(self):
+        """Тест выхода с некорректным токеном"""
+        response = self.client.post(
+            self.logout_url, {'refresh': 'invalid'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_deactivate_revokes_all_user_tokens(self):
+        """Тест блокировки пользователя с отзывом всех его токенов"""
+        token = RefreshToken.for_user(self.user)
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.post(
+            reverse('user-deactivate', args=[self.user.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['is_active'])
+
+        # После повторной активации старый токен остается отозванным
+        self.user.is_active = True
+        self.user.save(update_fields=['is_active'])
+        self.client.force_authenticate(user=None)
+        self.assertEqual(
+            self.refresh(token).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        self.assertTrue(is_token_revoked(token))
+
+    def test_deactivate_requires_admin(self):
+        """Тест блокировки пользователя без прав администратора"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse('user-deactivate', args=[self.admin_user.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_revocation_from_other_process_visible_after_sync(self):
+        """Тест: запись, добавленная в обход фильтра, видна после синхронизации"""
+        token = RefreshToken.for_user(self.user)
+        revocation_filter = get_revocation_filter()
+        RevokedToken.objects.create(
+            key=token['jti'], user=self.user,
+            expires_at='2100-01-01T00:00:00Z'
+        )
+        self.assertFalse(is_token_revoked(token))
+
+        revocation_filter.sync()
+        self.assertTrue(is_token_revoked(token))
+
+    def test_repeated_user_revocation_visible_after_sync(self):
+        """Тест: повторный отзыв токенов пользователя виден после синхронизации"""
+        token = RefreshToken.for_user(self.user)
+        RevokedToken.objects.create(
+            key=user_key(self.user.pk), user=self.user,
+            revoked_dttm='2000-01-01T00:00:00Z',
+            expires_at='2000-01-02T00:00:00Z'
+        )
+        RevokedToken.objects.create(
+            key='later', expires_at='2100-01-01T00:00:00Z'
+        )
+        revocation_filter = get_revocation_filter()
+        revocation_filter.rebuild()
+
+        # Запись обновляется в обход фильтра и сохраняет свой id
+        RevokedToken.objects.filter(key=user_key(self.user.pk)).update(
+            revoked_dttm=timezone.now(),
+            expires_at='2100-01-01T00:00:00Z'
+        )
+        self.assertFalse(is_token_revoked(token))
+
+        revocation_filter.sync()
+        self.assertTrue(is_token_revoked(token))
+
+    def test_purge_expired(self):
+        """Тест удаления истекших записей"""
+        token = RefreshToken.for_user(self.user)
+        revoke_token(token)
+        RevokedToken.objects.create(
+            key='expired', expires_at='2000-01-01T00:00:00Z'
+        )
+
+        self.assertEqual(purge_expired(), 1)
+        self.assertTrue(RevokedToken.objects.filter(key=token['jti']).exists())
@@ -2,7 +2,8 @@ from django.urls import path
 from rest_framework.routers import DefaultRouter
 
 from accounts.views import UserViewSet, EmployeeViewSet, \
-    CustomTokenObtainPairView, CustomTokenRefreshView
+    CustomTokenObtainPairView, CustomTokenRefreshView, \
+    AsyncTokenObtainPairView, LogoutView
 
 auth_router = DefaultRouter()
 
@@ -16,9 +17,19 @@ urlpatterns = [
         CustomTokenObtainPairView.as_view(),
         name='token_obtain_pair'
     ),
+    path(
+        'token/async/',
+        AsyncTokenObtainPairView.as_view(),
+        name='token_obtain_pair_async'
+    ),
     path(
         'token/refresh/',
         CustomTokenRefreshView.as_view(),
         name='token_refresh'
     ),
+    path(
+        'logout/',
+        LogoutView.as_view(),
+        name='token_revoke'
+    ),
 ]
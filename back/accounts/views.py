@@ -1,34 +1,154 @@
-from django.contrib.auth import get_user_model
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import aauthenticate, get_user_model
 from django.db.models import Q
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, OpenApiParameter, \
     extend_schema_view
 from rest_framework import viewsets, filters, status, parsers
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import APIException
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView, \
     TokenRefreshView
 
+from accounts.bulk_import import BulkImportError, detect_format, import_org
+from accounts.fragment_cache import get_employee_fragments
+from accounts.hierarchy import ids_sql
+from accounts.login_executor import LoginExecutorSaturated
 from accounts.models import Employee
+from accounts.org_graph import get_org_graph
+from accounts.provisioning import provision_users
+from accounts.revocation import revoke_token, revoke_user_tokens
 from accounts.permissions import IsAdminOrSelf, IsAdminOnly, \
     IsEmployeeOwnerOrAdmin
 from accounts.serializers import CustomTokenObtainPairSerializer, \
     UserSerializer, UserCreateSerializer, UserDetailSerializer, \
     EmployeeSerializer, EmployeeDetailSerializer, \
-    EmployeeCreateUpdateSerializer, EmployeePhotoUploadSerializer
+    EmployeeCreateUpdateSerializer, EmployeePhotoUploadSerializer, \
+    EmployeeImportSerializer, UserBulkProvisionSerializer, \
+    UserInviteAcceptSerializer, CustomTokenRefreshSerializer, \
+    TokenRevokeSerializer
+from talentum.metrics import SerializerMetricsMixin
 
 User = get_user_model()
 
 
+class LoginUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Сервис входа перегружен, повторите попытку позже'
+    default_code = 'login_unavailable'
+    wait = 1
+
+
 @extend_schema(tags=['auth'])
 class CustomTokenObtainPairView(TokenObtainPairView):
+    """
+    Проверка пароля выполняется в ограниченном пуле
+    (accounts.login_executor); при его заполнении запрос сразу
+    получает 503 с заголовком Retry-After.
+    """
     serializer_class = CustomTokenObtainPairSerializer
 
+    def post(self, request, *args, **kwargs):
+        try:
+            return super().post(request, *args, **kwargs)
+        except LoginExecutorSaturated:
+            raise LoginUnavailable()
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncTokenObtainPairView(View):
+    """
+    Асинхронный аналог CustomTokenObtainPairView для ASGI: пароль
+    проверяется в пуле без блокировки цикла событий, ответ совпадает
+    с синхронной версией.
+    """
+    http_method_names = ['post', 'options']
+
+    async def post(self, request, *args, **kwargs):
+        try:
+            payload = json.loads(request.body or b'{}')
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            return JsonResponse(
+                {'detail': 'Некорректный JSON'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        errors = {
+            field: ['Обязательное поле.']
+            for field in [User.USERNAME_FIELD, 'password']
+            if not payload.get(field)
+        }
+        if errors:
+            return JsonResponse(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            user = await aauthenticate(
+                request,
+                username=payload[User.USERNAME_FIELD],
+                password=payload['password']
+            )
+        except LoginExecutorSaturated:
+            response = JsonResponse(
+                {'detail': LoginUnavailable.default_detail},
+                status=LoginUnavailable.status_code
+            )
+            response['Retry-After'] = str(LoginUnavailable.wait)
+            return response
+
+        if user is None:
+            return JsonResponse(
+                {
+                    'detail': TokenObtainPairSerializer.default_error_messages[
+                        'no_active_account'
+                    ]
+                },
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        claims = await sync_to_async(
+            CustomTokenObtainPairSerializer.get_claims
+        )(user)
+        refresh = CustomTokenObtainPairSerializer.get_token(user, claims)
+        return JsonResponse({
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            **claims
+        })
+
 
 @extend_schema(tags=['auth'])
 class CustomTokenRefreshView(TokenRefreshView):
-    pass
+    serializer_class = CustomTokenRefreshSerializer
+
+
+@extend_schema(
+    tags=['auth'],
+    request=TokenRevokeSerializer,
+    responses={204: None},
+    description="Выход: отзыв переданного refresh-токена"
+)
+class LogoutView(GenericAPIView):
+    serializer_class = TokenRevokeSerializer
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        revoke_token(serializer.validated_data['refresh'])
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 @extend_schema_view(
@@ -57,7 +177,7 @@ class CustomTokenRefreshView(TokenRefreshView):
         tags=['users']
     ),
 )
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SerializerMetricsMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
@@ -65,12 +185,15 @@ class UserViewSet(viewsets.ModelViewSet):
     filterset_fields = ['role', 'is_active']
 
     def get_permissions(self):
-        if self.action in ['list', 'create', 'destroy', 'search']:
+        if self.action in ['list', 'create', 'destroy', 'search',
+                           'bulk_provision', 'deactivate']:
             permission_classes = [IsAdminOnly]
         elif self.action in ['update', 'partial_update', 'retrieve']:
             permission_classes = [IsAdminOrSelf]
         elif self.action == 'me':
             permission_classes = [IsAuthenticated]
+        elif self.action == 'accept_invite':
+            permission_classes = [AllowAny]
         else:
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
@@ -80,6 +203,10 @@ class UserViewSet(viewsets.ModelViewSet):
             return UserCreateSerializer
         elif self.action == 'retrieve' or self.action == 'me':
             return UserDetailSerializer
+        elif self.action == 'bulk_provision':
+            return UserBulkProvisionSerializer
+        elif self.action == 'accept_invite':
+            return UserInviteAcceptSerializer
         return UserSerializer
 
     def create(self, request, *args, **kwargs):
@@ -129,6 +256,60 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = UserDetailSerializer(request.user)
         return Response(serializer.data)
 
+    @extend_schema(
+        tags=['users'],
+        description="Массовое создание пользователей. При invite=true "
+                    "или без пароля выдается токен приглашения"
+    )
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_provision(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Пароли хешируются в процессе воркера: пул процессов внутри
+        # многопоточного веб-сервера не запускается. Параллельное
+        # хеширование - команда provision_users.
+        provisioned = provision_users(
+            serializer.validated_data['users'],
+            invite=serializer.validated_data['invite'],
+            workers=1
+        )
+        users = []
+        for user, invite in provisioned:
+            data = UserSerializer(user).data
+            if invite:
+                data['invite_uid'], data['invite_token'] = invite
+            users.append(data)
+        return Response(
+            {'created': len(users), 'users': users},
+            status=status.HTTP_201_CREATED
+        )
+
+    @extend_schema(
+        tags=['users'],
+        description="Установка пароля по токену приглашения"
+    )
+    @action(detail=False, methods=['post'], url_path='accept-invite')
+    def accept_invite(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.save()
+        return Response(UserDetailSerializer(user).data)
+
+    @extend_schema(
+        tags=['users'],
+        request=None,
+        description="Блокировка пользователя с отзывом всех выданных "
+                    "ему refresh-токенов"
+    )
+    @action(detail=True, methods=['post'])
+    def deactivate(self, request, pk=None):
+        user = self.get_object()
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        revoke_user_tokens(user)
+        return Response(UserDetailSerializer(user).data)
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -156,7 +337,7 @@ class UserViewSet(viewsets.ModelViewSet):
         description="Удаление профиля сотрудника из системы"
     ),
 )
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(SerializerMetricsMixin, viewsets.ModelViewSet):
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
@@ -164,9 +345,20 @@ class EmployeeViewSet(viewsets.ModelViewSet):
                      'user__last_name', 'position']
     filterset_fields = ['position', 'manager']
     parser_classes = [parsers.MultiPartParser, parsers.FormParser]
+    query_budgets = {
+        'list': 8,
+        'retrieve': 6,
+        'my_profile': 4,
+        'my_team': 5,
+        'create': 8,
+        'update': 6,
+        'partial_update': 6,
+        'destroy': 12,
+        'upload_photo': 8,
+    }
 
     def get_permissions(self):
-        if self.action in ['create', 'destroy']:
+        if self.action in ['create', 'destroy', 'bulk_import', 'cache_stats']:
             permission_classes = [IsAdminOnly]
         elif self.action in ['update', 'partial_update', 'upload_photo']:
             permission_classes = [IsEmployeeOwnerOrAdmin]
@@ -181,6 +373,8 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             return EmployeeCreateUpdateSerializer
         elif self.action == 'upload_photo':
             return EmployeePhotoUploadSerializer
+        elif self.action == 'bulk_import':
+            return EmployeeImportSerializer
         return EmployeeSerializer
 
     @extend_schema(
@@ -218,30 +412,22 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 
             levels = request.query_params.get('levels', None)
 
-            direct_subordinates = employee.subordinates.all()
+            direct_subordinates = employee.subordinates.select_related(
+                'user', 'manager__user'
+            )
 
             if not levels or int(levels) <= 1:
                 serializer = EmployeeSerializer(direct_subordinates, many=True)
                 return Response(serializer.data)
 
-            all_subordinates = list(direct_subordinates)
-            current_level = list(direct_subordinates)
-            current_level_number = 1
-            max_levels = int(levels)
-
-            while current_level and current_level_number < max_levels:
-                next_level = []
-                for sub in current_level:
-                    next_level.extend(sub.subordinates.all())
-
-                all_subordinates.extend(next_level)
-                current_level = next_level
-                current_level_number += 1
-
-            unique_subordinates = list(
-                {sub.id: sub for sub in all_subordinates}.values())
+            subordinate_ids = get_org_graph().subtree_ids(
+                employee.id, include_root=False, levels=int(levels)
+            )
+            all_subordinates = Employee.objects.filter(
+                id__in=ids_sql(subordinate_ids.tolist())
+            ).select_related('user', 'manager__user')
 
-            serializer = EmployeeSerializer(unique_subordinates, many=True)
+            serializer = EmployeeSerializer(all_subordinates, many=True)
             return Response(serializer.data)
 
         except Employee.DoesNotExist:
@@ -288,3 +474,53 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             )
             
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @extend_schema(
+        tags=['employees'],
+        description="Массовая загрузка пользователей, сотрудников и целей "
+                    "из CSV или JSONL. Руководители и владельцы целей "
+                    "указываются по username. Данные проверяются целиком: "
+                    "при любой ошибке ничего не сохраняется",
+        request={
+            'multipart/form-data': {
+                'type': 'object',
+                'properties': {
+                    'employees': {'type': 'string', 'format': 'binary'},
+                    'goals': {'type': 'string', 'format': 'binary'}
+                }
+            }
+        },
+        responses={
+            200: {"description": "Количество созданных и обновленных записей"},
+            400: {"description": "Ошибки проверки по строкам файлов"}
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='import')
+    def bulk_import(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        files = {}
+        try:
+            for name in ['employees', 'goals']:
+                uploaded = serializer.validated_data.get(name)
+                if uploaded:
+                    files[name] = uploaded.file
+                    files[f'{name}_format'] = detect_format(uploaded.name)
+            result = import_org(**files)
+        except BulkImportError as error:
+            return Response(
+                {'errors': error.errors, 'errors_count': error.total},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(result, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        tags=['employees'],
+        description="Статистика кеша представлений сотрудников в текущем "
+                    "процессе: попадания в память процесса и в общий кеш, "
+                    "промахи и их доли"
+    )
+    @action(detail=False, methods=['get'], url_path='cache-stats')
+    def cache_stats(self, request):
+        return Response(get_employee_fragments().hit_rates())
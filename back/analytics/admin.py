@@ -0,0 +1,31 @@
+from django.contrib import admin
+
+from .models import ReviewerCalibration, NormalizedPeerRating
+
+
+@admin.register(ReviewerCalibration)
+class ReviewerCalibrationAdmin(admin.ModelAdmin):
+    list_display = (
+        'reviewer',
+        'feedback_count',
+        'rating_mean',
+        'rating_std',
+        'updated_dttm'
+    )
+    search_fields = (
+        'reviewer__user__first_name',
+        'reviewer__user__last_name'
+    )
+    raw_id_fields = ('reviewer',)
+
+
+@admin.register(NormalizedPeerRating)
+class NormalizedPeerRatingAdmin(admin.ModelAdmin):
+    list_display = (
+        'feedback',
+        'reviewer',
+        'z_score',
+        'calibrated_rating',
+        'updated_dttm'
+    )
+    raw_id_fields = ('feedback', 'reviewer')
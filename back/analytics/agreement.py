@@ -0,0 +1,131 @@
+import numpy as np
+
+from .stats import group_median
+
+MIN_CO_REVIEWERS = 3
+MIN_OUTLIER_SAMPLE = 5
+MIN_MEAN_DEVIATION = 1.5
+MIN_T_STATISTIC = 2.0
+
+
+def agreement_stats(unit, values, unit_group, n_groups):
+    """
+    Согласованность оценок по группам целей.
+
+    Оценки передаются в разреженном виде (цель, оценка): unit - индекс
+    цели для каждой оценки, unit_group - группа для каждой цели.
+    Учитываются только цели с двумя и более оценками.
+    Возвращает словарь массивов длины n_groups: units, ratings,
+    alpha (альфа Криппендорфа, интервальная метрика) и icc (ICC(1)).
+    """
+    unit = np.asarray(unit, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    unit_group = np.asarray(unit_group, dtype=np.int64)
+    n_units = len(unit_group)
+
+    m = np.bincount(unit, minlength=n_units).astype(np.float64)
+    sums = np.bincount(unit, weights=values, minlength=n_units)
+    squares = np.bincount(unit, weights=values * values, minlength=n_units)
+
+    pairable = m >= 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        unit_ss = np.where(pairable, squares - sums * sums / m, 0.0)
+        unit_disagreement = np.where(
+            pairable, 2 * m * unit_ss / (m - 1), 0.0
+        )
+
+    keep = pairable[unit]
+    value_group = unit_group[unit[keep]]
+    kept_values = values[keep]
+
+    n = np.bincount(value_group, minlength=n_groups).astype(np.float64)
+    group_sums = np.bincount(
+        value_group, weights=kept_values, minlength=n_groups
+    )
+    group_squares = np.bincount(
+        value_group, weights=kept_values * kept_values, minlength=n_groups
+    )
+    pairable_group = unit_group[pairable]
+    k = np.bincount(pairable_group, minlength=n_groups).astype(np.float64)
+    within_ss = np.bincount(
+        pairable_group, weights=unit_ss[pairable], minlength=n_groups
+    )
+    observed = np.bincount(
+        pairable_group, weights=unit_disagreement[pairable],
+        minlength=n_groups
+    )
+    size_squares = np.bincount(
+        pairable_group, weights=m[pairable] ** 2, minlength=n_groups
+    )
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total_ss = group_squares - group_sums * group_sums / n
+        disagreement_observed = observed / n
+        disagreement_expected = 2 * total_ss / (n - 1)
+        alpha = 1 - disagreement_observed / disagreement_expected
+
+        between_ss = total_ss - within_ss
+        ms_between = between_ss / (k - 1)
+        ms_within = within_ss / (n - k)
+        n0 = (n - size_squares / n) / (k - 1)
+        icc = (ms_between - ms_within) / (ms_between + (n0 - 1) * ms_within)
+
+    alpha[~np.isfinite(alpha)] = np.nan
+    icc[~np.isfinite(icc)] = np.nan
+    return {
+        'units': k.astype(np.int64),
+        'ratings': n.astype(np.int64),
+        'alpha': alpha,
+        'icc': icc,
+    }
+
+
+def reviewer_deviations(unit, reviewer, values, n_units, n_reviewers):
+    """
+    Систематическое отклонение рецензентов от консенсуса по цели.
+
+    Для каждой оценки считается разница с медианой оценок цели;
+    медиана устойчива к одному выбивающемуся рецензенту. Учитываются
+    цели, где не меньше MIN_CO_REVIEWERS оценок. Возвращает
+    по рецензентам count, mean, std, t-статистику и признак выброса.
+    """
+    unit = np.asarray(unit, dtype=np.int64)
+    reviewer = np.asarray(reviewer, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+
+    m = np.bincount(unit, minlength=n_units)
+    keep = m[unit] >= MIN_CO_REVIEWERS
+    unit = unit[keep]
+    reviewer = reviewer[keep]
+    values = values[keep]
+    deviation = values - group_median(values, unit, n_units)[unit]
+
+    count = np.bincount(reviewer, minlength=n_reviewers)
+    deviation_sum = np.bincount(
+        reviewer, weights=deviation, minlength=n_reviewers
+    )
+    deviation_squares = np.bincount(
+        reviewer, weights=deviation * deviation, minlength=n_reviewers
+    )
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = deviation_sum / count
+        variance = (deviation_squares - count * mean * mean) / (count - 1)
+        std = np.sqrt(np.maximum(variance, 0.0))
+        t_statistic = mean / (std / np.sqrt(count))
+        t_statistic = np.where(
+            (std == 0) & (mean != 0), np.sign(mean) * np.inf, t_statistic
+        )
+
+    outlier = (
+        (count >= MIN_OUTLIER_SAMPLE)
+        & (np.abs(mean) >= MIN_MEAN_DEVIATION)
+        & (np.abs(np.nan_to_num(t_statistic)) >= MIN_T_STATISTIC)
+    )
+    return {
+        'count': count,
+        'mean': mean,
+        'std': std,
+        't_statistic': t_statistic,
+        'outlier': outlier,
+    }
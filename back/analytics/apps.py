@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class AnalyticsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'analytics'
+    verbose_name = _('Аналитика')
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from analytics.calibration import feedback_changed
+        from feedback.models import PeerFeedback
+
+        post_save.connect(feedback_changed, sender=PeerFeedback)
+        post_delete.connect(feedback_changed, sender=PeerFeedback)
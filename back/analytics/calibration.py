@@ -0,0 +1,203 @@
+import numpy as np
+from django.db import transaction
+from django.db.models import Avg, StdDev
+from django.utils import timezone
+
+from feedback.models import PeerFeedback
+from .dataset import fetch_columns
+from .models import ReviewerCalibration, NormalizedPeerRating, \
+    PendingCalibration
+
+MIN_REVIEWER_SAMPLE = 3
+RATING_MIN = 1
+RATING_MAX = 10
+BATCH_SIZE = 5000
+# Изменение общих среднего и отклонения, после которого пересчитываются
+# все рецензенты: от них зависят откалиброванные оценки всех отзывов
+GLOBAL_STATS_TOLERANCE = 0.01
+
+
+def calibrate(ratings, reviewer_codes, n_reviewers, global_mean, global_std,
+              min_sample=MIN_REVIEWER_SAMPLE):
+    """
+    Векторизованная z-нормализация оценок относительно истории рецензента.
+
+    Для рецензентов с числом отзывов меньше min_sample используются
+    общие среднее и отклонение. Откалиброванная оценка переводит z-оценку
+    на общую шкалу: global_mean + z * global_std, ограниченную 1..10.
+    Возвращает (count, mean, std) по рецензентам и (z, calibrated)
+    по каждой оценке.
+    """
+    ratings = np.asarray(ratings, dtype=np.float64)
+    reviewer_codes = np.asarray(reviewer_codes, dtype=np.int64)
+
+    count = np.bincount(reviewer_codes, minlength=n_reviewers)
+    sums = np.bincount(reviewer_codes, weights=ratings, minlength=n_reviewers)
+    squares = np.bincount(
+        reviewer_codes, weights=ratings * ratings, minlength=n_reviewers
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / count
+        std = np.sqrt(np.maximum(squares / count - mean * mean, 0.0))
+
+    reliable = count >= min_sample
+    center = np.where(reliable, mean, global_mean)
+    scale = np.where(reliable & (std > 0), std, global_std)
+    if global_std <= 0:
+        scale = np.where(scale > 0, scale, 1.0)
+
+    z = (ratings - center[reviewer_codes]) / scale[reviewer_codes]
+    calibrated = np.clip(
+        global_mean + z * global_std, RATING_MIN, RATING_MAX
+    )
+    return (count, mean, std), (z, calibrated)
+
+
+def mark_reviewers(reviewer_ids):
+    """
+    Отмечает рецензентов для пересчета. Существующая отметка
+    обновляется, а не пропускается: блокировка строки не дает пересчету
+    снять ее до фиксации изменения.
+    """
+    now = timezone.now()
+    PendingCalibration.objects.bulk_create(
+        [
+            PendingCalibration(reviewer_id=reviewer_id, updated_dttm=now)
+            for reviewer_id in reviewer_ids
+        ],
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['reviewer'],
+        update_fields=['updated_dttm']
+    )
+
+
+def feedback_changed(sender, instance, **kwargs):
+    """Сигнал сохранения и удаления PeerFeedback."""
+    mark_reviewers([instance.feedback_request.reviewer_id])
+
+
+def _take_pending_reviewer_ids():
+    """Снимает отметки рецензентов; возвращает ID снятых."""
+    reviewer_ids = set(
+        PendingCalibration.objects.values_list('reviewer_id', flat=True)
+    )
+    PendingCalibration.objects.filter(reviewer_id__in=reviewer_ids).delete()
+    return reviewer_ids
+
+
+def run_calibration(full=False):
+    """
+    Пересчитывает калибровку отмеченных рецензентов (отзывы добавлены,
+    изменены или удалены). Все рецензенты пересчитываются при full=True
+    и если общие среднее или отклонение отличаются от использованных
+    при расчете больше чем на GLOBAL_STATS_TOLERANCE.
+    Возвращает (рецензентов, отзывов).
+    """
+    with transaction.atomic():
+        # Отметки снимаются до чтения отзывов: изменение, отметившее
+        # рецензента позже, будет учтено следующим пересчетом
+        reviewer_ids = _take_pending_reviewer_ids()
+
+        totals = PeerFeedback.objects.aggregate(
+            mean=Avg('rating'),
+            std=StdDev('rating')
+        )
+        if totals['mean'] is None:
+            ReviewerCalibration.objects.all().delete()
+            return 0, 0
+        global_mean = float(totals['mean'])
+        global_std = float(totals['std'])
+
+        full = full or ReviewerCalibration.objects.exclude(
+            global_mean__range=(global_mean - GLOBAL_STATS_TOLERANCE,
+                                global_mean + GLOBAL_STATS_TOLERANCE),
+            global_std__range=(global_std - GLOBAL_STATS_TOLERANCE,
+                               global_std + GLOBAL_STATS_TOLERANCE)
+        ).exists()
+
+        feedback = PeerFeedback.objects.all()
+        # Калибровки рецензентов, у которых не осталось отзывов
+        removed = ReviewerCalibration.objects.exclude(
+            reviewer_id__in=feedback.values('feedback_request__reviewer_id')
+        )
+        if not full:
+            if not reviewer_ids:
+                return 0, 0
+            feedback = feedback.filter(
+                feedback_request__reviewer_id__in=reviewer_ids
+            )
+            removed = removed.filter(reviewer_id__in=reviewer_ids)
+        removed.delete()
+
+        feedback_ids, feedback_reviewer_ids, ratings = fetch_columns(
+            feedback, ['id', 'feedback_request__reviewer_id', 'rating']
+        )
+        if not len(feedback_ids):
+            return 0, 0
+        return _store_calibration(
+            feedback_ids, feedback_reviewer_ids, ratings,
+            global_mean, global_std
+        )
+
+
+def _store_calibration(feedback_ids, reviewer_ids, ratings, global_mean,
+                       global_std):
+    """Рассчитывает и сохраняет калибровку по отзывам рецензентов."""
+    unique_reviewers, reviewer_codes = np.unique(
+        reviewer_ids, return_inverse=True
+    )
+    (count, mean, std), (z, calibrated) = calibrate(
+        ratings, reviewer_codes, len(unique_reviewers),
+        global_mean, global_std
+    )
+
+    now = timezone.now()
+    ReviewerCalibration.objects.bulk_create(
+        [
+            ReviewerCalibration(
+                reviewer_id=int(reviewer_id),
+                feedback_count=int(count[i]),
+                rating_mean=float(mean[i]),
+                rating_std=float(std[i]),
+                global_mean=global_mean,
+                global_std=global_std,
+                updated_dttm=now,
+            )
+            for i, reviewer_id in enumerate(unique_reviewers)
+        ],
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['reviewer'],
+        update_fields=[
+            'feedback_count', 'rating_mean', 'rating_std',
+            'global_mean', 'global_std', 'updated_dttm'
+        ]
+    )
+    for start in range(0, len(feedback_ids), BATCH_SIZE):
+        stop = start + BATCH_SIZE
+        NormalizedPeerRating.objects.bulk_create(
+            [
+                NormalizedPeerRating(
+                    feedback_id=feedback_id,
+                    reviewer_id=reviewer_id,
+                    z_score=z_score,
+                    calibrated_rating=calibrated_rating,
+                    updated_dttm=now,
+                )
+                for feedback_id, reviewer_id, z_score, calibrated_rating
+                in zip(
+                    feedback_ids[start:stop].tolist(),
+                    reviewer_ids[start:stop].tolist(),
+                    z[start:stop].tolist(),
+                    calibrated[start:stop].tolist(),
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=['feedback'],
+            update_fields=[
+                'reviewer', 'z_score', 'calibrated_rating', 'updated_dttm'
+            ]
+        )
+
+    return len(unique_reviewers), len(feedback_ids)
@@ -0,0 +1,304 @@
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.db.models import F
+from django.utils import timezone
+
+from feedback.models import SelfAssessment, FeedbackRequest, PeerFeedback, \
+    ExpertEvaluation
+from goals.models import Goal, Progress
+
+CHUNK_SIZE = 10000
+STATE_FILE = '_export_state.json'
+TIMESTAMP = pa.timestamp('us', tz='UTC')
+# Отметка времени строки ставится до фиксации транзакции: строки,
+# зафиксированные позже предыдущего запуска, но с более ранней
+# отметкой, выгружаются повторным просмотром этого окна
+OVERLAP = timedelta(minutes=5)
+
+
+class ExportTable:
+    """
+    Описание выгружаемой таблицы: queryset, колонки со схемой Arrow,
+    поле отметки времени для инкрементальной выгрузки и путь к началу
+    периода цели, по которому файлы разбиваются на партиции.
+    """
+
+    def __init__(self, name, queryset, columns, timestamp_field,
+                 period_field):
+        self.name = name
+        self.queryset = queryset
+        self.columns = columns
+        self.timestamp_field = timestamp_field
+        self.period_field = period_field
+
+    @property
+    def schema(self):
+        return pa.schema([
+            (column, type_) for column, type_, _ in self.columns
+        ])
+
+    def rows(self, since=None, until=None, chunk_size=CHUNK_SIZE):
+        """
+        Кортежи (период, значения колонок...) упорядочены по периоду,
+        чтобы в каждый момент была открыта только одна партиция.
+        """
+        queryset = self.queryset.all()
+        if since:
+            queryset = queryset.filter(
+                **{f'{self.timestamp_field}__gt': since}
+            )
+        if until:
+            queryset = queryset.filter(
+                **{f'{self.timestamp_field}__lte': until}
+            )
+        expressions = {
+            f'_{column}': F(source) for column, _, source in self.columns
+        }
+        return queryset.annotate(
+            _period=F(self.period_field), **expressions
+        ).order_by('_period', 'id').values_list(
+            '_period', *expressions
+        ).iterator(chunk_size=chunk_size)
+
+
+EXPORT_TABLES = {
+    table.name: table for table in [
+        ExportTable(
+            'goals',
+            Goal.objects.all(),
+            [
+                ('id', pa.int64(), 'id'),
+                ('employee_id', pa.int64(), 'employee_id'),
+                ('title', pa.string(), 'title'),
+                ('description', pa.string(), 'description'),
+                ('expected_results', pa.string(), 'expected_results'),
+                ('status', pa.string(), 'status'),
+                ('start_period', pa.date32(), 'start_period'),
+                ('end_period', pa.date32(), 'end_period'),
+                ('created_dttm', TIMESTAMP, 'created_dttm'),
+                ('updated_dttm', TIMESTAMP, 'updated_dttm'),
+            ],
+            timestamp_field='updated_dttm',
+            period_field='start_period'
+        ),
+        ExportTable(
+            'progresses',
+            Progress.objects.all(),
+            [
+                ('id', pa.int64(), 'id'),
+                ('goal_id', pa.int64(), 'goal_id'),
+                ('description', pa.string(), 'description'),
+                ('created_dttm', TIMESTAMP, 'created_dttm'),
+            ],
+            timestamp_field='created_dttm',
+            period_field='goal__start_period'
+        ),
+        ExportTable(
+            'self_assessments',
+            SelfAssessment.objects.all(),
+            [
+                ('id', pa.int64(), 'id'),
+                ('goal_id', pa.int64(), 'goal_id'),
+                ('rating', pa.int16(), 'rating'),
+                ('comments', pa.string(), 'comments'),
+                ('areas_to_improve', pa.string(), 'areas_to_improve'),
+                ('created_dttm', TIMESTAMP, 'created_dttm'),
+                ('updated_dttm', TIMESTAMP, 'updated_dttm'),
+            ],
+            timestamp_field='updated_dttm',
+            period_field='goal__start_period'
+        ),
+        ExportTable(
+            'feedback_requests',
+            FeedbackRequest.objects.all(),
+            [
+                ('id', pa.int64(), 'id'),
+                ('goal_id', pa.int64(), 'goal_id'),
+                ('reviewer_id', pa.int64(), 'reviewer_id'),
+                ('requested_by_id', pa.int64(), 'requested_by_id'),
+                ('status', pa.string(), 'status'),
+                ('created_dttm', TIMESTAMP, 'created_dttm'),
+                ('updated_dttm', TIMESTAMP, 'updated_dttm'),
+            ],
+            timestamp_field='updated_dttm',
+            period_field='goal__start_period'
+        ),
+        ExportTable(
+            'peer_feedback',
+            PeerFeedback.objects.all(),
+            [
+                ('id', pa.int64(), 'id'),
+                ('feedback_request_id', pa.int64(), 'feedback_request_id'),
+                ('goal_id', pa.int64(), 'feedback_request__goal_id'),
+                ('reviewer_id', pa.int64(), 'feedback_request__reviewer_id'),
+                ('rating', pa.int16(), 'rating'),
+                ('comments', pa.string(), 'comments'),
+                ('areas_to_improve', pa.string(), 'areas_to_improve'),
+                ('created_dttm', TIMESTAMP, 'created_dttm'),
+                ('updated_dttm', TIMESTAMP, 'updated_dttm'),
+            ],
+            timestamp_field='updated_dttm',
+            period_field='feedback_request__goal__start_period'
+        ),
+        ExportTable(
+            'expert_evaluations',
+            ExpertEvaluation.objects.all(),
+            [
+                ('id', pa.int64(), 'id'),
+                ('goal_id', pa.int64(), 'goal_id'),
+                ('expert_id', pa.int64(), 'expert_id'),
+                ('final_rating', pa.int16(), 'final_rating'),
+                ('comments', pa.string(), 'comments'),
+                ('areas_to_improve', pa.string(), 'areas_to_improve'),
+                ('created_dttm', TIMESTAMP, 'created_dttm'),
+                ('updated_dttm', TIMESTAMP, 'updated_dttm'),
+            ],
+            timestamp_field='updated_dttm',
+            period_field='goal__start_period'
+        ),
+    ]
+}
+
+
+def _record_batch(rows, schema):
+    columns = list(zip(*rows))
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array(values, type=field.type)
+            for values, field in zip(columns[1:], schema)
+        ],
+        schema=schema
+    )
+
+
+def export_table(table, output_dir, run_id, since=None, until=None,
+                 chunk_size=CHUNK_SIZE):
+    """
+    Пишет строки таблицы в <output_dir>/<table>/period=<start>/part-<run>
+    .parquet пачками по chunk_size строк (одна группа строк на пачку).
+    Возвращает число строк и список записанных файлов.
+    """
+    schema = table.schema
+    writer = None
+    current_period = None
+    batch = []
+    files = []
+    total = 0
+
+    def flush():
+        if batch:
+            writer.write_batch(_record_batch(batch, schema))
+            batch.clear()
+
+    try:
+        for row in table.rows(since, until, chunk_size):
+            period = row[0]
+            if writer is None or period != current_period:
+                if writer is not None:
+                    flush()
+                    writer.close()
+                current_period = period
+                partition = os.path.join(
+                    output_dir, table.name, f'period={period.isoformat()}'
+                )
+                os.makedirs(partition, exist_ok=True)
+                path = os.path.join(partition, f'part-{run_id}.parquet')
+                writer = pq.ParquetWriter(path, schema)
+                files.append(path)
+
+            batch.append(row)
+            total += 1
+            if len(batch) >= chunk_size:
+                flush()
+
+        if writer is not None:
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return total, files
+
+
+def load_state(output_dir):
+    path = os.path.join(output_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as state_file:
+        return json.load(state_file)
+
+
+def save_state(output_dir, state):
+    path = os.path.join(output_dir, STATE_FILE)
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as state_file:
+        json.dump(state, state_file, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def _swap_table(staging_dir, output_dir, name):
+    """
+    Заменяет каталог таблицы в output_dir каталогом из staging_dir:
+    файлы прежних запусков (в том числе удаленные строки) удаляются.
+    """
+    target = os.path.join(output_dir, name)
+    previous = os.path.join(staging_dir, f'{name}.previous')
+    if os.path.exists(target):
+        os.replace(target, previous)
+    exported = os.path.join(staging_dir, name)
+    if os.path.exists(exported):
+        os.replace(exported, target)
+    shutil.rmtree(previous, ignore_errors=True)
+
+
+def export_parquet(output_dir, tables=None, full=False,
+                   chunk_size=CHUNK_SIZE, overlap=OVERLAP):
+    """
+    Выгружает таблицы в Parquet. По умолчанию выгружаются только строки,
+    измененные (updated_dttm, для неизменяемого прогресса - created_dttm)
+    после предыдущего запуска за вычетом окна overlap; отметка хранится
+    в STATE_FILE в каталоге выгрузки. В каждом запуске создаются новые
+    файлы, и строки окна overlap выгружаются повторно, поэтому при чтении
+    нужно брать последнюю версию строки по id. Удаленные строки
+    инкрементальная выгрузка не отражает - нужен полный запуск: он пишет
+    таблицу в скрытый каталог (читатели Parquet пропускают каталоги
+    с точкой в начале имени) и заменяет им прежний каталог таблицы.
+    Возвращает {таблица: (строки, файлы)}.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    state = {} if full else load_state(output_dir)
+    until = timezone.now()
+    run_id = until.strftime('%Y%m%dT%H%M%S%fZ')
+    staging_dir = os.path.join(output_dir, f'.staging-{run_id}')
+
+    results = {}
+    try:
+        for name in tables or EXPORT_TABLES:
+            since = state.get(name)
+            rows, files = export_table(
+                EXPORT_TABLES[name],
+                staging_dir if full else output_dir,
+                run_id,
+                since=since and datetime.fromisoformat(since) - overlap,
+                until=until,
+                chunk_size=chunk_size
+            )
+            if full:
+                _swap_table(staging_dir, output_dir, name)
+                files = [
+                    os.path.join(output_dir,
+                                 os.path.relpath(path, staging_dir))
+                    for path in files
+                ]
+            results[name] = rows, files
+            state[name] = until.isoformat()
+            save_state(output_dir, state)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    return results
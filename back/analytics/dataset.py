@@ -0,0 +1,172 @@
+import numpy as np
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+
+from accounts.models import Employee
+from feedback.models import SelfAssessment, PeerFeedback, ExpertEvaluation
+from goals.models import Goal
+
+CHUNK_SIZE = 5000
+
+
+def fetch_columns(queryset, fields, dtype=np.int64):
+    """
+    Загружает поля queryset в отдельные NumPy-массивы одним запросом,
+    не материализуя список моделей.
+    """
+    record_dtype = [(f'f{i}', dtype) for i in range(len(fields))]
+    records = np.fromiter(
+        queryset.order_by().values_list(*fields).iterator(
+            chunk_size=CHUNK_SIZE
+        ),
+        dtype=record_dtype
+    )
+    return [records[f'f{i}'] for i in range(len(fields))]
+
+
+class ReviewDataset:
+    """
+    Колоночное представление оценок за период.
+
+    Все массивы по целям индексируются позицией цели в goal_ids,
+    массивы по сотрудникам - позицией в employee_ids (оба отсортированы).
+    Отсутствующие оценки представлены NaN.
+    """
+
+    def __init__(self, goal_ids, goal_employee, employee_ids, manager_index,
+                 positions, position_codes, self_rating, peer_goal,
+                 peer_reviewer, peer_rating, expert_rating):
+        self.goal_ids = goal_ids
+        self.goal_employee = goal_employee
+        self.employee_ids = employee_ids
+        self.manager_index = manager_index
+        self.positions = positions
+        self.position_codes = position_codes
+        self.self_rating = self_rating
+        self.peer_goal = peer_goal
+        self.peer_reviewer = peer_reviewer
+        self.peer_rating = peer_rating
+        self.expert_rating = expert_rating
+
+        n_goals = len(goal_ids)
+        self.peer_count = np.bincount(peer_goal, minlength=n_goals)
+        peer_sum = np.bincount(
+            peer_goal, weights=peer_rating, minlength=n_goals
+        )
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.peer_mean = peer_sum / self.peer_count
+
+    @property
+    def n_goals(self):
+        return len(self.goal_ids)
+
+    @property
+    def goal_position(self):
+        return self.position_codes[self.goal_employee]
+
+    def subtree_pairs(self, item_employee):
+        """
+        Пары (элемент, руководитель) для всех руководителей
+        на всех уровнях иерархии над сотрудником элемента.
+        Каждая итерация обрабатывает один уровень иерархии целиком.
+        """
+        items = np.arange(len(item_employee))
+        current = self.manager_index[item_employee]
+        item_parts, manager_parts = [], []
+
+        for _ in range(len(self.employee_ids)):
+            mask = current >= 0
+            if not mask.any():
+                break
+            items = items[mask]
+            current = current[mask]
+            item_parts.append(items)
+            manager_parts.append(current)
+            current = self.manager_index[current]
+
+        if not item_parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(item_parts), np.concatenate(manager_parts)
+
+
+def _index_of(sorted_ids, ids):
+    return np.searchsorted(sorted_ids, ids)
+
+
+def load_review_dataset(start_period=None, end_period=None):
+    """
+    Загружает самооценки, отзывы коллег и экспертные оценки целей,
+    пересекающихся с периодом, несколькими запросами в NumPy-массивы.
+    """
+    goals = Goal.objects.all()
+    if start_period:
+        goals = goals.filter(end_period__gte=start_period)
+    if end_period:
+        goals = goals.filter(start_period__lte=end_period)
+
+    goal_ids, goal_employee_ids = fetch_columns(
+        goals, ['id', 'employee_id']
+    )
+    order = np.argsort(goal_ids)
+    goal_ids = goal_ids[order]
+    goal_employee_ids = goal_employee_ids[order]
+
+    employee_rows = list(
+        Employee.objects.order_by('id').values_list(
+            'id', Coalesce(F('manager_id'), Value(-1)), 'position'
+        )
+    )
+    employee_ids = np.fromiter(
+        (row[0] for row in employee_rows), dtype=np.int64,
+        count=len(employee_rows)
+    )
+    manager_ids = np.fromiter(
+        (row[1] for row in employee_rows), dtype=np.int64,
+        count=len(employee_rows)
+    )
+    positions, position_codes = np.unique(
+        np.array([row[2] for row in employee_rows], dtype=object),
+        return_inverse=True
+    )
+    manager_index = np.where(
+        manager_ids >= 0, _index_of(employee_ids, manager_ids), -1
+    )
+
+    n_goals = len(goal_ids)
+    self_goal, self_values = fetch_columns(
+        SelfAssessment.objects.filter(goal__in=goals),
+        ['goal_id', 'rating']
+    )
+    self_rating = np.full(n_goals, np.nan)
+    self_rating[_index_of(goal_ids, self_goal)] = self_values
+
+    expert_goal, expert_values = fetch_columns(
+        ExpertEvaluation.objects.filter(goal__in=goals),
+        ['goal_id', 'final_rating']
+    )
+    expert_rating = np.full(n_goals, np.nan)
+    expert_rating[_index_of(goal_ids, expert_goal)] = expert_values
+
+    peer_goal, peer_reviewer, peer_values = fetch_columns(
+        PeerFeedback.objects.filter(feedback_request__goal__in=goals),
+        [
+            'feedback_request__goal_id',
+            'feedback_request__reviewer_id',
+            'rating'
+        ]
+    )
+
+    return ReviewDataset(
+        goal_ids=goal_ids,
+        goal_employee=_index_of(employee_ids, goal_employee_ids),
+        employee_ids=employee_ids,
+        manager_index=manager_index,
+        positions=positions,
+        position_codes=position_codes,
+        self_rating=self_rating,
+        peer_goal=_index_of(goal_ids, peer_goal),
+        peer_reviewer=_index_of(employee_ids, peer_reviewer),
+        peer_rating=peer_values.astype(np.float64),
+        expert_rating=expert_rating,
+    )
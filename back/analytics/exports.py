@@ -0,0 +1,120 @@
+import csv
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Q
+
+from accounts.hierarchy import subtree_ids_sql
+from goals.models import Goal
+
+CHUNK_SIZE = 2000
+
+REVIEW_RESULTS_FIELDS = (
+    'id',
+    'title',
+    'status',
+    'start_period',
+    'end_period',
+    'employee_id',
+    'employee__user__first_name',
+    'employee__user__last_name',
+    'employee__position',
+    'employee__manager_id',
+    'employee__manager__user__first_name',
+    'employee__manager__user__last_name',
+    'self_assessment__rating',
+    'peer_ratings',
+    'expert_evaluation__final_rating',
+)
+
+REVIEW_RESULTS_HEADER = (
+    'goal_id',
+    'title',
+    'status',
+    'start_period',
+    'end_period',
+    'employee_id',
+    'employee_name',
+    'position',
+    'manager_id',
+    'manager_name',
+    'self_rating',
+    'peer_ratings',
+    'peer_count',
+    'peer_mean',
+    'final_rating',
+)
+
+
+class Echo:
+    """Псевдобуфер для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def review_results_queryset(start_period=None, end_period=None,
+                            statuses=None, manager_id=None):
+    """
+    Один запрос с JOIN по сотруднику, руководителю, самооценке
+    и экспертной оценке; оценки коллег собираются в массив.
+    """
+    goals = Goal.objects.all()
+    if start_period:
+        goals = goals.filter(end_period__gte=start_period)
+    if end_period:
+        goals = goals.filter(start_period__lte=end_period)
+    if statuses:
+        goals = goals.filter(status__in=statuses)
+    if manager_id:
+        goals = goals.filter(employee_id__in=subtree_ids_sql(manager_id))
+
+    return goals.annotate(
+        peer_ratings=ArrayAgg(
+            'feedback_requests__feedback__rating',
+            filter=Q(feedback_requests__feedback__isnull=False),
+            ordering='feedback_requests__feedback__id',
+            default=[]
+        )
+    ).values_list(*REVIEW_RESULTS_FIELDS).order_by('id')
+
+
+def _full_name(first_name, last_name):
+    if first_name is None and last_name is None:
+        return ''
+    return f'{first_name} {last_name}'.strip()
+
+
+def review_results_rows(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Строки CSV с заголовком. Данные читаются серверным курсором
+    порциями по chunk_size, поэтому память не зависит от числа целей.
+    """
+    yield REVIEW_RESULTS_HEADER
+    for (goal_id, title, status, start_period, end_period, employee_id,
+         first_name, last_name, position, manager_id, manager_first_name,
+         manager_last_name, self_rating, peer_ratings,
+         final_rating) in queryset.iterator(chunk_size=chunk_size):
+        peer_count = len(peer_ratings)
+        yield (
+            goal_id,
+            title,
+            status,
+            start_period.isoformat(),
+            end_period.isoformat(),
+            employee_id,
+            _full_name(first_name, last_name),
+            position,
+            manager_id if manager_id is not None else '',
+            _full_name(manager_first_name, manager_last_name),
+            self_rating if self_rating is not None else '',
+            ';'.join(str(rating) for rating in peer_ratings),
+            peer_count,
+            round(sum(peer_ratings) / peer_count, 2) if peer_count else '',
+            final_rating if final_rating is not None else '',
+        )
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow(row)
@@ -0,0 +1,64 @@
+import time
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from analytics.columnar import CHUNK_SIZE, EXPORT_TABLES, OVERLAP, \
+    export_parquet
+
+
+class Command(BaseCommand):
+    help = ('Exports goals, progresses, feedback and evaluations to Parquet '
+            'files partitioned by goal period. Unless --full is given, only '
+            'rows whose updated_dttm (created_dttm for progresses) is later '
+            'than the previous run minus --overlap are exported. Rows in '
+            'the overlap window are exported again, so readers must keep '
+            'the latest version of each id. Deleted rows are not tracked; '
+            'run with --full to drop them from the export: it replaces the '
+            'files of every exported table.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output',
+            help='Export directory (also stores the incremental state)'
+        )
+        parser.add_argument(
+            '--table',
+            action='append',
+            dest='tables',
+            choices=list(EXPORT_TABLES),
+            help='Table to export (can be repeated, defaults to all)'
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Ignore the previous run, export all rows and replace the '
+                 'existing files of the exported tables'
+        )
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument(
+            '--overlap',
+            type=float,
+            default=OVERLAP.total_seconds(),
+            help='Seconds before the previous run to export again, covering '
+                 'rows committed after their timestamp'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        results = export_parquet(
+            options['output'],
+            tables=options['tables'],
+            full=options['full'],
+            chunk_size=options['chunk_size'],
+            overlap=timedelta(seconds=options['overlap'])
+        )
+        elapsed = time.perf_counter() - started
+
+        for name, (rows, files) in results.items():
+            self.stdout.write(f'{name}: {rows} row(s), {len(files)} file(s)')
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {sum(rows for rows, _ in results.values())} row(s) '
+            f'in {elapsed:.2f}s')
+        )
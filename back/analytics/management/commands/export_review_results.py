@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from analytics.exports import review_results_queryset, review_results_rows, \
+    stream_csv
+from goals.models import Goal
+
+
+class Command(BaseCommand):
+    help = 'Streams review results (goals with all ratings) as CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-period', help='YYYY-MM-DD')
+        parser.add_argument('--end-period', help='YYYY-MM-DD')
+        parser.add_argument(
+            '--status',
+            action='append',
+            dest='statuses',
+            choices=[choice for choice, _ in Goal.STATUS_CHOICES],
+            help='Goal status to include (can be repeated)'
+        )
+        parser.add_argument(
+            '--manager',
+            type=int,
+            help='Only export the subtree of this manager (employee ID)'
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write to (defaults to stdout)'
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def _date(self, value, name):
+        if not value:
+            return None
+        parsed = parse_date(value)
+        if parsed is None:
+            raise CommandError(f'Invalid {name}: {value}')
+        return parsed
+
+    def handle(self, *args, **options):
+        queryset = review_results_queryset(
+            start_period=self._date(options['start_period'], 'start period'),
+            end_period=self._date(options['end_period'], 'end period'),
+            statuses=options['statuses'],
+            manager_id=options['manager']
+        )
+        lines = stream_csv(
+            review_results_rows(queryset, chunk_size=options['chunk_size'])
+        )
+
+        if options['output']:
+            with open(options['output'], 'w', newline='',
+                      encoding='utf-8') as output:
+                rows = 0
+                for line in lines:
+                    output.write(line)
+                    rows += 1
+            self.stderr.write(self.style.SUCCESS(
+                f'Exported {rows - 1} goal(s) to {options["output"]}')
+            )
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
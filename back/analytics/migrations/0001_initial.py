@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-19 01:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0002_employee_profile_photo'),
+        ('feedback', '0004_goalfeedbackstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewerCalibration',
+            fields=[
+                ('reviewer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_calibration', serialize=False, to='accounts.employee', verbose_name='Рецензент')),
+                ('feedback_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('rating_mean', models.FloatField(verbose_name='Средняя оценка')),
+                ('rating_std', models.FloatField(verbose_name='Стандартное отклонение оценок')),
+                ('last_feedback_id', models.BigIntegerField(default=0, verbose_name='Последний учтенный отзыв')),
+                ('updated_dttm', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'Калибровка рецензента',
+                'verbose_name_plural': 'Калибровки рецензентов',
+                'db_table': 'analytics_reviewer_calibrations',
+            },
+        ),
+        migrations.CreateModel(
+            name='NormalizedPeerRating',
+            fields=[
+                ('feedback', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='normalized_rating', serialize=False, to='feedback.peerfeedback', verbose_name='Отзыв коллеги')),
+                ('z_score', models.FloatField(verbose_name='Z-оценка')),
+                ('calibrated_rating', models.FloatField(verbose_name='Откалиброванная оценка')),
+                ('updated_dttm', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата обновления')),
+                ('reviewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='normalized_peer_ratings', to='accounts.employee', verbose_name='Рецензент')),
+            ],
+            options={
+                'verbose_name': 'Нормализованная оценка коллеги',
+                'verbose_name_plural': 'Нормализованные оценки коллег',
+                'db_table': 'analytics_normalized_peer_ratings',
+            },
+        ),
+    ]
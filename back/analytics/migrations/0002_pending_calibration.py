@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_employee_profile_photo'),
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingCalibration',
+            fields=[
+                ('reviewer', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='pending_calibration', serialize=False, to='accounts.employee', verbose_name='Рецензент')),
+                ('updated_dttm', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата изменения отзывов')),
+            ],
+            options={
+                'verbose_name': 'Рецензент для пересчета калибровки',
+                'verbose_name_plural': 'Рецензенты для пересчета калибровки',
+                'db_table': 'analytics_pending_calibrations',
+            },
+        ),
+        migrations.RemoveField(
+            model_name='reviewercalibration',
+            name='last_feedback_id',
+        ),
+        migrations.AddField(
+            model_name='reviewercalibration',
+            name='global_mean',
+            field=models.FloatField(default=0.0, verbose_name='Общая средняя оценка при расчете'),
+        ),
+        migrations.AddField(
+            model_name='reviewercalibration',
+            name='global_std',
+            field=models.FloatField(default=0.0, verbose_name='Общее отклонение оценок при расчете'),
+        ),
+    ]
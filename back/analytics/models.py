@@ -0,0 +1,118 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from accounts.models import Employee
+from feedback.models import PeerFeedback
+
+
+class ReviewerCalibration(models.Model):
+    """
+    Статистика оценок рецензента по всей истории отзывов,
+    используемая для нормализации его оценок.
+    """
+    reviewer = models.OneToOneField(
+        Employee,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rating_calibration',
+        verbose_name=_('Рецензент')
+    )
+    feedback_count = models.PositiveIntegerField(
+        _('Количество отзывов'),
+        default=0
+    )
+    rating_mean = models.FloatField(
+        _('Средняя оценка')
+    )
+    rating_std = models.FloatField(
+        _('Стандартное отклонение оценок')
+    )
+    global_mean = models.FloatField(
+        _('Общая средняя оценка при расчете'),
+        default=0.0
+    )
+    global_std = models.FloatField(
+        _('Общее отклонение оценок при расчете'),
+        default=0.0
+    )
+    updated_dttm = models.DateTimeField(
+        _('Дата обновления'),
+        default=timezone.now
+    )
+
+    class Meta:
+        verbose_name = _('Калибровка рецензента')
+        verbose_name_plural = _('Калибровки рецензентов')
+        db_table = 'analytics_reviewer_calibrations'
+
+    def __str__(self):
+        return f"Калибровка рецензента #{self.reviewer_id}"
+
+
+class PendingCalibration(models.Model):
+    """
+    Рецензент, отзывы которого изменились после последнего пересчета
+    калибровки. Отмечается в транзакции изменения отзыва и снимается
+    пересчетом.
+    """
+    # Без внешнего ключа: отметка появляется при каскадном удалении
+    # отзывов вместе с рецензентом и не должна мешать удалению
+    reviewer = models.OneToOneField(
+        Employee,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        primary_key=True,
+        related_name='pending_calibration',
+        verbose_name=_('Рецензент')
+    )
+    updated_dttm = models.DateTimeField(
+        _('Дата изменения отзывов'),
+        default=timezone.now
+    )
+
+    class Meta:
+        verbose_name = _('Рецензент для пересчета калибровки')
+        verbose_name_plural = _('Рецензенты для пересчета калибровки')
+        db_table = 'analytics_pending_calibrations'
+
+    def __str__(self):
+        return f"Пересчет калибровки рецензента #{self.reviewer_id}"
+
+
+class NormalizedPeerRating(models.Model):
+    """
+    Нормализованная (z-score) оценка отзыва коллеги с поправкой
+    на систематическое смещение рецензента.
+    """
+    feedback = models.OneToOneField(
+        PeerFeedback,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='normalized_rating',
+        verbose_name=_('Отзыв коллеги')
+    )
+    reviewer = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='normalized_peer_ratings',
+        verbose_name=_('Рецензент')
+    )
+    z_score = models.FloatField(
+        _('Z-оценка')
+    )
+    calibrated_rating = models.FloatField(
+        _('Откалиброванная оценка')
+    )
+    updated_dttm = models.DateTimeField(
+        _('Дата обновления'),
+        default=timezone.now
+    )
+
+    class Meta:
+        verbose_name = _('Нормализованная оценка коллеги')
+        verbose_name_plural = _('Нормализованные оценки коллег')
+        db_table = 'analytics_normalized_peer_ratings'
+
+    def __str__(self):
+        return f"Нормализованная оценка отзыва #{self.feedback_id}"
@@ -0,0 +1,13 @@
+from rest_framework import permissions
+
+
+class IsExpertiseLeaderOrAdmin(permissions.BasePermission):
+    """
+    Разрешение для лидеров профессии и администраторов.
+    """
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        return (request.user.is_staff
+                or request.user.role in ['admin', 'expertise_leader'])
@@ -0,0 +1,235 @@
+import math
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from .agreement import agreement_stats, reviewer_deviations
+from .dataset import load_review_dataset
+from .stats import group_stats, overall_stats, rating_histogram
+
+CACHE_KEY_PREFIX = 'analytics'
+DEFAULT_CACHE_TIMEOUT = 15 * 60
+
+
+def _number(value):
+    value = float(value)
+    if math.isnan(value):
+        return None
+    return round(value, 3)
+
+
+def _format_stats(stats):
+    return {
+        key: int(value) if key == 'count' else _number(value)
+        for key, value in stats.items()
+    }
+
+
+def _period(start_period, end_period):
+    return {
+        'start_period': start_period.isoformat() if start_period else None,
+        'end_period': end_period.isoformat() if end_period else None,
+    }
+
+
+def _format_group(stats, index):
+    return _format_stats({key: value[index] for key, value in stats.items()})
+
+
+def _rating_sources(dataset):
+    return {
+        'self': dataset.self_rating,
+        'peer': dataset.peer_mean,
+        'expert': dataset.expert_rating,
+    }
+
+
+def _gaps(dataset):
+    return {
+        'self_minus_peer': dataset.self_rating - dataset.peer_mean,
+        'self_minus_expert': dataset.self_rating - dataset.expert_rating,
+        'peer_minus_expert': dataset.peer_mean - dataset.expert_rating,
+    }
+
+
+def _grouped_section(sources, groups, n_groups, item_index=None):
+    """
+    Статистика по каждому источнику оценок в разрезе групп.
+    item_index позволяет повторять элементы (например, цель
+    учитывается у каждого руководителя в цепочке).
+    """
+    section = {}
+    for name, values in sources.items():
+        if item_index is not None:
+            values = values[item_index]
+        section[name] = group_stats(values, groups, n_groups)
+    return section
+
+
+def build_review_cycle_report(start_period=None, end_period=None):
+    dataset = load_review_dataset(start_period, end_period)
+    sources = _rating_sources(dataset)
+    gaps = _gaps(dataset)
+
+    ratings = {}
+    for name, values in sources.items():
+        ratings[name] = _format_stats(overall_stats(values))
+        ratings[name]['histogram'] = rating_histogram(values).tolist()
+    ratings['peer_individual'] = _format_stats(
+        overall_stats(dataset.peer_rating)
+    )
+    ratings['peer_individual']['histogram'] = rating_histogram(
+        dataset.peer_rating
+    ).tolist()
+
+    n_positions = len(dataset.positions)
+    goal_position = dataset.goal_position
+    position_goals = np.bincount(goal_position, minlength=n_positions)
+    position_stats = _grouped_section(
+        {**sources, **gaps}, goal_position, n_positions
+    )
+    by_position = []
+    for index in np.flatnonzero(position_goals):
+        row = {
+            'position': dataset.positions[index],
+            'goals': int(position_goals[index]),
+        }
+        for name, stats in position_stats.items():
+            row[name] = _format_group(stats, index)
+        by_position.append(row)
+
+    n_employees = len(dataset.employee_ids)
+    goal_index, manager_index = dataset.subtree_pairs(dataset.goal_employee)
+    manager_goals = np.bincount(manager_index, minlength=n_employees)
+    manager_stats = _grouped_section(
+        {**sources, **gaps}, manager_index, n_employees, item_index=goal_index
+    )
+    by_manager = []
+    for index in np.flatnonzero(manager_goals):
+        row = {
+            'manager_id': int(dataset.employee_ids[index]),
+            'goals': int(manager_goals[index]),
+        }
+        for name, stats in manager_stats.items():
+            row[name] = _format_group(stats, index)
+        by_manager.append(row)
+
+    return {
+        'period': _period(start_period, end_period),
+        'totals': {
+            'goals': dataset.n_goals,
+            'self_assessments': int(np.count_nonzero(
+                ~np.isnan(dataset.self_rating)
+            )),
+            'peer_feedback': len(dataset.peer_rating),
+            'expert_evaluations': int(np.count_nonzero(
+                ~np.isnan(dataset.expert_rating)
+            )),
+        },
+        'ratings': ratings,
+        'gaps': {
+            name: _format_stats(overall_stats(values))
+            for name, values in gaps.items()
+        },
+        'by_position': by_position,
+        'by_manager_subtree': by_manager,
+    }
+
+
+def build_agreement_report(start_period=None, end_period=None):
+    dataset = load_review_dataset(start_period, end_period)
+    n_goals = dataset.n_goals
+
+    overall = agreement_stats(
+        dataset.peer_goal, dataset.peer_rating,
+        np.zeros(n_goals, dtype=np.int64), 1
+    )
+
+    # Команда цели - прямой руководитель ее владельца,
+    # группа 0 - сотрудники без руководителя.
+    goal_team = dataset.manager_index[dataset.goal_employee] + 1
+    n_teams = len(dataset.employee_ids) + 1
+    teams = agreement_stats(
+        dataset.peer_goal, dataset.peer_rating, goal_team, n_teams
+    )
+    by_team = []
+    for index in np.flatnonzero(teams['units']):
+        by_team.append({
+            'manager_id': (
+                int(dataset.employee_ids[index - 1]) if index else None
+            ),
+            'goals': int(teams['units'][index]),
+            'ratings': int(teams['ratings'][index]),
+            'alpha': _number(teams['alpha'][index]),
+            'icc': _number(teams['icc'][index]),
+        })
+
+    deviations = reviewer_deviations(
+        dataset.peer_goal, dataset.peer_reviewer, dataset.peer_rating,
+        n_goals, len(dataset.employee_ids)
+    )
+    outliers = []
+    for index in np.flatnonzero(deviations['outlier']):
+        mean = float(deviations['mean'][index])
+        outliers.append({
+            'reviewer_id': int(dataset.employee_ids[index]),
+            'ratings': int(deviations['count'][index]),
+            'mean_deviation': _number(mean),
+            'std_deviation': _number(deviations['std'][index]),
+            't_statistic': _number(
+                np.clip(deviations['t_statistic'][index], -1e6, 1e6)
+            ),
+            'direction': 'lenient' if mean > 0 else 'harsh',
+        })
+    outliers.sort(key=lambda row: -abs(row['mean_deviation']))
+
+    return {
+        'period': _period(start_period, end_period),
+        'overall': {
+            'goals': int(overall['units'][0]),
+            'ratings': int(overall['ratings'][0]),
+            'alpha': _number(overall['alpha'][0]),
+            'icc': _number(overall['icc'][0]),
+        },
+        'by_team': by_team,
+        'outlier_reviewers': outliers,
+    }
+
+
+def _cached_report(name, builder, start_period, end_period, refresh):
+    """
+    Отчет за период с кешированием по имени отчета и границам периода.
+    """
+    cache_key = ':'.join([
+        CACHE_KEY_PREFIX,
+        name,
+        start_period.isoformat() if start_period else '-',
+        end_period.isoformat() if end_period else '-',
+    ])
+    if not refresh:
+        report = cache.get(cache_key)
+        if report is not None:
+            return report
+
+    report = builder(start_period, end_period)
+    timeout = getattr(
+        settings, 'ANALYTICS_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT
+    )
+    cache.set(cache_key, report, timeout)
+    return report
+
+
+def get_review_cycle_report(start_period=None, end_period=None,
+                            refresh=False):
+    return _cached_report(
+        'review-cycle', build_review_cycle_report,
+        start_period, end_period, refresh
+    )
+
+
+def get_agreement_report(start_period=None, end_period=None, refresh=False):
+    return _cached_report(
+        'agreement', build_agreement_report,
+        start_period, end_period, refresh
+    )
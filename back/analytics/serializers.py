@@ -0,0 +1,35 @@
+from rest_framework import serializers
+
+from goals.models import Goal
+
+
+class AnalyticsPeriodSerializer(serializers.Serializer):
+    start_period = serializers.DateField(required=False)
+    end_period = serializers.DateField(required=False)
+    refresh = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        start_period = attrs.get('start_period')
+        end_period = attrs.get('end_period')
+
+        if start_period and end_period and start_period > end_period:
+            raise serializers.ValidationError(
+                {"end_period": "Дата окончания должна быть позже даты начала."}
+            )
+
+        return attrs
+
+
+class ReviewResultsExportSerializer(AnalyticsPeriodSerializer):
+    status = serializers.CharField(required=False)
+    manager = serializers.IntegerField(required=False, min_value=1)
+
+    def validate_status(self, value):
+        statuses = [status for status in value.split(',') if status]
+        allowed = {choice for choice, _ in Goal.STATUS_CHOICES}
+        unknown = set(statuses) - allowed
+        if unknown:
+            raise serializers.ValidationError(
+                f"Неизвестные статусы: {', '.join(sorted(unknown))}"
+            )
+        return statuses
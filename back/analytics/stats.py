@@ -0,0 +1,93 @@
+import numpy as np
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def group_stats(values, groups, n_groups):
+    """
+    Векторизованная статистика по группам.
+
+    values - массив float (NaN игнорируются), groups - коды групп
+    в диапазоне [0, n_groups). Возвращает словарь массивов длины n_groups:
+    count, mean, std, min, max и перцентили p10..p90.
+    Для пустых групп значения равны NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    groups = np.asarray(groups, dtype=np.int64)
+
+    mask = ~np.isnan(values)
+    values = values[mask]
+    groups = groups[mask]
+
+    count = np.bincount(groups, minlength=n_groups)
+    sums = np.bincount(groups, weights=values, minlength=n_groups)
+    squares = np.bincount(groups, weights=values * values, minlength=n_groups)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / count
+        variance = squares / count - mean * mean
+    std = np.sqrt(np.maximum(variance, 0.0))
+
+    result = {
+        'count': count,
+        'mean': mean,
+        'std': std,
+    }
+
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    starts = np.concatenate(([0], np.cumsum(count)[:-1]))
+    nonempty = count > 0
+
+    def pick(index):
+        picked = np.full(n_groups, np.nan)
+        picked[nonempty] = sorted_values[index[nonempty]]
+        return picked
+
+    result['min'] = pick(starts)
+    result['max'] = pick(starts + count - 1)
+
+    for q in PERCENTILES:
+        position = (count - 1) * (q / 100.0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        lower_values = pick(starts + lower)
+        upper_values = pick(starts + upper)
+        result[f'p{q}'] = (
+            lower_values + (upper_values - lower_values) * (position - lower)
+        )
+
+    return result
+
+
+def group_median(values, groups, n_groups):
+    """Медиана значений по группам (NaN для пустых групп)."""
+    values = np.asarray(values, dtype=np.float64)
+    groups = np.asarray(groups, dtype=np.int64)
+
+    count = np.bincount(groups, minlength=n_groups)
+    sorted_values = values[np.lexsort((values, groups))]
+    starts = np.concatenate(([0], np.cumsum(count)[:-1]))
+    nonempty = count > 0
+
+    median = np.full(n_groups, np.nan)
+    lower = starts + (count - 1) // 2
+    upper = starts + count // 2
+    median[nonempty] = (
+        sorted_values[lower[nonempty]] + sorted_values[upper[nonempty]]
+    ) / 2
+    return median
+
+
+def overall_stats(values):
+    """Статистика по всему массиву как по одной группе."""
+    values = np.asarray(values, dtype=np.float64)
+    stats = group_stats(values, np.zeros(len(values), dtype=np.int64), 1)
+    return {key: value[0] for key, value in stats.items()}
+
+
+def rating_histogram(values, max_rating=10):
+    """Распределение целочисленных оценок 1..max_rating."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)].astype(np.int64)
+    return np.bincount(values, minlength=max_rating + 1)[1:max_rating + 1]
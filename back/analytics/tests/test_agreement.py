@@ -0,0 +1,153 @@
+from datetime import date
+from itertools import permutations
+
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User, Employee
+from analytics.agreement import agreement_stats, reviewer_deviations
+from goals.models import Goal
+from feedback.models import FeedbackRequest, PeerFeedback
+
+
+def naive_alpha(units):
+    """Альфа Криппендорфа (интервальная) по определению, циклами"""
+    pairable = [values for values in units if len(values) >= 2]
+    pooled = [value for values in pairable for value in values]
+    n = len(pooled)
+    observed = sum(
+        sum((a - b) ** 2 for a, b in permutations(values, 2))
+        / (len(values) - 1)
+        for values in pairable
+    ) / n
+    expected = sum(
+        (a - b) ** 2 for a, b in permutations(pooled, 2)
+    ) / (n * (n - 1))
+    return 1 - observed / expected
+
+
+class AgreementStatsTestCase(SimpleTestCase):
+    """Тесты векторизованных метрик согласованности"""
+
+    def test_alpha_matches_definition(self):
+        """Тест совпадения альфы с расчетом по определению"""
+        units = [[7, 8, 6], [3, 4], [9, 9, 10, 8], [5], [2, 3, 2]]
+        unit = np.repeat(np.arange(len(units)), [len(u) for u in units])
+        values = np.concatenate(units).astype(float)
+
+        stats = agreement_stats(unit, values, np.zeros(len(units), int), 1)
+        self.assertEqual(stats['units'][0], 4)
+        self.assertEqual(stats['ratings'][0], 12)
+        self.assertAlmostEqual(stats['alpha'][0], naive_alpha(units))
+        self.assertGreater(stats['icc'][0], 0.8)
+
+    def test_perfect_agreement(self):
+        """Тест полной согласованности рецензентов"""
+        unit = np.array([0, 0, 1, 1, 2, 2])
+        values = np.array([2, 2, 5, 5, 9, 9], dtype=float)
+
+        stats = agreement_stats(unit, values, np.zeros(3, int), 1)
+        self.assertAlmostEqual(stats['alpha'][0], 1.0)
+        self.assertAlmostEqual(stats['icc'][0], 1.0)
+
+    def test_reviewer_deviation_flags_lenient_reviewer(self):
+        """Тест выявления рецензента, завышающего оценки"""
+        n_units = 6
+        unit = np.repeat(np.arange(n_units), 3)
+        reviewer = np.tile([0, 1, 2], n_units)
+        values = np.tile([10.0, 5.0, 6.0], n_units)
+        values[1::3] += np.arange(n_units) % 2
+
+        deviations = reviewer_deviations(unit, reviewer, values, n_units, 3)
+        self.assertTrue(deviations['outlier'][0])
+        self.assertFalse(deviations['outlier'][1])
+        self.assertGreater(deviations['mean'][0], 0)
+
+
+class AgreementAPITestCase(APITestCase):
+    """Тесты API отчета о согласованности оценок"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создание данных для всех тестов"""
+        def create_user(username, role='employee'):
+            return User.objects.create_user(
+                username=username,
+                password='password123',
+                email=f'{username}@example.com',
+                role=role
+            )
+
+        def create_employee(username, manager=None):
+            return Employee.objects.create(
+                user=create_user(username),
+                position='Developer',
+                hire_dt=date(2024, 1, 1),
+                manager=manager
+            )
+
+        cls.leader_user = create_user('leader', 'expertise_leader')
+        cls.manager = create_employee('manager')
+        cls.owner = create_employee('owner', cls.manager)
+        cls.reviewers = [create_employee(f'reviewer{i}') for i in range(3)]
+
+        for i in range(5):
+            goal = Goal.objects.create(
+                employee=cls.owner,
+                title=f'Goal {i}',
+                description='Description',
+                expected_results='Expected Results',
+                start_period=date(2025, 1, 1),
+                end_period=date(2025, 3, 31),
+                status=Goal.STATUS_PENDING_ASSESSMENT
+            )
+            for reviewer, rating in zip(cls.reviewers, [10, 4 + i % 2, 5]):
+                PeerFeedback.objects.create(
+                    feedback_request=FeedbackRequest.objects.create(
+                        goal=goal,
+                        reviewer=reviewer,
+                        requested_by=cls.owner
+                    ),
+                    rating=rating,
+                    comments='Comments',
+                    areas_to_improve='Areas'
+                )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('analytics-agreement')
+
+    def test_agreement_report_for_expertise_leader(self):
+        """Тест получения отчета лидером профессии"""
+        self.client.force_authenticate(user=self.__class__.leader_user)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['overall']['goals'], 5)
+        self.assertEqual(response.data['overall']['ratings'], 15)
+        self.assertEqual(
+            response.data['by_team'][0]['manager_id'],
+            self.__class__.manager.id
+        )
+        outliers = response.data['outlier_reviewers']
+        self.assertEqual(len(outliers), 1)
+        self.assertEqual(
+            outliers[0]['reviewer_id'], self.__class__.reviewers[0].id
+        )
+        self.assertEqual(outliers[0]['direction'], 'lenient')
+
+    def test_agreement_report_forbidden_for_employee(self):
+        """Тест запрета доступа для обычного сотрудника"""
+        self.client.force_authenticate(user=self.__class__.owner.user)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_agreement_report_requires_authentication(self):
+        """Тест запрета доступа для анонимного пользователя"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,169 @@
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+import numpy as np
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from accounts.models import User, Employee
+from analytics.calibration import calibrate, run_calibration
+from analytics.models import ReviewerCalibration, NormalizedPeerRating, \
+    PendingCalibration
+from goals.models import Goal
+from feedback.models import FeedbackRequest, PeerFeedback
+
+
+class CalibrateTestCase(SimpleTestCase):
+    """Тесты векторизованной нормализации оценок"""
+
+    def test_z_scores_relative_to_reviewer(self):
+        """Тест z-оценок относительно истории каждого рецензента"""
+        ratings = np.array([9, 10, 9, 10, 4, 6, 4, 6], dtype=float)
+        reviewers = np.array([0, 0, 0, 0, 1, 1, 1, 1])
+
+        (count, mean, std), (z, calibrated) = calibrate(
+            ratings, reviewers, 2, global_mean=7.0, global_std=2.0
+        )
+        self.assertEqual(count.tolist(), [4, 4])
+        self.assertEqual(mean.tolist(), [9.5, 5.0])
+        self.assertEqual(z.tolist(), [-1, 1, -1, 1, -1, 1, -1, 1])
+        self.assertEqual(calibrated.tolist(), [5, 9, 5, 9, 5, 9, 5, 9])
+
+    def test_small_sample_uses_global_scale(self):
+        """Тест использования общей шкалы для рецензентов с малой выборкой"""
+        _, (z, _) = calibrate(
+            np.array([9.0]), np.array([0]), 1,
+            global_mean=7.0, global_std=2.0
+        )
+        self.assertEqual(z.tolist(), [1.0])
+
+
+class RunCalibrationTestCase(TestCase):
+    """Тесты пакетного пересчета калибровки"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создание данных для всех тестов"""
+        def create_employee(username):
+            user = User.objects.create_user(
+                username=username,
+                password='password123',
+                email=f'{username}@example.com',
+                role='employee'
+            )
+            return Employee.objects.create(
+                user=user,
+                position='Developer',
+                hire_dt=date(2024, 1, 1)
+            )
+
+        cls.owner = create_employee('owner')
+        cls.generous = create_employee('generous')
+        cls.strict = create_employee('strict')
+
+        cls.goals = [
+            Goal.objects.create(
+                employee=cls.owner,
+                title=f'Goal {i}',
+                description='Description',
+                expected_results='Expected Results',
+                start_period=date(2025, 1, 1),
+                end_period=date(2025, 3, 31),
+                status=Goal.STATUS_PENDING_ASSESSMENT
+            )
+            for i in range(4)
+        ]
+
+    def _feedback(self, goal, reviewer, rating):
+        return PeerFeedback.objects.create(
+            feedback_request=FeedbackRequest.objects.create(
+                goal=goal,
+                reviewer=reviewer,
+                requested_by=self.__class__.owner
+            ),
+            rating=rating,
+            comments='Comments',
+            areas_to_improve='Areas'
+        )
+
+    def _seed(self):
+        for goal, rating in zip(self.__class__.goals[:3], [9, 10, 9]):
+            self._feedback(goal, self.__class__.generous, rating)
+        return [
+            self._feedback(goal, self.__class__.strict, rating)
+            for goal, rating in zip(self.__class__.goals[:3], [4, 6, 5])
+        ]
+
+    # Общие среднее и отклонение в этих тестах меняются заметно,
+    # пересчет только отмеченных рецензентов проверяется без допуска
+    @mock.patch('analytics.calibration.GLOBAL_STATS_TOLERANCE', 10)
+    def test_incremental_calibration(self):
+        """Тест пересчета только рецензентов с новыми отзывами"""
+        self._seed()
+
+        self.assertEqual(run_calibration(), (2, 6))
+        self.assertEqual(NormalizedPeerRating.objects.count(), 6)
+        self.assertFalse(PendingCalibration.objects.exists())
+        generous = ReviewerCalibration.objects.get(
+            reviewer=self.__class__.generous
+        )
+        self.assertAlmostEqual(generous.rating_mean, 28 / 3)
+
+        self.assertEqual(run_calibration(), (0, 0))
+
+        feedback = self._feedback(
+            self.__class__.goals[3], self.__class__.strict, 7
+        )
+        self.assertEqual(run_calibration(), (1, 4))
+        strict = ReviewerCalibration.objects.get(
+            reviewer=self.__class__.strict
+        )
+        self.assertEqual(strict.feedback_count, 4)
+        self.assertGreater(feedback.normalized_rating.z_score, 0)
+
+    @mock.patch('analytics.calibration.GLOBAL_STATS_TOLERANCE', 10)
+    def test_edited_and_deleted_feedback_is_recalculated(self):
+        """Тест пересчета рецензентов с измененными и удаленными отзывами"""
+        strict_feedback = self._seed()
+        run_calibration()
+
+        feedback = strict_feedback[0]
+        feedback.rating = 8
+        feedback.save()
+        self.assertEqual(run_calibration(), (1, 3))
+        strict = ReviewerCalibration.objects.get(
+            reviewer=self.__class__.strict
+        )
+        self.assertAlmostEqual(strict.rating_mean, 19 / 3)
+
+        for feedback in strict_feedback:
+            feedback.feedback_request.delete()
+        self.assertEqual(run_calibration(), (0, 0))
+        self.assertFalse(ReviewerCalibration.objects.filter(
+            reviewer=self.__class__.strict
+        ).exists())
+        self.assertTrue(ReviewerCalibration.objects.filter(
+            reviewer=self.__class__.generous
+        ).exists())
+
+    def test_global_stats_change_recalculates_all(self):
+        """Тест пересчета всех рецензентов при изменении общей шкалы"""
+        self._seed()
+        run_calibration()
+
+        self._feedback(self.__class__.goals[3], self.__class__.strict, 1)
+        self.assertEqual(run_calibration(), (2, 7))
+        global_means = set(
+            ReviewerCalibration.objects.values_list('global_mean', flat=True)
+        )
+        self.assertEqual(len(global_means), 1)
+        self.assertAlmostEqual(global_means.pop(), 44 / 7)
+
+    def test_command_full_recalculation(self):
+        """Тест полного пересчета через management-команду"""
+        self._feedback(self.__class__.goals[0], self.__class__.strict, 5)
+
+        out = StringIO()
+        call_command('calibrate_reviewers', '--full', stdout=out)
+        self.assertIn('1 reviewer(s), 1 feedback row(s)', out.getvalue())
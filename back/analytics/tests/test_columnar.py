@@ -0,0 +1,200 @@
+import os
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+
+import pyarrow.parquet as pq
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import User, Employee
+from goals.models import Goal, Progress
+from feedback.models import FeedbackRequest, PeerFeedback
+from analytics.columnar import STATE_FILE, export_parquet
+
+
+class ParquetExportTestCase(TestCase):
+    """Тесты колоночной выгрузки в Parquet"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создание данных для всех тестов"""
+        def create_employee(username):
+            user = User.objects.create_user(
+                username=username,
+                password='password123',
+                email=f'{username}@example.com',
+                role='employee'
+            )
+            return Employee.objects.create(
+                user=user,
+                position='Developer',
+                hire_dt=date(2024, 1, 1)
+            )
+
+        cls.employee = create_employee('employee')
+        cls.reviewer = create_employee('reviewer')
+
+    def setUp(self):
+        self.output = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output.cleanup)
+
+    def _create_goal(self, title, start):
+        return Goal.objects.create(
+            employee=self.__class__.employee,
+            title=title,
+            description='Description',
+            expected_results='Expected Results',
+            start_period=start,
+            end_period=start.replace(month=start.month + 2),
+            status=Goal.STATUS_PENDING_ASSESSMENT
+        )
+
+    def _read(self, table):
+        path = os.path.join(self.output.name, table)
+        if not os.path.exists(path):
+            return []
+        return pq.read_table(path).to_pylist()
+
+    def test_export_partitions_by_period(self):
+        """Тест разбиения выгрузки на партиции по периоду цели"""
+        first = self._create_goal('First', date(2025, 1, 1))
+        second = self._create_goal('Second', date(2025, 4, 1))
+        Progress.objects.create(goal=first, description='Progress')
+        PeerFeedback.objects.create(
+            feedback_request=FeedbackRequest.objects.create(
+                goal=second,
+                reviewer=self.__class__.reviewer,
+                requested_by=self.__class__.employee
+            ),
+            rating=8,
+            comments='Comments',
+            areas_to_improve='Areas'
+        )
+
+        results = export_parquet(self.output.name, chunk_size=1)
+        rows, files = results['goals']
+        self.assertEqual(rows, 2)
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.output.name, 'goals'))),
+            ['period=2025-01-01', 'period=2025-04-01']
+        )
+
+        goals = sorted(self._read('goals'), key=lambda row: row['id'])
+        self.assertEqual([row['title'] for row in goals], ['First', 'Second'])
+        self.assertEqual(goals[0]['start_period'], date(2025, 1, 1))
+
+        feedback = self._read('peer_feedback')
+        self.assertEqual(len(feedback), 1)
+        self.assertEqual(feedback[0]['goal_id'], second.id)
+        self.assertEqual(
+            feedback[0]['reviewer_id'], self.__class__.reviewer.id
+        )
+        self.assertEqual(feedback[0]['rating'], 8)
+        self.assertEqual(len(self._read('progresses')), 1)
+        self.assertEqual(self._read('expert_evaluations'), [])
+        self.assertTrue(
+            os.path.exists(os.path.join(self.output.name, STATE_FILE))
+        )
+
+    def test_incremental_export(self):
+        """Тест инкрементальной выгрузки измененных строк"""
+        goal = self._create_goal('Goal', date(2025, 1, 1))
+        no_overlap = timedelta(0)
+        export_parquet(self.output.name, overlap=no_overlap)
+
+        results = export_parquet(self.output.name, overlap=no_overlap)
+        self.assertEqual(results['goals'], (0, []))
+
+        goal.status = Goal.STATUS_COMPLETED
+        goal.save()
+        self._create_goal('New', date(2025, 1, 1))
+        results = export_parquet(
+            self.output.name, tables=['goals'], overlap=no_overlap
+        )
+        self.assertEqual(results['goals'][0], 2)
+
+        goals = self._read('goals')
+        self.assertEqual(len(goals), 3)
+        latest = max(
+            (row for row in goals if row['id'] == goal.id),
+            key=lambda row: row['updated_dttm']
+        )
+        self.assertEqual(latest['status'], Goal.STATUS_COMPLETED)
+
+    def test_incremental_export_of_edited_feedback(self):
+        """Тест выгрузки отзывов и запросов, измененных после создания"""
+        request = FeedbackRequest.objects.create(
+            goal=self._create_goal('Goal', date(2025, 1, 1)),
+            reviewer=self.__class__.reviewer,
+            requested_by=self.__class__.employee
+        )
+        no_overlap = timedelta(0)
+        export_parquet(self.output.name, overlap=no_overlap)
+
+        feedback = PeerFeedback.objects.create(
+            feedback_request=request,
+            rating=4,
+            comments='Comments',
+            areas_to_improve='Areas'
+        )
+        export_parquet(self.output.name, overlap=no_overlap)
+        feedback.rating = 9
+        feedback.save()
+        results = export_parquet(self.output.name, overlap=no_overlap)
+
+        # Запрос выгружен при создании и после завершения отзывом
+        self.assertEqual(results['feedback_requests'][0], 0)
+        requests = self._read('feedback_requests')
+        self.assertEqual(
+            [row['status'] for row in requests],
+            [FeedbackRequest.STATUS_PENDING, FeedbackRequest.STATUS_COMPLETED]
+        )
+        self.assertEqual(results['peer_feedback'][0], 1)
+        latest = max(self._read('peer_feedback'),
+                     key=lambda row: row['updated_dttm'])
+        self.assertEqual(latest['rating'], 9)
+
+    def test_overlap_exports_recent_rows_again(self):
+        """Тест повторной выгрузки строк из окна перекрытия"""
+        self._create_goal('Goal', date(2025, 1, 1))
+        export_parquet(self.output.name)
+
+        results = export_parquet(self.output.name, tables=['goals'])
+        self.assertEqual(results['goals'][0], 1)
+
+    def test_full_export_drops_deleted_rows(self):
+        """Тест: полная выгрузка заменяет файлы предыдущих запусков"""
+        kept = self._create_goal('Kept', date(2025, 1, 1))
+        deleted = self._create_goal('Deleted', date(2025, 4, 1))
+        export_parquet(self.output.name, tables=['goals'])
+
+        deleted.delete()
+        results = export_parquet(self.output.name, tables=['goals'],
+                                 full=True)
+
+        self.assertEqual(results['goals'][0], 1)
+        self.assertTrue(all(os.path.exists(path)
+                            for path in results['goals'][1]))
+        self.assertEqual(
+            [row['id'] for row in self._read('goals')], [kept.id]
+        )
+        self.assertEqual(
+            os.listdir(os.path.join(self.output.name, 'goals')),
+            ['period=2025-01-01']
+        )
+        self.assertEqual(
+            sorted(os.listdir(self.output.name)), [STATE_FILE, 'goals']
+        )
+
+    def test_export_command(self):
+        """Тест выгрузки через management-команду"""
+        self._create_goal('Goal', date(2025, 1, 1))
+        out = StringIO()
+        call_command(
+            'export_parquet', self.output.name,
+            '--table', 'goals', '--full',
+            stdout=out
+        )
+        self.assertIn('goals: 1 row(s), 1 file(s)', out.getvalue())
+        self.assertEqual(len(self._read('goals')), 1)
@@ -0,0 +1,195 @@
+import csv
+import io
+import os
+import tempfile
+from datetime import date
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User, Employee
+from goals.models import Goal
+from feedback.models import SelfAssessment, FeedbackRequest, PeerFeedback, \
+    ExpertEvaluation
+
+
+class ReviewResultsExportTestCase(APITestCase):
+    """Тесты потоковой выгрузки результатов оценки"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создание данных для всех тестов"""
+        cls.admin_user = User.objects.create_user(
+            username='admin',
+            password='password123',
+            email='admin@example.com',
+            role='admin'
+        )
+
+        def create_employee(username, manager=None):
+            user = User.objects.create_user(
+                username=username,
+                password='password123',
+                email=f'{username}@example.com',
+                first_name=username.capitalize(),
+                last_name='User',
+                role='employee'
+            )
+            return Employee.objects.create(
+                user=user,
+                position='Developer',
+                hire_dt=date(2024, 1, 1),
+                manager=manager
+            )
+
+        cls.head = create_employee('head')
+        cls.lead = create_employee('lead', cls.head)
+        cls.dev = create_employee('dev', cls.lead)
+        cls.outsider = create_employee('outsider')
+
+        def create_goal(employee, goal_status, start=date(2025, 1, 1)):
+            return Goal.objects.create(
+                employee=employee,
+                title=f'{employee.user.username} goal',
+                description='Description',
+                expected_results='Expected Results',
+                start_period=start,
+                end_period=start.replace(month=3, day=31),
+                status=goal_status
+            )
+
+        cls.dev_goal = create_goal(cls.dev, Goal.STATUS_PENDING_ASSESSMENT)
+        SelfAssessment.objects.create(
+            goal=cls.dev_goal,
+            rating=8,
+            comments='Comments',
+            areas_to_improve='Areas'
+        )
+        for reviewer, rating in [(cls.lead, 6), (cls.outsider, 9)]:
+            PeerFeedback.objects.create(
+                feedback_request=FeedbackRequest.objects.create(
+                    goal=cls.dev_goal,
+                    reviewer=reviewer,
+                    requested_by=cls.dev
+                ),
+                rating=rating,
+                comments='Comments',
+                areas_to_improve='Areas'
+            )
+        ExpertEvaluation.objects.create(
+            goal=cls.dev_goal,
+            expert=cls.head,
+            final_rating=7,
+            comments='Comments',
+            areas_to_improve='Areas'
+        )
+
+        create_goal(cls.lead, Goal.STATUS_IN_PROGRESS)
+        create_goal(cls.outsider, Goal.STATUS_DRAFT)
+        create_goal(cls.dev, Goal.STATUS_COMPLETED, start=date(2024, 1, 1))
+
+    def setUp(self):
+        self.url = reverse('analytics-review-results')
+
+    def _rows(self, response):
+        content = b''.join(response.streaming_content).decode('utf-8')
+        return list(csv.DictReader(io.StringIO(content)))
+
+    def test_export_all_goals(self):
+        """Тест выгрузки всех целей с оценками"""
+        self.client.force_authenticate(user=self.__class__.admin_user)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+
+        rows = self._rows(response)
+        self.assertEqual(len(rows), 4)
+        row = next(
+            row for row in rows
+            if row['goal_id'] == str(self.__class__.dev_goal.id)
+        )
+        self.assertEqual(row['employee_name'], 'Dev User')
+        self.assertEqual(row['manager_name'], 'Lead User')
+        self.assertEqual(row['self_rating'], '8')
+        self.assertEqual(row['peer_ratings'], '6;9')
+        self.assertEqual(row['peer_count'], '2')
+        self.assertEqual(row['peer_mean'], '7.5')
+        self.assertEqual(row['final_rating'], '7')
+
+    def test_export_filters(self):
+        """Тест фильтрации по периоду, статусу и подразделению"""
+        self.client.force_authenticate(user=self.__class__.admin_user)
+
+        response = self.client.get(self.url, {
+            'start_period': '2025-01-01',
+            'manager': self.__class__.lead.id
+        })
+        rows = self._rows(response)
+        self.assertEqual(
+            sorted(row['title'] for row in rows),
+            ['dev goal', 'lead goal']
+        )
+
+        response = self.client.get(self.url, {
+            'status': 'draft,in_progress'
+        })
+        rows = self._rows(response)
+        self.assertEqual(
+            sorted(row['title'] for row in rows),
+            ['lead goal', 'outsider goal']
+        )
+
+    def test_export_invalid_status(self):
+        """Тест ошибки при неизвестном статусе"""
+        self.client.force_authenticate(user=self.__class__.admin_user)
+
+        response = self.client.get(self.url, {'status': 'unknown'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_forbidden_for_employee(self):
+        """Тест запрета выгрузки для обычного сотрудника"""
+        self.client.force_authenticate(user=self.__class__.dev.user)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_requires_authentication(self):
+        """Тест запрета выгрузки для анонимного пользователя"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_export_command(self):
+        """Тест выгрузки через management-команду"""
+        out = io.StringIO()
+        call_command(
+            'export_review_results',
+            '--status', 'completed',
+            '--end-period', '2024-12-31',
+            '--chunk-size', '1',
+            stdout=out
+        )
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['title'], 'dev goal')
+
+    def test_export_command_to_file(self):
+        """Тест выгрузки management-командой в файл"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'results.csv')
+        err = io.StringIO()
+        call_command(
+            'export_review_results',
+            '--status', 'completed',
+            '--end-period', '2024-12-31',
+            '--output', path,
+            stderr=err
+        )
+        self.assertIn('Exported 1 goal(s)', err.getvalue())
+        with open(path, newline='', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual([row['title'] for row in rows], ['dev goal'])
@@ -0,0 +1,168 @@
+from datetime import date
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User, Employee
+from goals.models import Goal
+from feedback.models import SelfAssessment, FeedbackRequest, PeerFeedback, \
+    ExpertEvaluation
+
+
+class ReviewCycleAnalyticsAPITestCase(APITestCase):
+    """Тесты API аналитики цикла оценки"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создание данных для всех тестов"""
+        cls.admin_user = User.objects.create_user(
+            username='admin',
+            password='password123',
+            email='admin@example.com',
+            role='admin'
+        )
+
+        def create_employee(username, position, manager=None):
+            user = User.objects.create_user(
+                username=username,
+                password='password123',
+                email=f'{username}@example.com',
+                role='employee'
+            )
+            return Employee.objects.create(
+                user=user,
+                position=position,
+                hire_dt=date(2024, 1, 1),
+                manager=manager
+            )
+
+        cls.head = create_employee('head', 'Head')
+        cls.lead = create_employee('lead', 'Team Lead', cls.head)
+        cls.dev1 = create_employee('dev1', 'Developer', cls.lead)
+        cls.dev2 = create_employee('dev2', 'Developer', cls.lead)
+        cls.expert = create_employee('expert', 'Tech Lead')
+
+        def create_goal(employee, self_rating, peer_ratings, final_rating,
+                        start=date(2025, 1, 1), end=date(2025, 3, 31)):
+            goal = Goal.objects.create(
+                employee=employee,
+                title='Goal',
+                description='Description',
+                expected_results='Expected Results',
+                start_period=start,
+                end_period=end,
+                status=Goal.STATUS_PENDING_ASSESSMENT
+            )
+            SelfAssessment.objects.create(
+                goal=goal,
+                rating=self_rating,
+                comments='Comments',
+                areas_to_improve='Areas'
+            )
+            for reviewer, rating in zip([cls.head, cls.expert], peer_ratings):
+                PeerFeedback.objects.create(
+                    feedback_request=FeedbackRequest.objects.create(
+                        goal=goal,
+                        reviewer=reviewer,
+                        requested_by=employee
+                    ),
+                    rating=rating,
+                    comments='Comments',
+                    areas_to_improve='Areas'
+                )
+            if final_rating:
+                ExpertEvaluation.objects.create(
+                    goal=goal,
+                    expert=cls.expert,
+                    final_rating=final_rating,
+                    comments='Comments',
+                    areas_to_improve='Areas'
+                )
+            return goal
+
+        create_goal(cls.dev1, 9, [6, 8], 7)
+        create_goal(cls.dev2, 7, [4, 6], 5)
+        create_goal(cls.lead, 8, [8], None)
+        create_goal(
+            cls.dev1, 10, [10], 10,
+            start=date(2024, 1, 1), end=date(2024, 3, 31)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('analytics-review-cycle')
+        self.period = {
+            'start_period': '2025-01-01',
+            'end_period': '2025-12-31'
+        }
+
+    def test_review_cycle_report(self):
+        """Тест расчета статистики за период"""
+        self.client.force_authenticate(user=self.__class__.admin_user)
+
+        response = self.client.get(self.url, self.period)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.data
+        self.assertEqual(data['totals']['goals'], 3)
+        self.assertEqual(data['totals']['peer_feedback'], 5)
+        self.assertEqual(data['totals']['expert_evaluations'], 2)
+
+        self.assertEqual(data['ratings']['self']['count'], 3)
+        self.assertAlmostEqual(data['ratings']['self']['mean'], 8.0)
+        self.assertAlmostEqual(data['ratings']['peer']['p50'], 7.0)
+        self.assertEqual(data['ratings']['expert']['histogram'][4], 1)
+        self.assertAlmostEqual(
+            data['gaps']['self_minus_peer']['mean'], 1.333, places=3
+        )
+        self.assertAlmostEqual(data['gaps']['peer_minus_expert']['mean'], 0.0)
+
+        by_position = {row['position']: row for row in data['by_position']}
+        self.assertEqual(by_position['Developer']['goals'], 2)
+        self.assertAlmostEqual(by_position['Developer']['self']['mean'], 8.0)
+        self.assertAlmostEqual(by_position['Team Lead']['peer']['mean'], 8.0)
+
+        by_manager = {
+            row['manager_id']: row for row in data['by_manager_subtree']
+        }
+        self.assertEqual(by_manager[self.__class__.lead.id]['goals'], 2)
+        self.assertEqual(by_manager[self.__class__.head.id]['goals'], 3)
+        self.assertAlmostEqual(
+            by_manager[self.__class__.head.id]['expert']['mean'], 6.0
+        )
+
+    def test_review_cycle_report_is_cached(self):
+        """Тест кеширования отчета по периоду"""
+        self.client.force_authenticate(user=self.__class__.admin_user)
+
+        first = self.client.get(self.url, self.period)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, self.period)
+        self.assertEqual(first.data, second.data)
+
+        refreshed = self.client.get(self.url, {**self.period, 'refresh': 1})
+        self.assertEqual(refreshed.status_code, status.HTTP_200_OK)
+
+    def test_review_cycle_invalid_period(self):
+        """Тест ошибки при некорректном периоде"""
+        self.client.force_authenticate(user=self.__class__.admin_user)
+
+        response = self.client.get(self.url, {
+            'start_period': '2025-12-31',
+            'end_period': '2025-01-01'
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_review_cycle_forbidden_for_employee(self):
+        """Тест запрета доступа для обычного сотрудника"""
+        self.client.force_authenticate(user=self.__class__.dev1.user)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_review_cycle_requires_authentication(self):
+        """Тест запрета доступа для анонимного пользователя"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,53 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from analytics.stats import group_stats, overall_stats, rating_histogram
+
+
+class GroupStatsTestCase(SimpleTestCase):
+    """Тесты векторизованной групповой статистики"""
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.n_groups = 7
+        self.values = rng.integers(1, 11, size=500).astype(np.float64)
+        self.values[rng.random(500) < 0.1] = np.nan
+        self.groups = rng.integers(0, self.n_groups - 1, size=500)
+
+    def test_matches_per_group_numpy(self):
+        """Тест совпадения с поэлементным расчетом по каждой группе"""
+        stats = group_stats(self.values, self.groups, self.n_groups)
+
+        for group in range(self.n_groups - 1):
+            values = self.values[self.groups == group]
+            values = values[~np.isnan(values)]
+            self.assertEqual(stats['count'][group], len(values))
+            self.assertAlmostEqual(stats['mean'][group], values.mean())
+            self.assertAlmostEqual(stats['std'][group], values.std())
+            self.assertEqual(stats['min'][group], values.min())
+            self.assertEqual(stats['max'][group], values.max())
+            for q in (10, 25, 50, 75, 90):
+                self.assertAlmostEqual(
+                    stats[f'p{q}'][group], np.percentile(values, q)
+                )
+
+    def test_empty_group_is_nan(self):
+        """Тест NaN для групп без значений"""
+        stats = group_stats(self.values, self.groups, self.n_groups)
+
+        empty = self.n_groups - 1
+        self.assertEqual(stats['count'][empty], 0)
+        self.assertTrue(np.isnan(stats['mean'][empty]))
+        self.assertTrue(np.isnan(stats['p50'][empty]))
+
+    def test_overall_stats_and_histogram(self):
+        """Тест общей статистики и гистограммы оценок"""
+        values = np.array([1, 2, 2, 10, np.nan])
+
+        stats = overall_stats(values)
+        self.assertEqual(stats['count'], 4)
+        self.assertAlmostEqual(stats['p50'], 2.0)
+        self.assertEqual(
+            rating_histogram(values).tolist(),
+            [1, 2, 0, 0, 0, 0, 0, 0, 0, 1]
+        )
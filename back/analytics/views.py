@@ -0,0 +1,125 @@
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from accounts.permissions import IsAdminOnly
+from .exports import review_results_queryset, review_results_rows, \
+    stream_csv
+from .permissions import IsExpertiseLeaderOrAdmin
+from .reports import get_review_cycle_report, get_agreement_report
+from .serializers import AnalyticsPeriodSerializer, \
+    ReviewResultsExportSerializer
+
+PERIOD_PARAMETERS = [
+    OpenApiParameter(
+        name='start_period',
+        description='Начало периода (цели, пересекающиеся с периодом)',
+        required=False,
+        type=str
+    ),
+    OpenApiParameter(
+        name='end_period',
+        description='Конец периода',
+        required=False,
+        type=str
+    ),
+    OpenApiParameter(
+        name='refresh',
+        description='Пересчитать отчет, игнорируя кеш',
+        required=False,
+        type=bool
+    ),
+]
+
+
+class AnalyticsViewSet(viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticated, IsAdminOnly]
+    serializer_class = AnalyticsPeriodSerializer
+
+    def get_serializer_class(self):
+        if self.action == 'review_results':
+            return ReviewResultsExportSerializer
+        return AnalyticsPeriodSerializer
+
+    def get_period(self):
+        serializer = self.get_serializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    @extend_schema(
+        tags=['analytics'],
+        description="Статистика оценок за период: распределения, "
+                    "перцентили, разрывы между самооценкой, оценками коллег "
+                    "и экспертов в разрезе должностей и подразделений",
+        parameters=PERIOD_PARAMETERS
+    )
+    @action(detail=False, methods=['get'], url_path='review-cycle')
+    def review_cycle(self, request):
+        period = self.get_period()
+        report = get_review_cycle_report(
+            period.get('start_period'),
+            period.get('end_period'),
+            refresh=period['refresh']
+        )
+        return Response(report)
+
+    @extend_schema(
+        tags=['analytics'],
+        description="Согласованность оценок коллег (альфа Криппендорфа, "
+                    "ICC) по командам и рецензенты, систематически "
+                    "отклоняющиеся от соавторов отзывов",
+        parameters=PERIOD_PARAMETERS
+    )
+    @action(detail=False, methods=['get'],
+            permission_classes=[IsExpertiseLeaderOrAdmin])
+    def agreement(self, request):
+        period = self.get_period()
+        report = get_agreement_report(
+            period.get('start_period'),
+            period.get('end_period'),
+            refresh=period['refresh']
+        )
+        return Response(report)
+
+    @extend_schema(
+        tags=['analytics'],
+        description="Потоковая выгрузка результатов оценки в CSV: цель, "
+                    "сотрудник, руководитель, самооценка, оценки коллег "
+                    "и итоговая оценка",
+        parameters=PERIOD_PARAMETERS[:2] + [
+            OpenApiParameter(
+                name='status',
+                description='Статусы целей через запятую',
+                required=False,
+                type=str
+            ),
+            OpenApiParameter(
+                name='manager',
+                description='ID руководителя: выгрузить только его '
+                            'подразделение (все уровни)',
+                required=False,
+                type=int
+            ),
+        ],
+        responses={(200, 'text/csv'): str}
+    )
+    @action(detail=False, methods=['get'], url_path='review-results')
+    def review_results(self, request):
+        params = self.get_period()
+        queryset = review_results_queryset(
+            start_period=params.get('start_period'),
+            end_period=params.get('end_period'),
+            statuses=params.get('status'),
+            manager_id=params.get('manager')
+        )
+        response = StreamingHttpResponse(
+            stream_csv(review_results_rows(queryset)),
+            content_type='text/csv; charset=utf-8'
+        )
+        response['Content-Disposition'] = (
+            'attachment; filename="review-results.csv"'
+        )
+        return response
@@ -65,4 +65,41 @@ def use_temp_storage_for_tests():
         except ImportError:
             # Если не получилось импортировать модель, просто переопределяем настройки
             with override_settings(**storage_settings):
-                yield temp_dir 
\ No newline at end of file
+                yield temp_dir 
+
+
+@pytest.fixture(autouse=True)
+def disable_invalidation_listener(settings):
+    """
+    Слушатель инвалидации держит отдельное соединение с тестовой базой;
+    тесты шины запускают его явно
+    """
+    settings.INVALIDATION_LISTENER = False
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    """
+    Запросы API в тестах проверяются на N+1; превышение бюджета
+    запросов действия (query_budgets) завершает тест ошибкой
+    """
+    settings.QUERY_WATCH = True
+    settings.QUERY_BUDGET_STRICT = True
+
+
+@pytest.fixture(autouse=True)
+def disable_metrics(settings):
+    """Метрики пишутся в файлы в памяти; тесты метрик включают их явно"""
+    settings.METRICS_ENABLED = False
+
+
+@pytest.fixture(autouse=True)
+def disable_sampling_profiler(settings):
+    """Поток выборки стеков не запускается в тестах"""
+    settings.SAMPLING_PROFILER_ENABLED = False
+
+
+@pytest.fixture(autouse=True)
+def disable_slow_query_log(settings):
+    """Журнал медленных запросов не пишется в тестах"""
+    settings.SLOW_QUERY_LOG_ENABLED = False
@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 
-from .models import SelfAssessment, FeedbackRequest, PeerFeedback, ExpertEvaluation
+from .models import SelfAssessment, FeedbackRequest, PeerFeedback, \
+    ExpertEvaluation, GoalFeedbackStats
 
 
 @admin.register(SelfAssessment)
@@ -63,3 +64,30 @@ class ExpertEvaluationAdmin(admin.ModelAdmin):
         'areas_to_improve'
         )
     raw_id_fields = ('goal', 'expert')
+
+
+@admin.register(GoalFeedbackStats)
+class GoalFeedbackStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        'goal',
+        'requests_count',
+        'pending_requests_count',
+        'peer_feedback_count',
+        'peer_rating_mean',
+        'self_rating',
+        'final_rating',
+        'updated_dttm'
+    )
+    list_filter = ('final_rating',)
+    search_fields = ('goal__title',)
+    raw_id_fields = ('goal',)
+    readonly_fields = (
+        'requests_count',
+        'pending_requests_count',
+        'peer_feedback_count',
+        'peer_rating_sum',
+        'peer_rating_mean',
+        'self_rating',
+        'final_rating',
+        'updated_dttm'
+    )
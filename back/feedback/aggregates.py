@@ -0,0 +1,12 @@
+from django.db.models import Aggregate, FloatField
+
+
+class Median(Aggregate):
+    """
+    Медиана значений, вычисляемая в PostgreSQL через
+    PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY ...).
+    """
+    function = 'PERCENTILE_CONT'
+    name = 'Median'
+    template = '%(function)s(0.5) WITHIN GROUP (ORDER BY %(expressions)s)'
+    output_field = FloatField()
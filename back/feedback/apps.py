@@ -6,3 +6,13 @@ class FeedbackConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'feedback'
     verbose_name = _('Обратная связь')
+
+    def ready(self):
+        from feedback.models import SelfAssessment, FeedbackRequest, \
+            PeerFeedback, ExpertEvaluation
+        from talentum import invalidation
+
+        invalidation.track(SelfAssessment, 'goal')
+        invalidation.track(FeedbackRequest, 'goal')
+        invalidation.track(PeerFeedback, 'feedback_request')
+        invalidation.track(ExpertEvaluation, 'goal')
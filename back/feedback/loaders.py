@@ -0,0 +1,14 @@
+from feedback.models import FeedbackRequest
+from talentum.dataloader import Loader
+
+
+class FeedbackRequestLoader(Loader):
+    """Запрос отзыва с целью и рецензентом по feedback_request_id."""
+
+    def key(self, peer_feedback):
+        return peer_feedback.feedback_request_id
+
+    def batch(self, keys):
+        return FeedbackRequest.objects.select_related(
+            'goal', 'reviewer__user', 'reviewer__manager__user'
+        ).in_bulk(keys)
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from feedback.models import GoalFeedbackStats
+
+
+class Command(BaseCommand):
+    help = 'Recalculates denormalized feedback statistics for goals'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--goal',
+            type=int,
+            action='append',
+            dest='goal_ids',
+            help='Goal ID to rebuild (can be repeated). Defaults to all goals.'
+        )
+
+    def handle(self, *args, **options):
+        goal_ids = options.get('goal_ids')
+
+        with transaction.atomic():
+            processed = GoalFeedbackStats.objects.rebuild(goal_ids=goal_ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt feedback statistics for {processed} goal(s)')
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-19 01:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0002_expertevaluation_feedbackrequest_peerfeedback'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedbackrequest',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['reviewer', 'created_dttm'], name='feedback_req_inbox_idx'),
+        ),
+    ]
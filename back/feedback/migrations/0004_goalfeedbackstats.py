@@ -0,0 +1,61 @@
+# Generated by Django 5.2.1 on 2026-10-19 01:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+POPULATE_SQL = """
+INSERT INTO goals_feedback_stats (
+    goal_id, requests_count, pending_requests_count, peer_feedback_count,
+    peer_rating_sum, peer_rating_mean, self_rating, final_rating,
+    updated_dttm
+)
+SELECT
+    g.id,
+    COUNT(fr.id),
+    COUNT(fr.id) FILTER (WHERE fr.status = 'pending'),
+    COUNT(pf.id),
+    COALESCE(SUM(pf.rating), 0),
+    AVG(pf.rating)::double precision,
+    sa.rating,
+    ee.final_rating,
+    NOW()
+FROM goals g
+LEFT JOIN feedback_requests fr ON fr.goal_id = g.id
+LEFT JOIN peer_feedback pf ON pf.feedback_request_id = fr.id
+LEFT JOIN goals_self_assessments sa ON sa.goal_id = g.id
+LEFT JOIN expert_evaluations ee ON ee.goal_id = g.id
+GROUP BY g.id, sa.rating, ee.final_rating
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0003_feedbackrequest_inbox_index'),
+        ('goals', '0002_delete_selfassessment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoalFeedbackStats',
+            fields=[
+                ('goal', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feedback_stats', serialize=False, to='goals.goal', verbose_name='Цель')),
+                ('requests_count', models.PositiveIntegerField(default=0, verbose_name='Запросов отзывов')),
+                ('pending_requests_count', models.PositiveIntegerField(default=0, verbose_name='Ожидающих запросов отзывов')),
+                ('peer_feedback_count', models.PositiveIntegerField(default=0, verbose_name='Отзывов коллег')),
+                ('peer_rating_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок коллег')),
+                ('peer_rating_mean', models.FloatField(blank=True, null=True, verbose_name='Средняя оценка коллег')),
+                ('self_rating', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Самооценка')),
+                ('final_rating', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Итоговая оценка')),
+                ('updated_dttm', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'Статистика оценок цели',
+                'verbose_name_plural': 'Статистика оценок целей',
+                'db_table': 'goals_feedback_stats',
+                'indexes': [models.Index(fields=['peer_rating_mean'], name='goal_stats_peer_mean_idx'), models.Index(fields=['final_rating'], name='goal_stats_final_rating_idx'), models.Index(fields=['pending_requests_count'], name='goal_stats_pending_idx')],
+            },
+        ),
+        migrations.RunSQL(POPULATE_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+# Существующие строки считаются не изменявшимися после создания
+COPY_CREATED_SQL = """
+UPDATE goals_self_assessments SET updated_dttm = created_dttm;
+UPDATE feedback_requests SET updated_dttm = created_dttm;
+UPDATE peer_feedback SET updated_dttm = created_dttm;
+UPDATE expert_evaluations SET updated_dttm = created_dttm;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0004_goalfeedbackstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='selfassessment',
+            name='updated_dttm',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Дата обновления'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='feedbackrequest',
+            name='updated_dttm',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Дата обновления'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='peerfeedback',
+            name='updated_dttm',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Дата обновления'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='expertevaluation',
+            name='updated_dttm',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Дата обновления'),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(COPY_CREATED_SQL, migrations.RunSQL.noop),
+    ]
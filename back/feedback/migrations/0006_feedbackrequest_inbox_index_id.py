@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0005_updated_dttm'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='feedbackrequest',
+            name='feedback_req_inbox_idx',
+        ),
+        migrations.AddIndex(
+            model_name='feedbackrequest',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['reviewer', 'created_dttm', 'id'], name='feedback_req_inbox_idx'),
+        ),
+    ]
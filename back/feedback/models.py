@@ -1,4 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, FloatField, Q, Sum
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from accounts.models import Employee
@@ -26,6 +29,10 @@ class SelfAssessment(models.Model):
         _('Дата создания'),
         auto_now_add=True
     )
+    updated_dttm = models.DateTimeField(
+        _('Дата обновления'),
+        auto_now=True
+    )
 
     class Meta:
         verbose_name = _('Самооценка')
@@ -35,6 +42,20 @@ class SelfAssessment(models.Model):
     def __str__(self):
         return f"Самооценка для {self.goal.title}"
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            GoalFeedbackStats.objects.set_values(
+                self.goal_id,
+                self_rating=self.rating
+            )
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            GoalFeedbackStats.objects.rebuild(goal_ids=[self.goal_id])
+        return result
+
 
 class FeedbackRequest(models.Model):
     STATUS_PENDING = 'pending'
@@ -77,16 +98,45 @@ class FeedbackRequest(models.Model):
         _('Дата создания'),
         auto_now_add=True
     )
+    updated_dttm = models.DateTimeField(
+        _('Дата обновления'),
+        auto_now=True
+    )
     
     class Meta:
         verbose_name = _('Запрос отзыва')
         verbose_name_plural = _('Запросы отзывов')
         unique_together = ('goal', 'reviewer')
         db_table = 'feedback_requests'
+        indexes = [
+            models.Index(
+                fields=['reviewer', 'created_dttm', 'id'],
+                name='feedback_req_inbox_idx',
+                condition=Q(status='pending')
+            ),
+        ]
     
     def __str__(self):
         return f"Запрос отзыва от {self.requested_by.user.get_full_name()} для {self.reviewer.user.get_full_name()}"
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                is_pending = self.status == self.STATUS_PENDING
+                GoalFeedbackStats.objects.apply_delta(
+                    self.goal_id,
+                    requests_count=1,
+                    pending_requests_count=1 if is_pending else 0
+                )
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            GoalFeedbackStats.objects.rebuild(goal_ids=[self.goal_id])
+        return result
+
 
 class PeerFeedback(models.Model):
     feedback_request = models.OneToOneField(
@@ -109,6 +159,10 @@ class PeerFeedback(models.Model):
         _('Дата создания'),
         auto_now_add=True
     )
+    updated_dttm = models.DateTimeField(
+        _('Дата обновления'),
+        auto_now=True
+    )
     
     class Meta:
         verbose_name = _('Отзыв коллеги')
@@ -119,10 +173,38 @@ class PeerFeedback(models.Model):
         return f"Отзыв от {self.feedback_request.reviewer.user.get_full_name()} на цель {self.feedback_request.goal.title}"
     
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        if self.feedback_request.status != FeedbackRequest.STATUS_COMPLETED:
-            self.feedback_request.status = FeedbackRequest.STATUS_COMPLETED
-            self.feedback_request.save(update_fields=['status'])
+        with transaction.atomic():
+            if self._state.adding:
+                count_delta, rating_delta = 1, self.rating
+            else:
+                old_rating = PeerFeedback.objects.filter(
+                    pk=self.pk
+                ).values_list('rating', flat=True).get()
+                count_delta, rating_delta = 0, self.rating - old_rating
+
+            super().save(*args, **kwargs)
+
+            pending_delta = 0
+            if self.feedback_request.status != FeedbackRequest.STATUS_COMPLETED:
+                pending_delta = -1
+                self.feedback_request.status = FeedbackRequest.STATUS_COMPLETED
+                self.feedback_request.save(
+                    update_fields=['status', 'updated_dttm']
+                )
+
+            GoalFeedbackStats.objects.apply_delta(
+                self.feedback_request.goal_id,
+                peer_feedback_count=count_delta,
+                peer_rating_sum=rating_delta,
+                pending_requests_count=pending_delta
+            )
+
+    def delete(self, *args, **kwargs):
+        goal_id = self.feedback_request.goal_id
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            GoalFeedbackStats.objects.rebuild(goal_ids=[goal_id])
+        return result
 
 
 class ExpertEvaluation(models.Model):
@@ -152,6 +234,10 @@ class ExpertEvaluation(models.Model):
         _('Дата создания'),
         auto_now_add=True
     )
+    updated_dttm = models.DateTimeField(
+        _('Дата обновления'),
+        auto_now=True
+    )
     
     class Meta:
         verbose_name = _('Итоговая оценка от лидера профессии')
@@ -162,7 +248,197 @@ class ExpertEvaluation(models.Model):
         return f"Оценка от {self.expert.user.get_full_name()} на цель {self.goal.title}"
     
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        if self.goal.status != Goal.STATUS_COMPLETED:
-            self.goal.status = Goal.STATUS_COMPLETED
-            self.goal.save(update_fields=['status'])
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if self.goal.status != Goal.STATUS_COMPLETED:
+                self.goal.status = Goal.STATUS_COMPLETED
+                self.goal.save(update_fields=['status', 'updated_dttm'])
+            GoalFeedbackStats.objects.set_values(
+                self.goal_id,
+                final_rating=self.final_rating
+            )
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            GoalFeedbackStats.objects.rebuild(goal_ids=[self.goal_id])
+        return result
+
+
+class GoalFeedbackStatsManager(models.Manager):
+    REBUILD_BATCH_SIZE = 2000
+
+    def apply_delta(self, goal_id, **deltas):
+        """
+        Инкрементально изменяет счетчики цели одним UPDATE.
+        Среднее пересчитывается в том же выражении из новых значений.
+        """
+        self.get_or_create(goal_id=goal_id)
+
+        count_delta = deltas.get('peer_feedback_count', 0)
+        sum_delta = deltas.get('peer_rating_sum', 0)
+        new_count = F('peer_feedback_count') + count_delta
+        new_sum = F('peer_rating_sum') + sum_delta
+
+        updates = {
+            field: F(field) + delta
+            for field, delta in deltas.items()
+        }
+        if count_delta or sum_delta:
+            updates['peer_rating_mean'] = (
+                Cast(new_sum, FloatField()) / new_count
+            )
+        updates['updated_dttm'] = timezone.now()
+        self.filter(goal_id=goal_id).update(**updates)
+
+    def set_values(self, goal_id, **values):
+        values['updated_dttm'] = timezone.now()
+        self.update_or_create(goal_id=goal_id, defaults=values)
+
+    def rebuild(self, goal_ids=None):
+        """
+        Полностью пересчитывает агрегаты по исходным таблицам.
+        Возвращает количество обработанных целей.
+        """
+        goals = Goal.objects.order_by()
+        if goal_ids is not None:
+            goals = goals.filter(id__in=goal_ids)
+
+        rows = goals.values('id').annotate(
+            requests_count=Count('feedback_requests'),
+            pending_requests_count=Count(
+                'feedback_requests',
+                filter=Q(
+                    feedback_requests__status=FeedbackRequest.STATUS_PENDING
+                )
+            ),
+            peer_feedback_count=Count('feedback_requests__feedback'),
+            peer_rating_sum=Coalesce(
+                Sum('feedback_requests__feedback__rating'), 0
+            ),
+            self_rating=F('self_assessment__rating'),
+            final_rating=F('expert_evaluation__final_rating'),
+        )
+
+        now = timezone.now()
+        processed = 0
+        batch = []
+        for row in rows.iterator(chunk_size=self.REBUILD_BATCH_SIZE):
+            count = row['peer_feedback_count']
+            batch.append(self.model(
+                goal_id=row['id'],
+                requests_count=row['requests_count'],
+                pending_requests_count=row['pending_requests_count'],
+                peer_feedback_count=count,
+                peer_rating_sum=row['peer_rating_sum'],
+                peer_rating_mean=(
+                    row['peer_rating_sum'] / count if count else None
+                ),
+                self_rating=row['self_rating'],
+                final_rating=row['final_rating'],
+                updated_dttm=now,
+            ))
+            if len(batch) >= self.REBUILD_BATCH_SIZE:
+                processed += self._upsert(batch)
+                batch = []
+        if batch:
+            processed += self._upsert(batch)
+        return processed
+
+    def _upsert(self, batch):
+        self.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=['goal'],
+            update_fields=[
+                'requests_count',
+                'pending_requests_count',
+                'peer_feedback_count',
+                'peer_rating_sum',
+                'peer_rating_mean',
+                'self_rating',
+                'final_rating',
+                'updated_dttm',
+            ]
+        )
+        return len(batch)
+
+
+class GoalFeedbackStats(models.Model):
+    """
+    Денормализованные агрегаты оценок по цели.
+    Обновляются в транзакциях сохранения отзывов и оценок,
+    полностью пересчитываются командой rebuild_goal_feedback_stats.
+    """
+    goal = models.OneToOneField(
+        Goal,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feedback_stats',
+        verbose_name=_('Цель')
+    )
+    requests_count = models.PositiveIntegerField(
+        _('Запросов отзывов'),
+        default=0
+    )
+    pending_requests_count = models.PositiveIntegerField(
+        _('Ожидающих запросов отзывов'),
+        default=0
+    )
+    peer_feedback_count = models.PositiveIntegerField(
+        _('Отзывов коллег'),
+        default=0
+    )
+    peer_rating_sum = models.PositiveIntegerField(
+        _('Сумма оценок коллег'),
+        default=0
+    )
+    peer_rating_mean = models.FloatField(
+        _('Средняя оценка коллег'),
+        null=True,
+        blank=True
+    )
+    self_rating = models.PositiveSmallIntegerField(
+        _('Самооценка'),
+        null=True,
+        blank=True
+    )
+    final_rating = models.PositiveSmallIntegerField(
+        _('Итоговая оценка'),
+        null=True,
+        blank=True
+    )
+    updated_dttm = models.DateTimeField(
+        _('Дата обновления'),
+        default=timezone.now
+    )
+
+    objects = GoalFeedbackStatsManager()
+
+    class Meta:
+        verbose_name = _('Статистика оценок цели')
+        verbose_name_plural = _('Статистика оценок целей')
+        db_table = 'goals_feedback_stats'
+        indexes = [
+            models.Index(
+                fields=['peer_rating_mean'],
+                name='goal_stats_peer_mean_idx'
+            ),
+            models.Index(
+                fields=['final_rating'],
+                name='goal_stats_final_rating_idx'
+            ),
+            models.Index(
+                fields=['pending_requests_count'],
+                name='goal_stats_pending_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"Статистика оценок для цели #{self.goal_id}"
+
+    @property
+    def completion_ratio(self):
+        if not self.requests_count:
+            return None
+        return self.peer_feedback_count / self.requests_count
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class FeedbackInboxCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация для входящих запросов отзывов.
+    Курсор требует уникальной сортировки: запросы с одинаковым
+    created_dttm (массовая загрузка) упорядочиваются по id. Сортировка
+    совпадает с частичным индексом (reviewer_id, created_dttm, id)
+    WHERE status = 'pending'.
+    """
+    ordering = ('-created_dttm', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -1,7 +1,10 @@
 from rest_framework import serializers
 
 from accounts.serializers import EmployeeSerializer
-from .models import SelfAssessment, FeedbackRequest, PeerFeedback, ExpertEvaluation
+from talentum.dataloader import BatchListSerializer, get_loader
+from .loaders import FeedbackRequestLoader
+from .models import SelfAssessment, FeedbackRequest, PeerFeedback, \
+    ExpertEvaluation, GoalFeedbackStats
 
 
 class SelfAssessmentSerializer(serializers.ModelSerializer):
@@ -24,6 +27,7 @@ class FeedbackRequestListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = FeedbackRequest
+        list_serializer_class = BatchListSerializer
         fields = (
             'id',
             'goal',
@@ -37,6 +41,57 @@ class FeedbackRequestListSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'goal', 'status', 'status_display', 'created_dttm')
 
 
+class GoalFeedbackStatsSerializer(serializers.ModelSerializer):
+    completion_ratio = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = GoalFeedbackStats
+        fields = (
+            'requests_count',
+            'pending_requests_count',
+            'peer_feedback_count',
+            'peer_rating_sum',
+            'peer_rating_mean',
+            'completion_ratio',
+            'self_rating',
+            'final_rating'
+        )
+        read_only_fields = fields
+
+
+class FeedbackInboxSerializer(serializers.ModelSerializer):
+    goal_title = serializers.CharField(source='goal.title', read_only=True)
+    goal_status = serializers.CharField(source='goal.status', read_only=True)
+    goal_owner_id = serializers.IntegerField(
+        source='goal.employee_id',
+        read_only=True
+    )
+    goal_owner_name = serializers.CharField(
+        source='goal.employee.user.get_full_name',
+        read_only=True
+    )
+    requested_by_name = serializers.CharField(
+        source='requested_by.user.get_full_name',
+        read_only=True
+    )
+
+    class Meta:
+        model = FeedbackRequest
+        fields = (
+            'id',
+            'goal',
+            'goal_title',
+            'goal_status',
+            'goal_owner_id',
+            'goal_owner_name',
+            'requested_by',
+            'requested_by_name',
+            'message',
+            'created_dttm'
+        )
+        read_only_fields = fields
+
+
 class FeedbackRequestCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = FeedbackRequest
@@ -84,9 +139,11 @@ class FeedbackRequestCreateSerializer(serializers.ModelSerializer):
 class PeerFeedbackSerializer(serializers.ModelSerializer):
     reviewer = serializers.SerializerMethodField()
     goal = serializers.SerializerMethodField()
+    batch_loaders = (FeedbackRequestLoader,)
     
     class Meta:
         model = PeerFeedback
+        list_serializer_class = BatchListSerializer
         fields = (
             'id',
             'reviewer',
@@ -98,13 +155,19 @@ class PeerFeedbackSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ('id', 'reviewer', 'goal', 'created_dttm')
     
+    def _feedback_request(self, obj):
+        if PeerFeedback.feedback_request.is_cached(obj):
+            return obj.feedback_request
+        return get_loader(self, FeedbackRequestLoader).load(obj)
+
     def get_reviewer(self, obj):
-        return EmployeeSerializer(obj.feedback_request.reviewer).data
+        return EmployeeSerializer(self._feedback_request(obj).reviewer).data
     
     def get_goal(self, obj):
+        goal = self._feedback_request(obj).goal
         return {
-            'id': obj.feedback_request.goal.id,
-            'title': obj.feedback_request.goal.title
+            'id': goal.id,
+            'title': goal.title
         }
 
 
@@ -113,6 +176,7 @@ class ExpertEvaluationSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = ExpertEvaluation
+        list_serializer_class = BatchListSerializer
         fields = (
             'id',
             'expert',
@@ -135,4 +199,44 @@ class ExpertEvaluationSerializer(serializers.ModelSerializer):
             expert=user.employee_profile,
             **validated_data
         )
-        return expert_evaluation 
+        return expert_evaluation
+
+
+class GoalPeerFeedbackSerializer(serializers.ModelSerializer):
+    reviewer = EmployeeSerializer(
+        source='feedback_request.reviewer',
+        read_only=True
+    )
+
+    class Meta:
+        model = PeerFeedback
+        list_serializer_class = BatchListSerializer
+        fields = (
+            'id',
+            'reviewer',
+            'rating',
+            'comments',
+            'areas_to_improve',
+            'created_dttm'
+        )
+        read_only_fields = fields
+
+
+class FeedbackStatsSerializer(serializers.Serializer):
+    requests_count = serializers.IntegerField()
+    pending_requests_count = serializers.IntegerField()
+    feedback_count = serializers.IntegerField()
+    mean_rating = serializers.FloatField(allow_null=True)
+    median_rating = serializers.FloatField(allow_null=True)
+    min_rating = serializers.IntegerField(allow_null=True)
+    max_rating = serializers.IntegerField(allow_null=True)
+    rating_stddev = serializers.FloatField(allow_null=True)
+
+
+class GoalFeedbackSummarySerializer(serializers.Serializer):
+    goal_id = serializers.IntegerField()
+    goal_title = serializers.CharField()
+    self_assessment = SelfAssessmentSerializer(allow_null=True)
+    expert_evaluation = ExpertEvaluationSerializer(allow_null=True)
+    peer_feedback = GoalPeerFeedbackSerializer(many=True)
+    stats = FeedbackStatsSerializer()
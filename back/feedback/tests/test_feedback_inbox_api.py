@@ -0,0 +1,160 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User, Employee
+from goals.models import Goal
+from feedback.models import FeedbackRequest
+
+
+class FeedbackInboxAPITestCase(APITestCase):
+    """Тесты API входящих запросов отзывов"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создание данных для всех тестов"""
+        today = timezone.now().date()
+
+        cls.reviewer_user = User.objects.create_user(
+            username='reviewer',
+            password='password123',
+            email='reviewer@example.com',
+            first_name='Reviewer',
+            last_name='User',
+            role='employee'
+        )
+        cls.reviewer = Employee.objects.create(
+            user=cls.reviewer_user,
+            position='Developer',
+            hire_dt=today
+        )
+
+        cls.goals = []
+        for i in range(5):
+            owner_user = User.objects.create_user(
+                username=f'owner{i}',
+                password='password123',
+                email=f'owner{i}@example.com',
+                first_name=f'Owner{i}',
+                last_name='User',
+                role='employee'
+            )
+            owner = Employee.objects.create(
+                user=owner_user,
+                position='Developer',
+                hire_dt=today
+            )
+            goal = Goal.objects.create(
+                employee=owner,
+                title=f'Goal {i}',
+                description='Description',
+                expected_results='Expected Results',
+                start_period=today,
+                end_period=today + timedelta(days=30),
+                status=Goal.STATUS_PENDING_ASSESSMENT
+            )
+            FeedbackRequest.objects.create(
+                goal=goal,
+                reviewer=cls.reviewer,
+                requested_by=owner,
+                message=f'Request {i}'
+            )
+            cls.goals.append(goal)
+
+        # Завершенный запрос не должен попадать во входящие
+        FeedbackRequest.objects.filter(goal=cls.goals[0]).update(
+            status=FeedbackRequest.STATUS_COMPLETED
+        )
+
+    def setUp(self):
+        self.inbox_url = reverse('feedback-inbox-list')
+        self.count_url = reverse('feedback-inbox-unread-count')
+
+    def test_inbox_contains_only_pending_requests(self):
+        """Тест получения только ожидающих запросов с данными цели"""
+        self.client.force_authenticate(user=self.__class__.reviewer_user)
+
+        response = self.client.get(self.inbox_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 4)
+
+        item = response.data['results'][0]
+        self.assertEqual(item['goal_title'], 'Goal 4')
+        self.assertEqual(item['goal_owner_name'], 'Owner4 User')
+        self.assertEqual(item['requested_by_name'], 'Owner4 User')
+
+    def test_inbox_cursor_pagination(self):
+        """Тест курсорной пагинации входящих запросов"""
+        self.client.force_authenticate(user=self.__class__.reviewer_user)
+
+        response = self.client.get(self.inbox_url, {'page_size': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+
+    def test_inbox_cursor_with_equal_timestamps(self):
+        """Тест: запросы с одинаковым временем создания не теряются
+        и не повторяются на границе страниц"""
+        FeedbackRequest.objects.filter(reviewer=self.__class__.reviewer) \
+            .update(created_dttm=timezone.now())
+        self.client.force_authenticate(user=self.__class__.reviewer_user)
+
+        ids = []
+        response = self.client.get(self.inbox_url, {'page_size': 3})
+        ids += [item['id'] for item in response.data['results']]
+        response = self.client.get(response.data['next'])
+        ids += [item['id'] for item in response.data['results']]
+
+        expected = FeedbackRequest.objects.filter(
+            reviewer=self.__class__.reviewer,
+            status=FeedbackRequest.STATUS_PENDING
+        ).order_by('-id').values_list('id', flat=True)
+        self.assertEqual(ids, list(expected))
+
+    def test_inbox_query_count_is_constant(self):
+        """Тест постоянного количества запросов к БД для списка"""
+        self.client.force_authenticate(user=self.__class__.reviewer_user)
+
+        # Сотрудник пользователя и страница запросов
+        with self.assertNumQueries(2):
+            response = self.client.get(self.inbox_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unread_count(self):
+        """Тест получения количества ожидающих запросов"""
+        self.client.force_authenticate(user=self.__class__.reviewer_user)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.count_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 4)
+
+    def test_inbox_empty_for_other_user(self):
+        """Тест пустого списка для пользователя без входящих запросов"""
+        other_user = User.objects.create_user(
+            username='other',
+            password='password123',
+            email='other@example.com',
+            role='employee'
+        )
+        self.client.force_authenticate(user=other_user)
+
+        response = self.client.get(self.inbox_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+
+        response = self.client.get(self.count_url)
+        self.assertEqual(response.data['count'], 0)
+
+    def test_inbox_unauthenticated(self):
+        """Тест запрета доступа без аутентификации"""
+        response = self.client.get(self.inbox_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,203 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User, Employee
+from goals.models import Goal
+from feedback.models import SelfAssessment, FeedbackRequest, PeerFeedback, \
+    ExpertEvaluation
+
+
+class GoalFeedbackSummaryAPITestCase(APITestCase):
+    """Тесты API сводки обратной связи по цели"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создание данных для всех тестов"""
+        today = timezone.now().date()
+
+        cls.manager_user = User.objects.create_user(
+            username='manager',
+            password='password123',
+            email='manager@example.com',
+            first_name='Manager',
+            last_name='User',
+            role='employee'
+        )
+        cls.manager = Employee.objects.create(
+            user=cls.manager_user,
+            position='Team Lead',
+            hire_dt=today
+        )
+
+        cls.employee_user = User.objects.create_user(
+            username='employee',
+            password='password123',
+            email='employee@example.com',
+            first_name='Employee',
+            last_name='User',
+            role='employee'
+        )
+        cls.employee = Employee.objects.create(
+            user=cls.employee_user,
+            position='Developer',
+            hire_dt=today,
+            manager=cls.manager
+        )
+
+        cls.goal = Goal.objects.create(
+            employee=cls.employee,
+            title='Test Goal',
+            description='Test Description',
+            expected_results='Test Expected Results',
+            start_period=today,
+            end_period=today + timedelta(days=30),
+            status=Goal.STATUS_PENDING_ASSESSMENT
+        )
+
+        SelfAssessment.objects.create(
+            goal=cls.goal,
+            rating=7,
+            comments='Self comments',
+            areas_to_improve='Self areas'
+        )
+
+        cls.reviewers = []
+        for i in range(4):
+            reviewer_user = User.objects.create_user(
+                username=f'reviewer{i}',
+                password='password123',
+                email=f'reviewer{i}@example.com',
+                first_name=f'Reviewer{i}',
+                last_name='User',
+                role='employee'
+            )
+            reviewer = Employee.objects.create(
+                user=reviewer_user,
+                position='Developer',
+                hire_dt=today,
+                manager=cls.manager
+            )
+            cls.reviewers.append(reviewer)
+            FeedbackRequest.objects.create(
+                goal=cls.goal,
+                reviewer=reviewer,
+                requested_by=cls.employee
+            )
+
+        for reviewer, rating in zip(cls.reviewers, [4, 6, 8]):
+            PeerFeedback.objects.create(
+                feedback_request=FeedbackRequest.objects.get(
+                    goal=cls.goal, reviewer=reviewer
+                ),
+                rating=rating,
+                comments='Comments',
+                areas_to_improve='Areas'
+            )
+
+        cls.other_user = User.objects.create_user(
+            username='other',
+            password='password123',
+            email='other@example.com',
+            role='employee'
+        )
+        Employee.objects.create(
+            user=cls.other_user,
+            position='Designer',
+            hire_dt=today
+        )
+
+    def setUp(self):
+        self.summary_url = reverse(
+            'goal-feedback-summary-list',
+            kwargs={'goal_pk': self.__class__.goal.pk}
+        )
+
+    def test_summary_by_goal_owner(self):
+        """Тест получения сводки владельцем цели"""
+        self.client.force_authenticate(user=self.__class__.employee_user)
+
+        response = self.client.get(self.summary_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['goal_id'], self.__class__.goal.id)
+        self.assertEqual(response.data['self_assessment']['rating'], 7)
+        self.assertIsNone(response.data['expert_evaluation'])
+        self.assertEqual(len(response.data['peer_feedback']), 3)
+        self.assertEqual(
+            response.data['peer_feedback'][0]['reviewer']['id'],
+            self.__class__.reviewers[0].id
+        )
+
+        stats = response.data['stats']
+        self.assertEqual(stats['requests_count'], 4)
+        self.assertEqual(stats['pending_requests_count'], 1)
+        self.assertEqual(stats['feedback_count'], 3)
+        self.assertAlmostEqual(stats['mean_rating'], 6.0)
+        self.assertAlmostEqual(stats['median_rating'], 6.0)
+        self.assertEqual(stats['min_rating'], 4)
+        self.assertEqual(stats['max_rating'], 8)
+        self.assertAlmostEqual(stats['rating_stddev'], 2.0)
+
+    def test_summary_includes_expert_evaluation(self):
+        """Тест наличия экспертной оценки в сводке"""
+        leader_user = User.objects.create_user(
+            username='leader',
+            password='password123',
+            email='leader@example.com',
+            role='expertise_leader'
+        )
+        leader = Employee.objects.create(
+            user=leader_user,
+            position='Tech Lead',
+            hire_dt=timezone.now().date()
+        )
+        ExpertEvaluation.objects.create(
+            goal=self.__class__.goal,
+            expert=leader,
+            final_rating=9,
+            comments='Expert comments',
+            areas_to_improve='Expert areas'
+        )
+        self.client.force_authenticate(user=self.__class__.manager_user)
+
+        response = self.client.get(self.summary_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['expert_evaluation']['final_rating'], 9)
+        self.assertEqual(
+            response.data['expert_evaluation']['expert']['id'],
+            leader.id
+        )
+
+    def test_summary_query_count_is_constant(self):
+        """Тест независимости числа запросов от количества отзывов"""
+        self.client.force_authenticate(user=self.__class__.employee_user)
+
+        with CaptureQueriesContext(connection) as before:
+            self.client.get(self.summary_url)
+
+        PeerFeedback.objects.create(
+            feedback_request=FeedbackRequest.objects.get(
+                goal=self.__class__.goal,
+                reviewer=self.__class__.reviewers[3]
+            ),
+            rating=10,
+            comments='Comments',
+            areas_to_improve='Areas'
+        )
+
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get(self.summary_url)
+        self.assertEqual(len(response.data['peer_feedback']), 4)
+        self.assertEqual(len(before), len(after))
+
+    def test_summary_by_other_employee_forbidden(self):
+        """Тест запрета просмотра сводки посторонним сотрудником"""
+        self.client.force_authenticate(user=self.__class__.other_user)
+
+        response = self.client.get(self.summary_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
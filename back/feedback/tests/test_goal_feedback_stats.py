@@ -0,0 +1,217 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User, Employee
+from goals.models import Goal
+from feedback.models import SelfAssessment, FeedbackRequest, PeerFeedback, \
+    ExpertEvaluation, GoalFeedbackStats
+
+
+class GoalFeedbackStatsTestCase(APITestCase):
+    """Тесты денормализованной статистики оценок по целям"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Создание данных для всех тестов"""
+        today = timezone.now().date()
+
+        cls.admin_user = User.objects.create_user(
+            username='admin',
+            password='password123',
+            email='admin@example.com',
+            role='admin'
+        )
+
+        cls.employee_user = User.objects.create_user(
+            username='employee',
+            password='password123',
+            email='employee@example.com',
+            first_name='Employee',
+            last_name='User',
+            role='employee'
+        )
+        cls.employee = Employee.objects.create(
+            user=cls.employee_user,
+            position='Developer',
+            hire_dt=today
+        )
+
+        cls.leader_user = User.objects.create_user(
+            username='leader',
+            password='password123',
+            email='leader@example.com',
+            role='expertise_leader'
+        )
+        cls.leader = Employee.objects.create(
+            user=cls.leader_user,
+            position='Tech Lead',
+            hire_dt=today
+        )
+
+        cls.reviewers = []
+        for i in range(3):
+            reviewer_user = User.objects.create_user(
+                username=f'reviewer{i}',
+                password='password123',
+                email=f'reviewer{i}@example.com',
+                role='employee'
+            )
+            cls.reviewers.append(Employee.objects.create(
+                user=reviewer_user,
+                position='Developer',
+                hire_dt=today
+            ))
+
+        cls.goal_data = {
+            'employee': cls.employee,
+            'description': 'Test Description',
+            'expected_results': 'Test Expected Results',
+            'start_period': today,
+            'end_period': today + timedelta(days=30),
+            'status': Goal.STATUS_PENDING_ASSESSMENT,
+        }
+
+    def setUp(self):
+        self.goal = Goal.objects.create(title='Goal', **self.goal_data)
+
+    def _request_feedback(self, goal, reviewer):
+        return FeedbackRequest.objects.create(
+            goal=goal,
+            reviewer=reviewer,
+            requested_by=self.__class__.employee
+        )
+
+    def _give_feedback(self, feedback_request, rating):
+        return PeerFeedback.objects.create(
+            feedback_request=feedback_request,
+            rating=rating,
+            comments='Comments',
+            areas_to_improve='Areas'
+        )
+
+    def _stats(self, goal):
+        return GoalFeedbackStats.objects.get(goal=goal)
+
+    def test_stats_updated_on_write(self):
+        """Тест инкрементального обновления статистики при сохранении"""
+        requests = [
+            self._request_feedback(self.goal, reviewer)
+            for reviewer in self.__class__.reviewers
+        ]
+        stats = self._stats(self.goal)
+        self.assertEqual(stats.requests_count, 3)
+        self.assertEqual(stats.pending_requests_count, 3)
+        self.assertEqual(stats.peer_feedback_count, 0)
+        self.assertIsNone(stats.peer_rating_mean)
+
+        self._give_feedback(requests[0], 6)
+        feedback = self._give_feedback(requests[1], 9)
+        stats = self._stats(self.goal)
+        self.assertEqual(stats.pending_requests_count, 1)
+        self.assertEqual(stats.peer_feedback_count, 2)
+        self.assertEqual(stats.peer_rating_sum, 15)
+        self.assertAlmostEqual(stats.peer_rating_mean, 7.5)
+        self.assertAlmostEqual(stats.completion_ratio, 2 / 3)
+
+        feedback.rating = 8
+        feedback.save()
+        stats = self._stats(self.goal)
+        self.assertEqual(stats.peer_feedback_count, 2)
+        self.assertEqual(stats.peer_rating_sum, 14)
+        self.assertAlmostEqual(stats.peer_rating_mean, 7.0)
+
+        SelfAssessment.objects.create(
+            goal=self.goal,
+            rating=7,
+            comments='Comments',
+            areas_to_improve='Areas'
+        )
+        ExpertEvaluation.objects.create(
+            goal=self.goal,
+            expert=self.__class__.leader,
+            final_rating=8,
+            comments='Comments',
+            areas_to_improve='Areas'
+        )
+        stats = self._stats(self.goal)
+        self.assertEqual(stats.self_rating, 7)
+        self.assertEqual(stats.final_rating, 8)
+
+    def test_stats_recalculated_on_delete(self):
+        """Тест пересчета статистики при удалении отзыва"""
+        feedback_request = self._request_feedback(
+            self.goal, self.__class__.reviewers[0]
+        )
+        feedback = self._give_feedback(feedback_request, 5)
+
+        feedback.delete()
+        stats = self._stats(self.goal)
+        self.assertEqual(stats.peer_feedback_count, 0)
+        self.assertEqual(stats.peer_rating_sum, 0)
+        self.assertIsNone(stats.peer_rating_mean)
+
+    def test_rebuild_matches_incremental_stats(self):
+        """Тест совпадения полного пересчета с инкрементальными значениями"""
+        for reviewer, rating in zip(self.__class__.reviewers, [3, 7]):
+            self._give_feedback(
+                self._request_feedback(self.goal, reviewer), rating
+            )
+        self._request_feedback(self.goal, self.__class__.reviewers[2])
+        expected = self._stats(self.goal)
+
+        GoalFeedbackStats.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_goal_feedback_stats', stdout=out)
+        self.assertIn('1 goal(s)', out.getvalue())
+
+        rebuilt = self._stats(self.goal)
+        self.assertEqual(rebuilt.requests_count, expected.requests_count)
+        self.assertEqual(
+            rebuilt.pending_requests_count, expected.pending_requests_count
+        )
+        self.assertEqual(
+            rebuilt.peer_feedback_count, expected.peer_feedback_count
+        )
+        self.assertEqual(rebuilt.peer_rating_sum, expected.peer_rating_sum)
+        self.assertAlmostEqual(
+            rebuilt.peer_rating_mean, expected.peer_rating_mean
+        )
+
+    def test_goal_list_ordering_and_filtering_by_stats(self):
+        """Тест сортировки и фильтрации списка целей по агрегатам"""
+        low_goal = Goal.objects.create(title='Low Goal', **self.goal_data)
+        self._give_feedback(
+            self._request_feedback(self.goal, self.__class__.reviewers[0]), 9
+        )
+        self._give_feedback(
+            self._request_feedback(low_goal, self.__class__.reviewers[0]), 4
+        )
+        self.client.force_authenticate(user=self.__class__.admin_user)
+
+        response = self.client.get(
+            reverse('goal-list'),
+            {'ordering': 'feedback_stats__peer_rating_mean'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [goal['title'] for goal in response.data],
+            ['Low Goal', 'Goal']
+        )
+        self.assertAlmostEqual(
+            response.data[0]['feedback_stats']['peer_rating_mean'], 4.0
+        )
+
+        response = self.client.get(
+            reverse('goal-list'),
+            {'peer_rating_min': 5}
+        )
+        self.assertEqual(
+            [goal['title'] for goal in response.data],
+            ['Goal']
+        )
@@ -244,6 +244,36 @@ class FeedbackSerializersTestCase(APITestCase):
         for field in read_only_fields:
             self.assertTrue(field in serializer.Meta.read_only_fields)
 
+    def test_peer_feedback_list_loads_requests_in_one_query(self):
+        """Тест: запросы отзывов списка загружаются одним запросом"""
+        for reviewer in (self.__class__.employee2,
+                         self.__class__.expertise_leader):
+            feedback_request = FeedbackRequest.objects.create(
+                goal=self.__class__.goal,
+                reviewer=reviewer,
+                requested_by=self.__class__.employee,
+                message='Please review'
+            )
+            PeerFeedback.objects.create(
+                feedback_request=feedback_request,
+                rating=8,
+                comments='Peer feedback comments'
+            )
+
+        # Список отзывов и одна выборка запросов с целями и рецензентами
+        with self.assertNumQueries(2):
+            data = PeerFeedbackSerializer(
+                PeerFeedback.objects.order_by('id'), many=True
+            ).data
+
+        self.assertEqual(
+            [item['reviewer']['id'] for item in data],
+            [self.__class__.employee2.id, self.__class__.expertise_leader.id]
+        )
+        self.assertEqual(
+            {item['goal']['id'] for item in data}, {self.__class__.goal.id}
+        )
+
     def test_expert_evaluation_serializer(self):
         """Тест сериализатора экспертной оценки"""
         # Создаем экспертную оценку
@@ -6,9 +6,13 @@ from goals.urls import router as goals_router
 from .views import (
     SelfAssessmentViewSet, FeedbackRequestViewSet, 
     MyFeedbackRequestsViewSet, PeerFeedbackViewSet, 
-    ExpertEvaluationViewSet
+    ExpertEvaluationViewSet, FeedbackInboxViewSet,
+    GoalFeedbackSummaryViewSet
 )
 
+router = DefaultRouter()
+router.register('feedback-inbox', FeedbackInboxViewSet, basename='feedback-inbox')
+
 self_assessment_router = NestedDefaultRouter(goals_router, 'goals', lookup='goal')
 self_assessment_router.register(
     'self-assessment',
@@ -37,6 +41,13 @@ expert_evaluation_router.register(
     basename='goal-expert-evaluation'
 )
 
+feedback_summary_router = NestedDefaultRouter(goals_router, 'goals', lookup='goal')
+feedback_summary_router.register(
+    'feedback-summary',
+    GoalFeedbackSummaryViewSet,
+    basename='goal-feedback-summary'
+)
+
 my_feedback_requests_router = NestedDefaultRouter(goals_router, 'goals', lookup='goal')
 my_feedback_requests_router.register(
     'my-feedback-requests',
@@ -45,9 +56,11 @@ my_feedback_requests_router.register(
 )
 
 urlpatterns = [
+    path('', include(router.urls)),
     path('', include(self_assessment_router.urls)),
     path('', include(feedback_request_router.urls)),
     path('', include(peer_feedback_router.urls)),
     path('', include(expert_evaluation_router.urls)),
     path('', include(my_feedback_requests_router.urls)),
+    path('', include(feedback_summary_router.urls)),
 ]
@@ -1,3 +1,4 @@
+from django.db.models import Avg, Count, Max, Min, Q, StdDev
 from django.shortcuts import render, get_object_or_404
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import mixins, viewsets, status
@@ -6,14 +7,19 @@ from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from accounts.models import Employee
 from goals.models import Goal
 from goals.permissions import IsEmployeeOwnerOrManagerOrExpertiseLeaderOrAdmin
+from talentum.metrics import SerializerMetricsMixin
+from .aggregates import Median
 from .models import SelfAssessment, FeedbackRequest, PeerFeedback, ExpertEvaluation
+from .pagination import FeedbackInboxCursorPagination
 from .permissions import CanRequestFeedback, CanProvideFeedback, CanProvideExpertEvaluation
 from .serializers import (
     SelfAssessmentSerializer, FeedbackRequestListSerializer, 
     FeedbackRequestCreateSerializer, PeerFeedbackSerializer, 
-    ExpertEvaluationSerializer
+    ExpertEvaluationSerializer, FeedbackInboxSerializer,
+    GoalFeedbackSummarySerializer
 )
 
 
@@ -36,6 +42,7 @@ from .serializers import (
     ),
 )
 class SelfAssessmentViewSet(
+    SerializerMetricsMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
     mixins.UpdateModelMixin,
@@ -44,6 +51,12 @@ class SelfAssessmentViewSet(
     serializer_class = SelfAssessmentSerializer
     permission_classes = [IsAuthenticated,
                           IsEmployeeOwnerOrManagerOrExpertiseLeaderOrAdmin]
+    query_budgets = {
+        'retrieve': 9,
+        'create': 12,
+        'update': 10,
+        'partial_update': 10,
+    }
 
     def get_queryset(self):
         goal_id = self.kwargs.get('goal_pk')
@@ -92,11 +105,18 @@ class SelfAssessmentViewSet(
     ),
 )
 class FeedbackRequestViewSet(
+    SerializerMetricsMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     viewsets.GenericViewSet
 ):
+    query_budgets = {
+        'list': 8,
+        'retrieve': 8,
+        'create': 10,
+    }
+
     def get_permissions(self):
         if self.action == 'create':
             return [IsAuthenticated(), CanRequestFeedback()]
@@ -116,7 +136,14 @@ class FeedbackRequestViewSet(
         goal_id = self.kwargs.get('goal_pk')
         user = self.request.user
 
-        queryset = FeedbackRequest.objects.filter(goal_id=goal_id)
+        queryset = FeedbackRequest.objects.filter(
+            goal_id=goal_id
+        ).select_related(
+            'reviewer__user',
+            'reviewer__manager__user',
+            'requested_by__user',
+            'requested_by__manager__user'
+        )
 
         if user.role not in ['admin', 'expertise_leader']:
             try:
@@ -162,11 +189,13 @@ class FeedbackRequestViewSet(
     )
 )
 class MyFeedbackRequestsViewSet(
+    SerializerMetricsMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
     serializer_class = FeedbackRequestListSerializer
     permission_classes = [IsAuthenticated]
+    query_budgets = {'list': 4}
     
     def get_queryset(self):
         user = self.request.user
@@ -175,11 +204,62 @@ class MyFeedbackRequestsViewSet(
             return FeedbackRequest.objects.filter(
                 reviewer=employee,
                 status=FeedbackRequest.STATUS_PENDING
+            ).select_related(
+                'reviewer__user',
+                'reviewer__manager__user',
+                'requested_by__user',
+                'requested_by__manager__user'
             ).order_by('-created_dttm')
         except:
             return FeedbackRequest.objects.none()
 
 
+@extend_schema_view(
+    list=extend_schema(
+        description="Входящие запросы отзывов текущего пользователя "
+                    "(курсорная пагинация)",
+        tags=['feedback']
+    )
+)
+class FeedbackInboxViewSet(
+    SerializerMetricsMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet
+):
+    serializer_class = FeedbackInboxSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = FeedbackInboxCursorPagination
+    query_budgets = {'list': 4, 'unread_count': 3}
+
+    def get_queryset(self):
+        # Фильтр по reviewer_id без соединения с employees использует
+        # частичный индекс feedback_req_inbox_idx
+        reviewer_id = Employee.objects.filter(
+            user=self.request.user
+        ).values_list('id', flat=True).first()
+        if reviewer_id is None:
+            return FeedbackRequest.objects.none()
+        queryset = FeedbackRequest.objects.filter(
+            reviewer_id=reviewer_id,
+            status=FeedbackRequest.STATUS_PENDING
+        )
+        if self.action == 'list':
+            queryset = queryset.select_related(
+                'goal__employee__user',
+                'requested_by__user'
+            )
+        return queryset
+
+    @extend_schema(
+        tags=['feedback'],
+        description="Количество ожидающих запросов отзывов "
+                    "для индикатора в навигации"
+    )
+    @action(detail=False, methods=['get'], url_path='unread-count')
+    def unread_count(self, request):
+        return Response({'count': self.get_queryset().count()})
+
+
 @extend_schema_view(
     create=extend_schema(
         description="Предоставление отзыва по запросу",
@@ -191,12 +271,14 @@ class MyFeedbackRequestsViewSet(
     ),
 )
 class PeerFeedbackViewSet(
+    SerializerMetricsMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     viewsets.GenericViewSet
 ):
     serializer_class = PeerFeedbackSerializer
     permission_classes = [IsAuthenticated, CanProvideFeedback]
+    query_budgets = {'retrieve': 6, 'create': 12}
     
     def get_queryset(self):
         feedback_request_id = self.kwargs.get('request_pk')
@@ -229,11 +311,13 @@ class PeerFeedbackViewSet(
     ),
 )
 class ExpertEvaluationViewSet(
+    SerializerMetricsMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet
 ):
     serializer_class = ExpertEvaluationSerializer
+    query_budgets = {'retrieve': 6, 'create': 12}
     
     def get_permissions(self):
         if self.action == 'create':
@@ -288,3 +372,66 @@ class ExpertEvaluationViewSet(
             raise ValidationError("Для этой цели еще не предоставлено ни одного отзыва от коллег")
         
         serializer.save(goal_id=goal_id)
+
+
+class GoalFeedbackSummaryViewSet(SerializerMetricsMixin,
+                                 viewsets.GenericViewSet):
+    """
+    Сводка по обратной связи для цели: самооценка, все отзывы коллег,
+    экспертная оценка и агрегированная статистика по оценкам.
+    Количество запросов к БД не зависит от числа отзывов.
+    """
+    serializer_class = GoalFeedbackSummarySerializer
+    permission_classes = [IsAuthenticated,
+                          IsEmployeeOwnerOrManagerOrExpertiseLeaderOrAdmin]
+    query_budgets = {'list': 10}
+
+    def get_queryset(self):
+        return Goal.objects.select_related(
+            'self_assessment',
+            'expert_evaluation__expert__user',
+            'expert_evaluation__expert__manager__user'
+        )
+
+    def get_peer_feedback(self, goal):
+        return PeerFeedback.objects.filter(
+            feedback_request__goal=goal
+        ).select_related(
+            'feedback_request__reviewer__user',
+            'feedback_request__reviewer__manager__user'
+        ).order_by('created_dttm')
+
+    def get_stats(self, goal):
+        return FeedbackRequest.objects.filter(goal=goal).aggregate(
+            requests_count=Count('id'),
+            pending_requests_count=Count(
+                'id',
+                filter=Q(status=FeedbackRequest.STATUS_PENDING)
+            ),
+            feedback_count=Count('feedback'),
+            mean_rating=Avg('feedback__rating'),
+            median_rating=Median('feedback__rating'),
+            min_rating=Min('feedback__rating'),
+            max_rating=Max('feedback__rating'),
+            rating_stddev=StdDev('feedback__rating', sample=True),
+        )
+
+    @extend_schema(
+        tags=['feedback'],
+        description="Сводка по всей обратной связи для цели "
+                    "со статистикой оценок"
+    )
+    def list(self, request, goal_pk=None):
+        goal = get_object_or_404(self.get_queryset(), id=goal_pk)
+        self.check_object_permissions(request, goal)
+
+        summary = {
+            'goal_id': goal.id,
+            'goal_title': goal.title,
+            'self_assessment': getattr(goal, 'self_assessment', None),
+            'expert_evaluation': getattr(goal, 'expert_evaluation', None),
+            'peer_feedback': self.get_peer_feedback(goal),
+            'stats': self.get_stats(goal),
+        }
+        serializer = self.get_serializer(summary)
+        return Response(serializer.data)
@@ -6,3 +6,10 @@ class GoalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'goals'
     verbose_name = _('Цели')
+
+    def ready(self):
+        from goals.models import Goal, Progress
+        from talentum import invalidation
+
+        invalidation.track(Goal, 'employee')
+        invalidation.track(Progress, 'goal')
@@ -1,5 +1,5 @@
 from django_filters.rest_framework import FilterSet, \
-    BaseInFilter, CharFilter
+    BaseInFilter, CharFilter, NumberFilter
 
 from goals.models import Goal
 
@@ -10,6 +10,21 @@ class CharInFilter(BaseInFilter, CharFilter):
 
 class GoalFilterSet(FilterSet):
     status = CharInFilter(field_name='status', lookup_expr='in')
+    peer_rating_min = NumberFilter(
+        field_name='feedback_stats__peer_rating_mean', lookup_expr='gte'
+    )
+    peer_rating_max = NumberFilter(
+        field_name='feedback_stats__peer_rating_mean', lookup_expr='lte'
+    )
+    final_rating_min = NumberFilter(
+        field_name='feedback_stats__final_rating', lookup_expr='gte'
+    )
+    final_rating_max = NumberFilter(
+        field_name='feedback_stats__final_rating', lookup_expr='lte'
+    )
+    pending_requests_min = NumberFilter(
+        field_name='feedback_stats__pending_requests_count', lookup_expr='gte'
+    )
 
     class Meta:
         model = Goal
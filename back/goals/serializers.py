@@ -1,7 +1,9 @@
 from rest_framework import serializers
 
 from accounts.serializers import EmployeeSerializer
-from feedback.serializers import SelfAssessmentSerializer, FeedbackRequestListSerializer, ExpertEvaluationSerializer
+from feedback.serializers import SelfAssessmentSerializer, FeedbackRequestListSerializer, ExpertEvaluationSerializer, \
+    GoalFeedbackStatsSerializer
+from talentum.dataloader import BatchListSerializer
 from .models import Goal, Progress
 
 
@@ -11,9 +13,11 @@ class GoalListSerializer(serializers.ModelSerializer):
         source='get_status_display',
         read_only=True
     )
+    feedback_stats = GoalFeedbackStatsSerializer(read_only=True)
 
     class Meta:
         model = Goal
+        list_serializer_class = BatchListSerializer
         fields = (
             'id',
             'title',
@@ -22,6 +26,7 @@ class GoalListSerializer(serializers.ModelSerializer):
             'status_display',
             'start_period',
             'end_period',
+            'feedback_stats',
             'created_dttm',
             'updated_dttm'
         )
@@ -1,5 +1,7 @@
 from datetime import timedelta
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
@@ -180,6 +182,20 @@ class GoalAPITestCase(APITestCase):
         self.assertIn(self.goal.id, goal_ids)
         self.assertIn(self.goal2.id, goal_ids)
 
+    def test_goal_list_manager_passes_subtree_as_array(self):
+        """Тест: поддерево передается одним параметром-массивом"""
+        self.client.force_authenticate(user=self.__class__.manager_user)
+        self.client.get(self.__class__.goals_url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.__class__.goals_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        goals_sql = next(
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT "goals"')
+        )
+        self.assertIn('unnest(ARRAY[', goals_sql)
+
     def test_goal_list_admin_all_goals(self):
         """Тест получения списка целей (администратор видит все цели)"""
         self.client.force_authenticate(user=self.__class__.admin_user)
@@ -240,6 +256,35 @@ class GoalAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['id'], self.goal.id)
 
+    def test_goal_detail_with_feedback_requests(self):
+        """Тест детальной информации о цели с запросами отзывов (без N+1)"""
+        from feedback.models import FeedbackRequest
+
+        self.goal.status = Goal.STATUS_PENDING_ASSESSMENT
+        self.goal.save()
+        for reviewer in (self.__class__.employee2, self.__class__.manager,
+                         self.__class__.expertise_leader):
+            FeedbackRequest.objects.create(
+                goal=self.goal,
+                reviewer=reviewer,
+                requested_by=self.__class__.employee
+            )
+        self.client.force_authenticate(user=self.__class__.employee_user)
+
+        # Первый запрос загружает снимок оргструктуры процесса
+        self.client.get(self.goal_detail_url)
+
+        # Запросы отзывов и рецензенты загружаются вместе с целью,
+        # их число не зависит от количества запросов
+        with self.assertNumQueries(4):
+            response = self.client.get(self.goal_detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['feedback_requests']), 3)
+        self.assertEqual(
+            response.data['feedback_requests'][0]['requested_by']['id'],
+            self.__class__.employee.id
+        )
+
     def test_goal_create_success(self):
         """Тест успешного создания новой цели"""
         self.client.force_authenticate(user=self.__class__.employee_user)
@@ -1,4 +1,4 @@
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import viewsets, mixins, status, filters
@@ -7,7 +7,11 @@ from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from accounts.hierarchy import ids_sql
 from accounts.models import Employee
+from accounts.org_graph import get_org_graph
+from feedback.models import FeedbackRequest
+from talentum.metrics import SerializerMetricsMixin
 from .filters import GoalFilterSet
 from .models import Goal, Progress
 from .permissions import (
@@ -46,18 +50,44 @@ from .serializers import (
         tags=['goals']
     ),
 )
-class GoalViewSet(viewsets.ModelViewSet):
+class GoalViewSet(SerializerMetricsMixin, viewsets.ModelViewSet):
     queryset = Goal.objects.all().select_related(
         'employee',
-        'employee__user'
+        'employee__user',
+        'feedback_stats'
     ).prefetch_related(
         'progress_entries'
     )
     permission_classes = [IsAuthenticated, CanManageGoal]
-
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    query_budgets = {
+        'list': 6,
+        'my_goals': 6,
+        'employee_goals': 8,
+        'retrieve': 10,
+        'create': 8,
+        'update': 8,
+        'partial_update': 8,
+        'destroy': 10,
+        'submit': 12,
+        'approve': 12,
+        'complete': 10,
+    }
+
+    # Действия, отвечающие GoalDetailSerializer
+    detail_actions = ('retrieve', 'submit', 'approve', 'complete')
+
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter,
+                       filters.OrderingFilter]
     filterset_class = GoalFilterSet
     search_fields = ['title', 'description']
+    ordering_fields = [
+        'created_dttm',
+        'end_period',
+        'feedback_stats__peer_rating_mean',
+        'feedback_stats__peer_feedback_count',
+        'feedback_stats__pending_requests_count',
+        'feedback_stats__final_rating',
+    ]
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -70,40 +100,52 @@ class GoalViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
+        queryset = self.queryset
+        if self.action in self.detail_actions:
+            # Детальное представление выводит оценки и запросы отзывов
+            # с рецензентами
+            queryset = queryset.select_related(
+                'self_assessment',
+                'expert_evaluation__expert__user'
+            ).prefetch_related(Prefetch(
+                'feedback_requests',
+                queryset=FeedbackRequest.objects.select_related(
+                    'reviewer__user',
+                    'requested_by__user'
+                )
+            ))
 
         if user.role == 'admin':
-            return self.queryset
+            return queryset
 
         try:
             employee = user.employee_profile
 
             # If this is a request for personal goals only
             if self.action == 'my_goals':
-                return self.queryset.filter(employee=employee)
+                return queryset.filter(employee=employee)
                 
             employee_goals = Q(employee=employee)
 
-            if employee.subordinates.exists():
-                all_subordinates = self._get_all_subordinates(employee)
-                subordinate_goals = Q(employee__in=all_subordinates)
-                return self.queryset.filter(employee_goals | subordinate_goals)
+            org_graph = get_org_graph()
+            if org_graph.has_subordinates(employee.id):
+                subordinate_ids = org_graph.subtree_ids(
+                    employee.id, include_root=False
+                )
+                subordinate_goals = Q(
+                    employee_id__in=ids_sql(subordinate_ids.tolist())
+                )
+                return queryset.filter(employee_goals | subordinate_goals)
 
             if user.role == 'expertise_leader':
-                return self.queryset.filter(
+                return queryset.filter(
                     employee_goals | Q(status=Goal.STATUS_PENDING_ASSESSMENT)
                 )
 
-            return self.queryset.filter(employee_goals)
+            return queryset.filter(employee_goals)
 
         except Employee.DoesNotExist:
-            return self.queryset.none()
-
-    def _get_all_subordinates(self, employee):
-        """Рекурсивно получает всех подчиненных (прямых и косвенных)"""
-        all_subordinates = list(employee.subordinates.all())
-        for sub in employee.subordinates.all():
-            all_subordinates.extend(self._get_all_subordinates(sub))
-        return all_subordinates
+            return queryset.none()
 
     def perform_create(self, serializer):
         try:
@@ -240,7 +282,7 @@ class GoalViewSet(viewsets.ModelViewSet):
                 raise PermissionDenied("У вас нет прав для просмотра целей этого сотрудника")
                 
             goals = Goal.objects.filter(employee=target_employee).select_related(
-                'employee', 'employee__user'
+                'employee', 'employee__user', 'feedback_stats'
             ).prefetch_related('progress_entries')
             
             serializer = GoalListSerializer(goals, many=True, context={'request': request})
@@ -264,6 +306,7 @@ class GoalViewSet(viewsets.ModelViewSet):
     ),
 )
 class ProgressViewSet(
+    SerializerMetricsMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet
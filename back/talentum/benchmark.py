@@ -0,0 +1,175 @@
+import json
+import math
+import platform
+import time
+from contextlib import ExitStack
+
+import django
+from django.db import connection, connections, transaction
+from django.test import Client
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from talentum.memprofile import traced
+from talentum.metrics import RequestSample
+
+PERCENTILES = (50, 95, 99)
+# Результаты сравниваются по этим перцентилям времени ответа
+COMPARED_PERCENTILES = ('p50', 'p95')
+
+
+def percentile(values, q):
+    """Перцентиль q по ближайшему рангу; nan для пустого списка."""
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def summarize(values):
+    """Перцентили и среднее в миллисекундах."""
+    summary = {
+        f'p{q}': round(percentile(values, q) * 1000, 3) for q in PERCENTILES
+    }
+    summary['mean'] = round(sum(values) / len(values) * 1000, 3) \
+        if values else float('nan')
+    return summary
+
+
+class Scenario:
+    """
+    Запрос к API от имени пользователя user. Запрос выполняется
+    в транзакции, которая откатывается, поэтому изменяющие запросы
+    (переходы статусов, создание) повторяются на тех же данных.
+    """
+
+    def __init__(self, name, user, method, path, data=None):
+        self.name = name
+        self.user = user
+        self.method = method
+        self.path = path
+        self.data = data
+
+    def client(self):
+        """Клиент с access-токеном пользователя, как у фронтенда."""
+        access = RefreshToken.for_user(self.user).access_token
+        return Client(SERVER_NAME='localhost',
+                      HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def request(self, client):
+        data = json.dumps(self.data) if self.data is not None else ''
+        sample = RequestSample()
+        with transaction.atomic():
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(sample))
+                started = time.perf_counter()
+                response = client.generic(
+                    self.method, self.path, data,
+                    content_type='application/json'
+                )
+                elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        return response, elapsed, sample
+
+
+def measure(scenario, iterations, warmup):
+    """
+    warmup прогревающих запросов, iterations измеряемых и один
+    запрос под tracemalloc (трассировка искажает время, поэтому
+    выполняется отдельно).
+    """
+    client = scenario.client()
+    for _ in range(warmup):
+        scenario.request(client)
+
+    latencies = []
+    db_times = []
+    queries = []
+    statuses = set()
+    for _ in range(iterations):
+        response, elapsed, sample = scenario.request(client)
+        latencies.append(elapsed)
+        db_times.append(sample.db_time)
+        queries.append(sample.queries)
+        statuses.add(response.status_code)
+
+    with traced(1, 0) as trace:
+        response, _, _ = scenario.request(client)
+    statuses.add(response.status_code)
+
+    return {
+        'method': scenario.method,
+        'path': scenario.path,
+        'status': sorted(statuses),
+        'iterations': iterations,
+        'latency_ms': summarize(latencies),
+        'db_ms': summarize(db_times),
+        'queries': max(queries, default=0),
+        'peak_bytes': trace.peak,
+        'retained_bytes': trace.retained,
+    }
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'database_version': (
+            f'{connection.pg_version // 10000}.{connection.pg_version % 10000}'
+            if connection.vendor == 'postgresql' else None
+        ),
+    }
+
+
+def report(scenarios, parameters):
+    return {
+        'created': timezone.now().isoformat(),
+        'environment': environment(),
+        'parameters': parameters,
+        'scenarios': scenarios,
+    }
+
+
+def compare(current, baseline, latency_tolerance=0.2, memory_tolerance=0.2,
+            min_latency_ms=1.0):
+    """
+    Регрессии current относительно baseline по общим сценариям:
+    другой статус ответа, больше SQL-запросов, рост перцентилей
+    времени больше чем на latency_tolerance (и не меньше
+    min_latency_ms - шум измерения) и пика памяти больше чем
+    на memory_tolerance. Возвращает список
+    {'scenario', 'metric', 'baseline', 'current'}.
+    """
+    regressions = []
+
+    def regression(name, metric, old, new):
+        regressions.append({
+            'scenario': name,
+            'metric': metric,
+            'baseline': old,
+            'current': new,
+        })
+
+    for name, result in current['scenarios'].items():
+        old = baseline['scenarios'].get(name)
+        if old is None:
+            continue
+        if result['status'] != old['status']:
+            regression(name, 'status', old['status'], result['status'])
+        if result['queries'] > old['queries']:
+            regression(name, 'queries', old['queries'], result['queries'])
+        for key in COMPARED_PERCENTILES:
+            old_value = old['latency_ms'][key]
+            new_value = result['latency_ms'][key]
+            if math.isnan(old_value) or math.isnan(new_value):
+                continue
+            if new_value > old_value * (1 + latency_tolerance) \
+                    and new_value - old_value >= min_latency_ms:
+                regression(name, f'latency_ms.{key}', old_value, new_value)
+        if result['peak_bytes'] > old['peak_bytes'] * (1 + memory_tolerance):
+            regression(name, 'peak_bytes', old['peak_bytes'],
+                       result['peak_bytes'])
+    return regressions
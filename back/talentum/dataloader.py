@@ -0,0 +1,116 @@
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+
+
+class Loader:
+    """
+    Пакетная загрузка значений по ключам с запоминанием на время запроса.
+
+    Ключи, переданные в prime, только запоминаются; первый get
+    неизвестного ключа загружает одним вызовом batch все накопленные
+    ключи. Если ни одно значение не понадобилось (например, представление
+    взято из кеша), запрос к базе не выполняется.
+    """
+    default = None
+
+    def __init__(self):
+        self._values = {}
+        self._pending = set()
+
+    def key(self, obj):
+        raise NotImplementedError
+
+    def batch(self, keys):
+        """Словарь значений для набора ключей."""
+        raise NotImplementedError
+
+    def prime(self, objects):
+        for obj in objects:
+            key = self.key(obj)
+            if key is not None and key not in self._values:
+                self._pending.add(key)
+
+    def get(self, key):
+        if key is None:
+            return self.default
+        if key not in self._values:
+            keys = self._pending | {key}
+            self._pending = set()
+            found = self.batch(keys)
+            for loaded_key in keys:
+                self._values[loaded_key] = found.get(loaded_key, self.default)
+        return self._values[key]
+
+    def load(self, obj):
+        return self.get(self.key(obj))
+
+
+def get_loader(serializer, loader_class):
+    """
+    Экземпляр загрузчика, общий для всех сериализаторов запроса
+    (или дерева сериализаторов, если запроса в контексте нет).
+    """
+    request = serializer.context.get('request')
+    owner = request if request is not None else serializer.root
+    loaders = getattr(owner, '_batch_loaders', None)
+    if loaders is None:
+        loaders = {}
+        setattr(owner, '_batch_loaders', loaders)
+    loader = loaders.get(loader_class)
+    if loader is None:
+        loader = loaders[loader_class] = loader_class()
+    return loader
+
+
+def _nested_serializers(serializer):
+    for field in serializer.fields.values():
+        if isinstance(field, serializers.BaseSerializer) \
+                and not isinstance(field, serializers.ListSerializer):
+            yield field
+
+
+def _uses_loaders(serializer):
+    return bool(getattr(serializer, 'batch_loaders', ())) or any(
+        _uses_loaders(field) for field in _nested_serializers(serializer)
+    )
+
+
+def prime(serializer, instances):
+    """
+    Передает загрузчикам сериализатора и вложенных в него сериализаторов
+    (для связей один-к-одному и многие-к-одному) ключи всех объектов.
+    """
+    if not instances:
+        return
+    for loader_class in getattr(serializer, 'batch_loaders', ()):
+        get_loader(serializer, loader_class).prime(instances)
+
+    for field in _nested_serializers(serializer):
+        if not _uses_loaders(field):
+            continue
+        nested = []
+        for instance in instances:
+            try:
+                value = field.get_attribute(instance)
+            except (AttributeError, KeyError, ObjectDoesNotExist, SkipField):
+                continue
+            if value is not None:
+                nested.append(value)
+        prime(field, nested)
+
+
+class BatchListSerializer(serializers.ListSerializer):
+    """
+    Список, перед сериализацией которого загрузчики получают ключи
+    всех элементов: SerializerMethodField на Loader выполняют один
+    запрос на связь вместо запроса на каждый объект.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, 'all') else data)
+        prime(self.child, items)
+        return self.render_items(items)
+
+    def render_items(self, items):
+        return [self.child.to_representation(item) for item in items]
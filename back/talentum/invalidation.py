@@ -0,0 +1,257 @@
+import json
+import logging
+import os
+import select
+import threading
+import uuid
+
+import psycopg2
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'talentum_invalidation'
+# Полезная нагрузка NOTIFY ограничена 8000 байтами
+MAX_PAYLOAD = 7500
+# Ключ сброса всех кешей: изменения в обход сигналов моделей
+ALL = '*'
+
+RECONNECT_DELAY = 1.0
+POLL_TIMEOUT = 5.0
+
+_handlers = []
+_handlers_lock = threading.Lock()
+
+
+def entity_key(model, pk):
+    return f'{model._meta.label_lower}:{pk}'
+
+
+def subscribe(handler):
+    """
+    Регистрирует обработчик handler(keys) и запускает слушатель
+    текущего процесса. keys - множество ключей или None (сбросить все).
+    """
+    with _handlers_lock:
+        if handler not in _handlers:
+            _handlers.append(handler)
+    get_listener()
+
+
+def unsubscribe(handler):
+    with _handlers_lock:
+        if handler in _handlers:
+            _handlers.remove(handler)
+
+
+def dispatch(keys):
+    if keys is not None and ALL in keys:
+        keys = None
+    for handler in list(_handlers):
+        try:
+            handler(keys)
+        except Exception:
+            logger.exception('Ошибка обработчика инвалидации %r', handler)
+
+
+def _payloads(keys):
+    chunk = []
+    size = 0
+    for key in keys:
+        if chunk and size + len(key) + 4 > MAX_PAYLOAD:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(key)
+        size += len(key) + 4
+    if chunk:
+        yield chunk
+
+
+def notify(keys, using=None):
+    """Немедленная отправка ключей всем процессам и локальным обработчикам."""
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    dispatch(set(keys))
+    conn = transaction.get_connection(using)
+    with conn.cursor() as cursor:
+        for chunk in _payloads(keys):
+            cursor.execute(
+                'SELECT pg_notify(%s, %s)',
+                [CHANNEL, json.dumps({'origin': process_origin(),
+                                      'keys': chunk})]
+            )
+
+
+class _Publication:
+    """Отложенная до фиксации отправка ключей (см. pending_keys)."""
+
+    def __init__(self, keys, using):
+        self.keys = keys
+        self.using = using
+
+    def __call__(self):
+        notify(self.keys, using=self.using)
+
+
+def publish(*keys, using=None):
+    """Отправка ключей после фиксации текущей транзакции."""
+    transaction.on_commit(_Publication(keys, using), using=using)
+
+
+def pending_keys(using=None):
+    """
+    Ключи, измененные в текущей незафиксированной транзакции. Кеши
+    не должны ни читать, ни сохранять такие сущности: транзакция видит
+    данные, которых еще нет у других процессов.
+    """
+    conn = transaction.get_connection(using)
+    return {
+        key
+        for _, func, _ in conn.run_on_commit
+        if isinstance(func, _Publication)
+        for key in func.keys
+    }
+
+
+def publish_all(using=None):
+    """Сброс всех кешей после массовых изменений SQL-запросами."""
+    publish(ALL, using=using)
+
+
+def _instance_keys(instance, related):
+    keys = [entity_key(type(instance), instance.pk)]
+    for name in related:
+        field = instance._meta.get_field(name)
+        value = getattr(instance, field.attname)
+        if value is not None:
+            keys.append(entity_key(field.related_model, value))
+    return keys
+
+
+def track(model, *related):
+    """
+    Публикация ключа экземпляра model ('<app_label>.<model>:<pk>')
+    и объектов по внешним ключам related при каждом сохранении
+    и удалении, после фиксации транзакции.
+    """
+    def changed(sender, instance, **kwargs):
+        publish(*_instance_keys(instance, related),
+                using=kwargs.get('using'))
+
+    post_save.connect(changed, sender=model, weak=False,
+                      dispatch_uid=f'invalidation:{model._meta.label}')
+    post_delete.connect(changed, sender=model, weak=False,
+                        dispatch_uid=f'invalidation:{model._meta.label}')
+
+
+class InvalidationListener(threading.Thread):
+    """
+    Поток с отдельным соединением, выполнившим LISTEN на канале CHANNEL.
+
+    Уведомления собственного процесса пропускаются: локальные обработчики
+    уже вызваны при фиксации транзакции. После переподключения часть
+    уведомлений могла быть потеряна, поэтому обработчики получают
+    keys=None.
+    """
+
+    def __init__(self, connection_params, origin):
+        super().__init__(name='invalidation-listener', daemon=True)
+        self.connection_params = connection_params
+        self.origin = origin
+        self.ready = threading.Event()
+        self._stopped = threading.Event()
+        self._connection = None
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.connection_params)
+        conn.set_isolation_level(
+            psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT
+        )
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN {CHANNEL}')
+        return conn
+
+    def _handle(self, notification):
+        try:
+            payload = json.loads(notification.payload)
+        except ValueError:
+            return
+        if payload.get('origin') != self.origin:
+            dispatch(set(payload.get('keys') or ()))
+
+    def run(self):
+        reconnected = False
+        while not self._stopped.is_set():
+            try:
+                self._connection = self._connect()
+                if reconnected:
+                    dispatch(None)
+                self.ready.set()
+                while not self._stopped.is_set():
+                    readable, _, _ = select.select(
+                        [self._connection], [], [], POLL_TIMEOUT
+                    )
+                    if not readable:
+                        continue
+                    self._connection.poll()
+                    while self._connection.notifies:
+                        self._handle(self._connection.notifies.pop(0))
+            except Exception:
+                if self._stopped.is_set():
+                    break
+                logger.exception('Слушатель инвалидации переподключается')
+                self._stopped.wait(RECONNECT_DELAY)
+                reconnected = True
+            finally:
+                self._close()
+
+    def _close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def stop(self):
+        self._stopped.set()
+        self._close()
+
+
+_origin = None
+_listener = None
+_listener_pid = None
+_listener_lock = threading.Lock()
+
+
+def process_origin():
+    global _origin
+
+    if _origin is None or _origin[0] != os.getpid():
+        _origin = (os.getpid(), uuid.uuid4().hex)
+    return _origin[1]
+
+
+def get_listener():
+    """
+    Слушатель текущего процесса; создается заново после fork.
+    При INVALIDATION_LISTENER=False уведомления других процессов
+    не принимаются.
+    """
+    global _listener, _listener_pid
+
+    if not getattr(settings, 'INVALIDATION_LISTENER', True):
+        return None
+    pid = os.getpid()
+    if _listener_pid != pid:
+        with _listener_lock:
+            if _listener_pid != pid:
+                _listener = InvalidationListener(
+                    connection.get_connection_params(), process_origin()
+                )
+                _listener.start()
+                _listener_pid = pid
+    return _listener
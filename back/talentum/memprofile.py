@@ -0,0 +1,234 @@
+import json
+import os
+import random
+import re
+import threading
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+
+from talentum.metrics import MEMORY_BUCKETS, get_registry
+from talentum.querywatch import view_name
+
+CAPTURE_ID = re.compile(r'^\d{20}-[0-9a-f]{8}$')
+MAX_BODY = 64 * 1024
+# Значения этих полей тела запроса не сохраняются
+_SECRET_FIELD = re.compile(r'password|token|secret', re.IGNORECASE)
+
+# tracemalloc общий для всех потоков процесса
+_trace_lock = threading.Lock()
+
+
+# Кадры middleware и команд проекта, через которые проходит любой
+# запрос: выделения внутри Django относятся к ним, а не к коду приложения
+_PASS_THROUGH = re.compile(
+    r'^talentum/(querywatch|metrics|profiling|slowlog|memprofile|sampling)'
+    r'\.py$|/management/commands/'
+)
+
+
+def _site(traceback):
+    """
+    Ближайший к месту выделения кадр кода приложения; если его нет -
+    сам кадр выделения.
+    """
+    base_dir = str(settings.BASE_DIR) + os.sep
+    for frame in reversed(traceback):
+        filename = frame.filename
+        if not filename.startswith(base_dir) or 'site-packages' in filename:
+            continue
+        filename = filename[len(base_dir):]
+        if not _PASS_THROUGH.search(filename):
+            return f'{filename}:{frame.lineno}'
+    frame = traceback[-1]
+    filename = frame.filename.split('site-packages' + os.sep, 1)[-1]
+    return f'{filename}:{frame.lineno}'
+
+
+def allocation_sites(snapshot, limit):
+    """
+    Живые выделения снимка по местам в коде проекта:
+    [{'site', 'size', 'count'}] по убыванию размера.
+    """
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ))
+    sites = {}
+    for stat in snapshot.statistics('traceback'):
+        site = sites.setdefault(_site(stat.traceback),
+                                {'size': 0, 'count': 0})
+        site['size'] += stat.size
+        site['count'] += stat.count
+    ranked = sorted(sites.items(), key=lambda item: -item[1]['size'])
+    return [{'site': site, **values} for site, values in ranked[:limit]]
+
+
+class MemoryTrace:
+    peak = 0
+    retained = 0
+    sites = ()
+
+
+@contextmanager
+def traced(frames, limit):
+    """
+    Выделения памяти внутри блока: peak - пик, retained - живые
+    на выходе, sites - их места (allocation_sites; при limit=0 снимок
+    не делается).
+    """
+    result = MemoryTrace()
+    tracemalloc.start(frames)
+    try:
+        yield result
+        result.retained, result.peak = tracemalloc.get_traced_memory()
+        if limit:
+            result.sites = allocation_sites(tracemalloc.take_snapshot(),
+                                            limit)
+    finally:
+        tracemalloc.stop()
+
+
+def _masked(value):
+    if isinstance(value, dict):
+        return {
+            key: '***' if _SECRET_FIELD.search(str(key)) else _masked(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_masked(item) for item in value]
+    return value
+
+
+def capture_request(request):
+    """
+    Данные для повтора запроса: тело только JSON без секретов.
+    Вызывается до представления, пока тело не прочитано парсерами.
+    """
+    body = None
+    content_type = request.META.get('CONTENT_TYPE', '')
+    length = int(request.META.get('CONTENT_LENGTH') or 0)
+    if content_type.startswith('application/json') and 0 < length <= MAX_BODY:
+        try:
+            body = _masked(json.loads(request.body))
+        except ValueError:
+            body = None
+    return {
+        'method': request.method,
+        'path': request.get_full_path(),
+        'host': request.get_host(),
+        'content_type': content_type,
+        'body': body,
+    }
+
+
+class CaptureStore:
+    """Снимки запросов в каталоге <id>.json; хранятся keep последних."""
+
+    def __init__(self, directory, keep):
+        self.directory = directory
+        self.keep = keep
+
+    def path(self, capture_id):
+        if not CAPTURE_ID.match(capture_id):
+            raise ValueError(f'Неверный идентификатор снимка: {capture_id}')
+        return os.path.join(self.directory, f'{capture_id}.json')
+
+    def ids(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted((name[:-5] for name in names if name.endswith('.json')
+                       and CAPTURE_ID.match(name[:-5])), reverse=True)
+
+    def save(self, capture):
+        os.makedirs(self.directory, exist_ok=True)
+        capture_id = '{:%Y%m%d%H%M%S%f}-{}'.format(
+            timezone.now(), uuid.uuid4().hex[:8]
+        )
+        capture = {'id': capture_id, **capture}
+        with open(self.path(capture_id), 'w') as file:
+            json.dump(capture, file, ensure_ascii=False)
+        for old_id in self.ids()[self.keep:]:
+            try:
+                os.remove(self.path(old_id))
+            except FileNotFoundError:
+                pass
+        return capture_id
+
+    def load(self, capture_id):
+        with open(self.path(capture_id)) as file:
+            return json.load(file)
+
+
+def get_capture_store():
+    return CaptureStore(settings.MEMORY_PROFILING_DIR,
+                        settings.MEMORY_PROFILING_KEEP)
+
+
+class MemoryProfilingMiddleware:
+    """
+    tracemalloc для представлений из MEMORY_PROFILING_VIEWS
+    ('GoalViewSet.list,EmployeeViewSet.list' или '*') с вероятностью
+    MEMORY_PROFILING_RATE. Пик и места выделений сохраняются вместе
+    с данными запроса (команда replay_memory_capture), пик попадает
+    в метрики. Одновременно трассируется один запрос процесса.
+    """
+
+    def __init__(self, get_response):
+        views = getattr(settings, 'MEMORY_PROFILING_VIEWS', ())
+        if not views:
+            raise MiddlewareNotUsed
+        self.views = set(views)
+        self.get_response = get_response
+
+    def _selected(self, request):
+        if random.random() >= settings.MEMORY_PROFILING_RATE:
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        name = view_name(request, match)
+        if '*' in self.views or name in self.views:
+            return name
+        return None
+
+    def __call__(self, request):
+        name = self._selected(request)
+        if name is None or tracemalloc.is_tracing() \
+                or not _trace_lock.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            captured_request = capture_request(request)
+            with traced(settings.MEMORY_PROFILING_FRAMES,
+                        settings.MEMORY_PROFILING_TOP) as trace:
+                response = self.get_response(request)
+        finally:
+            _trace_lock.release()
+
+        # Пользователь JWT известен только после представления
+        user = getattr(request, 'user', None)
+        captured_request['user_id'] = (
+            user.pk if user is not None and user.is_authenticated else None
+        )
+        get_capture_store().save({
+            'view': name,
+            'captured': timezone.now().isoformat(),
+            'status': response.status_code,
+            'peak': trace.peak,
+            'retained': trace.retained,
+            'sites': trace.sites,
+            'request': captured_request,
+        })
+        if getattr(settings, 'METRICS_ENABLED', False):
+            get_registry().observe('talentum_memory_peak_bytes',
+                                   {'view': name}, trace.peak, MEMORY_BUCKETS)
+        return response
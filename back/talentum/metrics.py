@@ -0,0 +1,395 @@
+import glob
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from contextvars import ContextVar
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+
+from talentum.querywatch import view_name
+
+MAGIC = b'TMET'
+# magic, занятая длина файла
+HEADER = struct.Struct('<4sI')
+KEY_LENGTH = struct.Struct('<I')
+VALUE = struct.Struct('<d')
+INITIAL_SIZE = 64 * 1024
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                    1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+MEMORY_BUCKETS = tuple(2 ** power * 1024 * 1024 for power in range(11))
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+
+METRICS = {
+    'talentum_http_requests_total': (
+        COUNTER, 'Число запросов по представлению, методу и статусу'
+    ),
+    'talentum_http_request_duration_seconds': (
+        HISTOGRAM, 'Время обработки запроса'
+    ),
+    'talentum_db_queries': (
+        HISTOGRAM, 'Число SQL-запросов за запрос'
+    ),
+    'talentum_db_duration_seconds': (
+        HISTOGRAM, 'Суммарное время SQL-запросов за запрос'
+    ),
+    'talentum_serializer_duration_seconds': (
+        HISTOGRAM, 'Время сериализации ответа (SerializerMetricsMixin)'
+    ),
+    'talentum_response_render_duration_seconds': (
+        HISTOGRAM, 'Время рендеринга ответа (JSON, шаблон)'
+    ),
+    'talentum_memory_peak_bytes': (
+        HISTOGRAM, 'Пик выделенной памяти за запрос (talentum.memprofile)'
+    ),
+}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _padded(length):
+    return (length + 7) // 8 * 8
+
+
+def _escape(value):
+    return (str(value).replace('\\', r'\\').replace('"', r'\"')
+            .replace('\n', r'\n'))
+
+
+def sample_key(name, labels):
+    """Ключ значения в формате текстовой выдачи: name{label="value"}."""
+    if not labels:
+        return name
+    pairs = ','.join(f'{label}="{_escape(value)}"'
+                     for label, value in labels.items())
+    return f'{name}{{{pairs}}}'
+
+
+def _entries(buffer, used):
+    position = HEADER.size
+    while position < used:
+        length, = KEY_LENGTH.unpack_from(buffer, position)
+        start = position + KEY_LENGTH.size
+        key = bytes(buffer[start:start + length]).decode('utf-8')
+        value_position = position + _padded(KEY_LENGTH.size + length)
+        value, = VALUE.unpack_from(buffer, value_position)
+        yield key, value, value_position
+        position = value_position + VALUE.size
+
+
+class MetricsFile:
+    """
+    Значения метрик одного процесса в файле, отображенном в память.
+
+    Пишет только процесс-владелец; выдача /metrics читает файлы всех
+    процессов и суммирует значения. Запись ключа добавляется в конец,
+    после чего увеличивается занятая длина в заголовке, поэтому читатель
+    не видит недописанных записей.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._positions = {}
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            size = os.fstat(fd).st_size
+            if size < INITIAL_SIZE:
+                os.ftruncate(fd, INITIAL_SIZE)
+                size = INITIAL_SIZE
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        magic, used = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            used = HEADER.size
+            HEADER.pack_into(self._map, 0, MAGIC, used)
+        self._used = used
+        for key, _, position in _entries(self._map, used):
+            self._positions[key] = position
+
+    def _grow(self, size):
+        new_size = len(self._map)
+        while new_size < size:
+            new_size *= 2
+        self._map.close()
+        fd = os.open(self.path, os.O_RDWR)
+        try:
+            os.ftruncate(fd, new_size)
+            self._map = mmap.mmap(fd, new_size)
+        finally:
+            os.close(fd)
+
+    def _append(self, key):
+        encoded = key.encode('utf-8')
+        position = self._used
+        value_position = position + _padded(KEY_LENGTH.size + len(encoded))
+        end = value_position + VALUE.size
+        if end > len(self._map):
+            self._grow(end)
+        KEY_LENGTH.pack_into(self._map, position, len(encoded))
+        start = position + KEY_LENGTH.size
+        self._map[start:start + len(encoded)] = encoded
+        VALUE.pack_into(self._map, value_position, 0.0)
+        self._used = end
+        HEADER.pack_into(self._map, 0, MAGIC, end)
+        self._positions[key] = value_position
+        return value_position
+
+    def ensure(self, keys):
+        """Создает нулевые значения ключей (порядок сохраняется в выдаче)."""
+        with self._lock:
+            for key in keys:
+                if key not in self._positions:
+                    self._append(key)
+
+    def inc(self, key, amount=1.0):
+        with self._lock:
+            position = self._positions.get(key)
+            if position is None:
+                position = self._append(key)
+            value, = VALUE.unpack_from(self._map, position)
+            VALUE.pack_into(self._map, position, value + amount)
+
+    def items(self):
+        with self._lock:
+            return [(key, value)
+                    for key, value, _ in _entries(self._map, self._used)]
+
+
+def read_file(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+    if len(data) < HEADER.size:
+        return []
+    magic, used = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        return []
+    return [(key, value) for key, value, _ in _entries(data, used)]
+
+
+def _bucket_label(bound):
+    return '+Inf' if math.isinf(bound) else format(bound, 'g')
+
+
+class Registry:
+    """Запись метрик текущего процесса в его файл в каталоге directory."""
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.file = MetricsFile(os.path.join(directory, f'{os.getpid()}.db'))
+
+    def inc(self, name, labels, amount=1.0):
+        self.file.inc(sample_key(name, labels), amount)
+
+    def observe(self, name, labels, value, buckets):
+        """
+        Наблюдение гистограммы: счетчики корзин хранятся накопленными,
+        все корзины набора меток создаются при первом наблюдении.
+        """
+        bounds = (*buckets, math.inf)
+        bucket_keys = [
+            sample_key(f'{name}_bucket',
+                       {**labels, 'le': _bucket_label(bound)})
+            for bound in bounds
+        ]
+        self.file.ensure(bucket_keys)
+        for bound, key in zip(bounds, bucket_keys):
+            if value <= bound:
+                self.file.inc(key)
+        self.file.inc(sample_key(f'{name}_sum', labels), value)
+        self.file.inc(sample_key(f'{name}_count', labels))
+
+
+def collect(directory):
+    """Сумма значений по всем файлам процессов в порядке появления ключей."""
+    totals = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.db'))):
+        try:
+            items = read_file(path)
+        except OSError:
+            continue
+        for key, value in items:
+            totals[key] = totals.get(key, 0.0) + value
+    return totals
+
+
+def _metric_name(key):
+    name = key.split('{', 1)[0]
+    for suffix in ('_bucket', '_sum', '_count'):
+        base = name[:-len(suffix)]
+        if name.endswith(suffix) and METRICS.get(base, ('',))[0] == HISTOGRAM:
+            return base
+    return name
+
+
+def _format_value(value):
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def render(totals):
+    """Текстовый формат Prometheus (exposition format 0.0.4)."""
+    grouped = {}
+    for key, value in totals.items():
+        grouped.setdefault(_metric_name(key), []).append((key, value))
+    lines = []
+    for name, samples in grouped.items():
+        kind, description = METRICS.get(name, ('untyped', ''))
+        if description:
+            lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(f'{key} {_format_value(value)}' for key, value in samples)
+    return '\n'.join(lines) + '\n'
+
+
+_registry = None
+_registry_key = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Реестр текущего процесса; после fork создается новый файл."""
+    global _registry, _registry_key
+
+    key = (os.getpid(), settings.METRICS_DIR)
+    if _registry_key != key:
+        with _registry_lock:
+            if _registry_key != key:
+                _registry = Registry(settings.METRICS_DIR)
+                _registry_key = key
+    return _registry
+
+
+class RequestSample:
+    """Время SQL, сериализации и рендеринга ответа одного запроса."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+_current_sample = ContextVar('metrics_sample', default=None)
+
+
+class MetricsMiddleware:
+    """
+    Гистограммы времени запроса, числа и времени SQL-запросов, времени
+    сериализации и рендеринга ответа по представлению ('GoalViewSet.retrieve'). Значения
+    каждого процесса пишутся в METRICS_DIR, выдача metrics_view
+    объединяет все процессы (воркеры gunicorn).
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample = RequestSample()
+        token = _current_sample.set(sample)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(sample))
+                response = self.get_response(request)
+        finally:
+            _current_sample.reset(token)
+        duration = time.perf_counter() - start
+
+        view = view_name(request) or 'unmatched'
+        labels = {'view': view}
+        registry = get_registry()
+        registry.inc('talentum_http_requests_total', {
+            'view': view,
+            'method': request.method,
+            'status': response.status_code,
+        })
+        registry.observe('talentum_http_request_duration_seconds', labels,
+                         duration, DURATION_BUCKETS)
+        registry.observe('talentum_db_queries', labels,
+                         sample.queries, QUERY_BUCKETS)
+        registry.observe('talentum_db_duration_seconds', labels,
+                         sample.db_time, DURATION_BUCKETS)
+        registry.observe('talentum_serializer_duration_seconds', labels,
+                         sample.serializer_time, DURATION_BUCKETS)
+        registry.observe('talentum_response_render_duration_seconds',
+                         labels, sample.render_time, DURATION_BUCKETS)
+        return response
+
+    def process_template_response(self, request, response):
+        # Внешний middleware вызывается последним, непосредственно перед
+        # response.render(): ответы DRF рендерятся в JSON здесь
+        sample = _current_sample.get()
+        if sample is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                sample.render_time += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+class SerializerMetricsMixin:
+    """
+    Миксин представлений DRF: время to_representation сериализаторов,
+    созданных get_serializer (serializer.data в list, retrieve
+    и действиях), учитывается в talentum_serializer_duration_seconds.
+    Сериализаторы, вложенные в них, входят во время внешнего.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        sample = _current_sample.get()
+        if sample is not None:
+            to_representation = serializer.to_representation
+
+            def timed(instance):
+                started = time.perf_counter()
+                try:
+                    return to_representation(instance)
+                finally:
+                    sample.serializer_time += time.perf_counter() - started
+
+            serializer.to_representation = timed
+        return serializer
+
+
+def metrics_view(request):
+    """
+    Метрики всех процессов в текстовом формате Prometheus.
+    Требуется заголовок Authorization: Bearer <METRICS_TOKEN>;
+    без заданного токена выдача недоступна.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not getattr(settings, 'METRICS_ENABLED', False) or not token:
+        return HttpResponse(status=404)
+    if request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponse(status=401)
+    return HttpResponse(render(collect(settings.METRICS_DIR)),
+                        content_type=CONTENT_TYPE)
@@ -0,0 +1,269 @@
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import FileResponse, Http404
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from accounts.permissions import IsAdminOnly
+from talentum.querywatch import view_name
+from talentum.sampling import StackSampler, format_collapsed
+
+HEADER = 'HTTP_X_PROFILE'
+QUERY_FLAG = 'profile'
+MAX_QUERIES = 5000
+PROFILE_ID = re.compile(r'^\d{20}-[0-9a-f]{8}$')
+
+PSTATS = 'prof'
+COLLAPSED = 'collapsed'
+META = 'json'
+
+# cProfile допускает один активный профилировщик на процесс
+_profile_lock = threading.Lock()
+
+
+def _requested(request):
+    if request.META.get(HEADER):
+        return True
+    query = request.META.get('QUERY_STRING', '')
+    return f'{QUERY_FLAG}=' in query \
+        and request.GET.get(QUERY_FLAG) not in (None, '', '0', 'false')
+
+
+def _is_admin(request):
+    """
+    Администратор по сессии или по заголовку Authorization: токен
+    проверяется здесь, до представления, только для запросов
+    с флагом профилирования.
+    """
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        user = None
+        for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+            try:
+                result = authentication_class().authenticate(request)
+            except APIException:
+                return False
+            if result is not None:
+                user = result[0]
+                break
+    return user is not None and (user.is_staff or user.role == 'admin')
+
+
+class SqlRecorder:
+    """Обертка execute: текст и время каждого SQL-запроса."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            if len(self.queries) < MAX_QUERIES:
+                self.queries.append({
+                    'sql': sql,
+                    'duration_ms': round(duration * 1000, 3),
+                })
+
+
+class ProfileStore:
+    """
+    Результаты профилирования в каталоге, общем для процессов:
+    <id>.prof (pstats), <id>.collapsed (свернутые стеки) и <id>.json
+    (запрос и SQL). Хранятся keep последних профилей.
+    """
+
+    def __init__(self, directory, keep):
+        self.directory = directory
+        self.keep = keep
+
+    def path(self, profile_id, kind):
+        if not PROFILE_ID.match(profile_id):
+            raise Http404
+        return os.path.join(self.directory, f'{profile_id}.{kind}')
+
+    def save(self, profiler, stacks, meta):
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = '{:%Y%m%d%H%M%S%f}-{}'.format(
+            timezone.now(), uuid.uuid4().hex[:8]
+        )
+        meta = {'id': profile_id, **meta}
+        profiler.dump_stats(self.path(profile_id, PSTATS))
+        with open(self.path(profile_id, COLLAPSED), 'w') as file:
+            file.write(format_collapsed(stacks))
+        with open(self.path(profile_id, META), 'w') as file:
+            json.dump(meta, file, ensure_ascii=False)
+        self.prune()
+        return profile_id
+
+    def ids(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            (name[:-len(META) - 1] for name in names
+             if name.endswith(f'.{META}')),
+            reverse=True
+        )
+
+    def prune(self):
+        for profile_id in self.ids()[self.keep:]:
+            for kind in (PSTATS, COLLAPSED, META):
+                try:
+                    os.remove(self.path(profile_id, kind))
+                except FileNotFoundError:
+                    pass
+
+    def meta(self, profile_id):
+        try:
+            with open(self.path(profile_id, META)) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            raise Http404
+
+
+def get_profile_store():
+    return ProfileStore(settings.PROFILING_DIR, settings.PROFILING_KEEP)
+
+
+class ProfilingMiddleware:
+    """
+    Профилирование запроса по заголовку X-Profile или параметру
+    ?profile=1 от администратора: cProfile, выборка стеков потока
+    запроса и SQL-запросы с временем. Идентификатор результата
+    возвращается в заголовке X-Profile-Id, файлы выдает ProfileViewSet.
+    Остальные запросы не профилируются.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not _requested(request) or not _is_admin(request):
+            return self.get_response(request)
+        if not _profile_lock.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            return self.profile(request)
+        finally:
+            _profile_lock.release()
+
+    def profile(self, request):
+        profiler = cProfile.Profile()
+        recorder = SqlRecorder()
+        sampler = StackSampler(settings.PROFILING_SAMPLE_INTERVAL,
+                               thread_ids={threading.get_ident()})
+        started = timezone.now()
+        start = time.perf_counter()
+        sampler.start()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(recorder))
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+                sampler.stop()
+        duration = time.perf_counter() - start
+
+        user = getattr(request, 'user', None)
+        profile_id = get_profile_store().save(profiler, sampler.take(), {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'view': view_name(request),
+            'user': getattr(user, 'username', None),
+            'status': response.status_code,
+            'started': started.isoformat(),
+            'duration_ms': round(duration * 1000, 3),
+            'sql_count': recorder.count,
+            'sql_duration_ms': round(recorder.duration * 1000, 3),
+            'queries': recorder.queries,
+        })
+        response['X-Profile-Id'] = profile_id
+        return response
+
+
+class ProfileViewSet(viewsets.ViewSet):
+    """Результаты профилирования запросов (ProfilingMiddleware)."""
+    permission_classes = [IsAuthenticated, IsAdminOnly]
+    lookup_value_regex = r'\d{20}-[0-9a-f]{8}'
+
+    @extend_schema(
+        tags=['profiling'],
+        description="Список последних профилей запросов без SQL",
+        operation_id='v1_profiles_list',
+        responses={200: OpenApiTypes.OBJECT}
+    )
+    def list(self, request):
+        store = get_profile_store()
+        profiles = []
+        for profile_id in store.ids():
+            try:
+                meta = store.meta(profile_id)
+            except Http404:
+                continue
+            meta.pop('queries', None)
+            profiles.append(meta)
+        return Response(profiles)
+
+    @extend_schema(
+        tags=['profiling'],
+        description="Профиль запроса с SQL-запросами и их временем",
+        responses={200: OpenApiTypes.OBJECT}
+    )
+    def retrieve(self, request, pk=None):
+        return Response(get_profile_store().meta(pk))
+
+    @extend_schema(
+        tags=['profiling'],
+        description="Файл pstats (python -m pstats, snakeviz)",
+        responses={200: OpenApiTypes.BINARY}
+    )
+    @action(detail=True, methods=['get'])
+    def pstats(self, request, pk=None):
+        return self._download(pk, PSTATS, 'application/octet-stream')
+
+    @extend_schema(
+        tags=['profiling'],
+        description="Свернутые стеки для flamegraph.pl и speedscope",
+        responses={200: OpenApiTypes.STR}
+    )
+    @action(detail=True, methods=['get'])
+    def collapsed(self, request, pk=None):
+        return self._download(pk, COLLAPSED, 'text/plain; charset=utf-8')
+
+    def _download(self, profile_id, kind, content_type):
+        try:
+            file = open(get_profile_store().path(profile_id, kind), 'rb')
+        except FileNotFoundError:
+            raise Http404
+        return FileResponse(file, as_attachment=True,
+                            filename=f'{profile_id}.{kind}',
+                            content_type=content_type)
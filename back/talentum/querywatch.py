@@ -0,0 +1,167 @@
+import logging
+import re
+import traceback
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPEAT_THRESHOLD = 5
+STACK_DEPTH = 8
+
+# Служебные команды транзакций не зависят от кода представления
+_TRANSACTION_SQL = re.compile(
+    r'^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT|BEGIN|COMMIT'
+    r'|ROLLBACK)\b',
+    re.IGNORECASE
+)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+_SPACES = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def fingerprint(sql):
+    """
+    Форма запроса без значений: запросы, отличающиеся только
+    параметрами или длиной списка IN, совпадают.
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+def _application_stack():
+    """Кадры кода проекта (без Django, DRF и самого модуля)."""
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(base_dir)
+        and 'site-packages' not in frame.filename
+        and frame.filename != __file__
+    ]
+    return traceback.format_list(frames[-STACK_DEPTH:])
+
+
+class QueryRecorder:
+    """
+    Обертка execute для connection.execute_wrapper: считает запросы
+    по форме и запоминает стек первого повтора каждой формы.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.shapes = Counter()
+        self.samples = {}
+        self.stacks = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        if not _TRANSACTION_SQL.match(sql):
+            self.record(sql)
+        return execute(sql, params, many, context)
+
+    def record(self, sql):
+        shape = fingerprint(sql)
+        self.count += 1
+        self.shapes[shape] += 1
+        if self.shapes[shape] == 1:
+            self.samples[shape] = sql
+        elif self.shapes[shape] == 2:
+            self.stacks[shape] = _application_stack()
+
+    def repeated(self, threshold):
+        """Формы, выполненные не менее threshold раз (вероятный N+1)."""
+        return [
+            (shape, count) for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+def view_name(request, match=None):
+    """
+    Имя представления для отчетов: '<ViewSet>.<action>' для
+    представлений DRF, иначе имя маршрута. match - результат resolve,
+    если запрос еще не сопоставлен с маршрутом.
+    """
+    if match is None:
+        match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    view_class = getattr(match.func, 'cls', None)
+    if view_class is None:
+        return match.view_name
+    actions = getattr(match.func, 'actions', None) or {}
+    action = actions.get(request.method.lower())
+    if action is None:
+        return view_class.__name__
+    return f'{view_class.__name__}.{action}'
+
+
+def query_budget(request):
+    """
+    Допустимое число запросов для действия представления
+    из атрибута query_budgets ViewSet ({'list': 5, ...}).
+    """
+    match = getattr(request, 'resolver_match', None)
+    view_class = getattr(getattr(match, 'func', None), 'cls', None)
+    budgets = getattr(view_class, 'query_budgets', None)
+    if not budgets:
+        return None
+    actions = getattr(match.func, 'actions', None) or {}
+    return budgets.get(actions.get(request.method.lower()))
+
+
+class QueryWatchMiddleware:
+    """
+    Контроль запросов к базе для разработки и тестов (QUERY_WATCH).
+
+    Повторяющиеся запросы одной формы (N+1) записываются в журнал
+    со стеком кода, который их выполнил. Превышение бюджета действия
+    (query_budgets) записывается в журнал, а при QUERY_BUDGET_STRICT
+    завершается исключением QueryBudgetExceeded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'QUERY_WATCH', False):
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(recorder))
+            response = self.get_response(request)
+        self.report(request, recorder)
+        return response
+
+    def report(self, request, recorder):
+        name = view_name(request) or request.path
+        threshold = getattr(settings, 'QUERY_WATCH_REPEAT_THRESHOLD',
+                            DEFAULT_REPEAT_THRESHOLD)
+        for shape, count in recorder.repeated(threshold):
+            logger.warning(
+                'N+1 в %s: %d запросов вида\n%s\n%s',
+                name, count, recorder.samples[shape],
+                ''.join(recorder.stacks.get(shape, ()))
+            )
+
+        budget = query_budget(request)
+        if budget is None or recorder.count <= budget:
+            return
+        message = (
+            f'{name}: {recorder.count} запросов при бюджете {budget}; '
+            f'самые частые: {recorder.shapes.most_common(3)}'
+        )
+        if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,322 @@
+import atexit
+import glob
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from html import escape
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+DEFAULT_INTERVAL = 0.005
+
+_labels = {}
+
+
+def frame_label(code):
+    """Имя кадра: функция и файл относительно проекта или site-packages."""
+    label = _labels.get(code)
+    if label is not None:
+        return label
+    filename = code.co_filename
+    base_dir = str(settings.BASE_DIR) + os.sep
+    if filename.startswith(base_dir):
+        filename = filename[len(base_dir):]
+    elif 'site-packages' + os.sep in filename:
+        filename = filename.split('site-packages' + os.sep, 1)[1]
+    # ';' разделяет кадры в формате свернутых стеков
+    label = f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(
+        ';', ':'
+    )
+    _labels[code] = label
+    return label
+
+
+def collapse(frame, root_codes=None):
+    """
+    Стек от корня к кадру frame в формате flamegraph: 'a;b;c'.
+    С root_codes стек начинается с самого внешнего кадра этих функций,
+    а стеки без них пропускаются (None).
+    """
+    labels = []
+    root = None
+    while frame is not None:
+        labels.append(frame_label(frame.f_code))
+        if root_codes is not None and frame.f_code in root_codes:
+            root = len(labels)
+        frame = frame.f_back
+    if root_codes is not None:
+        if root is None:
+            return None
+        labels = labels[:root]
+    return ';'.join(reversed(labels))
+
+
+def request_handler_codes():
+    """Функции Django, внутри которых обрабатывается запрос."""
+    from django.core.handlers.base import BaseHandler
+
+    return frozenset({
+        BaseHandler.get_response.__code__,
+        BaseHandler.get_response_async.__code__,
+    })
+
+
+def format_collapsed(counts):
+    """Строки 'стек число' (вход flamegraph.pl и speedscope)."""
+    return ''.join(
+        f'{stack} {count}\n' for stack, count in counts.most_common()
+    )
+
+
+def parse_collapsed(text):
+    counts = Counter()
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(' ')
+        if stack and count.isdigit():
+            counts[stack] += int(count)
+    return counts
+
+
+class StackSampler(threading.Thread):
+    """
+    Поток, каждые interval секунд снимающий стеки потоков thread_ids
+    (по умолчанию всех, кроме себя) и считающий одинаковые стеки.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, thread_ids=None,
+                 root_codes=None):
+        super().__init__(name='stack-sampler', daemon=True)
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.root_codes = root_codes
+        self.counts = Counter()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def sample(self):
+        own_id = threading.get_ident()
+        frames = sys._current_frames()
+        thread_ids = self.thread_ids
+        if thread_ids is None:
+            thread_ids = frames.keys()
+        with self._lock:
+            for thread_id in thread_ids:
+                frame = frames.get(thread_id)
+                if frame is None or thread_id == own_id:
+                    continue
+                stack = collapse(frame, self.root_codes)
+                if stack is not None:
+                    self.counts[stack] += 1
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def take(self):
+        """Накопленные стеки; счетчики начинаются заново."""
+        with self._lock:
+            counts, self.counts = self.counts, Counter()
+        return counts
+
+    def stop(self):
+        self._stopped.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
+
+
+class ContinuousProfiler(StackSampler):
+    """
+    Постоянная выборка стеков потоков, обрабатывающих запросы
+    (от BaseHandler.get_response: middleware, представления, права,
+    сериализаторы). Раз в flush_interval секунд накопленные стеки
+    записываются в файл <pid>-<время>.collapsed в directory; файлы
+    старше retention секунд удаляются. Файлы всех процессов объединяет
+    команда merge_profiles.
+    """
+
+    def __init__(self, directory, interval, flush_interval, retention):
+        super().__init__(interval, root_codes=request_handler_codes())
+        self.name = 'continuous-profiler'
+        self.pid = os.getpid()
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.retention = retention
+
+    def run(self):
+        next_flush = time.monotonic() + self.flush_interval
+        while not self._stopped.wait(self.interval):
+            self.sample()
+            if time.monotonic() >= next_flush:
+                self.flush()
+                next_flush = time.monotonic() + self.flush_interval
+
+    def flush(self):
+        if os.getpid() != self.pid:
+            # Копия профилировщика родителя, унаследованная при fork
+            return
+        counts = self.take()
+        if counts:
+            os.makedirs(self.directory, exist_ok=True)
+            name = '{}-{}.collapsed'.format(
+                os.getpid(), time.strftime('%Y%m%d%H%M%S')
+            )
+            path = os.path.join(self.directory, name)
+            # Стеки за ту же секунду (flush при выходе) дописываются
+            if os.path.exists(path):
+                with open(path) as file:
+                    counts.update(parse_collapsed(file.read()))
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w') as file:
+                file.write(format_collapsed(counts))
+            os.replace(tmp_path, path)
+        self.prune()
+
+    def prune(self):
+        expired = time.time() - self.retention
+        for path in glob.glob(os.path.join(self.directory, '*.collapsed')):
+            try:
+                if os.path.getmtime(path) < expired:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+_profiler = None
+_profiler_pid = None
+_profiler_lock = threading.Lock()
+
+
+def get_continuous_profiler():
+    """Профилировщик текущего процесса; запускается заново после fork."""
+    global _profiler, _profiler_pid
+
+    pid = os.getpid()
+    if _profiler_pid != pid:
+        with _profiler_lock:
+            if _profiler_pid != pid:
+                _profiler = ContinuousProfiler(
+                    settings.SAMPLING_PROFILER_DIR,
+                    settings.SAMPLING_PROFILER_INTERVAL,
+                    settings.SAMPLING_PROFILER_FLUSH_INTERVAL,
+                    settings.SAMPLING_PROFILER_RETENTION,
+                )
+                _profiler.start()
+                atexit.register(_profiler.flush)
+                _profiler_pid = pid
+    return _profiler
+
+
+class SamplingProfilerMiddleware:
+    """
+    Запускает ContinuousProfiler в каждом процессе при первом запросе
+    (SAMPLING_PROFILER_ENABLED): воркеры, созданные fork, получают
+    собственный поток.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SAMPLING_PROFILER_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        get_continuous_profiler()
+        return self.get_response(request)
+
+
+def merge_collapsed(paths, match=None):
+    """Сумма стеков из файлов; match оставляет стеки с этой подстрокой."""
+    counts = Counter()
+    for path in paths:
+        with open(path) as file:
+            counts.update(parse_collapsed(file.read()))
+    if match:
+        counts = Counter({
+            stack: count for stack, count in counts.items() if match in stack
+        })
+    return counts
+
+
+FRAME_HEIGHT = 16
+FONT_SIZE = 11
+CHAR_WIDTH = 6.5
+
+
+def _frame_tree(counts):
+    root = {'name': 'all', 'value': 0, 'children': {}}
+    for stack, count in counts.items():
+        node = root
+        node['value'] += count
+        for name in stack.split(';'):
+            node = node['children'].setdefault(
+                name, {'name': name, 'value': 0, 'children': {}}
+            )
+            node['value'] += count
+    return root
+
+
+def _frame_color(name):
+    # Стабильный теплый цвет по имени, как в flamegraph.pl
+    value = zlib.crc32(name.encode('utf-8'))
+    return 'rgb({},{},{})'.format(
+        205 + value % 50, 80 + (value >> 8) % 130, (value >> 16) % 55
+    )
+
+
+def flamegraph_svg(counts, title='Flame graph', width=1200):
+    """SVG flame graph свернутых стеков (корень внизу, ширина - доля выборок)."""
+    root = _frame_tree(counts)
+    total = root['value'] or 1
+    scale = width / total
+
+    frames = []
+    max_depth = 0
+    pending = [(root, 0.0, 0)]
+    while pending:
+        node, x, depth = pending.pop()
+        frame_width = node['value'] * scale
+        if frame_width < 0.1:
+            continue
+        frames.append((node, x, depth, frame_width))
+        max_depth = max(max_depth, depth)
+        child_x = x
+        for child in sorted(node['children'].values(),
+                            key=lambda item: item['name']):
+            pending.append((child, child_x, depth + 1))
+            child_x += child['value'] * scale
+
+    top = 2 * FRAME_HEIGHT
+    height = top + (max_depth + 1) * FRAME_HEIGHT + FRAME_HEIGHT
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{height}" font-family="monospace" '
+        f'font-size="{FONT_SIZE}">',
+        f'<text x="{width / 2}" y="{FRAME_HEIGHT}" '
+        f'text-anchor="middle">{escape(title)}</text>',
+    ]
+    for node, x, depth, frame_width in frames:
+        y = top + (max_depth - depth) * FRAME_HEIGHT
+        name = escape(node['name'])
+        percent = node['value'] * 100 / total
+        parts.append(
+            f'<g><title>{name} ({node["value"]} samples, '
+            f'{percent:.2f}%)</title>'
+            f'<rect x="{x:.2f}" y="{y}" width="{frame_width:.2f}" '
+            f'height="{FRAME_HEIGHT - 1}" fill="{_frame_color(node["name"])}"'
+            f'/>'
+        )
+        chars = int((frame_width - 4) / CHAR_WIDTH)
+        if chars >= 3:
+            text = node['name']
+            if len(text) > chars:
+                text = text[:chars - 2] + '..'
+            parts.append(
+                f'<text x="{x + 2:.2f}" y="{y + FRAME_HEIGHT - 4}">'
+                f'{escape(text)}</text>'
+            )
+        parts.append('</g>')
+    parts.append('</svg>')
+    return '\n'.join(parts) + '\n'
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -37,9 +38,12 @@ INSTALLED_APPS = [
     'accounts',
     'goals',
     'feedback',
+    'analytics',
 ]
 
 MIDDLEWARE = [
+    'talentum.metrics.MetricsMiddleware',
+    'talentum.sampling.SamplingProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -48,6 +52,10 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'talentum.profiling.ProfilingMiddleware',
+    'talentum.slowlog.SlowQueryMiddleware',
+    'talentum.memprofile.MemoryProfilingMiddleware',
+    'talentum.querywatch.QueryWatchMiddleware',
 ]
 
 CORS_ALLOWED_ORIGINS = os.getenv(
@@ -142,11 +150,146 @@ SPECTACULAR_SETTINGS = {
             'name': 'expert-evaluation',
             'description': 'Управление экспертной оценкой'
         },
+        {
+            'name': 'analytics',
+            'description': 'Аналитика по циклам оценки'
+        },
+        {
+            'name': 'profiling',
+            'description': 'Профилирование запросов по требованию'
+        },
     ],
 }
 
 AUTH_USER_MODEL = 'accounts.User'
 
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.OffloadedPasswordBackend',
+]
+
+# Пул проверки паролей при входе: сверх WORKERS + QUEUE_SIZE одновременных
+# входов запросы сразу получают 503
+LOGIN_EXECUTOR_WORKERS = int(os.getenv('LOGIN_EXECUTOR_WORKERS', '4'))
+LOGIN_EXECUTOR_QUEUE_SIZE = int(os.getenv('LOGIN_EXECUTOR_QUEUE_SIZE', '16'))
+LOGIN_EXECUTOR_TIMEOUT = float(os.getenv('LOGIN_EXECUTOR_TIMEOUT', '10'))
+
+# Фильтр Блума отозванных refresh-токенов в каждом процессе: отзывы
+# из других процессов видны с задержкой до SYNC_INTERVAL секунд
+TOKEN_REVOCATION_SYNC_INTERVAL = float(
+    os.getenv('TOKEN_REVOCATION_SYNC_INTERVAL', '30')
+)
+# Перекрытие окна синхронизации: отзывы, зафиксированные позже
+# своей даты отзыва, и расхождение часов между серверами
+TOKEN_REVOCATION_SYNC_OVERLAP = float(
+    os.getenv('TOKEN_REVOCATION_SYNC_OVERLAP', '60')
+)
+TOKEN_REVOCATION_REBUILD_INTERVAL = float(
+    os.getenv('TOKEN_REVOCATION_REBUILD_INTERVAL', '3600')
+)
+TOKEN_REVOCATION_FILTER_CAPACITY = int(
+    os.getenv('TOKEN_REVOCATION_FILTER_CAPACITY', '100000')
+)
+
+# Каталог снимка иерархии сотрудников (accounts.org_graph), общего
+# для всех воркеров через mmap; по умолчанию в памяти (/dev/shm)
+ORG_GRAPH_DIR = os.getenv(
+    'ORG_GRAPH_DIR',
+    '/dev/shm/talentum' if os.path.isdir('/dev/shm')
+    else os.path.join(tempfile.gettempdir(), 'talentum')
+)
+
+# Поток LISTEN/NOTIFY в каждом процессе, сбрасывающий локальные кеши
+# при изменениях в других процессах (talentum.invalidation)
+INVALIDATION_LISTENER = os.getenv('INVALIDATION_LISTENER', 'True') == 'True'
+
+# Кеш представлений сотрудников (accounts.fragment_cache): LRU в памяти
+# процесса перед общим кешем Django
+EMPLOYEE_FRAGMENT_LOCAL_SIZE = int(
+    os.getenv('EMPLOYEE_FRAGMENT_LOCAL_SIZE', '10000')
+)
+EMPLOYEE_FRAGMENT_LOCAL_TTL = float(
+    os.getenv('EMPLOYEE_FRAGMENT_LOCAL_TTL', '60')
+)
+EMPLOYEE_FRAGMENT_SHARED_TTL = int(
+    os.getenv('EMPLOYEE_FRAGMENT_SHARED_TTL', '3600')
+)
+
+# Метрики запросов для Prometheus (talentum.metrics): значения каждого
+# процесса в METRICS_DIR, выдача /metrics суммирует все процессы.
+# Выключены по умолчанию; выдача требует Authorization: Bearer
+# <METRICS_TOKEN> и без токена недоступна
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False') == 'True'
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(ORG_GRAPH_DIR, 'metrics'))
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Профилирование отдельных запросов администратора по заголовку
+# X-Profile или параметру ?profile=1 (talentum.profiling). Каталог
+# результатов должен быть общим для всех процессов
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'True') == 'True'
+PROFILING_DIR = os.getenv(
+    'PROFILING_DIR', os.path.join(tempfile.gettempdir(), 'talentum-profiles')
+)
+PROFILING_KEEP = int(os.getenv('PROFILING_KEEP', '50'))
+PROFILING_SAMPLE_INTERVAL = float(
+    os.getenv('PROFILING_SAMPLE_INTERVAL', '0.005')
+)
+
+# Постоянная выборка стеков запросов в каждом процессе
+# (talentum.sampling): раз в FLUSH_INTERVAL секунд стеки записываются
+# в SAMPLING_PROFILER_DIR, команда merge_profiles строит flame graph
+SAMPLING_PROFILER_ENABLED = os.getenv(
+    'SAMPLING_PROFILER_ENABLED', 'True'
+) == 'True'
+SAMPLING_PROFILER_DIR = os.getenv(
+    'SAMPLING_PROFILER_DIR', os.path.join(PROFILING_DIR, 'continuous')
+)
+SAMPLING_PROFILER_INTERVAL = float(
+    os.getenv('SAMPLING_PROFILER_INTERVAL', '0.01')
+)
+SAMPLING_PROFILER_FLUSH_INTERVAL = float(
+    os.getenv('SAMPLING_PROFILER_FLUSH_INTERVAL', '60')
+)
+SAMPLING_PROFILER_RETENTION = int(
+    os.getenv('SAMPLING_PROFILER_RETENTION', str(7 * 24 * 60 * 60))
+)
+
+# Журнал SQL-запросов дольше SLOW_QUERY_THRESHOLD_MS (talentum.slowlog);
+# для доли SLOW_QUERY_EXPLAIN_RATE из них сохраняется EXPLAIN (ANALYZE,
+# BUFFERS). Отчет - команда slow_query_report
+SLOW_QUERY_LOG_ENABLED = os.getenv('SLOW_QUERY_LOG_ENABLED', 'True') == 'True'
+SLOW_QUERY_LOG = os.getenv(
+    'SLOW_QUERY_LOG', os.path.join(PROFILING_DIR, 'slow_queries.jsonl')
+)
+SLOW_QUERY_LOG_MAX_BYTES = int(
+    os.getenv('SLOW_QUERY_LOG_MAX_BYTES', str(50 * 1024 * 1024))
+)
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '200'))
+SLOW_QUERY_EXPLAIN_RATE = float(os.getenv('SLOW_QUERY_EXPLAIN_RATE', '0.05'))
+
+# tracemalloc для перечисленных представлений ('GoalViewSet.list,...'
+# или '*'; пусто - выключено) с вероятностью MEMORY_PROFILING_RATE
+# (talentum.memprofile). Снимки повторяет команда replay_memory_capture
+MEMORY_PROFILING_VIEWS = [
+    view for view in os.getenv('MEMORY_PROFILING_VIEWS', '').split(',')
+    if view
+]
+MEMORY_PROFILING_RATE = float(os.getenv('MEMORY_PROFILING_RATE', '1'))
+MEMORY_PROFILING_FRAMES = int(os.getenv('MEMORY_PROFILING_FRAMES', '25'))
+MEMORY_PROFILING_TOP = int(os.getenv('MEMORY_PROFILING_TOP', '15'))
+MEMORY_PROFILING_DIR = os.getenv(
+    'MEMORY_PROFILING_DIR', os.path.join(PROFILING_DIR, 'memory')
+)
+MEMORY_PROFILING_KEEP = int(os.getenv('MEMORY_PROFILING_KEEP', '100'))
+
+# Контроль запросов к базе (talentum.querywatch): N+1 и бюджеты
+# запросов действий ViewSet (query_budgets)
+QUERY_WATCH = os.getenv('QUERY_WATCH', str(DEBUG)) == 'True'
+QUERY_WATCH_REPEAT_THRESHOLD = int(
+    os.getenv('QUERY_WATCH_REPEAT_THRESHOLD', '5')
+)
+# Превышение бюджета завершает запрос ошибкой (в тестах)
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'False') == 'True'
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -188,3 +331,5 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+ANALYTICS_CACHE_TIMEOUT = int(os.getenv('ANALYTICS_CACHE_TIMEOUT', '900'))
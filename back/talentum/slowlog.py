@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+
+from talentum.querywatch import fingerprint, view_name
+
+logger = logging.getLogger(__name__)
+
+_READ_ONLY = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+# Изменения последовательностей не отменяются откатом транзакции
+_SEQUENCE_CALL = re.compile(r'\b(nextval|setval)\s*\(', re.IGNORECASE)
+_EXPLAIN_SAVEPOINT = 'slow_query_explain'
+
+_write_lock = threading.Lock()
+
+
+def shape_id(sql):
+    """Короткий идентификатор формы запроса (см. querywatch.fingerprint)."""
+    return hashlib.sha1(fingerprint(sql).encode('utf-8')).hexdigest()[:12]
+
+
+def params_fingerprint(params):
+    """Отпечаток значений параметров без самих значений."""
+    if params is None:
+        return None
+    return hashlib.sha1(repr(params).encode('utf-8')).hexdigest()[:12]
+
+
+def explain(connection, sql, params):
+    """
+    План запроса отдельным курсором в обход оберток execute.
+    SELECT и WITH выполняются повторно (EXPLAIN ANALYZE, BUFFERS),
+    остальные запросы и обращения к последовательностям только
+    планируются. EXPLAIN всегда откатывается (до точки сохранения
+    внутри транзакции или целиком), поэтому изменяющие CTE и функции
+    с побочными эффектами в SELECT не оставляют следов.
+    """
+    if connection.vendor != 'postgresql':
+        return None
+    if _READ_ONLY.match(sql) and not _SEQUENCE_CALL.search(sql):
+        statement = f'EXPLAIN (ANALYZE, BUFFERS) {sql}'
+    else:
+        statement = f'EXPLAIN {sql}'
+    in_transaction = not connection.get_autocommit()
+    with connection.connection.cursor() as cursor:
+        if in_transaction:
+            cursor.execute(f'SAVEPOINT {_EXPLAIN_SAVEPOINT}')
+        else:
+            cursor.execute('BEGIN')
+        try:
+            cursor.execute(statement, params)
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        finally:
+            if in_transaction:
+                cursor.execute(f'ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}')
+                cursor.execute(f'RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}')
+            else:
+                cursor.execute('ROLLBACK')
+    return plan
+
+
+def write_record(path, record, max_bytes):
+    """Строка JSON в журнал; при превышении max_bytes журнал -> .1."""
+    line = json.dumps(record, ensure_ascii=False) + '\n'
+    with _write_lock:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        try:
+            if os.path.getsize(path) >= max_bytes:
+                os.replace(path, f'{path}.1')
+        except FileNotFoundError:
+            pass
+        # O_APPEND: строки разных процессов не перемешиваются
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, line.encode('utf-8'))
+        finally:
+            os.close(fd)
+
+
+def read_records(path):
+    """Записи журнала и его предыдущей части (.1), старые первыми."""
+    for name in (f'{path}.1', path):
+        try:
+            file = open(name, encoding='utf-8')
+        except FileNotFoundError:
+            continue
+        with file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+class SlowQueryRecorder:
+    """
+    Обертка execute: запросы дольше threshold секунд записываются
+    в журнал с представлением, отпечатком параметров и (с вероятностью
+    explain_rate) планом выполнения.
+    """
+
+    def __init__(self, request, threshold, explain_rate, path, max_bytes):
+        self.request = request
+        self.threshold = threshold
+        self.explain_rate = explain_rate
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - start
+        if duration >= self.threshold:
+            try:
+                self.record(context['connection'], sql, params, many,
+                            duration)
+            except Exception:
+                logger.exception('Не удалось записать медленный запрос')
+        return result
+
+    def record(self, connection, sql, params, many, duration):
+        plan = None
+        if not many and random.random() < self.explain_rate:
+            try:
+                plan = explain(connection, sql, params)
+            except Exception as error:
+                plan = f'EXPLAIN failed: {error}'
+        write_record(self.path, {
+            'time': timezone.now().isoformat(),
+            'view': view_name(self.request) or self.request.path,
+            'duration_ms': round(duration * 1000, 3),
+            'shape': shape_id(sql),
+            'sql': sql,
+            'params_count': len(params) if not many and params else 0,
+            'params_fingerprint': None if many else params_fingerprint(params),
+            'database': connection.alias,
+            'explain': plan,
+        }, self.max_bytes)
+
+
+class SlowQueryMiddleware:
+    """
+    Журнал медленных запросов к базе (SLOW_QUERY_LOG) с планами
+    выполнения для части из них. Отчет - команда slow_query_report.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SLOW_QUERY_LOG_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = SlowQueryRecorder(
+            request,
+            settings.SLOW_QUERY_THRESHOLD_MS / 1000,
+            settings.SLOW_QUERY_EXPLAIN_RATE,
+            settings.SLOW_QUERY_LOG,
+            settings.SLOW_QUERY_LOG_MAX_BYTES,
+        )
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(recorder))
+            return self.get_response(request)
@@ -0,0 +1,111 @@
+import io
+import json
+import math
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from talentum.benchmark import compare, percentile, summarize
+
+SCENARIOS = {
+    'goals.list', 'goals.my_goals', 'goals.retrieve', 'goals.submit',
+    'goals.approve', 'goals.complete', 'employees.my_team',
+    'feedback_requests.list', 'feedback_requests.create',
+    'feedback_inbox.list', 'expert_evaluation.create',
+}
+
+
+def _result(queries=5, p50=10.0, p95=20.0, peak=1000, status=(200,)):
+    return {
+        'status': list(status),
+        'queries': queries,
+        'latency_ms': {'p50': p50, 'p95': p95, 'p99': p95, 'mean': p50},
+        'peak_bytes': peak,
+    }
+
+
+class BenchmarkCompareTestCase(SimpleTestCase):
+    """Тесты сравнения результатов бенчмарка с базовыми"""
+
+    def test_percentiles(self):
+        values = [i / 1000 for i in range(100, 0, -1)]
+        self.assertEqual(percentile(values, 50), 0.051)
+        self.assertTrue(math.isnan(percentile([], 50)))
+        self.assertEqual(summarize(values)['p99'], 99.0)
+
+    def test_regressions(self):
+        baseline = {'scenarios': {
+            'same': _result(),
+            'slower': _result(),
+            'noise': _result(p50=0.5, p95=0.6),
+            'queries': _result(),
+            'memory': _result(),
+            'status': _result(),
+        }}
+        current = {'scenarios': {
+            'same': _result(p50=11.0, queries=4),
+            'slower': _result(p95=30.0),
+            'noise': _result(p50=0.9, p95=1.0),
+            'queries': _result(queries=6),
+            'memory': _result(peak=2000),
+            'status': _result(status=(500,)),
+            'new': _result(),
+        }}
+        regressions = {
+            (item['scenario'], item['metric'])
+            for item in compare(current, baseline)
+        }
+        self.assertEqual(regressions, {
+            ('slower', 'latency_ms.p95'),
+            ('queries', 'queries'),
+            ('memory', 'peak_bytes'),
+            ('status', 'status'),
+        })
+
+
+class BenchmarkCommandTestCase(TestCase):
+    """Тесты команды benchmark_api на небольшой организации"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.output = os.path.join(self.directory, 'results.json')
+
+    def _run(self, **options):
+        call_command(
+            'benchmark_api', employees=200, seed=1, iterations=2, warmup=1,
+            stdout=io.StringIO(), **options
+        )
+
+    def test_results_and_baseline(self):
+        self._run(output=self.output)
+        with open(self.output) as file:
+            results = json.load(file)
+
+        self.assertEqual(set(results['scenarios']), SCENARIOS)
+        for name, result in results['scenarios'].items():
+            self.assertTrue(all(status < 300 for status in result['status']),
+                            name)
+            self.assertGreater(result['queries'], 0, name)
+            self.assertGreater(result['peak_bytes'], 0, name)
+        self.assertEqual(results['parameters']['goals'], 2000)
+
+        # Изменения запросов откатываются: повтор дает те же статусы
+        # и то же число запросов
+        baseline = os.path.join(self.directory, 'baseline.json')
+        for result in results['scenarios'].values():
+            result['latency_ms'] = {'p50': 1e6, 'p95': 1e6}
+            result['peak_bytes'] *= 10
+        with open(baseline, 'w') as file:
+            json.dump(results, file)
+        self._run(baseline=baseline)
+
+        results['scenarios']['goals.retrieve']['queries'] = 1
+        with open(baseline, 'w') as file:
+            json.dump(results, file)
+        with self.assertRaisesMessage(CommandError, '1 regression(s)'):
+            self._run(baseline=baseline, scenario=['goals.retrieve'])
@@ -0,0 +1,113 @@
+import queue
+import threading
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from accounts.models import User, Employee
+from accounts.org_graph import ORG_GRAPH_KEY
+from talentum import invalidation
+
+
+class HandlerMixin:
+
+    def subscribe_handler(self):
+        received = queue.Queue()
+
+        def handler(keys):
+            received.put((threading.current_thread().name, keys))
+
+        invalidation.subscribe(handler)
+        self.addCleanup(invalidation.unsubscribe, handler)
+        return received
+
+
+class InvalidationHooksTests(HandlerMixin, TestCase):
+    """Тесты публикации ключей при изменении моделей"""
+
+    def test_keys_published_on_commit(self):
+        """Тест: ключи сущности и связанных объектов после фиксации"""
+        received = self.subscribe_handler()
+        user = User.objects.create_user(
+            username='employee', email='employee@example.com'
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            employee = Employee.objects.create(
+                user=user, hire_dt='2021-01-01', position='Developer'
+            )
+
+        keys = set()
+        while not received.empty():
+            keys |= received.get_nowait()[1]
+        self.assertEqual(keys, {
+            f'accounts.employee:{employee.id}', f'accounts.user:{user.id}',
+            ORG_GRAPH_KEY
+        })
+
+    def test_nothing_published_without_commit(self):
+        """Тест: откат транзакции не рассылает ключи"""
+        received = self.subscribe_handler()
+        with self.captureOnCommitCallbacks(execute=False):
+            User.objects.create_user(
+                username='employee', email='employee@example.com'
+            )
+        self.assertTrue(received.empty())
+
+    def test_wildcard_flushes_everything(self):
+        """Тест: ключ '*' передается обработчикам как None"""
+        received = self.subscribe_handler()
+        invalidation.dispatch({invalidation.ALL, 'accounts.user:1'})
+        self.assertEqual(received.get_nowait()[1], None)
+
+    def test_large_key_sets_split_into_payloads(self):
+        """Тест: уведомления не превышают ограничение NOTIFY"""
+        keys = [f'goals.goal:{i}' for i in range(5000)]
+        chunks = list(invalidation._payloads(keys))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(sum(chunks, []), keys)
+
+
+class InvalidationListenerTests(HandlerMixin, TransactionTestCase):
+    """Тесты доставки уведомлений через LISTEN/NOTIFY"""
+
+    def start_listener(self, origin):
+        listener = invalidation.InvalidationListener(
+            connection.get_connection_params(), origin
+        )
+        listener.start()
+        self.addCleanup(listener.join, 5)
+        self.addCleanup(listener.stop)
+        self.assertTrue(listener.ready.wait(5))
+        return listener
+
+    def test_other_process_receives_keys(self):
+        """Тест: слушатель другого процесса получает ключи сохраненной записи"""
+        received = self.subscribe_handler()
+        self.start_listener(origin='other-process')
+
+        user = User.objects.create_user(
+            username='employee', email='employee@example.com'
+        )
+
+        delivered = []
+        while len(delivered) < 2:
+            delivered.append(received.get(timeout=5))
+        threads = {thread for thread, _ in delivered}
+        self.assertIn('invalidation-listener', threads)
+        for _, keys in delivered:
+            self.assertEqual(keys, {f'accounts.user:{user.id}'})
+
+    def test_own_notifications_skipped(self):
+        """Тест: уведомления своего процесса не обрабатываются повторно"""
+        received = self.subscribe_handler()
+        self.start_listener(origin=invalidation.process_origin())
+
+        invalidation.notify(['accounts.user:1'])
+        invalidation.notify(['accounts.user:2'])
+
+        self.assertEqual(received.get(timeout=5)[0], 'MainThread')
+        self.assertEqual(received.get(timeout=5)[0], 'MainThread')
+        with self.assertRaises(queue.Empty):
+            received.get(timeout=0.5)
@@ -0,0 +1,88 @@
+import io
+import json
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import Employee, User
+from talentum.memprofile import capture_request, get_capture_store
+from talentum.metrics import collect, render
+
+
+class MemoryProfilingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='employee', email='employee@example.com',
+            password='password123', role='employee'
+        )
+        cls.employee = Employee.objects.create(
+            user=cls.user, hire_dt='2021-01-01', position='Developer'
+        )
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings_override = override_settings(
+            MEMORY_PROFILING_VIEWS=['EmployeeViewSet.list'],
+            MEMORY_PROFILING_RATE=1,
+            MEMORY_PROFILING_DIR=f'{self.directory}/memory',
+            METRICS_ENABLED=True,
+            METRICS_DIR=f'{self.directory}/metrics',
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_selected_views_are_captured(self):
+        self.client.get(reverse('employee-list'))
+        self.client.get(reverse('employee-detail', args=[self.employee.pk]))
+
+        store = get_capture_store()
+        self.assertEqual(len(store.ids()), 1)
+        capture = store.load(store.ids()[0])
+        self.assertEqual(capture['view'], 'EmployeeViewSet.list')
+        self.assertGreater(capture['peak'], 0)
+        self.assertGreaterEqual(capture['peak'], capture['retained'])
+        self.assertTrue(capture['sites'])
+        self.assertEqual(capture['request']['user_id'], self.user.pk)
+
+        text = render(collect(f'{self.directory}/metrics'))
+        self.assertIn(
+            'talentum_memory_peak_bytes_count{view="EmployeeViewSet.list"} 1',
+            text
+        )
+
+    def test_secrets_are_not_captured(self):
+        request = RequestFactory().post(
+            '/api/v1/auth/token/',
+            data=json.dumps({'username': 'employee',
+                             'password': 'password123'}),
+            content_type='application/json'
+        )
+        captured = capture_request(request)
+        self.assertEqual(captured['body'],
+                         {'username': 'employee', 'password': '***'})
+
+    def test_capture_is_replayed(self):
+        self.client.get(reverse('employee-list'))
+        capture_id = get_capture_store().ids()[0]
+
+        output = io.StringIO()
+        call_command('replay_memory_capture', capture_id, stdout=output)
+        report = output.getvalue()
+        self.assertIn('EmployeeViewSet.list: GET /api/v1/employees/ -> 200',
+                      report)
+        self.assertIn('peak', report)
+        self.assertIn('site', report)
+        # Повтор не сохраняет новых снимков
+        self.assertEqual(get_capture_store().ids(), [capture_id])
+
+        output = io.StringIO()
+        call_command('replay_memory_capture', list=True, stdout=output)
+        self.assertIn(capture_id, output.getvalue())
@@ -0,0 +1,138 @@
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import Employee, User
+from talentum.metrics import (
+    INITIAL_SIZE, MetricsFile, Registry, collect, read_file, render
+)
+
+
+class MetricsStorageTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_values_survive_reopening(self):
+        path = os.path.join(self.directory, '1.db')
+        metrics = MetricsFile(path)
+        metrics.inc('requests{view="a"}')
+        metrics.inc('requests{view="a"}', 2)
+
+        self.assertEqual(MetricsFile(path).items(),
+                         [('requests{view="a"}', 3.0)])
+        self.assertEqual(read_file(path), [('requests{view="a"}', 3.0)])
+
+    def test_file_grows(self):
+        path = os.path.join(self.directory, '1.db')
+        metrics = MetricsFile(path)
+        keys = [f'requests{{view="{"x" * 100}{index}"}}'
+                for index in range(1000)]
+        for key in keys:
+            metrics.inc(key)
+
+        self.assertGreater(os.path.getsize(path), INITIAL_SIZE)
+        self.assertEqual([key for key, _ in read_file(path)], keys)
+
+    def test_processes_are_summed(self):
+        first = MetricsFile(os.path.join(self.directory, '1.db'))
+        second = MetricsFile(os.path.join(self.directory, '2.db'))
+        first.inc('requests')
+        second.inc('requests', 4)
+        second.inc('errors')
+
+        self.assertEqual(collect(self.directory),
+                         {'requests': 5.0, 'errors': 1.0})
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry(self.directory)
+        for value in (0.02, 0.3, 7):
+            registry.observe('talentum_http_request_duration_seconds',
+                             {'view': 'GoalViewSet.list'}, value,
+                             (0.1, 1.0))
+
+        text = render(collect(self.directory))
+        self.assertIn(
+            '# TYPE talentum_http_request_duration_seconds histogram', text
+        )
+        for line in (
+            'talentum_http_request_duration_seconds_bucket'
+            '{view="GoalViewSet.list",le="0.1"} 1',
+            'talentum_http_request_duration_seconds_bucket'
+            '{view="GoalViewSet.list",le="1"} 2',
+            'talentum_http_request_duration_seconds_bucket'
+            '{view="GoalViewSet.list",le="+Inf"} 3',
+            'talentum_http_request_duration_seconds_count'
+            '{view="GoalViewSet.list"} 3',
+        ):
+            self.assertIn(line, text)
+
+
+class MetricsEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='employee', email='employee@example.com',
+            password='password123', role='employee'
+        )
+        Employee.objects.create(
+            user=cls.user, hire_dt='2021-01-01', position='Developer'
+        )
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings_override = override_settings(
+            METRICS_ENABLED=True, METRICS_DIR=directory,
+            METRICS_TOKEN='secret'
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_requests_are_recorded_by_view_and_action(self):
+        self.client.get(reverse('employee-list'))
+        self.client.get(reverse('employee-list'))
+
+        response = self.client.get(
+            '/metrics', HTTP_AUTHORIZATION='Bearer secret'
+        )
+        self.assertEqual(response.status_code, 200)
+        text = response.content.decode()
+        self.assertIn(
+            'talentum_http_requests_total{view="EmployeeViewSet.list",'
+            'method="GET",status="200"} 2', text
+        )
+        for name in ('talentum_db_queries', 'talentum_db_duration_seconds',
+                     'talentum_serializer_duration_seconds',
+                     'talentum_response_render_duration_seconds'):
+            self.assertIn(f'{name}_count{{view="EmployeeViewSet.list"}} 2',
+                          text)
+        for name in ('talentum_serializer_duration_seconds',
+                     'talentum_response_render_duration_seconds'):
+            total = next(
+                line for line in text.splitlines()
+                if line.startswith(f'{name}_sum{{view="EmployeeViewSet.list"}}')
+            )
+            self.assertGreater(float(total.split()[-1]), 0)
+
+    def test_token_is_required(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get(
+            '/metrics', HTTP_AUTHORIZATION='Bearer wrong'
+        ).status_code, 401)
+        response = self.client.get(
+            '/metrics', HTTP_AUTHORIZATION='Bearer secret'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_unavailable_without_token(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer ')
+        self.assertEqual(response.status_code, 404)
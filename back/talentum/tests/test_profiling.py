@@ -0,0 +1,191 @@
+import glob
+import io
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+import time
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import Employee, User
+from talentum.profiling import ProfileStore
+from talentum.sampling import (
+    ContinuousProfiler, StackSampler, format_collapsed, parse_collapsed
+)
+
+
+class ProfilingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_user(
+            username='admin', email='admin@example.com',
+            password='password123', role='admin'
+        )
+        cls.employee_user = User.objects.create_user(
+            username='employee', email='employee@example.com',
+            password='password123', role='employee'
+        )
+        Employee.objects.create(
+            user=cls.employee_user, hire_dt='2021-01-01', position='Developer'
+        )
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings_override = override_settings(
+            PROFILING_ENABLED=True, PROFILING_DIR=self.directory,
+            PROFILING_KEEP=2, PROFILING_SAMPLE_INTERVAL=0.001
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+
+    def authenticate(self, user):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+        )
+
+    def test_admin_request_is_profiled(self):
+        self.authenticate(self.admin_user)
+        response = self.client.get(reverse('employee-list'),
+                                   HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, 200)
+        profile_id = response['X-Profile-Id']
+
+        meta = self.client.get(
+            reverse('profile-detail', args=[profile_id])
+        ).data
+        self.assertEqual(meta['view'], 'EmployeeViewSet.list')
+        self.assertEqual(meta['user'], 'admin')
+        self.assertEqual(meta['sql_count'], len(meta['queries']))
+        self.assertGreater(meta['sql_count'], 0)
+
+        response = self.client.get(
+            reverse('profile-pstats', args=[profile_id])
+        )
+        path = f'{self.directory}/downloaded.prof'
+        with open(path, 'wb') as file:
+            file.write(b''.join(response.streaming_content))
+        functions = {name for _, _, name in pstats.Stats(path).stats}
+        self.assertIn('list', functions)
+
+        response = self.client.get(
+            reverse('profile-collapsed', args=[profile_id])
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_query_flag_enables_profiling(self):
+        self.authenticate(self.admin_user)
+        response = self.client.get(reverse('employee-list'), {'profile': 1})
+        self.assertIn('X-Profile-Id', response)
+
+    def test_other_users_are_not_profiled(self):
+        self.authenticate(self.employee_user)
+        response = self.client.get(reverse('employee-list'),
+                                   HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(
+            self.client.get(reverse('profile-list')).status_code, 403
+        )
+
+    def test_old_profiles_are_removed(self):
+        self.authenticate(self.admin_user)
+        ids = [
+            self.client.get(reverse('employee-list'),
+                            HTTP_X_PROFILE='1')['X-Profile-Id']
+            for _ in range(3)
+        ]
+        listed = [meta['id'] for meta in
+                  self.client.get(reverse('profile-list')).data]
+        self.assertEqual(listed, [ids[2], ids[1]])
+        self.assertEqual(ProfileStore(self.directory, 2).ids(), listed)
+
+
+class StackSamplerTests(TestCase):
+    def test_samples_busy_thread(self):
+        stopped = threading.Event()
+
+        def busy_loop():
+            while not stopped.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=busy_loop)
+        worker.start()
+        sampler = StackSampler(0.001, thread_ids={worker.ident})
+        sampler.start()
+        time.sleep(0.1)
+        sampler.stop()
+        stopped.set()
+        worker.join()
+
+        counts = sampler.take()
+        self.assertTrue(counts)
+        self.assertTrue(all('busy_loop (talentum/tests/test_profiling.py'
+                            in stack for stack in counts))
+        self.assertEqual(parse_collapsed(format_collapsed(counts)), counts)
+
+
+class ContinuousProfilerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='employee', email='employee@example.com',
+            password='password123', role='employee'
+        )
+        Employee.objects.create(
+            user=cls.user, hire_dt='2021-01-01', position='Developer'
+        )
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_request_stacks_are_written_and_merged(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        profiler = ContinuousProfiler(self.directory, 0.001, 3600, 3600)
+        profiler.start()
+        deadline = time.monotonic() + 0.3
+        while time.monotonic() < deadline:
+            client.get(reverse('employee-list'))
+        profiler.stop()
+        profiler.flush()
+
+        paths = glob.glob(os.path.join(self.directory, '*.collapsed'))
+        self.assertEqual(len(paths), 1)
+        with open(paths[0]) as file:
+            counts = parse_collapsed(file.read())
+        self.assertTrue(counts)
+        self.assertTrue(all(
+            stack.startswith('get_response (django/core/handlers/base.py')
+            for stack in counts
+        ))
+
+        output = io.StringIO()
+        call_command('merge_profiles', '-', directory=self.directory,
+                     stdout=output)
+        self.assertEqual(parse_collapsed(output.getvalue()), counts)
+
+        svg_path = os.path.join(self.directory, 'cpu.svg')
+        call_command('merge_profiles', svg_path, directory=self.directory,
+                     match='talentum/querywatch.py', stdout=io.StringIO())
+        with open(svg_path) as file:
+            svg = file.read()
+        self.assertTrue(svg.startswith('<svg'))
+        self.assertIn('get_response', svg)
+
+    def test_old_files_are_removed(self):
+        old_path = os.path.join(self.directory, '1-20200101000000.collapsed')
+        with open(old_path, 'w') as file:
+            file.write('a;b 1\n')
+        os.utime(old_path, (0, 0))
+
+        ContinuousProfiler(self.directory, 0.01, 60, 3600).flush()
+        self.assertFalse(os.path.exists(old_path))
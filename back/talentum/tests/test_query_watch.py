@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import Employee, User
+from accounts.views import EmployeeViewSet
+from talentum.querywatch import (
+    QueryBudgetExceeded, QueryRecorder, QueryWatchMiddleware, fingerprint
+)
+
+
+class FingerprintTests(TestCase):
+    def test_values_are_replaced(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM users WHERE id = 15 AND name = 'x''y'"),
+            'SELECT * FROM users WHERE id = ? AND name = ?'
+        )
+
+    def test_in_lists_of_any_length_match(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            fingerprint('SELECT * FROM t WHERE id IN (%s)')
+        )
+
+    def test_transaction_statements_are_not_counted(self):
+        recorder = QueryRecorder()
+        recorder(lambda *args: None, 'SAVEPOINT "s1"', None, False, {})
+        recorder(lambda *args: None, 'SELECT 1', None, False, {})
+        self.assertEqual(recorder.count, 1)
+
+
+class QueryWatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager_user = User.objects.create_user(
+            username='manager', email='manager@example.com',
+            password='password123', role='employee'
+        )
+        cls.manager = Employee.objects.create(
+            user=cls.manager_user, hire_dt='2020-01-01', position='Team Lead'
+        )
+        cls.subordinates = []
+        for index in range(8):
+            user = User.objects.create_user(
+                username=f'employee{index}',
+                email=f'employee{index}@example.com', password='password123',
+                first_name=f'Employee{index}', role='employee'
+            )
+            cls.subordinates.append(Employee.objects.create(
+                user=user, hire_dt='2021-01-01', position='Developer',
+                manager=cls.manager
+            ))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.manager_user)
+
+    def test_repeated_queries_are_logged_with_stack(self):
+        def view(request):
+            for employee in Employee.objects.filter(manager=self.manager):
+                employee.user.get_full_name()
+
+        middleware = QueryWatchMiddleware(view)
+        with self.assertLogs('talentum.querywatch', 'WARNING') as logs:
+            middleware(RequestFactory().get('/'))
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('8 запросов вида', logs.output[0])
+        self.assertIn('test_query_watch.py', logs.output[0])
+
+    def test_team_stays_within_budget(self):
+        response = self.client.get(reverse('employee-my-team'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 8)
+
+    def test_exceeded_budget_fails_request(self):
+        budgets = {**EmployeeViewSet.query_budgets, 'my_team': 0}
+        with self.settings(QUERY_BUDGET_STRICT=True), \
+                self.modify_budgets(budgets):
+            with self.assertRaisesMessage(QueryBudgetExceeded,
+                                          'EmployeeViewSet.my_team'):
+                self.client.get(reverse('employee-my-team'))
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_exceeded_budget_is_logged_when_not_strict(self):
+        budgets = {**EmployeeViewSet.query_budgets, 'my_team': 0}
+        with self.modify_budgets(budgets), \
+                self.assertLogs('talentum.querywatch', 'WARNING') as logs:
+            response = self.client.get(reverse('employee-my-team'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('при бюджете 0', logs.output[-1])
+
+    def modify_budgets(self, budgets):
+        return mock.patch.object(EmployeeViewSet, 'query_budgets', budgets)
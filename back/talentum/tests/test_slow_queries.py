@@ -0,0 +1,119 @@
+import io
+import os
+import shutil
+import tempfile
+
+import psycopg2
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import Employee, User
+from talentum.slowlog import explain, read_records, shape_id, write_record
+
+
+class SlowQueryLogTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='employee', email='employee@example.com',
+            password='password123', role='employee'
+        )
+        Employee.objects.create(
+            user=cls.user, hire_dt='2021-01-01', position='Developer'
+        )
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'slow.jsonl')
+
+    def test_queries_over_threshold_are_logged_with_plan(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        with override_settings(
+            SLOW_QUERY_LOG_ENABLED=True, SLOW_QUERY_LOG=self.path,
+            SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_EXPLAIN_RATE=1
+        ):
+            response = client.get(reverse('employee-list'))
+        self.assertEqual(response.status_code, 200)
+
+        records = list(read_records(self.path))
+        self.assertTrue(records)
+        record = next(r for r in records if '"employees"' in r['sql'])
+        self.assertEqual(record['view'], 'EmployeeViewSet.list')
+        self.assertEqual(record['shape'], shape_id(record['sql']))
+        self.assertIn('Execution Time', record['explain'])
+        # После EXPLAIN транзакция запроса остается рабочей
+        self.assertTrue(User.objects.filter(pk=self.user.pk).exists())
+
+    def test_modifying_queries_are_only_planned(self):
+        plan = explain(
+            connection,
+            'UPDATE users SET first_name = %s WHERE id = %s',
+            ['Changed', self.user.pk]
+        )
+        self.assertIn('Update on users', plan)
+        self.assertNotIn('actual time', plan)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, '')
+
+    def test_modifying_cte_is_rolled_back(self):
+        plan = explain(
+            connection,
+            'WITH changed AS (UPDATE users SET first_name = %s '
+            'WHERE id = %s RETURNING id) SELECT count(*) FROM changed',
+            ['Changed', self.user.pk]
+        )
+        self.assertIn('actual time', plan)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, '')
+
+    def test_sequence_calls_are_only_planned(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT nextval('users_id_seq')")
+            before = cursor.fetchone()[0]
+        plan = explain(connection, "SELECT nextval('users_id_seq')", None)
+        self.assertNotIn('actual time', plan)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT nextval('users_id_seq')")
+            self.assertEqual(cursor.fetchone()[0], before + 1)
+
+    def test_failed_explain_keeps_transaction_usable(self):
+        with self.assertRaises(psycopg2.Error):
+            explain(connection, 'SELECT missing_column FROM users', None)
+        self.assertTrue(User.objects.filter(pk=self.user.pk).exists())
+
+    def test_log_is_rotated(self):
+        write_record(self.path, {'n': 1}, max_bytes=1)
+        write_record(self.path, {'n': 2}, max_bytes=1)
+        self.assertTrue(os.path.exists(f'{self.path}.1'))
+        self.assertEqual([r['n'] for r in read_records(self.path)], [1, 2])
+
+    def test_report_ranks_shapes(self):
+        fast_sql = 'SELECT * FROM goals WHERE id = %s'
+        slow_sql = 'SELECT * FROM goals WHERE employee_id IN (%s, %s)'
+        records = [
+            (fast_sql, 'GoalViewSet.retrieve', 300, None),
+            (slow_sql, 'GoalViewSet.list', 900, 'Seq Scan on goals'),
+            (slow_sql, 'GoalViewSet.list', 1200, None),
+        ]
+        for sql, view, duration, plan in records:
+            write_record(self.path, {
+                'time': '2026-01-01T00:00:00+00:00', 'view': view,
+                'duration_ms': duration, 'shape': shape_id(sql), 'sql': sql,
+                'params_count': 2, 'params_fingerprint': 'x',
+                'database': 'default', 'explain': plan,
+            }, max_bytes=10 ** 6)
+
+        output = io.StringIO()
+        call_command('slow_query_report', log=self.path, explain=True,
+                     stdout=output)
+        report = output.getvalue()
+        self.assertLess(report.index(shape_id(slow_sql)),
+                        report.index(shape_id(fast_sql)))
+        self.assertIn('2 queries, total 2100 ms', report)
+        self.assertIn('views: GoalViewSet.list x2', report)
+        self.assertIn('Seq Scan on goals', report)
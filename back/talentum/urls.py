@@ -1,11 +1,18 @@
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from rest_framework.routers import SimpleRouter
 
 from accounts.urls import api_router as accounts_api_router
+from talentum.metrics import metrics_view
+from talentum.profiling import ProfileViewSet
+
+profiling_router = SimpleRouter()
+profiling_router.register(r'profiles', ProfileViewSet, basename='profile')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
 
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path(
@@ -19,4 +26,6 @@ urlpatterns = [
 
     path('api/v1/', include('goals.urls')),
     path('api/v1/', include('feedback.urls')),
+    path('api/v1/', include('analytics.urls')),
+    path('api/v1/', include(profiling_router.urls)),
 ]